@@ -1,32 +1,160 @@
 """
 API Integration Module for Job Scraper APIs
 Supports RapidAPI job scrapers: LinkedIn, Indeed, Glassdoor, and aggregators
+
+Every provider goes through JobAPIBase._fetch_page(), which:
+- answers repeated requests from a TTL response cache (and lets identical
+  in-flight requests share one call), so a repeated query costs no credit
+- tracks the provider's quota from RapidAPI's X-RateLimit-* headers and stops
+  spending when it is used up, until the reset time
+- backs off once on 429 using Retry-After
+
+search() walks result pages until max_results is reached, and search_many()
+fans (keyword, location) queries out over a thread pool no wider than the
+remaining quota allows.
 """
 import os
 import time
 import hashlib
-import requests
-from typing import List, Dict, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from dotenv import load_dotenv
 
+from perf_metrics import METRICS, timed_request
+from single_flight import SingleFlight
+
 load_dotenv()
 
 USER_AGENT = "Mozilla/5.0 (compatible; JobScraperUltimate/2.0)"
 
+# Paid responses are reused this long (seconds)
+API_CACHE_TTL = 3600.0
+API_FLIGHT = SingleFlight("api", ttl=API_CACHE_TTL, max_entries=1024)
+
+# Concurrent requests per search_many() call (further capped by remaining quota)
+DEFAULT_API_WORKERS = 4
+
+
+class QuotaExhausted(Exception):
+    """The provider's request quota is used up until its reset time"""
+
+
+class ApiQuota:
+    """Request quota of one RapidAPI provider, as last reported by its headers"""
+
+    def __init__(self, host: str):
+        self.host = host
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0      # time.time() when the quota refills (0 = unknown)
+        self.reserved = 0        # requests sent but not yet answered
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Reserve one request, or raise QuotaExhausted"""
+        with self._lock:
+            if self.remaining is not None and self.remaining - self.reserved <= 0:
+                if self.reset_at and time.time() >= self.reset_at:
+                    self.remaining = None  # refilled; the next response reports the new value
+                else:
+                    raise QuotaExhausted(f"{self.host}: quota used up" + (
+                        f", resets in {self.reset_at - time.time():.0f}s" if self.reset_at else ""))
+            self.reserved += 1
+            self.requests += 1
+
+    def release(self, headers=None, status: int = 0):
+        """Finish a reserved request and take the quota the response reports"""
+        with self._lock:
+            self.reserved = max(0, self.reserved - 1)
+            if headers is not None:
+                limit = _header_int(headers, "X-RateLimit-Requests-Limit", "X-RateLimit-Limit")
+                remaining = _header_int(headers, "X-RateLimit-Requests-Remaining", "X-RateLimit-Remaining")
+                reset = _header_int(headers, "X-RateLimit-Requests-Reset", "X-RateLimit-Reset")
+                if limit is not None:
+                    self.limit = limit
+                if remaining is not None:
+                    # Concurrent responses arrive out of order: keep the lowest count until the reset
+                    refilled = self.reset_at and time.time() >= self.reset_at
+                    self.remaining = remaining if self.remaining is None or refilled else min(self.remaining, remaining)
+                if reset is not None:
+                    # RapidAPI sends seconds until reset; some providers send an epoch
+                    self.reset_at = reset if reset > 1_000_000_000 else time.time() + reset
+            if status == 429 and self.remaining is None:
+                self.remaining = 0
+
+    def available(self) -> Optional[int]:
+        """Requests that can still be sent now (None = unknown, assume plenty)"""
+        with self._lock:
+            if self.remaining is None:
+                return None
+            if self.reset_at and time.time() >= self.reset_at:
+                return None
+            return max(0, self.remaining - self.reserved)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"limit": self.limit, "remaining": self.remaining, "requests": self.requests,
+                    "resets_in": max(0.0, self.reset_at - time.time()) if self.reset_at else None}
+
+
+_QUOTAS: Dict[str, ApiQuota] = {}
+_QUOTAS_LOCK = threading.Lock()
+
+
+def get_quota(host: str) -> ApiQuota:
+    """The shared quota tracker for an API host"""
+    with _QUOTAS_LOCK:
+        quota = _QUOTAS.get(host)
+        if quota is None:
+            quota = _QUOTAS[host] = ApiQuota(host)
+        return quota
+
+
+def quota_report() -> Dict[str, Dict[str, Any]]:
+    """{host: quota} for every provider used in this process"""
+    with _QUOTAS_LOCK:
+        quotas = list(_QUOTAS.values())
+    return {q.host: q.to_dict() for q in quotas}
+
+
+def _header_int(headers, *names) -> Optional[int]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            try:
+                return int(float(value))
+            except ValueError:
+                continue
+    return None
+
 
 class JobAPIBase:
     """Base class for all job API integrations"""
-    
+
+    API_HOST = ""
+    API_URL = ""
+    ENGINE = ""
+    LABEL = "JobAPI"
+    KEY_ENV = "RAPIDAPI_KEY"
+    # Query parameter holding the 1-based page number (None = single page)
+    PAGE_PARAM: Optional[str] = None
+    MAX_PAGES = 5
+
     def __init__(self, api_key: Optional[str] = None, rapidapi_key: Optional[str] = None):
         self.api_key = api_key
         self.rapidapi_key = rapidapi_key or os.getenv("RAPIDAPI_KEY")
+        # requests is imported when the first API client is built, not when the registry loads
+        import requests
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": USER_AGENT})
-    
+        self.quota = get_quota(self.API_HOST or self.LABEL)
+
     def _hash(self, title: str, url: str) -> str:
         """Generate unique hash for job posting"""
         return hashlib.sha1(f"{title}|{url}".encode("utf-8", errors="ignore")).hexdigest()
-    
+
     def _format_result(self, engine: str, query: str, title: str, url: str, snippet: str = "") -> Dict:
         """Format API response into standard job result format"""
         return {
@@ -39,374 +167,334 @@ class JobAPIBase:
             "hash": self._hash(title, url)
         }
 
+    # ---------------- provider hooks -----------------
+
+    def _params(self, keyword: str, location: str, max_results: int) -> Dict[str, str]:
+        """Query parameters for page 1 (PAGE_PARAM is added per page)"""
+        raise NotImplementedError
+
+    def _jobs(self, data) -> list:
+        """The job list inside a response body"""
+        if isinstance(data, list):
+            return data
+        return data.get("data", []) or data.get("jobs", []) or []
+
+    def _result(self, job: Dict, keyword: str, location: str) -> Optional[Dict]:
+        """One job as a standard result, or None to skip it"""
+        raise NotImplementedError
+
+    # ---------------- fetching -----------------
+
+    def _fetch_page(self, params: Dict[str, str], verbose: bool = False):
+        """
+        GET API_URL with params: cached, quota-checked and counted.
+        Raises QuotaExhausted when the provider has no requests left.
+        """
+        key = (self.API_URL, tuple(sorted(params.items())))
+        ran = []
+
+        def fetch():
+            ran.append(True)
+            return self._request(params, verbose)
+
+        data = API_FLIGHT.do(key, fetch)
+        METRICS.cache("api_response", not ran)
+        if not ran and verbose:
+            print(f"[{self.LABEL}] cached response")
+        return data
+
+    def _request(self, params: Dict[str, str], verbose: bool = False, retry: bool = True):
+        headers = {
+            "X-RapidAPI-Key": self.rapidapi_key,
+            "X-RapidAPI-Host": self.API_HOST
+        }
+        self.quota.acquire()
+        response = None
+        try:
+            response = timed_request(self.session.get, self.API_URL, "api", headers=headers, params=params, timeout=30)
+        finally:
+            self.quota.release(response.headers if response is not None else None,
+                               response.status_code if response is not None else 0)
+        if response.status_code == 429 and retry:
+            wait = min(30.0, float(_header_int(response.headers, "Retry-After") or 2))
+            if verbose:
+                print(f"[{self.LABEL}] Rate limited, retrying in {wait:.0f}s")
+            time.sleep(wait)
+            return self._request(params, verbose, retry=False)
+        response.raise_for_status()
+        return response.json()
 
-class LinkedInJobAPI(JobAPIBase):
-    """LinkedIn Job Search API via RapidAPI"""
-    
-    API_HOST = "linkedin-job-search-api.p.rapidapi.com"
-    API_URL = f"https://{API_HOST}/search"
-    
-    def __init__(self, api_key: Optional[str] = None):
-        rapidapi_key = api_key or os.getenv("LINKEDIN_API_KEY") or os.getenv("RAPIDAPI_KEY")
-        super().__init__(api_key=api_key, rapidapi_key=rapidapi_key)
-    
     def search(self, keyword: str, location: str = "", max_results: int = 20, verbose: bool = False) -> List[Dict]:
         """
-        Search LinkedIn jobs using RapidAPI
-        
+        Search jobs, following result pages until max_results are collected,
+        a page comes back empty or adds nothing new, or the quota runs out.
+
         Args:
             keyword: Job search keywords
             location: Location filter (e.g., "New York, NY")
             max_results: Maximum number of results
             verbose: Print debug info
-        
+
         Returns:
             List of job dictionaries
         """
         if not self.rapidapi_key:
             if verbose:
-                print("[LinkedInJobAPI] No API key found. Set RAPIDAPI_KEY or LINKEDIN_API_KEY in .env")
-            return []
-        
-        try:
-            headers = {
-                "X-RapidAPI-Key": self.rapidapi_key,
-                "X-RapidAPI-Host": self.API_HOST
-            }
-            
-            params = {
-                "keywords": keyword,
-                "location": location,
-                "datePosted": "anyTime",
-                "sort": "mostRelevant"
-            }
-            
-            if verbose:
-                print(f"[LinkedInJobAPI] Searching: {keyword} in {location}")
-            
-            response = self.session.get(self.API_URL, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            # Parse API response (format varies by specific API)
-            jobs = data.get("data", []) or data.get("jobs", []) or data
-            
-            for job in jobs[:max_results]:
-                if isinstance(job, dict):
-                    title = job.get("title") or job.get("jobTitle") or job.get("name", "")
-                    url = job.get("url") or job.get("jobUrl") or job.get("link", "")
-                    company = job.get("company") or job.get("companyName", "")
-                    description = job.get("description") or job.get("snippet", "")
-                    
-                    if title and url:
-                        snippet = f"{company}: {description[:200]}" if company else description[:200]
-                        results.append(self._format_result(
-                            engine="linkedin_api",
-                            query=f"{keyword} {location}".strip(),
-                            title=title,
-                            url=url,
-                            snippet=snippet
-                        ))
-            
-            if verbose:
-                print(f"[LinkedInJobAPI] Found {len(results)} results")
-            
-            return results
-            
-        except requests.exceptions.RequestException as e:
-            if verbose:
-                print(f"[LinkedInJobAPI] Request error: {e}")
-            return []
-        except Exception as e:
-            if verbose:
-                print(f"[LinkedInJobAPI] Error: {e}")
+                print(f"[{self.LABEL}] No API key found. Set RAPIDAPI_KEY or {self.KEY_ENV} in .env")
             return []
 
+        from requests.exceptions import RequestException
+        if verbose:
+            print(f"[{self.LABEL}] Searching: {keyword} in {location}")
+
+        results: List[Dict] = []
+        seen = set()
+        pages = self.MAX_PAGES if self.PAGE_PARAM else 1
+        for page in range(1, pages + 1):
+            params = self._params(keyword, location, max_results)
+            if self.PAGE_PARAM:
+                params[self.PAGE_PARAM] = str(page)
+            try:
+                data = self._fetch_page(params, verbose)
+            except QuotaExhausted as e:
+                if verbose:
+                    print(f"[{self.LABEL}] {e}")
+                break
+            except RequestException as e:
+                if verbose:
+                    print(f"[{self.LABEL}] Request error: {e}")
+                break
+            except Exception as e:
+                if verbose:
+                    print(f"[{self.LABEL}] Error: {e}")
+                break
+
+            added = 0
+            for job in self._jobs(data):
+                if len(results) >= max_results:
+                    break
+                if not isinstance(job, dict):
+                    continue
+                result = self._result(job, keyword, location)
+                if result and result["hash"] not in seen:
+                    seen.add(result["hash"])
+                    results.append(result)
+                    added += 1
+            if len(results) >= max_results or not added:
+                break
+
+        if verbose:
+            print(f"[{self.LABEL}] Found {len(results)} results")
+        return results
+
+    def search_many(self, queries: Sequence[Tuple[str, str]], max_results: int = 20,
+                    max_workers: int = DEFAULT_API_WORKERS, verbose: bool = False) -> Dict[Tuple[str, str], List[Dict]]:
+        """
+        Run several (keyword, location) searches concurrently on this
+        client's session, never more at once than the provider's remaining quota.
+
+        Returns:
+            {(keyword, location): results}
+        """
+        queries = list(dict.fromkeys(queries))
+        if not queries:
+            return {}
+        available = self.quota.available()
+        workers = max(1, min(max_workers, len(queries), available if available is not None else max_workers))
+        if available is not None and available < len(queries) and verbose:
+            print(f"[{self.LABEL}] Quota allows ~{available} more requests for {len(queries)} queries")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=self.ENGINE or "api") as executor:
+            found = executor.map(lambda q: self.search(q[0], q[1], max_results=max_results, verbose=verbose), queries)
+            return dict(zip(queries, found))
+
+
+class LinkedInJobAPI(JobAPIBase):
+    """LinkedIn Job Search API via RapidAPI"""
+
+    API_HOST = "linkedin-job-search-api.p.rapidapi.com"
+    API_URL = f"https://{API_HOST}/search"
+    ENGINE = "linkedin_api"
+    LABEL = "LinkedInJobAPI"
+    KEY_ENV = "LINKEDIN_API_KEY"
+
+    def __init__(self, api_key: Optional[str] = None):
+        rapidapi_key = api_key or os.getenv("LINKEDIN_API_KEY") or os.getenv("RAPIDAPI_KEY")
+        super().__init__(api_key=api_key, rapidapi_key=rapidapi_key)
+
+    def _params(self, keyword: str, location: str, max_results: int) -> Dict[str, str]:
+        return {
+            "keywords": keyword,
+            "location": location,
+            "datePosted": "anyTime",
+            "sort": "mostRelevant"
+        }
+
+    def _result(self, job: Dict, keyword: str, location: str) -> Optional[Dict]:
+        title = job.get("title") or job.get("jobTitle") or job.get("name", "")
+        url = job.get("url") or job.get("jobUrl") or job.get("link", "")
+        company = job.get("company") or job.get("companyName", "")
+        description = job.get("description") or job.get("snippet", "")
+        if not (title and url):
+            return None
+        snippet = f"{company}: {description[:200]}" if company else description[:200]
+        return self._format_result(self.ENGINE, f"{keyword} {location}".strip(), title, url, snippet)
+
 
 class IndeedJobAPI(JobAPIBase):
     """Indeed Jobs Scraper API via RapidAPI"""
-    
+
     API_HOST = "indeed-jobs-api.p.rapidapi.com"
     API_URL = f"https://{API_HOST}/search"
-    
+    ENGINE = "indeed_api"
+    LABEL = "IndeedJobAPI"
+    KEY_ENV = "INDEED_API_KEY"
+    PAGE_PARAM = "page"
+
     def __init__(self, api_key: Optional[str] = None):
         rapidapi_key = api_key or os.getenv("INDEED_API_KEY") or os.getenv("RAPIDAPI_KEY")
         super().__init__(api_key=api_key, rapidapi_key=rapidapi_key)
-    
-    def search(self, keyword: str, location: str = "", max_results: int = 20, verbose: bool = False) -> List[Dict]:
-        """Search Indeed jobs using RapidAPI"""
-        if not self.rapidapi_key:
-            if verbose:
-                print("[IndeedJobAPI] No API key found. Set RAPIDAPI_KEY or INDEED_API_KEY in .env")
-            return []
-        
-        try:
-            headers = {
-                "X-RapidAPI-Key": self.rapidapi_key,
-                "X-RapidAPI-Host": self.API_HOST
-            }
-            
-            params = {
-                "query": keyword,
-                "location": location,
-                "page": "1"
-            }
-            
-            if verbose:
-                print(f"[IndeedJobAPI] Searching: {keyword} in {location}")
-            
-            response = self.session.get(self.API_URL, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            jobs = data.get("jobs", []) or data.get("data", []) or data
-            
-            for job in jobs[:max_results]:
-                if isinstance(job, dict):
-                    title = job.get("title") or job.get("jobTitle", "")
-                    url = job.get("url") or job.get("jobUrl") or job.get("link", "")
-                    company = job.get("company") or job.get("companyName", "")
-                    snippet = job.get("description") or job.get("snippet", "")
-                    
-                    if title and url:
-                        full_snippet = f"{company}: {snippet[:200]}" if company else snippet[:200]
-                        results.append(self._format_result(
-                            engine="indeed_api",
-                            query=f"{keyword} {location}".strip(),
-                            title=title,
-                            url=url,
-                            snippet=full_snippet
-                        ))
-            
-            if verbose:
-                print(f"[IndeedJobAPI] Found {len(results)} results")
-            
-            return results
-            
-        except Exception as e:
-            if verbose:
-                print(f"[IndeedJobAPI] Error: {e}")
-            return []
+
+    def _params(self, keyword: str, location: str, max_results: int) -> Dict[str, str]:
+        return {
+            "query": keyword,
+            "location": location
+        }
+
+    def _jobs(self, data) -> list:
+        if isinstance(data, list):
+            return data
+        return data.get("jobs", []) or data.get("data", []) or []
+
+    def _result(self, job: Dict, keyword: str, location: str) -> Optional[Dict]:
+        title = job.get("title") or job.get("jobTitle", "")
+        url = job.get("url") or job.get("jobUrl") or job.get("link", "")
+        company = job.get("company") or job.get("companyName", "")
+        snippet = job.get("description") or job.get("snippet", "")
+        if not (title and url):
+            return None
+        full_snippet = f"{company}: {snippet[:200]}" if company else snippet[:200]
+        return self._format_result(self.ENGINE, f"{keyword} {location}".strip(), title, url, full_snippet)
 
 
 class GlassdoorJobAPI(JobAPIBase):
     """Glassdoor Job + Reviews API via RapidAPI"""
-    
+
     API_HOST = "glassdoor-job-scraper.p.rapidapi.com"
     API_URL = f"https://{API_HOST}/search"
-    
+    ENGINE = "glassdoor_api"
+    LABEL = "GlassdoorJobAPI"
+    KEY_ENV = "GLASSDOOR_API_KEY"
+
     def __init__(self, api_key: Optional[str] = None):
         rapidapi_key = api_key or os.getenv("GLASSDOOR_API_KEY") or os.getenv("RAPIDAPI_KEY")
         super().__init__(api_key=api_key, rapidapi_key=rapidapi_key)
-    
-    def search(self, keyword: str, location: str = "", max_results: int = 20, verbose: bool = False) -> List[Dict]:
-        """Search Glassdoor jobs using RapidAPI"""
-        if not self.rapidapi_key:
-            if verbose:
-                print("[GlassdoorJobAPI] No API key found. Set RAPIDAPI_KEY or GLASSDOOR_API_KEY in .env")
-            return []
-        
-        try:
-            headers = {
-                "X-RapidAPI-Key": self.rapidapi_key,
-                "X-RapidAPI-Host": self.API_HOST
-            }
-            
-            params = {
-                "keyword": keyword,
-                "location": location
-            }
-            
-            if verbose:
-                print(f"[GlassdoorJobAPI] Searching: {keyword} in {location}")
-            
-            response = self.session.get(self.API_URL, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            jobs = data.get("jobs", []) or data.get("data", []) or data
-            
-            for job in jobs[:max_results]:
-                if isinstance(job, dict):
-                    title = job.get("jobTitle") or job.get("title", "")
-                    url = job.get("jobUrl") or job.get("url") or job.get("link", "")
-                    company = job.get("employer") or job.get("company", "")
-                    rating = job.get("rating", "")
-                    salary = job.get("salary", "")
-                    
-                    snippet_parts = []
-                    if company:
-                        snippet_parts.append(company)
-                    if rating:
-                        snippet_parts.append(f"Rating: {rating}⭐")
-                    if salary:
-                        snippet_parts.append(f"Salary: {salary}")
-                    
-                    snippet = " | ".join(snippet_parts)
-                    
-                    if title and url:
-                        results.append(self._format_result(
-                            engine="glassdoor_api",
-                            query=f"{keyword} {location}".strip(),
-                            title=title,
-                            url=url,
-                            snippet=snippet
-                        ))
-            
-            if verbose:
-                print(f"[GlassdoorJobAPI] Found {len(results)} results")
-            
-            return results
-            
-        except Exception as e:
-            if verbose:
-                print(f"[GlassdoorJobAPI] Error: {e}")
-            return []
+
+    def _params(self, keyword: str, location: str, max_results: int) -> Dict[str, str]:
+        return {
+            "keyword": keyword,
+            "location": location
+        }
+
+    def _jobs(self, data) -> list:
+        if isinstance(data, list):
+            return data
+        return data.get("jobs", []) or data.get("data", []) or []
+
+    def _result(self, job: Dict, keyword: str, location: str) -> Optional[Dict]:
+        title = job.get("jobTitle") or job.get("title", "")
+        url = job.get("jobUrl") or job.get("url") or job.get("link", "")
+        company = job.get("employer") or job.get("company", "")
+        rating = job.get("rating", "")
+        salary = job.get("salary", "")
+        if not (title and url):
+            return None
+
+        snippet_parts = []
+        if company:
+            snippet_parts.append(company)
+        if rating:
+            snippet_parts.append(f"Rating: {rating}⭐")
+        if salary:
+            snippet_parts.append(f"Salary: {salary}")
+        return self._format_result(self.ENGINE, f"{keyword} {location}".strip(), title, url, " | ".join(snippet_parts))
 
 
 class JobAggregatorAPI(JobAPIBase):
     """Multi-platform Job Aggregator API (LinkedIn + Indeed + Glassdoor + more)"""
-    
+
     API_HOST = "job-search-api1.p.rapidapi.com"
     API_URL = f"https://{API_HOST}/search"
-    
+    ENGINE = "job_aggregator_api"
+    LABEL = "JobAggregatorAPI"
+    KEY_ENV = "JOB_AGGREGATOR_API_KEY"
+    PAGE_PARAM = "page"
+
     def __init__(self, api_key: Optional[str] = None):
         rapidapi_key = api_key or os.getenv("JOB_AGGREGATOR_API_KEY") or os.getenv("RAPIDAPI_KEY")
         super().__init__(api_key=api_key, rapidapi_key=rapidapi_key)
-    
-    def search(self, keyword: str, location: str = "", max_results: int = 20, verbose: bool = False) -> List[Dict]:
-        """Search across multiple job platforms using aggregator API"""
-        if not self.rapidapi_key:
-            if verbose:
-                print("[JobAggregatorAPI] No API key found. Set RAPIDAPI_KEY or JOB_AGGREGATOR_API_KEY in .env")
-            return []
-        
-        try:
-            headers = {
-                "X-RapidAPI-Key": self.rapidapi_key,
-                "X-RapidAPI-Host": self.API_HOST
-            }
-            
-            params = {
-                "query": keyword,
-                "location": location,
-                "page": "1"
-            }
-            
-            if verbose:
-                print(f"[JobAggregatorAPI] Searching multi-platform: {keyword} in {location}")
-            
-            response = self.session.get(self.API_URL, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            jobs = data.get("data", []) or data.get("jobs", []) or data
-            
-            for job in jobs[:max_results]:
-                if isinstance(job, dict):
-                    title = job.get("title") or job.get("job_title", "")
-                    url = job.get("url") or job.get("job_url", "")
-                    company = job.get("company_name") or job.get("company", "")
-                    source = job.get("source", "aggregator")
-                    
-                    snippet = f"[{source}] {company}" if company else f"[{source}]"
-                    
-                    if title and url:
-                        results.append(self._format_result(
-                            engine="job_aggregator_api",
-                            query=f"{keyword} {location}".strip(),
-                            title=title,
-                            url=url,
-                            snippet=snippet
-                        ))
-            
-            if verbose:
-                print(f"[JobAggregatorAPI] Found {len(results)} results from multiple platforms")
-            
-            return results
-            
-        except Exception as e:
-            if verbose:
-                print(f"[JobAggregatorAPI] Error: {e}")
-            return []
+
+    def _params(self, keyword: str, location: str, max_results: int) -> Dict[str, str]:
+        return {
+            "query": keyword,
+            "location": location
+        }
+
+    def _result(self, job: Dict, keyword: str, location: str) -> Optional[Dict]:
+        title = job.get("title") or job.get("job_title", "")
+        url = job.get("url") or job.get("job_url", "")
+        company = job.get("company_name") or job.get("company", "")
+        source = job.get("source", "aggregator")
+        if not (title and url):
+            return None
+        snippet = f"[{source}] {company}" if company else f"[{source}]"
+        return self._format_result(self.ENGINE, f"{keyword} {location}".strip(), title, url, snippet)
 
 
 class RemoteJobsAPI(JobAPIBase):
     """Remote Jobs API (RemoteOK, WeWorkRemotely, Remotive aggregated)"""
-    
+
     API_HOST = "remote-jobs-api.p.rapidapi.com"
     API_URL = f"https://{API_HOST}/jobs"
-    
+    ENGINE = "remote_jobs_api"
+    LABEL = "RemoteJobsAPI"
+    KEY_ENV = "REMOTE_JOBS_API_KEY"
+
     def __init__(self, api_key: Optional[str] = None):
         rapidapi_key = api_key or os.getenv("REMOTE_JOBS_API_KEY") or os.getenv("RAPIDAPI_KEY")
         super().__init__(api_key=api_key, rapidapi_key=rapidapi_key)
-    
-    def search(self, keyword: str, location: str = "", max_results: int = 20, verbose: bool = False) -> List[Dict]:
-        """Search remote jobs across multiple remote job boards"""
-        if not self.rapidapi_key:
-            if verbose:
-                print("[RemoteJobsAPI] No API key found. Set RAPIDAPI_KEY or REMOTE_JOBS_API_KEY in .env")
-            return []
-        
-        try:
-            headers = {
-                "X-RapidAPI-Key": self.rapidapi_key,
-                "X-RapidAPI-Host": self.API_HOST
-            }
-            
-            params = {
-                "search": keyword,
-                "limit": str(max_results)
-            }
-            
-            if verbose:
-                print(f"[RemoteJobsAPI] Searching remote jobs: {keyword}")
-            
-            response = self.session.get(self.API_URL, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            
-            data = response.json()
-            results = []
-            
-            jobs = data if isinstance(data, list) else data.get("jobs", [])
-            
-            for job in jobs[:max_results]:
-                if isinstance(job, dict):
-                    title = job.get("position") or job.get("title", "")
-                    url = job.get("url") or job.get("apply_url", "")
-                    company = job.get("company", "")
-                    tags = job.get("tags", [])
-                    
-                    snippet = f"{company} | Remote"
-                    if tags:
-                        snippet += f" | {', '.join(tags[:3])}"
-                    
-                    if title and url:
-                        results.append(self._format_result(
-                            engine="remote_jobs_api",
-                            query=keyword,
-                            title=title,
-                            url=url,
-                            snippet=snippet
-                        ))
-            
-            if verbose:
-                print(f"[RemoteJobsAPI] Found {len(results)} remote jobs")
-            
-            return results
-            
-        except Exception as e:
-            if verbose:
-                print(f"[RemoteJobsAPI] Error: {e}")
-            return []
+
+    def _params(self, keyword: str, location: str, max_results: int) -> Dict[str, str]:
+        # One request returns up to `limit` jobs
+        return {
+            "search": keyword,
+            "limit": str(max_results)
+        }
+
+    def _jobs(self, data) -> list:
+        return data if isinstance(data, list) else data.get("jobs", [])
+
+    def _result(self, job: Dict, keyword: str, location: str) -> Optional[Dict]:
+        title = job.get("position") or job.get("title", "")
+        url = job.get("url") or job.get("apply_url", "")
+        company = job.get("company", "")
+        tags = job.get("tags", [])
+        if not (title and url):
+            return None
+        snippet = f"{company} | Remote"
+        if tags:
+            snippet += f" | {', '.join(tags[:3])}"
+        return self._format_result(self.ENGINE, keyword, title, url, snippet)
+
+
+# Registry of API engines: name -> (class, dedicated env key, label)
+# Every engine is also enabled by the shared RAPIDAPI_KEY.
+API_ENGINE_CLASSES = {
+    "linkedin_api": (LinkedInJobAPI, "LINKEDIN_API_KEY", "LinkedIn API"),
+    "indeed_api": (IndeedJobAPI, "INDEED_API_KEY", "Indeed API"),
+    "glassdoor_api": (GlassdoorJobAPI, "GLASSDOOR_API_KEY", "Glassdoor API"),
+    "job_aggregator_api": (JobAggregatorAPI, "JOB_AGGREGATOR_API_KEY", "Job Aggregator API"),
+    "remote_jobs_api": (RemoteJobsAPI, "REMOTE_JOBS_API_KEY", "Remote Jobs API"),
+}
 
 
 # Factory function to get all available API engines
@@ -416,74 +504,55 @@ def get_api_engines(verbose: bool = False) -> Dict[str, JobAPIBase]:
     Returns dict of {engine_name: api_instance}
     """
     engines = {}
-    
+
     # Check which APIs have keys configured
-    if os.getenv("RAPIDAPI_KEY") or os.getenv("LINKEDIN_API_KEY"):
-        engines["linkedin_api"] = LinkedInJobAPI()
-        if verbose:
-            print("[API] ✓ LinkedIn API enabled")
-    
-    if os.getenv("RAPIDAPI_KEY") or os.getenv("INDEED_API_KEY"):
-        engines["indeed_api"] = IndeedJobAPI()
-        if verbose:
-            print("[API] ✓ Indeed API enabled")
-    
-    if os.getenv("RAPIDAPI_KEY") or os.getenv("GLASSDOOR_API_KEY"):
-        engines["glassdoor_api"] = GlassdoorJobAPI()
-        if verbose:
-            print("[API] ✓ Glassdoor API enabled")
-    
-    if os.getenv("RAPIDAPI_KEY") or os.getenv("JOB_AGGREGATOR_API_KEY"):
-        engines["job_aggregator_api"] = JobAggregatorAPI()
-        if verbose:
-            print("[API] ✓ Job Aggregator API enabled")
-    
-    if os.getenv("RAPIDAPI_KEY") or os.getenv("REMOTE_JOBS_API_KEY"):
-        engines["remote_jobs_api"] = RemoteJobsAPI()
-        if verbose:
-            print("[API] ✓ Remote Jobs API enabled")
-    
+    for name, (cls, env_key, label) in API_ENGINE_CLASSES.items():
+        if os.getenv("RAPIDAPI_KEY") or os.getenv(env_key):
+            engines[name] = cls()
+            if verbose:
+                print(f"[API] ✓ {label} enabled")
+
     if not engines and verbose:
         print("[API] ⚠ No API keys configured. Set RAPIDAPI_KEY in .env to enable API features")
-    
+
     return engines
 
 
 # Test function
 if __name__ == "__main__":
     import sys
-    
+
     print("Testing Job API Integrations\n")
     print("=" * 60)
-    
+
     # Load environment
     load_dotenv()
-    
+
     # Test configuration
     test_keyword = sys.argv[1] if len(sys.argv) > 1 else "python developer"
     test_location = sys.argv[2] if len(sys.argv) > 2 else "Remote"
-    
+
     print(f"\nSearch: '{test_keyword}' in '{test_location}'")
     print("=" * 60 + "\n")
-    
+
     engines = get_api_engines(verbose=True)
-    
+
     if not engines:
         print("\n❌ No API engines available!")
         print("Please set RAPIDAPI_KEY in your .env file")
         print("\nGet your key at: https://rapidapi.com")
         sys.exit(1)
-    
+
     print(f"\n✓ Found {len(engines)} API engine(s)\n")
-    
+
     # Test each engine
     for name, api in engines.items():
         print(f"\n{'='*60}")
         print(f"Testing: {name}")
         print('='*60)
-        
+
         results = api.search(test_keyword, test_location, max_results=5, verbose=True)
-        
+
         if results:
             print(f"\n✓ Results ({len(results)}):")
             for i, job in enumerate(results, 1):
@@ -492,9 +561,9 @@ if __name__ == "__main__":
                 print(f"   Info: {job['snippet'][:100]}")
         else:
             print("\n⚠ No results found")
-        
-        time.sleep(1)  # Rate limiting
-    
+
     print("\n" + "="*60)
     print("✓ API Integration Test Complete")
+    for host, quota in quota_report().items():
+        print(f"  {host}: {quota['remaining']}/{quota['limit']} requests left")
     print("="*60)
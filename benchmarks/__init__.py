@@ -0,0 +1,12 @@
+"""
+Offline benchmarks - throughput and latency of the hot paths without the network
+Recorded (or synthetic) fixtures are replayed by a local stand-in HTTP server,
+outgoing mail goes to a local SMTP sink, and every suite reports min/median/p95
+per operation so a run can be compared against a saved baseline.
+
+    python -m benchmarks                       # all suites
+    python -m benchmarks parsers scoring       # selected suites
+    python -m benchmarks --save baseline.json  # write results
+    python -m benchmarks --compare baseline.json --tolerance 0.2
+    python -m benchmarks --importtime          # cold-import audit vs importtime_baseline.json
+"""
@@ -0,0 +1,126 @@
+"""
+Benchmark runner - python -m benchmarks [suite ...] [options]
+"""
+
+import os
+import sys
+import shutil
+import argparse
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from benchmarks import fixtures, startup
+from benchmarks.bench import format_table, load_baseline, regressions, save_results
+from benchmarks.smtp_sink import SmtpSink
+from benchmarks.standin_server import FAILURE_MODES, StandinServer, parse_failures, routed_requests
+from benchmarks.suites import SUITES, BenchContext
+
+
+def main():
+    ap = argparse.ArgumentParser(prog="python -m benchmarks", description="Offline JobGoblin benchmarks")
+    ap.add_argument("suites", nargs="*", help="Suites to run (" + ",".join(SUITES) + "); default all")
+    ap.add_argument("--quick", action="store_true", help="Fewer rounds and smaller batches (smoke run)")
+    ap.add_argument("--postings", type=int, default=fixtures.DEFAULT_POSTINGS, help="Postings per synthetic page")
+    ap.add_argument("--synthetic", action="store_true", help="Ignore recorded fixtures, use generated pages only")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="Stand-in server latency per response")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="Extra uniform random latency per response")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="Probability (0-1) a stand-in request fails")
+    ap.add_argument("--failures", default=",".join(FAILURE_MODES), help="Failure modes to inject (500,429,timeout,reset)")
+    ap.add_argument("--hang", type=float, default=5.0, help="Seconds a 'timeout' failure holds the connection")
+    ap.add_argument("--smtp-latency-ms", type=float, default=0.0, help="SMTP sink latency per command")
+    ap.add_argument("--save", default="", help="Write results JSON here")
+    ap.add_argument("--compare", default="", help="Baseline results JSON; exit 1 on regressions")
+    ap.add_argument("--tolerance", type=float, default=0.2, help="Allowed median slowdown vs baseline (0.2 = 20%%)")
+    ap.add_argument("--record", action="store_true", help="Fetch live pages into benchmarks/fixtures/ and exit (uses the network)")
+    ap.add_argument("--importtime", action="store_true",
+                    help="Print the -X importtime audit of cli/gui_app vs importtime_baseline.json and exit")
+    ap.add_argument("--update-importtime", action="store_true", help="Rewrite importtime_baseline.json and exit")
+    args = ap.parse_args()
+
+    if args.record:
+        saved = fixtures.record()
+        print(f"[benchmarks] recorded {len(saved)}/{len(fixtures.SOURCES) - 1} fixtures into {fixtures.FIXTURE_DIR}")
+        return
+
+    if args.importtime or args.update_importtime:
+        import_audit(update=args.update_importtime)
+        return
+
+    names = args.suites or list(SUITES)
+    unknown = [s for s in names if s not in SUITES]
+    if unknown:
+        ap.error(f"unknown suite(s): {', '.join(unknown)}")
+    save_path = os.path.abspath(args.save) if args.save else ""
+    baseline = load_baseline(args.compare) if args.compare else None
+
+    recorded = [] if args.synthetic else fixtures.recorded()
+    print(f"[benchmarks] fixtures: {len(recorded)} recorded, {len(fixtures.SOURCES) - len(recorded)} synthetic")
+
+    # Run in a scratch directory: no .env credentials, no proxies.json, output/ stays out of the repo
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="jobgoblin_bench_")
+    os.chdir(workdir)
+    server = StandinServer(fixtures.routes(args.postings, args.synthetic), latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms, fail_rate=args.fail_rate,
+                           failures=parse_failures(args.failures), hang_seconds=args.hang)
+    sink = SmtpSink(latency_ms=args.smtp_latency_ms)
+    results = []
+    try:
+        with server, sink, routed_requests(server):
+            ctx = BenchContext(server, sink, workdir, quick=args.quick, postings=args.postings,
+                               synthetic=args.synthetic)
+            for name in names:
+                print(f"[benchmarks] running {name}...")
+                results.extend(SUITES[name](ctx))
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    print(format_table(results, baseline))
+    print(f"\n[benchmarks] stand-in: {sum(server.hits.values())} requests"
+          + (f", injected failures {dict(server.failed)}" if server.failed else ""))
+
+    if save_path:
+        save_results(results, save_path, {"options": {
+            "quick": args.quick, "postings": args.postings, "latency_ms": args.latency_ms,
+            "fail_rate": args.fail_rate, "recorded": recorded}})
+        print(f"[benchmarks] saved {save_path}")
+
+    if baseline:
+        slow = regressions(results, baseline, args.tolerance)
+        if slow:
+            print(f"\n[benchmarks] {len(slow)} regression(s) beyond {args.tolerance * 100:.0f}%:")
+            for line in slow:
+                print(f"  {line}")
+            sys.exit(1)
+        print(f"[benchmarks] no regressions beyond {args.tolerance * 100:.0f}%")
+
+
+def import_audit(update: bool = False):
+    """Cold-import profile of the entry points; exit 1 when a heavy module is newly imported at startup"""
+    workdir = tempfile.mkdtemp(prefix="jobgoblin_bench_")
+    try:
+        report = startup.audit(cwd=workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    if update:
+        startup.save_audit(report)
+        print(startup.format_audit(report))
+        print(f"\n[benchmarks] wrote {startup.BASELINE_PATH}")
+        return
+    baseline = startup.load_audit()
+    print(startup.format_audit(report, baseline))
+    heavy = startup.new_heavy_imports(report, baseline)
+    if heavy:
+        print(f"\n[benchmarks] {len(heavy)} heavy import(s) not in the baseline:")
+        for line in heavy:
+            print(f"  {line}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
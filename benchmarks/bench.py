@@ -0,0 +1,140 @@
+"""
+Benchmark timing - repeated calls, percentile summary and baseline comparison
+Shaped after pytest-benchmark's report (min / median / mean / p95 / ops) but
+with no dependency beyond the standard library.
+"""
+
+import gc
+import json
+import time
+import platform
+import statistics
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+
+class BenchResult:
+    """Timings of one benchmark; `items` is the work per call, for throughput"""
+
+    def __init__(self, suite: str, name: str, times: List[float], items: int = 0, note: str = ""):
+        self.suite = suite
+        self.name = name
+        self.times = sorted(times)
+        self.items = items
+        self.note = note
+
+    @property
+    def key(self) -> str:
+        return f"{self.suite}.{self.name}"
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.times) if self.times else 0.0
+
+    @property
+    def p95(self) -> float:
+        if not self.times:
+            return 0.0
+        return self.times[min(len(self.times) - 1, int(round(0.95 * (len(self.times) - 1))))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        median = self.median
+        return {
+            "suite": self.suite,
+            "name": self.name,
+            "rounds": len(self.times),
+            "min": self.times[0] if self.times else 0.0,
+            "median": median,
+            "mean": statistics.fmean(self.times) if self.times else 0.0,
+            "p95": self.p95,
+            "max": self.times[-1] if self.times else 0.0,
+            "ops": 1.0 / median if median else 0.0,
+            "items_per_s": self.items / median if median and self.items else 0.0,
+            "note": self.note,
+        }
+
+
+def bench(suite: str, name: str, fn: Callable[[], Any], rounds: int = 20, warmup: int = 1,
+          items: int = 0, setup: Optional[Callable[[], None]] = None, note: str = "") -> BenchResult:
+    """
+    Time fn() `rounds` times after `warmup` untimed calls. setup() runs
+    before every call outside the timed region (e.g. to clear caches).
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    times = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            if setup:
+                setup()
+            started = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return BenchResult(suite, name, times, items, note)
+
+
+# ============= REPORTING =============
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def format_table(results: List[BenchResult], baseline: Optional[Dict[str, Dict]] = None) -> str:
+    header = f"{'benchmark':<38} {'rounds':>6} {'min':>10} {'median':>10} {'p95':>10} {'ops/s':>10} {'items/s':>10}"
+    if baseline:
+        header += f" {'vs base':>8}"
+    lines = [header, "-" * len(header)]
+    for r in results:
+        d = r.to_dict()
+        line = (f"{r.key:<38} {d['rounds']:>6} {_fmt(d['min']):>10} {_fmt(d['median']):>10} "
+                f"{_fmt(d['p95']):>10} {d['ops']:>10.1f} {d['items_per_s']:>10.0f}")
+        if baseline:
+            base = baseline.get(r.key)
+            line += f" {(d['median'] / base['median'] - 1) * 100:>+7.0f}%" if base and base.get("median") else f" {'new':>8}"
+        if r.note:
+            line += f"  ({r.note})"
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def save_results(results: List[BenchResult], path: str, extra: Optional[Dict] = None):
+    payload = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "benchmarks": {r.key: r.to_dict() for r in results},
+    }
+    if extra:
+        payload.update(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+
+
+def load_baseline(path: str) -> Dict[str, Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f).get("benchmarks", {})
+
+
+def regressions(results: List[BenchResult], baseline: Dict[str, Dict], tolerance: float = 0.2) -> List[str]:
+    """Benchmarks whose median got slower than baseline by more than tolerance"""
+    slow = []
+    for r in results:
+        base = baseline.get(r.key)
+        if not base or not base.get("median"):
+            continue
+        change = r.median / base["median"] - 1
+        if change > tolerance:
+            slow.append(f"{r.key}: {_fmt(base['median'])} -> {_fmt(r.median)} ({change * 100:+.0f}%)")
+    return slow
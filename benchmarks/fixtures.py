@@ -0,0 +1,257 @@
+"""
+Benchmark fixtures - one response body per source the scrapers parse
+A fixture recorded from the live site (python -m benchmarks --record) is used
+when present in benchmarks/fixtures/; otherwise a deterministic synthetic page
+is generated that carries the same markup each parser selects on, so the
+suites always run offline and give comparable numbers between machines.
+"""
+
+import os
+import json
+import random
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+from benchmarks.standin_server import ANY_HOST, Route
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+DEFAULT_POSTINGS = 25
+
+HTML = "text/html; charset=utf-8"
+JSON = "application/json"
+RSS = "application/rss+xml"
+
+COMPANIES = [
+    "Northwind Robotics", "Bluefin Analytics", "Copperleaf Health", "Granite Logistics", "Juniper Payments",
+    "Lumen Forge", "Meridian Biotech", "Oakridge Energy", "Pinecone Labs", "Quarry Systems",
+    "Redwood Retail", "Silverline Media", "Tidewater Insurance", "Umbra Security", "Vantage Freight",
+]
+TITLES = [
+    "Senior Python Developer", "Data Engineer", "Backend Software Engineer", "DevOps Engineer",
+    "Machine Learning Engineer", "Full Stack Developer", "Site Reliability Engineer", "Platform Engineer",
+    "Junior Web Developer", "Staff Software Engineer", "QA Automation Engineer", "Cloud Architect",
+]
+LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "Denver, CO", "Seattle, WA", "Chicago, IL", "Remote (US)"]
+SNIPPETS = [
+    "We are hiring a {title} to join our growing team. Competitive salary, benefits and remote-friendly culture.",
+    "{company} is looking for a {title} with experience in Python, SQL and cloud infrastructure.",
+    "Join {company} as a {title}. Full-time position, apply today. Careers at {company} offer growth.",
+    "Now hiring: {title}. You will build and maintain data pipelines and APIs. Employment type: full-time.",
+]
+
+
+def _slug(name: str) -> str:
+    return "".join(ch for ch in name.lower() if ch.isalnum())
+
+
+def postings(n: int = DEFAULT_POSTINGS, seed: int = 7) -> List[Dict[str, str]]:
+    """Deterministic fake postings shared by every synthetic page"""
+    rnd = random.Random(seed)
+    out = []
+    for i in range(n):
+        company = COMPANIES[i % len(COMPANIES)]
+        title = rnd.choice(TITLES)
+        out.append({
+            "id": f"{seed:02d}{i:05d}",
+            "title": title,
+            "company": company,
+            "slug": _slug(company),
+            "location": rnd.choice(LOCATIONS),
+            "snippet": rnd.choice(SNIPPETS).format(title=title, company=company),
+        })
+    return out
+
+
+# ============= SYNTHETIC PAGES =============
+
+def _page(body: str) -> str:
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>results</title></head><body>{body}</body></html>"
+
+
+def ddg_html(items: List[Dict]) -> str:
+    rows = []
+    for p in items:
+        target = quote(f"https://{p['slug']}.com/careers/{p['id']}", safe="")
+        rows.append(
+            f"<div class='result results_links web-result'><h2 class='result__title'>"
+            f"<a class='result__a' href='//duckduckgo.com/l/?uddg={target}&amp;rut=abc'>{p['title']} - {p['company']}</a></h2>"
+            f"<a class='result__snippet' href='//duckduckgo.com/l/?uddg={target}'>{p['snippet']}</a></div>"
+        )
+    return _page("<div id='links' class='results'>" + "".join(rows) + "</div><a href='/html/?q=next'>Next</a>")
+
+
+def ddg_lite(items: List[Dict]) -> str:
+    rows = []
+    for n, p in enumerate(items, 1):
+        target = quote(f"https://{p['slug']}.com/jobs/{p['id']}", safe="")
+        rows.append(
+            f"<tr><td>{n}.</td><td><a rel='nofollow' href='//duckduckgo.com/l/?uddg={target}' class='result-link'>"
+            f"{p['title']} at {p['company']}</a></td></tr>"
+            f"<tr><td></td><td class='result-snippet'>{p['snippet']}</td></tr>"
+        )
+    return _page("<table border='0'>" + "".join(rows) + "</table>")
+
+
+def ddg_home(items: List[Dict]) -> str:
+    return _page("<form action='/html/'><input name='q'></form>")
+
+
+def startpage(items: List[Dict]) -> str:
+    rows = [
+        f"<div class='result'><a class='title' href='https://{p['slug']}.com/careers/{p['id']}'>"
+        f"{p['title']} - {p['company']}</a><p class='description'>{p['snippet']}</p></div>"
+        for p in items
+    ]
+    return _page("<section class='w-gl'>" + "".join(rows) + "</section>")
+
+
+def indeed(items: List[Dict]) -> str:
+    rows = [
+        f"<div class='job_seen_beacon'><div class='cardOutline' data-jk='{p['id']}'>"
+        f"<h2 class='jobTitle'><a data-jk='{p['id']}' href='/rc/clk?jk={p['id']}&amp;from=serp'>{p['title']}</a></h2>"
+        f"<span class='companyName'>{p['company']}</span><div class='companyLocation'>{p['location']}</div>"
+        f"<div class='jobSnippet'>{p['snippet']}</div></div></div>"
+        for p in items
+    ]
+    return _page("<div id='mosaic-provider-jobcards'>" + "".join(rows) + "</div>")
+
+
+def simplyhired(items: List[Dict]) -> str:
+    rows = [
+        f"<li class='job'><article class='job-listing' data-job-id='{p['id']}'>"
+        f"<h3><a class='card-link' href='/job/{p['id']}'>{p['title']}</a></h3>"
+        f"<span class='company'>{p['company']}</span><span class='location'>{p['location']}</span>"
+        f"<p>{p['snippet']}</p></article></li>"
+        for p in items
+    ]
+    return _page("<ul id='job-list'>" + "".join(rows) + "</ul>")
+
+
+def greenhouse(items: List[Dict]) -> str:
+    rows = [
+        f"<div class='job'><a href='/{p['slug']}/jobs/{p['id']}'>{p['title']}</a>"
+        f"<span class='company'>{p['company']}</span><span class='location'>{p['location']}</span></div>"
+        for p in items
+    ]
+    return _page("<section class='jobs'>" + "".join(rows) + "</section>")
+
+
+def lever(items: List[Dict]) -> str:
+    rows = [
+        f"<div class='posting'><a class='posting-title' href='/{p['slug']}/{p['id']}'><h5>{p['title']}</h5></a>"
+        f"<span class='posting-company'>{p['company']}</span><span class='posting-location'>{p['location']}</span></div>"
+        for p in items
+    ]
+    return _page("<div class='postings-group'>" + "".join(rows) + "</div>")
+
+
+def remoteok(items: List[Dict]) -> str:
+    data: List[Dict] = [{"legal": "API terms of service: link back to RemoteOK"}]
+    for p in items:
+        data.append({
+            "id": p["id"], "position": p["title"], "company": p["company"], "location": p["location"],
+            "tags": ["python", "backend"], "url": f"/remote-jobs/{p['id']}",
+            "description": f"<p>{p['snippet']}</p>" * 4,
+        })
+    return json.dumps(data)
+
+
+def remotive(items: List[Dict]) -> str:
+    jobs = [{
+        "id": int(p["id"]), "title": p["title"], "company_name": p["company"], "category": "Software Development",
+        "url": f"https://remotive.com/remote-jobs/software-dev/{_slug(p['title'])}-{p['id']}",
+        "candidate_required_location": p["location"], "description": f"<p>{p['snippet']}</p>" * 4,
+    } for p in items]
+    return json.dumps({"job-count": len(jobs), "jobs": jobs})
+
+
+def weworkremotely(items: List[Dict]) -> str:
+    rows = [
+        f"<item><title>{p['company']}: {p['title']}</title><region>{p['location']}</region>"
+        f"<link>https://weworkremotely.com/remote-jobs/{p['slug']}-{p['id']}</link>"
+        f"<description>&lt;p&gt;{p['snippet']} python&lt;/p&gt;</description></item>"
+        for p in items
+    ]
+    return ("<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel>"
+            "<title>We Work Remotely: Programming Jobs</title>" + "".join(rows) + "</channel></rss>")
+
+
+def contact_page(items: List[Dict]) -> str:
+    """Company site: contact addresses buried in ordinary page weight; {{host}} is filled per request"""
+    filler = "".join(f"<p>{p['snippet']}</p>" for p in items)
+    return _page(
+        "<nav><a href='/'>Home</a><a href='/about'>About</a><a href='/careers'>Careers</a></nav>"
+        f"<main>{filler}<h2>Contact us</h2>"
+        "<p>Questions about open roles? Email <a href='mailto:careers@{{host}}'>careers@{{host}}</a> "
+        "or our recruiter at jane.doe@{{host}}.</p>"
+        "<p>Press: press@{{host}} &middot; Support: help@{{host}}</p>"
+        "<img src='/static/logo@2x.png'><footer>&copy; {{host}} noreply@{{host}}</footer></main>"
+    )
+
+
+# name -> (host, path prefix, content type, file extension, live URL for --record, builder)
+SOURCES = {
+    "ddg_home": ("duckduckgo.com", "/", HTML, "html", "https://duckduckgo.com/", ddg_home),
+    "ddg_html": ("duckduckgo.com", "/html", HTML, "html", "https://duckduckgo.com/html/?q=python+developer+jobs", ddg_html),
+    "ddg_lite": ("lite.duckduckgo.com", "/lite", HTML, "html", "https://lite.duckduckgo.com/lite/?q=python+developer+jobs", ddg_lite),
+    "startpage": ("www.startpage.com", "/sp/search", HTML, "html", "https://www.startpage.com/sp/search?query=python+developer+jobs", startpage),
+    "indeed": ("www.indeed.com", "/jobs", HTML, "html", "https://www.indeed.com/jobs?q=python+developer", indeed),
+    "simplyhired": ("www.simplyhired.com", "/search", HTML, "html", "https://www.simplyhired.com/search?q=python+developer", simplyhired),
+    "greenhouse": ("boards.greenhouse.io", "/search", HTML, "html", "https://boards.greenhouse.io/search?q=python", greenhouse),
+    "lever": ("jobs.lever.co", "/search", HTML, "html", "https://jobs.lever.co/search/?commit=filter&query=python", lever),
+    "remoteok": ("remoteok.com", "/api", JSON, "json", "https://remoteok.com/api", remoteok),
+    "remotive": ("remotive.com", "/api/remote-jobs", JSON, "json", "https://remotive.com/api/remote-jobs", remotive),
+    "weworkremotely": ("weworkremotely.com", "/categories", RSS, "rss",
+                       "https://weworkremotely.com/categories/remote-programming-jobs.rss", weworkremotely),
+    "contact_page": (ANY_HOST, "/", HTML, "html", "", contact_page),
+}
+
+
+def _path(name: str) -> str:
+    return os.path.join(FIXTURE_DIR, f"{name}.{SOURCES[name][3]}")
+
+
+def load(name: str, n: int = DEFAULT_POSTINGS, synthetic: bool = False) -> str:
+    """The recorded fixture if there is one (and synthetic is False), else a generated page"""
+    path = _path(name)
+    if not synthetic and os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read()
+    return SOURCES[name][5](postings(n))
+
+
+def routes(n: int = DEFAULT_POSTINGS, synthetic: bool = False) -> List[Route]:
+    """Stand-in server routes for every source"""
+    return [Route(host, path, load(name, n, synthetic), ctype)
+            for name, (host, path, ctype, _ext, _url, _build) in SOURCES.items()]
+
+
+def recorded() -> List[str]:
+    return [name for name in SOURCES if os.path.exists(_path(name))]
+
+
+def record(names: Optional[List[str]] = None, verbose: bool = True) -> List[str]:
+    """Fetch the live pages once and save them as fixtures (the only step that uses the network)"""
+    import requests
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    saved = []
+    for name in names or list(SOURCES):
+        url = SOURCES[name][4]
+        if not url:
+            continue
+        try:
+            resp = requests.get(url, timeout=30, headers={
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                              "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"})
+            resp.raise_for_status()
+        except Exception as e:
+            if verbose:
+                print(f"[benchmarks] could not record {name}: {e}")
+            continue
+        with open(_path(name), "w", encoding="utf-8") as f:
+            f.write(resp.text)
+        saved.append(name)
+        if verbose:
+            print(f"[benchmarks] recorded {name} ({len(resp.text)} bytes)")
+    return saved
@@ -0,0 +1,143 @@
+"""
+SMTP sink - accepts mail on 127.0.0.1 and keeps it in memory
+Speaks enough ESMTP for smtplib (EHLO, AUTH PLAIN/LOGIN, MAIL, RCPT, DATA,
+RSET, NOOP, QUIT) and advertises STARTTLS; the upgrade itself is skipped with
+plaintext_starttls(), since the sink has no certificate and TLS cost is not
+what the email benchmarks measure.
+"""
+
+import threading
+import socketserver
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class SmtpSink:
+    """In-memory SMTP server; .messages holds {from, to, data} per accepted mail"""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.messages: List[Dict] = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server: Optional[socketserver.ThreadingTCPServer] = None
+
+    def start(self) -> "SmtpSink":
+        sink = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                sink._session(self)
+
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="smtp-sink", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "SmtpSink":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1] if self._server else 0
+
+    def reset(self):
+        with self._lock:
+            self.messages.clear()
+            self.connections = 0
+
+    # ---------------- protocol -----------------
+
+    def _session(self, handler: socketserver.StreamRequestHandler):
+        import time
+
+        def reply(line: str):
+            handler.wfile.write((line + "\r\n").encode("ascii"))
+            handler.wfile.flush()
+
+        with self._lock:
+            self.connections += 1
+        reply("220 smtp-sink ESMTP ready")
+        sender, recipients = "", []
+        auth_steps = 0
+        while True:
+            raw = handler.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if auth_steps:
+                auth_steps -= 1
+                reply("334 UGFzc3dvcmQ6" if auth_steps else "235 2.7.0 Authentication successful")
+                continue
+            verb = line.split(" ", 1)[0].upper()
+            if self.latency_ms:
+                time.sleep(self.latency_ms / 1000.0)
+            if verb in ("EHLO", "HELO"):
+                handler.wfile.write(b"250-smtp-sink\r\n250-STARTTLS\r\n250-AUTH PLAIN LOGIN\r\n250 8BITMIME\r\n")
+                handler.wfile.flush()
+            elif verb == "STARTTLS":
+                reply("220 2.0.0 Ready to start TLS")
+            elif verb == "AUTH":
+                args = line.split()[1:]
+                if args and args[0].upper() == "LOGIN":
+                    auth_steps = 1 if len(args) > 1 else 2
+                    reply("334 UGFzc3dvcmQ6" if len(args) > 1 else "334 VXNlcm5hbWU6")
+                else:
+                    reply("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                sender, recipients = line[10:].strip().strip("<>"), []
+                reply("250 2.1.0 OK")
+            elif verb == "RCPT":
+                recipients.append(line[8:].strip().strip("<>"))
+                reply("250 2.1.5 OK")
+            elif verb == "DATA":
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = handler.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    data.append(chunk)
+                with self._lock:
+                    self.messages.append({"from": sender, "to": recipients, "data": b"".join(data)})
+                reply("250 2.0.0 Queued")
+            elif verb in ("RSET", "NOOP"):
+                reply("250 OK")
+            elif verb == "QUIT":
+                reply("221 2.0.0 Bye")
+                return
+            else:
+                reply("502 5.5.2 Command not recognized")
+
+
+@contextmanager
+def plaintext_starttls() -> Iterator[None]:
+    """Let smtplib 'upgrade' against the sink without a TLS handshake"""
+    import smtplib
+
+    original = smtplib.SMTP.starttls
+
+    def starttls(self, *args, **kwargs):
+        self.ehlo_or_helo_if_needed()
+        code, resp = self.docmd("STARTTLS")
+        # RFC 3207: forget what the server said before the upgrade
+        self.helo_resp = self.ehlo_resp = None
+        self.esmtp_features = {}
+        self.does_esmtp = False
+        return code, resp
+
+    smtplib.SMTP.starttls = starttls
+    try:
+        yield
+    finally:
+        smtplib.SMTP.starttls = original
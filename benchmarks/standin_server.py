@@ -0,0 +1,238 @@
+"""
+Stand-in HTTP server - replays fixtures for any host on 127.0.0.1
+Requests made through `requests` are rerouted here by routed_requests(), with
+the original host carried in a header, so scrapers run unmodified. Latency,
+jitter and failures (5xx, 429, hung responses, connection resets) can be
+injected to see how the pipeline behaves when sites are slow or flaky.
+"""
+
+import time
+import random
+import socket
+import struct
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+HOST_HEADER = "X-Standin-Host"
+FAILURE_MODES = ("500", "429", "timeout", "reset")
+ANY_HOST = "*"
+
+
+class Route:
+    """A canned response for a host and path prefix"""
+
+    def __init__(self, host: str, path: str, body: bytes, content_type: str = "text/html; charset=utf-8",
+                 status: int = 200):
+        self.host = host
+        self.path = path
+        self.body = body if isinstance(body, bytes) else body.encode("utf-8")
+        self.content_type = content_type
+        self.status = status
+
+
+class StandinServer:
+    """Threaded local server that answers for every host it has routes for"""
+
+    def __init__(self, routes: Sequence[Route] = (), latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 fail_rate: float = 0.0, failures: Sequence[str] = FAILURE_MODES, hang_seconds: float = 5.0,
+                 seed: int = 0):
+        """
+        Args:
+            latency_ms / jitter_ms: Added to every response (uniform jitter on top)
+            fail_rate: Probability (0-1) that a request fails with one of `failures`
+            failures: Any of "500", "429", "timeout" (hang for hang_seconds, then
+                      close) and "reset" (drop the connection without a reply)
+        """
+        self.routes: Dict[str, Dict[str, Route]] = {}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.fail_rate = fail_rate
+        self.failures = [f for f in failures if f in FAILURE_MODES] or list(FAILURE_MODES)
+        self.hang_seconds = hang_seconds
+        self.hits: Counter = Counter()
+        self.failed: Counter = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        for route in routes:
+            self.add(route)
+
+    def add(self, route: Route):
+        self.routes.setdefault(route.host.lower(), {})[route.path] = route
+
+    # ---------------- lifecycle -----------------
+
+    def start(self) -> "StandinServer":
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self)
+
+            def do_HEAD(self):
+                server._handle(self, head=True)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                server._handle(self)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="standin-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def port(self) -> int:
+        return self._httpd.server_address[1] if self._httpd else 0
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    # ---------------- serving -----------------
+
+    def match(self, host: str, path: str) -> Optional[Route]:
+        """Longest path-prefix route for the host, else for any host"""
+        for candidates in (self.routes.get(host.lower()), self.routes.get(ANY_HOST)):
+            if not candidates:
+                continue
+            best = max((p for p in candidates if path.startswith(p)), key=len, default=None)
+            if best is not None:
+                return candidates[best]
+        return None
+
+    def _pick_failure(self) -> Optional[str]:
+        with self._lock:
+            if self.fail_rate <= 0 or self._random.random() >= self.fail_rate:
+                return None
+            return self._random.choice(self.failures)
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (self.latency_ms + jitter) / 1000.0
+
+    def _handle(self, handler: BaseHTTPRequestHandler, head: bool = False):
+        host = (handler.headers.get(HOST_HEADER) or handler.headers.get("Host") or "").split(":")[0]
+        path = urlsplit(handler.path).path or "/"
+        with self._lock:
+            self.hits[host] += 1
+
+        delay = self._delay()
+        if delay:
+            time.sleep(delay)
+
+        failure = self._pick_failure()
+        if failure:
+            with self._lock:
+                self.failed[failure] += 1
+        if failure == "reset":
+            # RST instead of FIN so the client sees a connection reset
+            handler.connection.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+            handler.close_connection = True
+            return
+        if failure == "timeout":
+            time.sleep(self.hang_seconds)
+            handler.close_connection = True
+            return
+        if failure in ("500", "429"):
+            self._reply(handler, int(failure), b"injected failure", "text/plain", head,
+                        extra={"Retry-After": "1"} if failure == "429" else None)
+            return
+
+        route = self.match(host, path)
+        if route is None:
+            self._reply(handler, 404, b"not found", "text/plain", head)
+            return
+        body = route.body.replace(b"{{host}}", _base_domain(host).encode("ascii", "ignore"))
+        self._reply(handler, route.status, body, route.content_type, head)
+
+    @staticmethod
+    def _reply(handler: BaseHTTPRequestHandler, status: int, body: bytes, content_type: str, head: bool,
+               extra: Optional[Dict[str, str]] = None):
+        handler.send_response(status)
+        handler.send_header("Content-Type", content_type)
+        handler.send_header("Content-Length", str(len(body)))
+        for k, v in (extra or {}).items():
+            handler.send_header(k, v)
+        handler.end_headers()
+        if not head:
+            handler.wfile.write(body)
+
+
+def _base_domain(host: str) -> str:
+    parts = host.lower().replace("www.", "").split(".")
+    return ".".join(parts[-2:]) if len(parts) >= 2 else host
+
+
+# ============= ROUTING =============
+
+_LOCAL_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+@contextmanager
+def routed_requests(server: StandinServer) -> Iterator[StandinServer]:
+    """
+    Send every `requests` call to the stand-in server (proxies disabled) and
+    refuse any other outbound connection, so a benchmark can never reach
+    the network even through a code path that bypasses `requests`.
+    """
+    from requests.adapters import HTTPAdapter
+
+    original_send = HTTPAdapter.send
+    original_getaddrinfo = socket.getaddrinfo
+
+    def send(adapter, request, **kwargs):
+        original_url = request.url
+        parts = urlsplit(original_url)
+        if parts.hostname not in _LOCAL_HOSTS:
+            request.headers[HOST_HEADER] = parts.hostname or ""
+            request.url = urlunsplit(("http", f"127.0.0.1:{server.port}", parts.path or "/", parts.query, ""))
+        kwargs["proxies"] = {}
+        response = original_send(adapter, request, **kwargs)
+        response.url = original_url
+        request.url = original_url
+        return response
+
+    def getaddrinfo(host, *args, **kwargs):
+        if host not in _LOCAL_HOSTS:
+            raise OSError(f"network access disabled in benchmarks ({host})")
+        return original_getaddrinfo(host, *args, **kwargs)
+
+    HTTPAdapter.send = send
+    socket.getaddrinfo = getaddrinfo
+    try:
+        yield server
+    finally:
+        HTTPAdapter.send = original_send
+        socket.getaddrinfo = original_getaddrinfo
+
+
+def parse_failures(spec: str) -> Tuple[str, ...]:
+    """'500,reset' -> ('500', 'reset'); unknown modes are dropped"""
+    return tuple(f.strip() for f in (spec or "").split(",") if f.strip() in FAILURE_MODES)
@@ -0,0 +1,144 @@
+"""
+Startup cost - cold import profiles of the entry points
+Every measurement is a fresh interpreter: `python -X importtime -c "import cli"`
+gives per-module self/cumulative microseconds, parsed here into a profile.
+The heaviest modules per entry point are kept in importtime_baseline.json so
+an eager import of selenium/numpy/requests creeping back in shows up in review.
+"""
+
+import os
+import sys
+import json
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "importtime_baseline.json")
+
+ENTRY_POINTS = ("cli", "gui_app")
+TOP_MODULES = 15
+
+# (module, self_us, cumulative_us, depth)
+ImportRow = Tuple[str, int, int, int]
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + (os.pathsep + env["PYTHONPATH"] if env.get("PYTHONPATH") else "")
+    env.pop("PYTHONPROFILEIMPORTTIME", None)
+    return env
+
+
+def run_cold(args: List[str], cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+    """Run the current interpreter with args in a fresh process"""
+    return subprocess.run([sys.executable] + args, cwd=cwd or REPO_ROOT, env=_env(),
+                          stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, timeout=120)
+
+
+def parse_importtime(stderr: str) -> List[ImportRow]:
+    """Rows of `-X importtime` output, in import order"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((name.strip(), int(self_us), int(cumulative_us), (len(name) - len(name.lstrip())) // 2))
+        except ValueError:
+            continue  # the column header
+    return rows
+
+
+def own_imports(rows: List[ImportRow], module: str) -> List[ImportRow]:
+    """
+    The rows of `module`'s import tree. Children are printed before their
+    parent, so they are the rows between the previous top-level import
+    (interpreter startup: site, sitecustomize, ...) and `module` itself.
+    """
+    end = next((i for i, r in enumerate(rows) if r[0] == module and r[3] == 0), len(rows) - 1)
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    return rows[start:end + 1]
+
+
+def import_profile(module: str, rounds: int = 3, cwd: Optional[str] = None) -> Dict[str, int]:
+    """
+    Cumulative import microseconds per module for `import module`, the
+    minimum over `rounds` cold starts (least disturbed by other load).
+    """
+    best: Dict[str, int] = {}
+    for _ in range(max(1, rounds)):
+        proc = run_cold(["-X", "importtime", "-c", f"import {module}"], cwd=cwd)
+        if proc.returncode != 0:
+            raise RuntimeError(f"import {module} failed: {proc.stderr.strip().splitlines()[-1:]}")
+        for name, _, cumulative, _ in own_imports(parse_importtime(proc.stderr), module):
+            # A module is only imported once per process; keep the fastest start
+            best[name] = min(cumulative, best.get(name, cumulative))
+    return best
+
+
+def heaviest(profile: Dict[str, int], entry: str, n: int = TOP_MODULES) -> List[Tuple[str, int]]:
+    """The n modules with the largest cumulative cost, excluding the entry point itself"""
+    ranked = sorted(((m, us) for m, us in profile.items() if m != entry), key=lambda kv: kv[1], reverse=True)
+    return ranked[:n]
+
+
+def audit(entries=ENTRY_POINTS, rounds: int = 3, cwd: Optional[str] = None) -> Dict[str, Dict]:
+    """{entry: {"total_ms": .., "top": [[module, ms], ...]}} for each entry point"""
+    report = {}
+    for entry in entries:
+        profile = import_profile(entry, rounds=rounds, cwd=cwd)
+        report[entry] = {
+            "total_ms": round(profile.get(entry, 0) / 1000.0, 1),
+            "top": [[m, round(us / 1000.0, 1)] for m, us in heaviest(profile, entry)],
+        }
+    return report
+
+
+def load_audit(path: str = BASELINE_PATH) -> Dict[str, Dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("entries", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_audit(report: Dict[str, Dict], path: str = BASELINE_PATH):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"created": datetime.now().isoformat(timespec="seconds"),
+                   "python": sys.version.split()[0], "entries": report}, f, indent=2)
+        f.write("\n")
+
+
+def format_audit(report: Dict[str, Dict], baseline: Optional[Dict[str, Dict]] = None) -> str:
+    """Per entry point: total and heaviest modules, with baseline values alongside"""
+    baseline = baseline or {}
+    lines = []
+    for entry, data in report.items():
+        base = baseline.get(entry, {})
+        base_top = dict(base.get("top", []))
+        total = f"import {entry}: {data['total_ms']:.1f} ms"
+        if base:
+            total += f"  (baseline {base.get('total_ms', 0):.1f} ms)"
+        lines.append(total)
+        for module, ms in data["top"]:
+            was = base_top.get(module)
+            lines.append(f"  {module:<40} {ms:>8.1f} ms" + (f"  (baseline {was:.1f})" if was is not None else
+                                                            ("  (new)" if base else "")))
+        lines.append("")
+    return "\n".join(lines).rstrip()
+
+
+def new_heavy_imports(report: Dict[str, Dict], baseline: Dict[str, Dict], min_ms: float = 10.0) -> List[str]:
+    """Modules now in an entry point's heaviest list (>= min_ms) that the baseline didn't import eagerly"""
+    found = []
+    for entry, data in report.items():
+        known = {m for m, _ in baseline.get(entry, {}).get("top", [])}
+        if entry not in baseline:
+            continue
+        for module, ms in data["top"]:
+            if ms >= min_ms and module not in known and "." not in module:
+                found.append(f"import {entry}: {module} {ms:.1f} ms")
+    return found
@@ -0,0 +1,253 @@
+"""
+Benchmark suites - parsers, scoring, extractors, end-to-end CLI, email and startup
+Each suite takes the shared BenchContext (stand-in server, SMTP sink, work
+directory, sizes) and returns BenchResults. Anything that fetches goes
+through the stand-in server; nothing here reaches the network.
+"""
+
+import io
+import os
+import sys
+import warnings
+import contextlib
+from typing import Callable, Dict, List
+
+from benchmarks import fixtures, startup
+from benchmarks.bench import BenchResult, bench
+from benchmarks.smtp_sink import SmtpSink, plaintext_starttls
+from benchmarks.standin_server import StandinServer
+
+KEYWORDS = ["python developer", "data engineer"]
+LOCATION = "Remote"
+
+
+class BenchContext:
+    """What every suite shares for one run"""
+
+    def __init__(self, server: StandinServer, sink: SmtpSink, workdir: str, quick: bool = False,
+                 postings: int = fixtures.DEFAULT_POSTINGS, synthetic: bool = False):
+        self.server = server
+        self.sink = sink
+        self.workdir = workdir
+        self.quick = quick
+        self.postings = postings
+        self.synthetic = synthetic
+
+    def rounds(self, full: int) -> int:
+        return max(1, full // 5) if self.quick else full
+
+    def page(self, name: str) -> str:
+        return fixtures.load(name, self.postings, self.synthetic)
+
+
+@contextlib.contextmanager
+def _quiet():
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def _records(n: int) -> List[Dict]:
+    """Search-result records with the duplication real sweeps see (same posting via several engines)"""
+    base = fixtures.postings(max(1, n // 3), seed=11)
+    out = []
+    for i in range(n):
+        p = base[i % len(base)]
+        copy = i // len(base)
+        url = [
+            f"https://{p['slug']}.com/careers/{p['id']}",
+            f"https://www.{p['slug']}.com/careers/{p['id']}/?utm_source=indeed&utm_medium=cpc&ref=jobboard",
+            f"https://www.indeed.com/rc/clk?jk={p['id']}&from=serp&vjs=3",
+        ][copy % 3]
+        out.append({
+            "engine": ["duckduckgo", "indeed", "startpage"][copy % 3],
+            "query": KEYWORDS[i % len(KEYWORDS)],
+            "title": p["title"] + ("" if copy == 0 else f" - {p['company']}"),
+            "url": url,
+            "snippet": p["snippet"],
+            "company": p["company"],
+            "hash": f"{p['id']}-{copy}",
+        })
+    return out
+
+
+# ============= SUITES =============
+
+def suite_parsers(ctx: BenchContext) -> List[BenchResult]:
+    """HTML/JSON/RSS parsing per source; fetch+parse through the stand-in where parsing is inline"""
+    import site_indeed
+    import site_simplyhired
+    import site_greenhouse
+    import site_lever
+    from site_remoteok import remoteok_search
+    from site_remotive import remotive_search
+    from site_weworkremotely import weworkremotely_search
+    from search_engines import startpage_search
+    from ultimate_job_scraper import scrape_duckduckgo_lite, scrape_duckduckgo_html
+
+    n = ctx.postings
+    query = f"{KEYWORDS[0]} {LOCATION}"
+    cases: List[tuple] = [
+        ("indeed", lambda html=ctx.page("indeed"): list(site_indeed._parse_page(html, KEYWORDS[0], LOCATION)), ""),
+        ("simplyhired", lambda html=ctx.page("simplyhired"): list(site_simplyhired._parse_page(html, query)), ""),
+        ("greenhouse", lambda html=ctx.page("greenhouse"): list(site_greenhouse._parse_page(html, query)), ""),
+        ("lever", lambda html=ctx.page("lever"): list(site_lever._parse_page(html, query)), ""),
+        ("ddg_html", lambda: scrape_duckduckgo_html(query, max_results=n, delay=0), "fetch+parse"),
+        ("ddg_lite", lambda: scrape_duckduckgo_lite(query, max_results=n, delay=0), "fetch+parse"),
+        ("startpage", lambda: startpage_search(query, max_results=n, use_proxy=False), "fetch+parse"),
+        ("remoteok", lambda: remoteok_search(KEYWORDS[0], max_results=n), "fetch+parse"),
+        ("remotive", lambda: remotive_search(KEYWORDS[0], max_results=n), "fetch+parse"),
+        ("weworkremotely", lambda: weworkremotely_search("python", max_results=n), "fetch+parse"),
+    ]
+    results = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")  # bs4 warns about parsing the WWR feed as HTML
+        for name, fn, note in cases:
+            found = len(fn())
+            rounds = ctx.rounds(10 if note else 30)
+            results.append(bench("parsers", name, fn, rounds=rounds, items=found,
+                                 note=f"{note}, {found} results" if note else f"{found} results"))
+    return results
+
+
+def suite_scoring(ctx: BenchContext) -> List[BenchResult]:
+    """Relevance scoring, URL canonicalization and near-duplicate collapse over a sweep-sized batch"""
+    from normalize import RelevanceScorer, filter_relevant, normalize_record
+    from url_canon import canonical_key
+    from near_dupes import collapse_near_duplicates
+
+    n = 1000 if ctx.quick else 5000
+    records = _records(n)
+    urls = [r["url"] for r in records]
+    scorer = RelevanceScorer(KEYWORDS)
+    rounds = ctx.rounds(20)
+    return [
+        bench("scoring", "score_batch", lambda: scorer.score_batch(records), rounds=rounds, items=n),
+        bench("scoring", "score_per_record", lambda: [scorer.score(r["title"], r["snippet"]) for r in records],
+              rounds=rounds, items=n),
+        bench("scoring", "filter_relevant", lambda: filter_relevant(records, KEYWORDS, 1.0), rounds=rounds, items=n),
+        bench("scoring", "canonical_key", lambda: [canonical_key(u) for u in urls], rounds=rounds, items=n),
+        bench("scoring", "normalize_record", lambda: [normalize_record(r) for r in records], rounds=rounds, items=n),
+        bench("scoring", "collapse_near_dupes", lambda: collapse_near_duplicates(records),
+              rounds=ctx.rounds(5), items=n),
+    ]
+
+
+def suite_extractors(ctx: BenchContext) -> List[BenchResult]:
+    """Email extraction from HTML, and from company sites through the stand-in"""
+    from email_extractor import extract_emails_from_html, extract_emails_from_url, extract_from_job_results
+
+    page = ctx.page("contact_page").replace("{{host}}", "northwindrobotics.com")
+    big_page = page * 40
+    records = [r for r in _records(60) if "indeed.com" not in r["url"]][:20]
+    urls = [r["url"] for r in records]
+    rounds = ctx.rounds(10)
+    return [
+        bench("extractors", "emails_from_html", lambda: extract_emails_from_html(page), rounds=ctx.rounds(50),
+              items=1, note=f"{len(page) // 1024}KB page"),
+        bench("extractors", "emails_from_html_large", lambda: extract_emails_from_html(big_page),
+              rounds=ctx.rounds(20), items=1, note=f"{len(big_page) // 1024}KB page"),
+        bench("extractors", "emails_from_url", lambda: [extract_emails_from_url(u, timeout=5) for u in urls],
+              rounds=rounds, items=len(urls)),
+        bench("extractors", "from_job_results", lambda: extract_from_job_results(records),
+              rounds=rounds, items=len(records)),
+    ]
+
+
+def _run_cli(argv: List[str]):
+    import cli
+
+    saved = sys.argv
+    sys.argv = ["cli.py"] + argv
+    try:
+        with _quiet():
+            cli.main()
+    except SystemExit:
+        pass
+    finally:
+        sys.argv = saved
+
+
+def suite_e2e(ctx: BenchContext) -> List[BenchResult]:
+    """cli.main over every free engine, search-only and with enrichment + email extraction"""
+    import search_engines
+
+    engines = "duckduckgo,startpage,indeed,simplyhired,greenhouse,lever,remoteok,remotive,weworkremotely"
+    common = ["--keywords", ",".join(KEYWORDS), "--locations", LOCATION, "--engines", engines,
+              "--max-per-query", str(ctx.postings), "--throttle", "0", "--no-auto-serpapi",
+              "--out", os.path.join(ctx.workdir, "bench_jobs.json"),
+              "--metrics-out", os.path.join(ctx.workdir, "bench_perf_report.json")]
+    units = len(KEYWORDS) * len(engines.split(","))
+
+    # The DDGS client has its own HTTP stack; use the HTML scraper so DuckDuckGo goes through the stand-in
+    has_ddgs = search_engines.HAS_DDGS
+    search_engines.HAS_DDGS = False
+    try:
+        rounds = ctx.rounds(5)
+        return [
+            bench("e2e", "cli_search", lambda: _run_cli(common + ["--no-enrich", "--no-store"]),
+                  rounds=rounds, warmup=1, items=units, note=f"{units} units"),
+            bench("e2e", "cli_enrich_extract", lambda: _run_cli(common + ["--extract-emails"]),
+                  rounds=rounds, warmup=1, items=units, note=f"{units} units, store + emails"),
+        ]
+    finally:
+        search_engines.HAS_DDGS = has_ddgs
+
+
+def suite_email(ctx: BenchContext) -> List[BenchResult]:
+    """EmailSender over SMTP (connect, STARTTLS, AUTH, send) into the local sink"""
+    env = {"SMTP_HOST": "127.0.0.1", "SMTP_PORT": str(ctx.sink.port),
+           "SMTP_USER": "bench@jobgoblin.local", "SMTP_PASSWORD": "bench"}
+    saved = {k: os.environ.get(k) for k in env}
+    os.environ.update(env)
+    try:
+        from email_sender import EmailSender
+
+        sender = EmailSender()
+        batch = 10
+        leads = [{"email": f"careers{i}@northwindrobotics.com", "domains": "northwindrobotics.com",
+                  "job_titles": "Senior Python Developer"} for i in range(batch)]
+        rounds = ctx.rounds(10)
+        with plaintext_starttls():
+            results = [
+                bench("email", "send_email", lambda: [sender.send_email(l["email"], "Job Lead Information",
+                                                                        sender._format_message(l)) for l in leads],
+                      rounds=rounds, items=batch),
+                bench("email", "send_lead", lambda: [sender.send_lead(l) for l in leads], rounds=rounds,
+                      items=batch, setup=sender.email_manager.reset_daily_limit, note="with send log"),
+            ]
+        accepted = len(ctx.sink.messages)
+        expected = batch * 2 * (rounds + 1)
+        if accepted != expected:
+            results[-1].note += f"; sink got {accepted}/{expected}"
+        return results
+    finally:
+        for k, v in saved.items():
+            if v is None:
+                os.environ.pop(k, None)
+            else:
+                os.environ[k] = v
+
+
+def suite_startup(ctx: BenchContext) -> List[BenchResult]:
+    """Cold start of each entry point in a fresh interpreter (import cost, and cli --help)"""
+    cases = [(f"import_{entry}", ["-c", f"import {entry}"]) for entry in startup.ENTRY_POINTS]
+    cases.append(("cli_help", [os.path.join(startup.REPO_ROOT, "cli.py"), "--help"]))
+    rounds = ctx.rounds(10)
+    results = []
+    for name, args in cases:
+        def run(args=args):
+            proc = startup.run_cold(args, cwd=ctx.workdir)
+            if proc.returncode != 0:
+                raise RuntimeError(f"{' '.join(args)} exited {proc.returncode}")
+        results.append(bench("startup", name, run, rounds=rounds, warmup=1, items=1, note="fresh interpreter"))
+    return results
+
+
+SUITES: Dict[str, Callable[[BenchContext], List[BenchResult]]] = {
+    "parsers": suite_parsers,
+    "scoring": suite_scoring,
+    "extractors": suite_extractors,
+    "e2e": suite_e2e,
+    "email": suite_email,
+    "startup": suite_startup,
+}
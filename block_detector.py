@@ -0,0 +1,304 @@
+"""
+Block Detector - classify search responses and back off blocked routes
+Every request an engine makes goes over a route: one specific proxy, a
+direct connection, the DDGS API or the local DDG proxy server. Each outcome
+(ok / captcha / rate_limited / banned / network_error) is charged to exactly
+that (engine, route), which then sits out an exponential backoff instead of
+being retried into the same wall. Callers ask for the routes still worth
+trying rather than guessing which proxy failed.
+A caller that needs to know how its own search went wraps it in observe():
+outcomes recorded inside the block (on that thread, or on threads it hands
+work to with a copied context) are collected for that call alone.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from perf_metrics import METRICS
+
+# Outcomes
+OK = "ok"
+CAPTCHA = "captcha"
+RATE_LIMITED = "rate_limited"
+BANNED = "banned"
+NETWORK_ERROR = "network_error"
+OUTCOMES = (OK, CAPTCHA, RATE_LIMITED, BANNED, NETWORK_ERROR)
+
+# Routes other than proxies
+DIRECT = "direct"
+DDGS_API = "ddgs"
+LOCAL_PROXY = "local_proxy"
+
+# Backoff per outcome: (first delay, cap) in seconds, doubling per failure in a row
+BACKOFF = {
+    CAPTCHA: (60.0, 1800.0),
+    RATE_LIMITED: (30.0, 900.0),
+    BANNED: (1800.0, 6 * 3600.0),
+    NETWORK_ERROR: (5.0, 300.0),
+}
+
+# A proxy with this many network errors in a row is disabled in the ProxyManager
+PROXY_DEAD_AFTER = 3
+
+# Proxies tried per request before falling back to a direct connection
+MAX_PROXY_ROUTES = 2
+
+# Page markers per engine; "*" applies to every engine
+CAPTCHA_MARKERS = {
+    "duckduckgo": ("confirm this search was made by a human", "anomaly-modal", "challenge-form"),
+    "startpage": ("/sp/captcha", "please verify you are not a robot"),
+    "google_cse": ("our systems have detected unusual traffic", "/sorry/index"),
+    "bing": ("b_captcha", "/turing/captcha"),
+    "*": ("g-recaptcha", "h-captcha", "cf-challenge", "cf_chl_opt", "verify you are human", "are you a robot"),
+}
+
+# Exception text the old retry loop treated as a dead connection
+NETWORK_WORDS = ("timeout", "timed out", "connection", "proxy", "reset", "refused", "unreachable", "ssl")
+
+# Only the start of a page is scanned for markers
+SCAN_BYTES = 64 * 1024
+
+
+def proxy_route(proxy_url: str) -> str:
+    return f"proxy:{proxy_url}"
+
+
+def route_proxy_url(route: str) -> Optional[str]:
+    """The proxy URL of a proxy route, None for the other routes"""
+    return route[len("proxy:"):] if route.startswith("proxy:") else None
+
+
+def _markers(engine: str) -> Tuple[str, ...]:
+    return CAPTCHA_MARKERS.get(engine, ()) + CAPTCHA_MARKERS["*"]
+
+
+def _head(response) -> str:
+    try:
+        return (response.text or "")[:SCAN_BYTES].lower()
+    except Exception:
+        return ""
+
+
+def retry_after(response) -> Optional[float]:
+    """Seconds from a Retry-After header (delta or HTTP date), if any"""
+    value = getattr(response, "headers", {}).get("Retry-After") if response is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_response(engine: str, response) -> str:
+    """
+    Outcome of an HTTP response from `engine`. OK means "not blocked": a 404
+    or 500 is the caller's problem, not a reason to abandon the route.
+    """
+    status = response.status_code
+    if status == 429:
+        return RATE_LIMITED
+    if status in (407, 502, 504):
+        # Proxy auth failures and dead upstream hops are the route, not the engine
+        return NETWORK_ERROR
+    if status == 202 and engine == "duckduckgo":
+        # DDG answers automated HTML queries with an empty 202 challenge page
+        return CAPTCHA
+    head = _head(response) if status in (200, 202, 403, 503) else ""
+    if any(m in head for m in _markers(engine)):
+        return CAPTCHA
+    if status == 403:
+        return BANNED
+    if status == 503:
+        return RATE_LIMITED
+    return OK
+
+
+def classify_exception(error: BaseException) -> Optional[str]:
+    """
+    Outcome of a failed request, or None when the error has nothing to do
+    with the route (a parsing bug shouldn't bench a working proxy).
+    """
+    response = getattr(error, "response", None)
+    if response is not None and getattr(response, "status_code", None):
+        outcome = classify_response("*", response)
+        if outcome != OK:
+            return outcome
+    name = type(error).__name__.lower()
+    text = str(error).lower()
+    if "ratelimit" in name or "rate limit" in text or "429" in text:
+        return RATE_LIMITED
+    if "captcha" in text:
+        return CAPTCHA
+    if "403" in text or "forbidden" in text:
+        return BANNED
+    if "timeout" in name or "connection" in name or "proxy" in name or any(w in text for w in NETWORK_WORDS):
+        return NETWORK_ERROR
+    return None
+
+
+class CallOutcome:
+    """Outcomes of the requests made during one observe() block"""
+
+    def __init__(self):
+        self.outcomes: List[str] = []
+
+    @property
+    def outcome(self) -> Optional[str]:
+        """OK if any request got a real answer, else the last failure (None if nothing reported)"""
+        if OK in self.outcomes:
+            return OK
+        return self.outcomes[-1] if self.outcomes else None
+
+
+_CALL: ContextVar[Optional[CallOutcome]] = ContextVar("block_call", default=None)
+
+
+@contextmanager
+def observe():
+    """Collect the outcomes recorded by this call (not by concurrent ones) into a CallOutcome"""
+    call = CallOutcome()
+    token = _CALL.set(call)
+    try:
+        yield call
+    finally:
+        _CALL.reset(token)
+
+
+def note(outcome: Optional[str]):
+    """Add an outcome to the current observe() block without charging any route"""
+    call = _CALL.get()
+    if call is not None and outcome:
+        call.outcomes.append(outcome)
+
+
+class BlockTracker:
+    """Per (engine, route) outcome history and backoff deadlines"""
+
+    def __init__(self, backoff: Dict[str, Tuple[float, float]] = None):
+        self.backoff = dict(BACKOFF if backoff is None else backoff)
+        self._lock = threading.Lock()
+        # (engine, route) -> {"outcome", "streak", "until", "counts"}
+        self._routes: Dict[Tuple[str, str], Dict] = {}
+        self.skipped = 0  # attempts not made because the route was backing off
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+            self.skipped = 0
+
+    def record(self, engine: str, route: str, outcome: str, retry_after_s: Optional[float] = None,
+               proxy_manager=None, to_call: bool = True) -> float:
+        """
+        Charge an outcome to (engine, route); returns the backoff it now sits
+        out (0 after OK). A proxy route that keeps failing at the network
+        level is also disabled in proxy_manager, for every engine. With
+        to_call the outcome also counts for the surrounding observe() block.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._routes.setdefault((engine, route), {"outcome": OK, "streak": 0, "until": 0.0, "counts": {}})
+            state["counts"][outcome] = state["counts"].get(outcome, 0) + 1
+            if outcome == OK:
+                state.update(outcome=OK, streak=0, until=0.0)
+                delay = 0.0
+            else:
+                streak = state["streak"] + 1 if state["outcome"] == outcome else 1
+                first, cap = self.backoff.get(outcome, BACKOFF[NETWORK_ERROR])
+                delay = min(cap, first * 2 ** (streak - 1))
+                if retry_after_s:
+                    delay = max(delay, min(retry_after_s, cap))
+                state.update(outcome=outcome, streak=streak, until=now + delay)
+            dead = outcome == NETWORK_ERROR and state["streak"] >= PROXY_DEAD_AFTER
+        METRICS.inc("block_outcomes_total", engine=engine, outcome=outcome)
+        if to_call:
+            note(outcome)
+
+        proxy_url = route_proxy_url(route)
+        if dead and proxy_url and proxy_manager is not None:
+            try:
+                proxy_manager.mark_proxy_failed(proxy_url)
+            except Exception:
+                pass
+        return delay
+
+    def wait_time(self, engine: str, route: str) -> float:
+        """Seconds until (engine, route) may be tried again"""
+        with self._lock:
+            state = self._routes.get((engine, route))
+            return max(0.0, state["until"] - time.monotonic()) if state else 0.0
+
+    def available(self, engine: str, route: str) -> bool:
+        return self.wait_time(engine, route) <= 0
+
+    def usable(self, engine: str, routes: Sequence[str]) -> List[str]:
+        """The routes not backing off, in order; the rest count as skipped attempts"""
+        ready = [r for r in routes if self.available(engine, r)]
+        skipped = len(routes) - len(ready)
+        if skipped:
+            with self._lock:
+                self.skipped += skipped
+            METRICS.inc("block_skipped_total", skipped, engine=engine)
+        return ready
+
+    def http_routes(self, engine: str, proxy_manager=None) -> List[Tuple[str, Optional[Dict]]]:
+        """
+        (route, requests proxies) to try in order for one request: up to
+        MAX_PROXY_ROUTES proxies that aren't backing off for this engine,
+        then a direct connection. Empty when every route is backing off.
+        """
+        routes: List[Tuple[str, Optional[Dict]]] = []
+        if proxy_manager is not None and proxy_manager.proxies:
+            seen = set()
+            for _ in range(len(proxy_manager.proxies)):
+                proxy = proxy_manager.get_next_proxy()
+                if not proxy or proxy.get("url") in seen:
+                    break
+                seen.add(proxy.get("url"))
+                route = proxy_route(proxy.get("url", ""))
+                if not self.usable(engine, [route]):
+                    continue
+                proxies = proxy_manager.get_requests_proxy(proxy)
+                if proxies:
+                    routes.append((route, proxies))
+                if len(routes) >= MAX_PROXY_ROUTES:
+                    break
+        if self.usable(engine, [DIRECT]):
+            routes.append((DIRECT, None))
+        return routes
+
+    def retry_after(self, engine: str) -> float:
+        """
+        0 if `engine` has a route worth trying now (or none on record),
+        otherwise the seconds until its first route comes off backoff.
+        """
+        now = time.monotonic()
+        with self._lock:
+            waits = [s["until"] - now for (e, _), s in self._routes.items() if e == engine]
+        if not waits or min(waits) <= 0:
+            return 0.0
+        return min(waits)
+
+    def tracked(self, engine: str) -> bool:
+        """True once `engine` has recorded an outcome on any of its own routes"""
+        with self._lock:
+            return any(e == engine for e, _ in self._routes)
+
+    def report(self) -> List[Dict]:
+        """One row per (engine, route): last outcome, failures in a row, wait left and counts"""
+        now = time.monotonic()
+        with self._lock:
+            return [{"engine": e, "route": r, "outcome": s["outcome"], "streak": s["streak"],
+                     "wait_s": round(max(0.0, s["until"] - now), 1), "counts": dict(s["counts"])}
+                    for (e, r), s in sorted(self._routes.items())]
+
+
+BLOCKS = BlockTracker()
@@ -4,14 +4,27 @@ import time
 import os
 import sys
 import math
-from typing import List
+import uuid
+from datetime import datetime
+from itertools import islice
+from typing import Iterable, List, Optional, Sequence, Tuple
 from dotenv import load_dotenv
-from search_engines import ENGINE_FUNCS
-from site_indeed import indeed_search
-from site_greenhouse import greenhouse_search
-from site_lever import lever_search
-from site_simplyhired import simplyhired_search
-from normalize import normalize_record, is_relevant
+from engine_registry import ENGINES, get_engine, resolve_engine, set_min_interval
+from engine_planner import EnginePlanner
+import query_plan
+from query_plan import get_history, plan_queries, plan_units, unit_query
+from single_flight import format_flight_stats
+from perf_metrics import METRICS, DEFAULT_REPORT_PATH, serve_prometheus
+from near_dupes import collapse_near_duplicates
+from url_canon import canonical_key
+from job_store import JobStore, DEFAULT_DB_PATH
+from jsonl_stream import JsonlSink, iter_jsonl, iter_chunks
+from job_record import JobColumns, to_dicts
+from block_detector import OK, observe
+from sweep_journal import SweepJournal
+from pipeline import JobPipeline
+from work_queue import WorkQueue, DEFAULT_QUEUE_DIR, run_worker, start_workers, coordinate
+from normalize import normalize_record, filter_relevant
 from email_extractor import extract_from_job_results, filter_and_dedupe_emails
 from email_manager import EmailManager
 from email_sender import EmailSender
@@ -20,182 +33,57 @@ from enrichment_pipeline import JobEnrichment, filter_by_enrichment_score, sort_
 load_dotenv()
 
 def expand_queries(keywords: List[str], locations: List[str]) -> List[str]:
-    out = []
-    for kw in keywords:
-        kw = kw.strip()
-        if not kw:
-            continue
-        if locations:
-            for loc in locations:
-                loc = loc.strip()
-                if not loc:
-                    continue
-                out.append(f"{kw} {loc}")
-        else:
-            out.append(kw)
-    return out
+    """Normalized, deduplicated "keyword location" strings (NYC / New York etc. collapse)."""
+    return plan_queries(keywords, locations)
+
+def expand_units(keywords: List[str], locations: List[str]) -> List[Tuple[str, str]]:
+    """Normalized, deduplicated keyword x location pairs; location is "" when none were given."""
+    return query_plan.expand_units(keywords, locations)
 
-def dedupe(existing: List[dict], new: List[dict]) -> List[dict]:
-    seen = {r.get("url"): True for r in existing}
-    merged = existing[:]
+def dedupe(existing: Iterable[dict], new: Iterable[dict]) -> JobColumns:
+    merged = JobColumns(existing)
+    seen = {canonical_key(u): True for u in merged.column("url")}
     for r in new:
-        u = r.get("url")
+        u = canonical_key(r.get("url"))
         if u and u not in seen:
             merged.append(r)
             seen[u] = True
     return merged
 
-def main():
-    ap = argparse.ArgumentParser(description="JOB SCRAPER ULTIMATE - broad search engine job discovery")
-    ap.add_argument("--keywords", required=True, help="Comma-separated keyword phrases")
-    ap.add_argument("--locations", default="", help="Comma-separated location phrases")
-    ap.add_argument("--engines", default="duckduckgo", help="Comma-separated engine list (duckduckgo,google_cse,bing,serpapi,indeed,linkedin)")
-    ap.add_argument("--max-per-query", type=int, default=20, help="Max results per query per engine")
-    ap.add_argument("--out", default="web_jobs_ultimate.json", help="Output JSON path")
-    ap.add_argument("--txt-out", default="", help="Optional TXT summary path (defaults to output/web_jobs_ultimate.txt)")
-    ap.add_argument("--append", action="store_true", help="Append/dedupe into existing output file")
-    ap.add_argument("--csv-out", default="", help="Optional CSV export path")
-    ap.add_argument("--verbose", action="store_true")
-    ap.add_argument("--throttle", type=float, default=1.2, help="Seconds sleep between queries per engine")
-    ap.add_argument("--relevance-threshold", type=float, default=1.0, help="Score threshold for relevance filter")
-    ap.add_argument("--no-auto-serpapi", action="store_true", help="Disable automatic SerpAPI fallback when zero results")
-    ap.add_argument("--email-to", default="", help="Comma-separated recipients (uses SENDGRID_API_KEY)")
-    ap.add_argument("--email-top", type=int, default=10, help="Top N results to email")
-    ap.add_argument("--email-subject", default="Job Scraper Ultimate Results", help="Email subject line")
-    ap.add_argument("--extract-emails", action="store_true", help="Extract contact emails from found job postings")
-    ap.add_argument("--emails-csv", default="", help="Output path for extracted emails CSV (defaults to output/found_emails.csv)")
-    ap.add_argument("--send-emails", action="store_true", help="Send emails to extracted contacts (respects 50/day limit)")
-    ap.add_argument("--email-timeout", type=int, default=10, help="Timeout in seconds for email extraction from websites")
-    ap.add_argument("--enrich", action="store_true", help="Enrich results with emails and company info (enabled by default)")
-    ap.add_argument("--no-enrich", action="store_true", help="Disable enrichment pipeline")
-    args = ap.parse_args()
-
-    keywords = [k.strip() for k in args.keywords.split(',') if k.strip()]
-    locations = [l.strip() for l in args.locations.split(',') if l.strip()]
-    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
-
-    queries = expand_queries(keywords, locations)
-    if args.verbose:
-        print(f"Expanded {len(keywords)} keywords + {len(locations)} locations -> {len(queries)} queries")
-
-    existing = []
-    if args.append and os.path.exists(args.out):
-        try:
-            with open(args.out, 'r', encoding='utf-8') as f:
-                existing = json.load(f)
-            if args.verbose:
-                print(f"Loaded {len(existing)} existing records from {args.out}")
-        except Exception as e:
-            print("Failed loading existing output", e)
-            existing = []
-
-    all_new = []
-
-    # Separate handling: web search engines (query string) vs site engines (kw+loc)
-    WEB_ENGINES = set(["duckduckgo", "google_cse", "bing", "serpapi", "linkedin", "glassdoor", "ziprecruiter"])
-    SITE_ENGINES = set(["indeed", "greenhouse", "lever", "simplyhired"])
-
-    # Web engines use combined queries
-    for q_idx, query in enumerate(queries, 1):
-        for eng in engines:
-            if eng not in WEB_ENGINES:
-                continue
-            # Special site-filtered engines via SerpAPI
-            modified_query = query
-            if eng in ("linkedin", "glassdoor", "ziprecruiter"):
-                site_map = {
-                    "linkedin": "site:linkedin.com/jobs ",
-                    "glassdoor": "site:glassdoor.com/Job ",
-                    "ziprecruiter": "site:ziprecruiter.com/jobs "
-                }
-                if "serpapi" in ENGINE_FUNCS:
-                    fn = ENGINE_FUNCS.get("serpapi")
-                    modified_query = site_map[eng] + query
-                else:
-                    if args.verbose:
-                        print(f"{eng} requires SerpAPI for site-filtered search; skipping")
-                    continue
-            else:
-                fn = ENGINE_FUNCS.get(eng)
-            if not fn:
-                if args.verbose:
-                    print(f"Unknown web engine {eng}; skipping")
-                continue
-            if args.verbose:
-                print(f"[{q_idx}/{len(queries)}] Engine {eng} querying: {modified_query}")
-            results = fn(modified_query, max_results=args.max_per_query, verbose=args.verbose)
-            filtered = [normalize_record(r) for r in results if is_relevant(r.get("title", ""), r.get("snippet", ""), keywords, args.relevance_threshold)]
-            if args.verbose:
-                print(f"Engine {eng} raw {len(results)} -> relevant {len(filtered)}")
-            all_new.extend(filtered)
-            time.sleep(args.throttle)
-
-    # Site engines iterate keyword x location pairs
-    for eng in engines:
-        if eng not in SITE_ENGINES:
-            continue
+def finish_batch(args, merged: Sequence[dict], store: Optional[JobStore], journal: Optional[SweepJournal] = None,
+                 from_workers: bool = False, since: Optional[str] = None) -> JobColumns:
+    """
+    In-memory mode: collapse, enrich, store and write all outputs at the end.
+    from_workers: records were already enriched by queue or pipeline workers
+    and merged into the store as they arrived.
+    since: when the run started (ISO); --append exports the store rows seen since then
+    """
+    # Collapse the same posting syndicated across boards before any per-job fetching
+    if merged and not args.keep_near_dupes:
+        before = len(merged)
+        merged = JobColumns(collapse_near_duplicates(merged))
         if args.verbose:
-            print(f"[site] Engine {eng} over {len(keywords)} keywords x {max(1,len(locations))} locations")
-        for kw in keywords:
-            if locations:
-                locs = locations
-            else:
-                locs = [""]
-            for loc in locs:
-                if args.verbose:
-                    print(f"[site] {eng} kw='{kw}' loc='{loc}'")
-                if eng == "indeed":
-                    results = indeed_search(kw, loc, max_results=args.max_per_query, verbose=args.verbose)
-                elif eng == "greenhouse":
-                    results = greenhouse_search(kw, loc, max_results=args.max_per_query, verbose=args.verbose)
-                elif eng == "lever":
-                    results = lever_search(kw, loc, max_results=args.max_per_query, verbose=args.verbose)
-                elif eng == "simplyhired":
-                    results = simplyhired_search(kw, loc, max_results=args.max_per_query, verbose=args.verbose)
-                else:
-                    results = []
-                filtered = [normalize_record(r) for r in results if is_relevant(r.get("title", ""), r.get("snippet", ""), keywords, args.relevance_threshold)]
-                if args.verbose:
-                    print(f"[site] {eng} raw {len(results)} -> relevant {len(filtered)}")
-                all_new.extend(filtered)
-                time.sleep(args.throttle)
-
-    merged = dedupe(existing, all_new)
-    if args.verbose:
-        print(f"Total new relevant {len(all_new)}; merged unique {len(merged)}")
-
-    # Auto SerpAPI fallback if nothing found and key present
-    if not merged and not args.no_auto_serpapi:
-        serpapi_key = os.getenv("SERPAPI_KEY")
-        if serpapi_key:
-            if "serpapi" not in engines:
-                if args.verbose:
-                    print("No results; auto SerpAPI fallback engaged.")
-                for q_idx, query in enumerate(queries, 1):
-                    fn = ENGINE_FUNCS.get("serpapi")
-                    if not fn:
-                        continue
-                    if args.verbose:
-                        print(f"[fallback {q_idx}/{len(queries)}] serpapi querying: {query}")
-                    results = fn(query, max_results=args.max_per_query, verbose=args.verbose)
-                    filtered = [normalize_record(r) for r in results if is_relevant(r.get("title", ""), r.get("snippet", ""))]
-                    merged = dedupe(merged, filtered)
-                    time.sleep(args.throttle)
-            else:
-                if args.verbose:
-                    print("SerpAPI already in engine list; no extra fallback.")
-        else:
-            if args.verbose:
-                print("SerpAPI key missing; fallback skipped.")
+            print(f"[near-dupes] {before} -> {len(merged)} records ({before - len(merged)} syndicated copies collapsed)")
 
     # ===== ENRICHMENT PIPELINE =====
     # Enhance job listings with emails, company info, and validation
-    if merged and not args.no_enrich:
+    if merged and not args.no_enrich and from_workers:
+        merged = JobColumns(sort_by_enrichment(merged, reverse=True))
+    elif merged and not args.no_enrich:
         if args.verbose:
             print(f"\n[enrichment] Starting enrichment pipeline for {len(merged)} jobs...")
         
         enricher = JobEnrichment(verbose=args.verbose)
-        enriched = enricher.enrich_jobs(merged)
+        with METRICS.stage("enrich"):
+            if journal is not None:
+                # Jobs enriched before an interruption are taken from the journal
+                done = journal.stage_items("enrich")
+                if args.verbose and done:
+                    print(f"[resume] {len(done)} jobs already enriched")
+                enriched = enricher.enrich_jobs(merged, done=done,
+                                                on_enriched=lambda url, job: journal.put_stage_item("enrich", url, job))
+            else:
+                enriched = enricher.enrich_jobs(merged)
         
         # Sort by enrichment score (highest first)
         enriched = sort_by_enrichment(enriched, reverse=True)
@@ -204,16 +92,105 @@ def main():
             avg_score = sum(j.get("enrichment_score", 0) for j in enriched) / len(enriched) if enriched else 0
             print(f"[enrichment] Complete. Average enrichment score: {avg_score:.1f}/12.0")
         
-        merged = enriched
+        merged = JobColumns(enriched)
 
+    if store is not None and not from_workers:
+        with METRICS.stage("store"):
+            new, updated = store.upsert_many(merged)
+        print(f"Job store {args.store}: {new} new, {updated} seen again ({store.count()} total)")
+
+    # With --append the outputs are store views (first_seen/last_seen) of this run's jobs;
+    # only --export-history rewrites the whole store, which grows with every run
+    history = (args.append or args.export_history) and store is not None
+    since = None if args.export_history else since
+    written = len(merged)
     try:
-        with open(args.out, 'w', encoding='utf-8') as f:
-            json.dump(merged, f, indent=2)
+        if history:
+            written = store.export_json(args.out, since=since)
+        else:
+            with open(args.out, 'w', encoding='utf-8') as f:
+                json.dump(to_dicts(merged), f, indent=2)
     except Exception as e:
         print("Error writing output", e)
         sys.exit(1)
 
     # Optional CSV export via flag
+    csv_out = args.csv_out.strip()
+    if csv_out:
+        import csv
+        try:
+            if history:
+                store.export_csv(csv_out, since=since)
+            else:
+                with open(csv_out, 'w', encoding='utf-8', newline='') as f:
+                    w = csv.writer(f)
+                    w.writerow(["title","url","engine","query","snippet"])
+                    for r in merged:
+                        w.writerow([r.get('title',''), r.get('url',''), r.get('engine',''), r.get('query',''), r.get('snippet','')])
+        except Exception as e:
+            print("Failed writing CSV", e)
+
+    # Prepare TXT summary output
+    txt_out = args.txt_out.strip()
+    if not txt_out:
+        os.makedirs('output', exist_ok=True)
+        txt_out = os.path.join('output', 'web_jobs_ultimate.txt')
+    try:
+        if history:
+            store.export_txt(txt_out, since=since)
+        else:
+            lines = []
+            for r in merged:
+                lines.append(f"{r.get('title','').strip()} | {r.get('url','')} | {r.get('engine','')} | {r.get('query','')}")
+            with open(txt_out, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines))
+    except Exception as e:
+        print("Failed writing TXT summary", e)
+        # Continue; JSON already written
+
+    msg = f"Wrote {written} records to {args.out} and summary {txt_out}"
+    if csv_out:
+        msg += f"; CSV {csv_out}"
+    print(msg)
+
+    return merged
+
+def finish_stream(args, stream_path: str, store: Optional[JobStore], resume: bool = False) -> Tuple[str, List[dict]]:
+    """
+    Streaming mode: enrichment, the job store and the CSV/TXT exports read the
+    JSONL stream one record at a time. Near-duplicate collapsing and sorting
+    by enrichment score need the whole result set and are skipped.
+    resume: continue the enriched stream of the interrupted run being resumed
+
+    Returns (path of the final stream, first --email-top records for the results email).
+    """
+    final_path = stream_path
+    if not args.no_enrich:
+        final_path = os.path.splitext(stream_path)[0] + ".enriched.jsonl"
+        if args.verbose:
+            print(f"\n[enrichment] Enriching stream {stream_path} -> {final_path}")
+        enricher = JobEnrichment(verbose=args.verbose)
+        with METRICS.stage("enrich"), JsonlSink(final_path, resume=resume, verbose=args.verbose) as out:
+            for r in iter_jsonl(stream_path):
+                # Already enriched by an earlier, interrupted run
+                if (canonical_key(r.get("url") or "") or r.get("hash")) in out.index:
+                    continue
+                try:
+                    r = enricher.enrich_job(r)
+                except Exception as e:
+                    if args.verbose:
+                        print(f"[enrichment] Error enriching job: {e}")
+                out.write(r)
+
+    if store is not None:
+        new = updated = 0
+        for chunk in iter_chunks(iter_jsonl(final_path)):
+            with METRICS.stage("store"):
+                n, u = store.upsert_many(chunk)
+            new += n
+            updated += u
+        print(f"Job store {args.store}: {new} new, {updated} seen again ({store.count()} total)")
+
     csv_out = args.csv_out.strip()
     if csv_out:
         import csv
@@ -221,38 +198,49 @@ def main():
             with open(csv_out, 'w', encoding='utf-8', newline='') as f:
                 w = csv.writer(f)
                 w.writerow(["title","url","engine","query","snippet"])
-                for r in merged:
+                for r in iter_jsonl(final_path):
                     w.writerow([r.get('title',''), r.get('url',''), r.get('engine',''), r.get('query',''), r.get('snippet','')])
         except Exception as e:
             print("Failed writing CSV", e)
 
-    # Prepare TXT summary output
     txt_out = args.txt_out.strip()
     if not txt_out:
         os.makedirs('output', exist_ok=True)
         txt_out = os.path.join('output', 'web_jobs_ultimate.txt')
-    lines = []
-    for r in merged:
-        lines.append(f"{r.get('title','').strip()} | {r.get('url','')} | {r.get('engine','')} | {r.get('query','')}")
+    count = 0
     try:
         with open(txt_out, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+            for r in iter_jsonl(final_path):
+                f.write(("\n" if count else "") + f"{r.get('title','').strip()} | {r.get('url','')} | {r.get('engine','')} | {r.get('query','')}")
+                count += 1
     except Exception as e:
         print("Failed writing TXT summary", e)
-        # Continue; JSON already written
 
-    msg = f"Wrote {len(merged)} records to {args.out} and summary {txt_out}"
+    msg = f"Streamed {count} records to {final_path} and summary {txt_out}"
     if csv_out:
         msg += f"; CSV {csv_out}"
     print(msg)
 
-    # Email extraction from found job postings
+    return final_path, list(islice(iter_jsonl(final_path), max(1, args.email_top)))
+
+def extract_and_export_emails(args, records: Iterable[dict], label: str, journal: Optional[SweepJournal] = None,
+                              company_emails: Optional[dict] = None) -> dict:
+    """
+    Extract contact emails from job records (list or stream) and export them to CSV.
+    company_emails: per-domain results already extracted by queue workers
+    """
     extracted_emails = {}
-    if args.extract_emails and merged:
-        print(f"\n[EMAIL EXTRACTION] Extracting emails from {len(merged)} job postings...")
+    if args.extract_emails:
+        print(f"\n[EMAIL EXTRACTION] Extracting emails from {label}...")
         
         try:
-            company_emails = extract_from_job_results(merged, verbose=args.verbose)
+            with METRICS.stage("extract_emails"):
+                if company_emails is None and journal is not None:
+                    company_emails = extract_from_job_results(
+                        records, verbose=args.verbose, done=journal.stage_items("emails"),
+                        on_domain=lambda domain, info: journal.put_stage_item("emails", domain, info))
+                elif company_emails is None:
+                    company_emails = extract_from_job_results(records, verbose=args.verbose)
             extracted_emails = filter_and_dedupe_emails(company_emails)
             
             if args.verbose:
@@ -274,6 +262,148 @@ def main():
                 import traceback
                 traceback.print_exc()
     
+    return extracted_emails
+
+def run_distributed(args, keywords: List[str], units: List[Tuple[str, str]], selected, store: Optional[JobStore]) -> Tuple[List[dict], dict]:
+    """
+    --workers: put every (engine, keyword, location) unit on the work queue,
+    let worker processes search/enrich/extract, and merge finished units into
+    the job store as they arrive. Returns (deduped records, per-domain emails).
+    """
+    params = {
+        "keywords": keywords, "max_per_query": args.max_per_query,
+        "relevance_threshold": args.relevance_threshold, "resolve_redirects": args.resolve_redirects,
+        "enrich": not args.no_enrich, "extract_emails": args.extract_emails, "throttle": args.throttle,
+    }
+    queue = WorkQueue(args.queue_dir)
+    run_id = queue.latest_run(params) if args.resume else None
+    if run_id:
+        print(f"[queue] Resuming run {run_id}")
+    else:
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+    added = queue.enqueue(run_id, [(e.name, kw, loc) for kw, loc in units for e in selected], params)
+    print(f"[queue] Run {run_id}: {added} unit(s) queued in {queue.path}; starting {args.workers} worker(s)")
+
+    workers = start_workers(args.workers, args.queue_dir, verbose=args.verbose)
+
+    def merge(records, emails):
+        if store is not None and records:
+            store.upsert_many(records)
+
+    counts = coordinate(queue, run_id, merge, workers, verbose=args.verbose)
+    for p in workers:
+        p.join(timeout=10)
+    print(f"[queue] {counts['done']} unit(s) done, {counts['failed']} failed")
+
+    records: List[dict] = []
+    company_emails: dict = {}
+    for recs, emails in queue.all_results(run_id):
+        records = dedupe(records, recs)
+        for domain, info in emails.items():
+            company_emails.setdefault(domain, info)
+    queue.close()
+    if store is not None:
+        print(f"Job store {args.store}: {store.count()} total")
+    return records, company_emails
+
+def open_journal(args, keywords: List[str], locations: List[str], engines: List[str]) -> SweepJournal:
+    """
+    Every finished (engine, keyword, location) unit is checkpointed; --resume
+    picks up the last unfinished run started with the same arguments
+    """
+    journal = SweepJournal.open("cli", {
+        "keywords": keywords, "locations": locations, "engines": engines,
+        "max_per_query": args.max_per_query, "relevance_threshold": args.relevance_threshold,
+        "out": args.out, "stream_out": args.stream_out,
+    }, resume=args.resume)
+    if journal.resumed:
+        print(f"Resuming run {journal.run_id}: {journal.units_done} searches already done")
+    elif args.resume:
+        print("No unfinished run with these arguments; starting a new one")
+    return journal
+
+def run_pipelined(args, keywords: List[str], units: List[Tuple[str, str]], selected, store: Optional[JobStore],
+                  journal: SweepJournal) -> Tuple[Sequence[dict], dict]:
+    """
+    --pipeline: search, normalize/dedupe, enrich, email extraction and the
+    outbox (job store, lead emails) run as concurrent stages with bounded
+    queues. Finished searches and enriched records are journaled like a
+    batch run, so --resume skips the searches already done.
+    Returns (records, per-domain emails).
+    """
+    def search(unit):
+        engine, kw, loc = unit
+        if args.verbose:
+            print(f"Engine {engine.name} querying: {engine.build_query(kw, loc)}")
+        try:
+            with observe() as call:
+                results = engine.search(kw, loc, max_results=args.max_per_query, verbose=args.verbose)
+        except Exception as e:
+            print(f"Engine {engine.name} failed: {e}")
+            return []
+        # Engines swallow blocks and return []: only a real answer counts as "empty"
+        if results or call.outcome == OK:
+            history.record(unit_query(kw, loc), len(results), engine.name)
+        journal.record_unit(engine.name, kw, loc, [normalize_record(r, args.resolve_redirects)
+                                                   for r in filter_relevant(results, keywords, args.relevance_threshold)])
+        return results
+
+    history = get_history()
+    pending: List[dict] = []
+
+    # Results of searches finished before the interruption, enriched where the pipeline got that far
+    restored: List[dict] = []
+    if journal.resumed:
+        enriched = journal.stage_items("enrich")
+        restored = [enriched.get(r.get("url"), r) for r in journal.unit_results()]
+        if store is not None and restored:
+            store.upsert_many([r for r in restored if not store.contains(r.get("url"))])
+
+    def on_record(record):
+        if not args.no_enrich and record.get("url"):
+            journal.put_stage_item("enrich", record["url"], record)
+        pending.append(record)
+        if store is not None and len(pending) >= 50:
+            store.upsert_many(pending)
+            pending.clear()
+
+    sender = EmailSender(verbose=args.verbose) if args.send_emails else None
+    sent = [0]
+
+    def on_lead(lead):
+        # Leads are mailed as they are found, within the daily limit
+        if sender is not None and sender.send_lead(lead, subject="Potential Job Opportunity"):
+            sent[0] += 1
+
+    jp = JobPipeline(
+        search, keywords, relevance_threshold=args.relevance_threshold, resolve_redirects=args.resolve_redirects,
+        enrich=not args.no_enrich, extract_emails=args.extract_emails, collapse_near_dupes=not args.keep_near_dupes,
+        on_record=on_record, on_lead=on_lead, search_workers=args.stage_workers, enrich_workers=args.stage_workers,
+        extract_workers=args.stage_workers, email_timeout=args.email_timeout, verbose=args.verbose,
+    )
+    todo = ((engine, kw, loc) for kw, loc in units for engine in selected if not journal.unit_done(engine.name, kw, loc))
+    for record in jp.run(todo):
+        if args.verbose:
+            print(f"[pipeline] {record.get('title', '').strip()} | {record.get('url', '')}")
+    history.save()
+    if store is not None and pending:
+        store.upsert_many(pending)
+    print(f"[pipeline] {len(jp.records)} records; {jp.summary()}")
+    if sender is not None:
+        print(f"[EMAIL SENDING] Sent {sent[0]} lead emails during the run")
+    return (dedupe(restored, jp.records) if restored else jp.records), jp.company_emails
+
+def report_metrics(args):
+    """Write the JSON performance report and print the human summary"""
+    try:
+        path = METRICS.write_report(args.metrics_out or DEFAULT_REPORT_PATH)
+        print("\n" + METRICS.summary())
+        print(f"Performance report: {path}")
+    except Exception as e:
+        print("Failed writing performance report", e)
+
+def send_results(args, merged: Sequence[dict], extracted_emails: dict):
+    """Email extracted contacts (--send-emails) and the top results (--email-to)"""
     # Email sending to extracted contacts
     if args.send_emails and extracted_emails:
         print(f"\n[EMAIL SENDING] Preparing to send emails to {len(extracted_emails)} contacts...")
@@ -326,5 +456,281 @@ def main():
             except Exception as e:
                 print("Email send failed:", e)
 
+def main():
+    ap = argparse.ArgumentParser(description="JOB SCRAPER ULTIMATE - broad search engine job discovery")
+    ap.add_argument("--keywords", default="", help="Comma-separated keyword phrases (required unless --search)")
+    ap.add_argument("--locations", default="", help="Comma-separated location phrases")
+    ap.add_argument("--engines", default="duckduckgo", help="Comma-separated engine list (" + ",".join(ENGINES) + ")")
+    ap.add_argument("--max-per-query", type=int, default=20, help="Max results per query per engine")
+    ap.add_argument("--out", default="web_jobs_ultimate.json", help="Output JSON path")
+    ap.add_argument("--txt-out", default="", help="Optional TXT summary path (defaults to output/web_jobs_ultimate.txt)")
+    ap.add_argument("--append", action="store_true", help="Add this run to the job store and export its jobs from the store (with first/last seen)")
+    ap.add_argument("--csv-out", default="", help="Optional CSV export path")
+    ap.add_argument("--verbose", action="store_true")
+    ap.add_argument("--throttle", type=float, default=1.2, help="Seconds sleep between queries per engine")
+    ap.add_argument("--relevance-threshold", type=float, default=1.0, help="Score threshold for relevance filter")
+    ap.add_argument("--no-auto-serpapi", action="store_true", help="Disable automatic SerpAPI fallback when zero results")
+    ap.add_argument("--plan", action="store_true", help="Let the planner pick and order engines per query from past yield/latency/cost")
+    ap.add_argument("--time-budget", type=float, default=None, help="With --plan: stop issuing searches after this many seconds")
+    ap.add_argument("--credit-budget", type=float, default=None, help="With --plan: max USD to spend on paid engines this run")
+    ap.add_argument("--skip-empty-queries", action="store_true",
+                    help="Skip engine/query pairs that returned nothing recently (by default they just run last)")
+    ap.add_argument("--email-to", default="", help="Comma-separated recipients (uses SENDGRID_API_KEY)")
+    ap.add_argument("--email-top", type=int, default=10, help="Top N results to email")
+    ap.add_argument("--email-subject", default="Job Scraper Ultimate Results", help="Email subject line")
+    ap.add_argument("--extract-emails", action="store_true", help="Extract contact emails from found job postings")
+    ap.add_argument("--emails-csv", default="", help="Output path for extracted emails CSV (defaults to output/found_emails.csv)")
+    ap.add_argument("--send-emails", action="store_true", help="Send emails to extracted contacts (respects 50/day limit)")
+    ap.add_argument("--email-timeout", type=int, default=10, help="Timeout in seconds for email extraction from websites")
+    ap.add_argument("--enrich", action="store_true", help="Enrich results with emails and company info (enabled by default)")
+    ap.add_argument("--no-enrich", action="store_true", help="Disable enrichment pipeline")
+    ap.add_argument("--resolve-redirects", action="store_true", help="Follow tracking redirects (Indeed /pagead/clk, lnkd.in, ...) to canonicalize result URLs")
+    ap.add_argument("--keep-near-dupes", action="store_true", help="Keep syndicated copies of the same posting instead of collapsing them")
+    ap.add_argument("--store", default=DEFAULT_DB_PATH, help=f"SQLite job store path (default: {DEFAULT_DB_PATH})")
+    ap.add_argument("--no-store", action="store_true", help="Don't record results in the job store")
+    ap.add_argument("--export-history", action="store_true", help="Export every job in the store to the outputs, not just this run's")
+    ap.add_argument("--search", default="", help="Full-text search the job store (title/snippet/company) and exit")
+    ap.add_argument("--search-limit", type=int, default=50, help="Max results for --search")
+    ap.add_argument("--stream-out", choices=["jsonl"], default=None,
+                    help="Append each relevant, deduped record to <out>.jsonl as it is found (constant memory; resumable)")
+    ap.add_argument("--pipeline", action="store_true",
+                    help="Overlap search, dedupe, enrichment, email extraction and sending as concurrent stages")
+    ap.add_argument("--stage-workers", type=int, default=4,
+                    help="With --pipeline: threads for each of the search, enrich and extract stages")
+    ap.add_argument("--workers", type=int, default=0,
+                    help="Run the sweep on N worker processes through the work queue (search, enrich and extract in parallel)")
+    ap.add_argument("--queue-dir", default=DEFAULT_QUEUE_DIR,
+                    help=f"Work queue directory; share it to add workers on other machines (default: {DEFAULT_QUEUE_DIR})")
+    ap.add_argument("--worker", action="store_true",
+                    help="Only act as a queue worker for --queue-dir (e.g. on another machine) and exit when idle")
+    ap.add_argument("--worker-idle-exit", type=float, default=60.0,
+                    help="With --worker: exit after this many idle seconds (0 = never)")
+    ap.add_argument("--metrics-out", default=DEFAULT_REPORT_PATH,
+                    help=f"JSON performance report written at the end of the run (default: {DEFAULT_REPORT_PATH})")
+    ap.add_argument("--metrics-port", type=int, default=0,
+                    help="Serve Prometheus metrics on http://127.0.0.1:PORT/metrics while running (0 = off)")
+    ap.add_argument("--resume", action="store_true",
+                    help="Continue the last unfinished run with the same arguments, skipping searches, enrichment and extraction already done")
+    args = ap.parse_args()
+
+    METRICS.reset()
+    if args.metrics_port:
+        serve_prometheus(args.metrics_port)
+        print(f"Serving metrics on http://127.0.0.1:{args.metrics_port}/metrics")
+
+    if args.search:
+        with JobStore(args.store) as store:
+            hits = store.search(args.search, limit=args.search_limit)
+        for r in hits:
+            print(f"{r.get('title', '').strip()} | {r.get('url', '')} | first seen {r.get('first_seen', '')[:10]} | last seen {r.get('last_seen', '')[:10]}")
+        print(f"{len(hits)} match(es) in {args.store}")
+        return
+
+    if args.worker:
+        n = run_worker(args.queue_dir, idle_exit=args.worker_idle_exit, verbose=args.verbose)
+        print(f"Worker processed {n} unit(s) from {args.queue_dir}")
+        return
+
+    if not args.keywords.strip():
+        ap.error("--keywords is required")
+
+    keywords = [k.strip() for k in args.keywords.split(',') if k.strip()]
+    locations = [l.strip() for l in args.locations.split(',') if l.strip()]
+    engines = [e.strip() for e in args.engines.split(',') if e.strip()]
+
+    queries = expand_queries(keywords, locations)
+    if args.verbose:
+        print(f"Expanded {len(keywords)} keywords + {len(locations)} locations -> {len(queries)} queries")
+
+    store = None if args.no_store else JobStore(args.store, verbose=args.verbose)
+    run_started = datetime.now().isoformat()
+
+    existing = []
+    if args.append and store is not None:
+        # History lives in the store; only a legacy JSON output is imported (once)
+        if store.count() == 0 and os.path.exists(args.out):
+            try:
+                with open(args.out, 'r', encoding='utf-8') as f:
+                    new, _ = store.upsert_many(json.load(f))
+                print(f"Imported {new} records from {args.out} into {args.store}")
+            except Exception as e:
+                print("Failed importing existing output", e)
+    elif args.append and os.path.exists(args.out):
+        try:
+            with open(args.out, 'r', encoding='utf-8') as f:
+                existing = json.load(f)
+            if args.verbose:
+                print(f"Loaded {len(existing)} existing records from {args.out}")
+        except Exception as e:
+            print("Failed loading existing output", e)
+            existing = []
+
+    all_new = JobColumns()  # column store: one list per field instead of a dict per job
+
+    # Every engine receives the same keyword x location units; the registry
+    # knows whether an engine wants a combined query string or kw+loc.
+    set_min_interval(args.throttle)
+    history = get_history()
+    selected = []
+    for eng in engines:
+        engine = resolve_engine(eng)
+        if not engine:
+            if args.verbose:
+                print(f"Unknown engine {eng}; skipping")
+            continue
+        if not engine.is_available():
+            if args.verbose:
+                print(f"{eng} requires {' or '.join(engine.requires_env)}; skipping")
+            continue
+        if args.verbose and engine.name != eng:
+            print(f"{eng}: using preferred engine {engine.name}")
+        selected.append(engine)
+    # Units every selected engine found empty recently run last (or not at all)
+    units = plan_units(keywords, locations, history, [e.name for e in selected], skip_cold=args.skip_empty_queries)
+    if args.verbose and len(units) < len(queries):
+        print(f"Skipping {len(queries) - len(units)} queries that came back empty recently")
+
+    if args.workers > 0:
+        if args.verbose and (args.stream_out or args.plan or args.time_budget is not None or args.credit_budget is not None):
+            print("--stream-out and planner options don't apply to --workers runs; ignoring")
+        with METRICS.stage("sweep"):
+            merged, company_emails = run_distributed(args, keywords, units, selected, store)
+        merged = finish_batch(args, dedupe(existing, merged), store, from_workers=True, since=run_started)
+        extracted_emails = extract_and_export_emails(args, merged, f"{len(merged)} job postings",
+                                                     company_emails=company_emails) if merged else {}
+        with METRICS.stage("send"):
+            send_results(args, merged, extracted_emails)
+        report_metrics(args)
+        return
+
+    if args.pipeline:
+        if args.verbose and (args.stream_out or args.plan or args.time_budget is not None or args.credit_budget is not None):
+            print("--stream-out and planner options don't apply to --pipeline runs; ignoring")
+        journal = open_journal(args, keywords, locations, engines)
+        with METRICS.stage("sweep"):
+            merged, company_emails = run_pipelined(args, keywords, units, selected, store, journal)
+        merged = finish_batch(args, dedupe(existing, merged), store, from_workers=True, since=run_started)
+        extracted_emails = extract_and_export_emails(args, merged, f"{len(merged)} job postings",
+                                                     company_emails=company_emails) if merged else {}
+        journal.finish()
+        # Lead emails already went out from the outbox stage
+        with METRICS.stage("send"):
+            send_results(args, merged, {})
+        report_metrics(args)
+        return
+
+    planner = None
+    if args.plan or args.time_budget is not None or args.credit_budget is not None:
+        planner = EnginePlanner(time_budget=args.time_budget, credit_budget=args.credit_budget, verbose=args.verbose)
+    seen_urls = {canonical_key(r.get("url")) for r in existing}
+
+    journal = open_journal(args, keywords, locations, engines)
+    if journal.resumed and args.stream_out != "jsonl":
+        # Streamed results are already in the JSONL file; batch results come back from the journal
+        all_new.extend(journal.unit_results())
+        seen_urls.update(canonical_key(r.get("url")) for r in all_new)
+
+    sink = None
+    if args.stream_out == "jsonl":
+        # The stream and its dedupe index hold this run only; a resumed run continues them
+        sink = JsonlSink(os.path.splitext(args.out)[0] + ".jsonl", resume=journal.resumed, verbose=args.verbose)
+        if args.verbose:
+            print(f"[stream] Writing records to {sink.path} as they arrive")
+
+    def run_search(engine, kw, loc):
+        t0 = time.monotonic()
+        failed = False
+        try:
+            with observe() as call:
+                results = engine.search(kw, loc, max_results=args.max_per_query, verbose=args.verbose)
+        except Exception as e:
+            print(f"Engine {engine.name} failed: {e}")
+            results = []
+            failed = True
+        filtered = [normalize_record(r, args.resolve_redirects) for r in filter_relevant(results, keywords, args.relevance_threshold)]
+        new_unique = 0
+        for r in filtered:
+            if sink is not None:
+                fresh = sink.write(r)
+            else:
+                key = canonical_key(r.get("url"))
+                fresh = bool(key) and key not in seen_urls
+                if fresh:
+                    seen_urls.add(key)
+            if fresh and not (args.append and store is not None and store.contains(r.get("url"))):
+                new_unique += 1
+        if planner:
+            planner.record(engine, kw, new_unique, time.monotonic() - t0, failed)
+        # Engines swallow blocks and return []: only a real answer counts as "empty"
+        if not failed and (results or call.outcome == OK):
+            history.record(unit_query(kw, loc), len(results), engine.name)
+        if args.verbose:
+            print(f"Engine {engine.name} raw {len(results)} -> relevant {len(filtered)} ({new_unique} new)")
+        # Streamed records are already on disk; nothing is kept in memory
+        kept = [] if sink is not None else filtered
+        if not failed:
+            journal.record_unit(engine.name, kw, loc, kept)
+        return kept
+
+    for u_idx, (kw, loc) in enumerate(units, 1):
+        engines_for_unit = [e for e in selected if not journal.unit_done(e.name, kw, loc)]
+        if args.skip_empty_queries:
+            engines_for_unit = [e for e in engines_for_unit if not history.is_cold(unit_query(kw, loc), e.name)]
+        for engine in (planner.plan(engines_for_unit, kw) if planner else engines_for_unit):
+            if args.verbose:
+                print(f"[{u_idx}/{len(units)}] Engine {engine.name} querying: {engine.build_query(kw, loc)}")
+            with METRICS.stage("search"):
+                all_new.extend(run_search(engine, kw, loc))
+
+    merged = dedupe(existing, all_new)
+    if args.verbose:
+        if sink is not None:
+            print(f"Streamed {sink.written} new records to {sink.path}")
+        else:
+            print(f"Total new relevant {len(all_new)}; merged unique {len(merged)}")
+
+    # Auto SerpAPI fallback if nothing found and key present
+    if not merged and not (sink is not None and len(sink.index)) and not args.no_auto_serpapi:
+        serpapi = get_engine("serpapi")
+        if serpapi and serpapi.is_available():
+            if "serpapi" not in engines:
+                if args.verbose:
+                    print("No results; auto SerpAPI fallback engaged.")
+                for u_idx, (kw, loc) in enumerate(units, 1):
+                    if journal.unit_done(serpapi.name, kw, loc):
+                        continue
+                    if planner and not planner.plan([serpapi], kw):
+                        continue
+                    if args.verbose:
+                        print(f"[fallback {u_idx}/{len(units)}] serpapi querying: {serpapi.build_query(kw, loc)}")
+                    with METRICS.stage("search"):
+                        merged = dedupe(merged, run_search(serpapi, kw, loc))
+            else:
+                if args.verbose:
+                    print("SerpAPI already in engine list; no extra fallback.")
+        else:
+            if args.verbose:
+                print("SerpAPI key missing; fallback skipped.")
+
+    history.save()
+    if planner:
+        planner.save()
+        if args.verbose:
+            print(f"[planner] {planner.summary()}")
+    if args.verbose:
+        print(f"[coalescing] {format_flight_stats()}")
+
+    if sink is not None:
+        sink.close()
+        final_path, merged = finish_stream(args, sink.path, store, resume=journal.resumed)
+        extracted_emails = extract_and_export_emails(args, iter_jsonl(final_path), f"stream {final_path}", journal)
+    else:
+        merged = finish_batch(args, merged, store, journal, since=run_started)
+        extracted_emails = extract_and_export_emails(args, merged, f"{len(merged)} job postings", journal) if merged else {}
+    journal.finish()
+    with METRICS.stage("send"):
+        send_results(args, merged, extracted_emails)
+    report_metrics(args)
+
 if __name__ == "__main__":
     main()
@@ -1,43 +1,123 @@
 """
 DuckDuckGo Proxy Client - Use the background proxy server for searches
+Single queries go to /search; many queries go to /search/batch in one
+request and are read back line by line as the server finishes them. Both
+reuse one keep-alive session to the local server.
 """
 
+import json
+import threading
 import requests
-from typing import List, Dict
+from typing import Dict, Iterator, List, Optional, Sequence
 
 PROXY_SERVER_URL = "http://localhost:8765"
 
+# Matches the server's per-request cap
+MAX_BATCH = 100
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """The shared session for talking to the proxy server"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            # The server is local: never send these through HTTP(S)_PROXY
+            _session.trust_env = False
+        return _session
+
+
 def search_via_proxy(query: str, max_results: int = 10, timeout: int = 30) -> List[Dict[str, str]]:
     """
     Search DuckDuckGo via local proxy server
-    
+
     Args:
         query: Search query
         max_results: Maximum results to return
         timeout: Request timeout in seconds
-        
+
     Returns:
         List of dicts with 'title' and 'url' keys
-        
+
     Raises:
         requests.RequestException: If proxy server is unavailable
     """
     try:
-        response = requests.get(
+        response = get_session().get(
             f"{PROXY_SERVER_URL}/search",
             params={"q": query, "max_results": max_results},
             timeout=timeout
         )
+        if response.status_code >= 500:
+            # The server reports upstream blocks (captcha, rate limit) in the body
+            try:
+                detail = response.json().get("error")
+            except ValueError:
+                detail = None
+            if detail:
+                raise Exception(f"Proxy server error: {detail}")
         response.raise_for_status()
         data = response.json()
         return data.get("results", [])
     except requests.RequestException as e:
         raise Exception(f"Proxy server error: {e}")
 
+
+def iter_batch_via_proxy(queries: Sequence[str], max_results: int = 10, timeout: int = 60,
+                         session: Optional[requests.Session] = None) -> Iterator[Dict]:
+    """
+    Stream results for many queries, in the order the server completes them.
+
+    Yields the server's NDJSON lines: {"index", "query", "count", "cached",
+    "results"} or {"index", "query", "error"}. Batches above MAX_BATCH are
+    sent as consecutive requests over the same session.
+    """
+    session = session or get_session()
+    queries = list(queries)
+    for start in range(0, len(queries), MAX_BATCH):
+        chunk = queries[start:start + MAX_BATCH]
+        try:
+            with session.post(f"{PROXY_SERVER_URL}/search/batch",
+                              json={"queries": chunk, "max_results": max_results},
+                              timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    item = json.loads(line)
+                    item["index"] = item.get("index", 0) + start
+                    yield item
+        except requests.RequestException as e:
+            raise Exception(f"Proxy server error: {e}")
+
+
+def search_batch_via_proxy(queries: Sequence[str], max_results: int = 10, timeout: int = 60,
+                           verbose: bool = False) -> Dict[str, List[Dict[str, str]]]:
+    """
+    Search many queries via the proxy server in one streamed request per
+    MAX_BATCH queries.
+
+    Returns:
+        {query: results}; queries that failed upstream map to []
+
+    Raises:
+        Exception: If the proxy server is unavailable
+    """
+    out: Dict[str, List[Dict[str, str]]] = {}
+    for item in iter_batch_via_proxy(queries, max_results=max_results, timeout=timeout):
+        if "error" in item and verbose:
+            print(f"[ddg_proxy] '{item['query']}' failed: {item['error']}")
+        out[item["query"]] = item.get("results", [])
+    return out
+
+
 def is_proxy_available() -> bool:
     """Check if the proxy server is available"""
     try:
-        response = requests.get(f"{PROXY_SERVER_URL}/health", timeout=2)
+        response = get_session().get(f"{PROXY_SERVER_URL}/health", timeout=2)
         return response.status_code == 200
     except:
         return False
@@ -51,5 +131,8 @@ if __name__ == "__main__":
         for i, result in enumerate(results, 1):
             print(f"{i}. {result['title']}")
             print(f"   {result['url']}\n")
+        batch = search_batch_via_proxy(["Python developer remote", "data engineer remote"], max_results=5)
+        for query, found in batch.items():
+            print(f"{query}: {len(found)} results")
     else:
         print("✗ Proxy server is not available")
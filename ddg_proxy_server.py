@@ -1,14 +1,41 @@
 """
-DuckDuckGo Proxy Server - Background HTTP proxy for DDG searches
-Runs as a subprocess, provides local endpoint at http://localhost:8765/search
+DuckDuckGo Proxy Server - Background HTTP service for DDG searches
+Runs as a subprocess, provides local endpoints at http://localhost:8765.
+Requests are served by a threaded server; upstream fetches run on a bounded
+worker pool whose threads each keep one pooled keep-alive session. Identical
+queries are answered from a TTL cache (and share one fetch while in flight),
+and /search/batch streams NDJSON lines as each query completes.
+
+    GET  /search?q=...&max_results=10
+    POST /search/batch   {"queries": [...], "max_results": 10}  -> NDJSON
+    GET  /metrics        Prometheus text
+    GET  /health
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import urllib.parse
+import threading
+import itertools
+import argparse
 import logging
+import json
+import time
 import sys
+import os
+
+from perf_metrics import METRICS, timed_request
+from single_flight import SingleFlight
+from block_detector import OK, classify_response
+
+try:
+    from waitress import serve as waitress_serve
+    HAS_WAITRESS = True
+except ImportError:
+    HAS_WAITRESS = False
 
 app = Flask(__name__)
 
@@ -16,20 +43,84 @@ app = Flask(__name__)
 log = logging.getLogger('werkzeug')
 log.setLevel(logging.ERROR)
 
+DEFAULT_PORT = 8765
+DEFAULT_WORKERS = 8          # concurrent upstream fetches
+DEFAULT_CACHE_TTL = 600.0    # seconds a query's results are reused
+CACHE_ENTRIES = 2048
+MAX_BATCH = 100              # queries per /search/batch request
+MAX_RESULTS_CAP = 50
+
 USER_AGENTS = [
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
 ]
 
-current_ua_index = 0
+_ua_cycle = itertools.cycle(USER_AGENTS)
+_ua_lock = threading.Lock()
+
+# Worker pool, per-thread sessions and the result cache (configured by configure())
+_executor = ThreadPoolExecutor(max_workers=DEFAULT_WORKERS, thread_name_prefix="ddg-fetch")
+_workers = DEFAULT_WORKERS
+_local = threading.local()
+CACHE = SingleFlight("ddg_proxy", ttl=DEFAULT_CACHE_TTL, max_entries=CACHE_ENTRIES)
+
+
+def configure(workers: int = DEFAULT_WORKERS, cache_ttl: float = DEFAULT_CACHE_TTL):
+    """Resize the upstream worker pool and set the cache TTL (call before serving)"""
+    global _executor, _workers, CACHE
+    _executor.shutdown(wait=False)
+    _workers = max(1, workers)
+    _executor = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix="ddg-fetch")
+    CACHE = SingleFlight("ddg_proxy", ttl=cache_ttl, max_entries=CACHE_ENTRIES)
+
 
 def get_user_agent():
     """Rotate user agents"""
-    global current_ua_index
-    ua = USER_AGENTS[current_ua_index]
-    current_ua_index = (current_ua_index + 1) % len(USER_AGENTS)
-    return ua
+    with _ua_lock:
+        return next(_ua_cycle)
+
+
+def _session() -> requests.Session:
+    """This worker thread's keep-alive session"""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _local.session = session
+    return session
+
+
+def _max_results(value, default: int = 10) -> int:
+    try:
+        return max(1, min(MAX_RESULTS_CAP, int(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+def cached_search(query: str, max_results: int = 10):
+    """
+    (results, cached) for a query. Runs on the worker pool; identical
+    queries in flight or within the TTL share one upstream fetch.
+    """
+    ran = []
+
+    def fetch():
+        ran.append(True)
+        return duckduckgo_search(query, max_results)
+
+    key = (" ".join(query.lower().split()), max_results)
+    results = CACHE.do(key, fetch)
+    METRICS.cache("ddg_proxy", not ran)
+    return results, not ran
+
+
+def _observe(endpoint: str, status: int, t0: float):
+    METRICS.inc("ddg_proxy_requests_total", endpoint=endpoint, status=str(status))
+    METRICS.observe("ddg_proxy_request_seconds", time.perf_counter() - t0, endpoint=endpoint)
+
 
 @app.route('/search', methods=['GET'])
 def search():
@@ -39,35 +130,101 @@ def search():
         q: search query
         max_results: maximum results (default 10)
     """
+    t0 = time.perf_counter()
     query = request.args.get('q', '')
-    max_results = int(request.args.get('max_results', 10))
-    
+    max_results = _max_results(request.args.get('max_results', 10))
+
     if not query:
+        _observe("search", 400, t0)
         return jsonify({"error": "Missing query parameter 'q'"}), 400
-    
+
     try:
-        results = duckduckgo_search(query, max_results)
+        results, cached = _executor.submit(cached_search, query, max_results).result()
+        _observe("search", 200, t0)
         return jsonify({
             "query": query,
             "count": len(results),
+            "cached": cached,
             "results": results
         })
     except Exception as e:
+        _observe("search", 500, t0)
         return jsonify({"error": str(e)}), 500
 
+
+@app.route('/search/batch', methods=['POST'])
+def search_batch():
+    """
+    Many queries in one request. Body: {"queries": [...], "max_results": 10}.
+    Streams one JSON line per query, in completion order:
+        {"index": i, "query": q, "count": n, "cached": bool, "results": [...]}
+        {"index": i, "query": q, "error": "..."}
+    """
+    t0 = time.perf_counter()
+    body = request.get_json(silent=True) or {}
+    queries = [q for q in body.get("queries") or [] if isinstance(q, str) and q.strip()]
+    max_results = _max_results(body.get("max_results", 10))
+
+    if not queries:
+        _observe("batch", 400, t0)
+        return jsonify({"error": "Body must be JSON with a non-empty 'queries' list"}), 400
+    if len(queries) > MAX_BATCH:
+        _observe("batch", 400, t0)
+        return jsonify({"error": f"At most {MAX_BATCH} queries per batch"}), 400
+
+    futures = {_executor.submit(cached_search, q, max_results): (i, q) for i, q in enumerate(queries)}
+    METRICS.inc("ddg_proxy_batch_queries_total", len(queries))
+
+    def lines():
+        try:
+            for future in as_completed(futures):
+                index, query = futures[future]
+                try:
+                    results, cached = future.result()
+                    line = {"index": index, "query": query, "count": len(results),
+                            "cached": cached, "results": results}
+                except Exception as e:
+                    line = {"index": index, "query": query, "error": str(e)}
+                yield json.dumps(line) + "\n"
+        finally:
+            # Client went away: drop the queries that haven't started
+            for future in futures:
+                future.cancel()
+            _observe("batch", 200, t0)
+
+    return Response(stream_with_context(lines()), mimetype="application/x-ndjson")
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus text: request/upstream counters and latencies, cache hit/miss"""
+    stats = CACHE.stats()
+    extra = [
+        "# TYPE jobgoblin_ddg_proxy_upstream_fetches_total counter",
+        f"jobgoblin_ddg_proxy_upstream_fetches_total {stats['executed']}",
+        "# TYPE jobgoblin_ddg_proxy_coalesced_total counter",
+        f"jobgoblin_ddg_proxy_coalesced_total {stats['coalesced']}",
+        "# TYPE jobgoblin_ddg_proxy_workers gauge",
+        f"jobgoblin_ddg_proxy_workers {_workers}",
+    ]
+    body = METRICS.prometheus_text() + "\n".join(extra) + "\n"
+    return Response(body, mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    return jsonify({"status": "ok", "service": "ddg-proxy"})
+    return jsonify({"status": "ok", "service": "ddg-proxy", "workers": _workers, "cache_ttl": CACHE.ttl})
+
 
 def duckduckgo_search(query: str, max_results: int = 10):
     """
     Perform DuckDuckGo HTML search
-    
+
     Args:
         query: Search query string
         max_results: Maximum number of results
-        
+
     Returns:
         List of dicts with 'title' and 'url'
     """
@@ -81,25 +238,30 @@ def duckduckgo_search(query: str, max_results: int = 10):
         "Connection": "keep-alive",
         "Upgrade-Insecure-Requests": "1"
     }
-    
+
     params = {"q": query}
-    
-    resp = requests.get(url, params=params, headers=headers, timeout=15)
+
+    resp = timed_request(_session().get, url, "ddg_proxy", params=params, headers=headers, timeout=15)
+    # A challenge page must fail the query (and stay out of the cache), not read as "no results"
+    outcome = classify_response("duckduckgo", resp)
+    if outcome != OK:
+        METRICS.inc("ddg_proxy_blocked_total", outcome=outcome)
+        raise RuntimeError(f"DuckDuckGo {outcome} (HTTP {resp.status_code})")
     resp.raise_for_status()
-    
+
     soup = BeautifulSoup(resp.text, "html.parser")
-    
+
     results = []
     for link in soup.find_all("a", href=True):
         if len(results) >= max_results:
             break
-            
+
         href = link.get("href", "")
         title = link.get_text(strip=True)
-        
+
         if not title or len(title) < 3:
             continue
-        
+
         # Parse DuckDuckGo redirect links
         if href.startswith("//duckduckgo.com/l/"):
             try:
@@ -112,13 +274,23 @@ def duckduckgo_search(query: str, max_results: int = 10):
                     })
             except:
                 continue
-    
+
     return results
 
+
 if __name__ == '__main__':
-    import os
-    # Run on localhost:8765, suppress output
+    ap = argparse.ArgumentParser(description="Local DuckDuckGo search service")
+    ap.add_argument("--port", type=int, default=DEFAULT_PORT)
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent upstream fetches")
+    ap.add_argument("--cache-ttl", type=float, default=DEFAULT_CACHE_TTL, help="Seconds to reuse a query's results")
+    args = ap.parse_args()
+    configure(args.workers, args.cache_ttl)
+
+    # Run on localhost, suppress output
     print("DDG_PROXY_READY", flush=True)  # Signal readiness
     sys.stdout = open(os.devnull, 'w')  # Suppress further output
     sys.stderr = open(os.devnull, 'w')
-    app.run(host='127.0.0.1', port=8765, debug=False, use_reloader=False)
+    if HAS_WAITRESS:
+        waitress_serve(app, host='127.0.0.1', port=args.port, threads=args.workers * 2)
+    else:
+        app.run(host='127.0.0.1', port=args.port, debug=False, use_reloader=False, threaded=True)
@@ -2,10 +2,10 @@
 Email extraction module - scrapes websites for contact emails
 """
 import re
-import requests
-from typing import List, Set, Dict, Tuple
+import time
+from typing import Callable, List, Optional, Set, Dict, Tuple
 from urllib.parse import urljoin, urlparse
-from bs4 import BeautifulSoup
+from perf_metrics import METRICS
 
 USER_AGENT = "Mozilla/5.0 (compatible; JobScraperUltimate/1.0)"
 
@@ -111,6 +111,14 @@ def extract_emails_from_url(url: str, timeout: int = 10, verbose: bool = False)
     Uses short timeouts and smart domain variations to find contact emails fast.
     Returns (set of emails, error_message or empty string)
     """
+    t0 = time.perf_counter()
+    emails, error = _extract_emails_from_url(url, timeout, verbose)
+    METRICS.observe("email_extract_seconds", time.perf_counter() - t0)
+    METRICS.inc("email_extract_total", outcome="error" if error else ("found" if emails else "none"))
+    METRICS.inc("emails_found_total", len(emails))
+    return emails, error
+
+def _extract_emails_from_url(url: str, timeout: int, verbose: bool) -> Tuple[Set[str], str]:
     if not url or not (url.startswith('http://') or url.startswith('https://')):
         return set(), "Invalid URL"
     
@@ -208,12 +216,19 @@ def extract_company_emails_from_domain(domain: str, timeout: int = 10, verbose:
     
     return extract_emails_from_url(url, timeout, verbose)
 
-def extract_from_job_results(job_records: List[Dict], verbose: bool = False) -> Dict[str, Set[str]]:
+def extract_from_job_results(job_records: List[Dict], verbose: bool = False,
+                             done: Optional[Dict[str, Dict]] = None,
+                             on_domain: Optional[Callable[[str, Dict], None]] = None) -> Dict[str, Set[str]]:
     """
     Given a list of job result records, extract emails from company URLs.
     Returns dict mapping company domain/name -> set of emails
+    
+    done: domains already extracted by an interrupted run (not fetched again)
+    on_domain: called with (domain, info) after each domain, for checkpointing
     """
     company_emails = {}
+    for domain, info in (done or {}).items():
+        company_emails[domain] = dict(info, emails=set(info.get('emails') or ()))
     
     for record in job_records:
         url = record.get('url', '')
@@ -238,6 +253,8 @@ def extract_from_job_results(job_records: List[Dict], verbose: bool = False) ->
                 'title': record.get('title', ''),
                 'job_url': url
             }
+            if on_domain:
+                on_domain(domain, company_emails[domain])
     
     return company_emails
 
@@ -170,6 +170,20 @@ class EmailSender:
                 print(f"[email_sender] Error sending email to {recipient}: {e}")
             return False
     
+    def send_lead(self, email_data: Dict, subject: str = "Job Lead Information",
+                  message_template: str = None) -> bool:
+        """
+        Send to one lead as soon as it is found (pipeline outbox).
+        Respects the daily limit; returns True if sent.
+        """
+        if not self.backend or self.get_daily_stats()['remaining'] <= 0:
+            return False
+        recipient = email_data['email']
+        body = self._format_message(email_data, message_template)
+        success = self.send_email(recipient, subject, body)
+        self.email_manager.mark_email_sent(recipient, recipient, subject, "success" if success else "failed")
+        return success
+    
     def send_to_list(self, recipient_list: List[str], subject: str = "Job Lead Information",
                     message_template: str = None, dry_run: bool = False) -> Dict[str, int]:
         """
@@ -0,0 +1,221 @@
+"""
+Engine Planner - cost- and yield-aware engine selection
+Records per-engine statistics (new unique URLs per call, latency, failure rate,
+spend) per query family and uses them to decide which engines to call for a
+query, in what order, under an optional time or credit budget.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from engine_registry import SearchEngine
+
+DEFAULT_STATS_FILE = os.path.join("output", "engine_stats.json")
+
+
+def query_family(keyword: str) -> str:
+    """Group queries by their normalized keyword (locations share yield patterns)"""
+    return " ".join((keyword or "").lower().split())
+
+
+class EngineStat:
+    """Running statistics for one engine within one query family"""
+
+    def __init__(self, data: Optional[Dict] = None):
+        data = data or {}
+        self.calls = int(data.get("calls", 0))
+        self.failures = int(data.get("failures", 0))
+        self.yield_ewma = float(data.get("yield_ewma", 0.0))
+        self.latency_ewma = float(data.get("latency_ewma", 0.0))
+        self.spent = float(data.get("spent", 0.0))
+        self.last_call = float(data.get("last_call", 0.0))
+        self.skipped = int(data.get("skipped", 0))
+
+    def to_dict(self) -> Dict:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "yield_ewma": round(self.yield_ewma, 4),
+            "latency_ewma": round(self.latency_ewma, 4),
+            "spent": round(self.spent, 6),
+            "last_call": self.last_call,
+            "skipped": self.skipped,
+        }
+
+    @property
+    def failure_rate(self) -> float:
+        return self.failures / self.calls if self.calls else 0.0
+
+    def update(self, new_unique: int, latency: float, failed: bool, cost: float, alpha: float):
+        if self.calls == 0:
+            self.yield_ewma = float(new_unique)
+            self.latency_ewma = latency
+        else:
+            self.yield_ewma = alpha * new_unique + (1 - alpha) * self.yield_ewma
+            self.latency_ewma = alpha * latency + (1 - alpha) * self.latency_ewma
+        self.calls += 1
+        if failed:
+            self.failures += 1
+        self.spent += cost
+        self.last_call = time.time()
+        self.skipped = 0
+
+
+class EnginePlanner:
+    """Decides which engines to call per query and learns from each call"""
+
+    def __init__(
+        self,
+        stats_file: str = DEFAULT_STATS_FILE,
+        time_budget: Optional[float] = None,
+        credit_budget: Optional[float] = None,
+        min_yield: float = 0.25,
+        min_samples: int = 3,
+        explore_every: int = 10,
+        alpha: float = 0.3,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            stats_file: JSON file holding statistics across runs ("" = in-memory only)
+            time_budget: Stop planning calls once this many seconds have elapsed
+            credit_budget: Maximum spend (USD) on paid engines for this run
+            min_yield: Engines whose recent new-URL yield is below this are skipped...
+            min_samples: ...once they have at least this many calls for the family
+            explore_every: ...but every Nth skip is re-probed to notice recovery
+            alpha: EWMA smoothing factor for yield and latency
+        """
+        self.stats_file = stats_file
+        self.time_budget = time_budget
+        self.credit_budget = credit_budget
+        self.min_yield = min_yield
+        self.min_samples = min_samples
+        self.explore_every = explore_every
+        self.alpha = alpha
+        self.verbose = verbose
+        self.started = time.monotonic()
+        self.run_spent = 0.0
+        self.calls_made = 0
+        self.calls_skipped = 0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, EngineStat]] = {}
+        self.load()
+
+    # ---------------- persistence -----------------
+
+    def load(self):
+        """Load statistics from previous runs"""
+        if not self.stats_file or not os.path.exists(self.stats_file):
+            return
+        try:
+            with open(self.stats_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for engine, families in data.get("engines", {}).items():
+                self.stats[engine] = {fam: EngineStat(s) for fam, s in families.items()}
+        except Exception as e:
+            print(f"[planner] Error loading stats: {e}")
+
+    def save(self):
+        """Persist statistics for future runs"""
+        if not self.stats_file:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.stats_file) or ".", exist_ok=True)
+            with self._lock:
+                data = {
+                    "engines": {
+                        engine: {fam: st.to_dict() for fam, st in families.items()}
+                        for engine, families in self.stats.items()
+                    },
+                    "updated": time.time(),
+                }
+            with open(self.stats_file, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            print(f"[planner] Error saving stats: {e}")
+
+    # ---------------- planning -----------------
+
+    def _stat(self, engine_name: str, family: str) -> EngineStat:
+        return self.stats.setdefault(engine_name, {}).setdefault(family, EngineStat())
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def credits_left(self) -> Optional[float]:
+        if self.credit_budget is None:
+            return None
+        return self.credit_budget - self.run_spent
+
+    def expected_value(self, engine: SearchEngine, keyword: str) -> float:
+        """Expected new unique URLs per second of latency-plus-cost"""
+        st = self._stat(engine.name, query_family(keyword))
+        if st.calls < self.min_samples:
+            # Optimistic prior so unexplored engines get tried
+            expected_yield = max(st.yield_ewma, 10.0)
+        else:
+            expected_yield = st.yield_ewma * (1.0 - st.failure_rate)
+        latency = st.latency_ewma or 1.0
+        # Treat one cent of spend like one second of waiting
+        penalty = latency + engine.min_interval + engine.cost_per_call * 100
+        return expected_yield / max(penalty, 0.01)
+
+    def plan(self, engines: Sequence[SearchEngine], keyword: str) -> List[SearchEngine]:
+        """
+        The engines worth calling for this keyword, best expected value first.
+        Engines with near-zero recent yield and engines that would break the
+        time or credit budget are left out.
+        """
+        family = query_family(keyword)
+        candidates = []
+        with self._lock:
+            for engine in engines:
+                if self.time_budget is not None and self.elapsed() >= self.time_budget:
+                    self._skip(engine, family, "time budget exhausted")
+                    continue
+                st = self._stat(engine.name, family)
+                if st.calls >= self.min_samples and st.yield_ewma < self.min_yield:
+                    st.skipped += 1
+                    if st.skipped < self.explore_every:
+                        self._skip(engine, family, f"low yield ({st.yield_ewma:.2f} new/call)")
+                        continue
+                    if self.verbose:
+                        print(f"[planner] re-probing {engine.name} for '{family}'")
+                candidates.append(engine)
+            candidates.sort(key=lambda e: self.expected_value(e, keyword), reverse=True)
+            # Credits are held back for engines already planned for this unit, best first
+            left = self.credits_left()
+            planned = []
+            for engine in candidates:
+                if left is not None:
+                    if engine.cost_per_call > left:
+                        self._skip(engine, family, "credit budget exhausted")
+                        continue
+                    left -= engine.cost_per_call
+                planned.append(engine)
+        return planned
+
+    def _skip(self, engine: SearchEngine, family: str, reason: str):
+        self.calls_skipped += 1
+        if self.verbose:
+            print(f"[planner] skip {engine.name} for '{family}': {reason}")
+
+    def record(self, engine: SearchEngine, keyword: str, new_unique: int, latency: float, failed: bool = False):
+        """Record the outcome of one call"""
+        with self._lock:
+            st = self._stat(engine.name, query_family(keyword))
+            st.update(new_unique, latency, failed, engine.cost_per_call, self.alpha)
+            self.run_spent += engine.cost_per_call
+            self.calls_made += 1
+
+    def summary(self) -> str:
+        """One-line description of this run's planning"""
+        line = f"{self.calls_made} calls made, {self.calls_skipped} skipped"
+        if self.run_spent:
+            line += f", ${self.run_spent:.3f} spent"
+        if self.credit_budget is not None:
+            line += f" of ${self.credit_budget:.2f} budget"
+        return line
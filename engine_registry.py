@@ -0,0 +1,291 @@
+"""
+Engine Registry - one catalog for every search backend
+Each engine declares how it is queried (free-text query vs keyword+location),
+how often it may be called, what it costs, and exposes a uniform
+sync search() / async asearch() interface so callers never special-case engines.
+"""
+
+import os
+import time
+import importlib
+import threading
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from api_integrations import API_ENGINE_CLASSES
+from perf_metrics import METRICS
+
+# Capabilities: how an engine wants its input
+QUERY = "query"    # one free-text query string ("python developer new york")
+KW_LOC = "kw_loc"  # keyword and location passed separately
+
+# Cost classes
+FREE = "free"
+PAID = "paid"
+
+
+class RateLimiter:
+    """Thread-safe limiter enforcing a minimum interval between calls"""
+
+    def __init__(self, min_interval: float = 0.0):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def wait(self):
+        """Block until the caller may issue the next call"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+class SearchEngine:
+    """A registered search backend with declared capabilities, limits and cost"""
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[..., List[Dict]],
+        kind: str = QUERY,
+        label: str = "",
+        cost: str = FREE,
+        cost_per_call: float = 0.0,
+        min_interval: float = 1.2,
+        requires_env: Sequence[str] = (),
+        query_prefix: str = "",
+        prefer: str = "",
+    ):
+        """
+        Args:
+            name: Registry key (what users pass to --engines)
+            func: Backend callable. QUERY engines take (query, max_results=, verbose=);
+                  KW_LOC engines take (keyword, location, max_results=, verbose=)
+            kind: QUERY or KW_LOC
+            label: Human-readable name
+            cost: FREE or PAID
+            cost_per_call: Estimated spend per call in USD (0 for free engines)
+            min_interval: Minimum seconds between calls to this engine
+            requires_env: Any one of these env vars enables the engine (empty = always on)
+            query_prefix: Prepended to QUERY-engine queries (e.g. "site:glassdoor.com/Job ")
+            prefer: Name of an engine to try first when it is available (e.g. a paid API)
+        """
+        self.name = name
+        self.func = func
+        self.kind = kind
+        self.label = label or name
+        self.cost = cost
+        self.cost_per_call = cost_per_call
+        self.requires_env = tuple(requires_env)
+        self.query_prefix = query_prefix
+        self.prefer = prefer
+        self.limiter = RateLimiter(min_interval)
+
+    def __repr__(self):
+        return f"SearchEngine({self.name!r}, kind={self.kind!r}, cost={self.cost!r})"
+
+    @property
+    def min_interval(self) -> float:
+        return self.limiter.min_interval
+
+    def is_available(self) -> bool:
+        """True when the engine's credentials (if any) are configured"""
+        if not self.requires_env:
+            return True
+        return any(os.getenv(var) for var in self.requires_env)
+
+    def build_query(self, keyword: str, location: str = "") -> str:
+        """The query string a QUERY engine receives for a keyword/location pair"""
+        return f"{self.query_prefix}{keyword} {location}".strip()
+
+    def search(self, keyword: str, location: str = "", max_results: int = 20, verbose: bool = False) -> List[Dict]:
+        """
+        Run one search, respecting this engine's rate limit.
+
+        QUERY engines receive "<prefix><keyword> <location>"; KW_LOC engines
+        receive keyword and location separately.
+        """
+        self.limiter.wait()
+        if self.kind == KW_LOC:
+            return self._timed(self.func, keyword, location, max_results=max_results, verbose=verbose)
+        return self._timed(self.func, self.build_query(keyword, location), max_results=max_results, verbose=verbose)
+
+    def _timed(self, func, *args, **kwargs) -> List[Dict]:
+        """Call the backend, recording latency, outcome and result count"""
+        t0 = time.perf_counter()
+        try:
+            results = func(*args, **kwargs) or []
+        except Exception:
+            METRICS.observe("engine_search_seconds", time.perf_counter() - t0, engine=self.name)
+            METRICS.inc("engine_searches_total", engine=self.name, outcome="error")
+            raise
+        METRICS.observe("engine_search_seconds", time.perf_counter() - t0, engine=self.name)
+        METRICS.inc("engine_searches_total", engine=self.name, outcome="ok" if results else "empty")
+        METRICS.inc("engine_results_total", len(results), engine=self.name)
+        return results
+
+    def search_query(self, query: str, max_results: int = 20, verbose: bool = False) -> List[Dict]:
+        """Run a free-text query. KW_LOC engines treat the whole query as the keyword."""
+        if self.kind == KW_LOC:
+            return self.search(query, "", max_results=max_results, verbose=verbose)
+        self.limiter.wait()
+        return self._timed(self.func, f"{self.query_prefix}{query}", max_results=max_results, verbose=verbose)
+
+    async def asearch(self, keyword: str, location: str = "", max_results: int = 20, verbose: bool = False) -> List[Dict]:
+        """Async variant of search(); runs the blocking backend in a worker thread"""
+        import asyncio
+        return await asyncio.to_thread(self.search, keyword, location, max_results, verbose)
+
+
+# ============= REGISTRY =============
+
+ENGINES: Dict[str, SearchEngine] = {}
+
+
+def register_engine(engine: SearchEngine) -> SearchEngine:
+    """Add (or replace) an engine in the registry"""
+    ENGINES[engine.name] = engine
+    return engine
+
+
+def get_engine(name: str) -> Optional[SearchEngine]:
+    """Look up an engine by name"""
+    return ENGINES.get(name)
+
+
+def available_engines(names: Optional[Sequence[str]] = None) -> List[SearchEngine]:
+    """Registered engines (optionally restricted to names) whose credentials are configured"""
+    if names is None:
+        candidates = list(ENGINES.values())
+    else:
+        candidates = [ENGINES[n] for n in names if n in ENGINES]
+    return [e for e in candidates if e.is_available()]
+
+
+def resolve_engine(name: str) -> Optional[SearchEngine]:
+    """
+    The engine to actually call for name: its preferred engine when that
+    one is available, otherwise the engine itself.
+    """
+    engine = ENGINES.get(name)
+    if engine and engine.prefer:
+        preferred = ENGINES.get(engine.prefer)
+        if preferred and preferred.is_available():
+            return preferred
+    return engine
+
+
+def set_min_interval(seconds: float, names: Optional[Sequence[str]] = None):
+    """Override the per-engine throttle (e.g. from --throttle)"""
+    for name, engine in ENGINES.items():
+        if names is None or name in names:
+            engine.limiter.min_interval = seconds
+
+
+async def search_many_async(
+    tasks: Sequence[Tuple[SearchEngine, str, str]],
+    max_results: int = 20,
+    max_concurrency: int = 4,
+    verbose: bool = False,
+) -> List[Tuple[SearchEngine, str, str, List[Dict]]]:
+    """
+    Run (engine, keyword, location) tasks concurrently.
+    Each engine still honours its own rate limit; failures yield empty result lists.
+    """
+    import asyncio
+    sem = asyncio.Semaphore(max_concurrency)
+
+    async def run(engine, kw, loc):
+        async with sem:
+            try:
+                results = await engine.asearch(kw, loc, max_results=max_results, verbose=verbose)
+            except Exception as e:
+                if verbose:
+                    print(f"[registry] {engine.name} failed for '{kw} {loc}': {e}")
+                results = []
+            return engine, kw, loc, results
+
+    return await asyncio.gather(*(run(e, kw, loc) for e, kw, loc in tasks))
+
+
+def _lazy(module: str, attr: str) -> Callable[..., List[Dict]]:
+    """
+    Backend function imported on first call, so loading the registry (and
+    cli --help) doesn't pull in selenium, ddgs, bs4 or requests up front.
+    """
+    func = []
+
+    def run(*args, **kwargs) -> List[Dict]:
+        if not func:
+            func.append(getattr(importlib.import_module(module), attr))
+        return func[0](*args, **kwargs)
+
+    run.__name__ = attr
+    run.__qualname__ = attr
+    return run
+
+
+def _api_engine_func(cls):
+    """Lazily instantiate a RapidAPI client on first use"""
+    instance = []
+
+    def run(keyword: str, location: str = "", max_results: int = 20, verbose: bool = False) -> List[Dict]:
+        if not instance:
+            instance.append(cls())
+        return instance[0].search(keyword, location, max_results=max_results, verbose=verbose)
+
+    return run
+
+
+# ---------------- Built-in engines -----------------
+
+# Backends load on first search; the SerpAPI-routed engines share one
+_serpapi = _lazy("search_engines", "serpapi_search")
+
+# Free-text search engines
+register_engine(SearchEngine("duckduckgo", _lazy("search_engines", "duckduckgo_search_v2"),
+                             QUERY, "DuckDuckGo", FREE, 0.0, 1.2))
+register_engine(SearchEngine("startpage", _lazy("search_engines", "startpage_search"),
+                             QUERY, "Startpage", FREE, 0.0, 1.2))
+register_engine(SearchEngine("google_cse", _lazy("search_engines", "google_cse_search"),
+                             QUERY, "Google CSE", PAID, 0.005, 0.2,
+                             requires_env=("GOOGLE_API_KEY",)))
+register_engine(SearchEngine("bing", _lazy("search_engines", "bing_search"), QUERY, "Bing", PAID, 0.003, 0.2,
+                             requires_env=("BING_API_KEY",)))
+register_engine(SearchEngine("serpapi", _serpapi, QUERY, "SerpAPI", PAID, 0.01, 0.5,
+                             requires_env=("SERPAPI_KEY",)))
+
+# Site-filtered searches routed through SerpAPI (API version preferred when configured)
+register_engine(SearchEngine("linkedin", _serpapi, QUERY, "LinkedIn (via SerpAPI)", PAID, 0.01, 0.5,
+                             requires_env=("SERPAPI_KEY",), query_prefix="site:linkedin.com/jobs ",
+                             prefer="linkedin_api"))
+register_engine(SearchEngine("glassdoor", _serpapi, QUERY, "Glassdoor (via SerpAPI)", PAID, 0.01, 0.5,
+                             requires_env=("SERPAPI_KEY",), query_prefix="site:glassdoor.com/Job ",
+                             prefer="glassdoor_api"))
+register_engine(SearchEngine("ziprecruiter", _serpapi, QUERY, "ZipRecruiter (via SerpAPI)", PAID, 0.01, 0.5,
+                             requires_env=("SERPAPI_KEY",), query_prefix="site:ziprecruiter.com/jobs "))
+register_engine(SearchEngine("linkedin_browser", _lazy("search_engines", "linkedin_search"),
+                             QUERY, "LinkedIn (Selenium)", FREE, 0.0, 5.0,
+                             requires_env=("LINKEDIN_EMAIL",)))
+
+# Job sites (keyword + location)
+register_engine(SearchEngine("indeed", _lazy("site_indeed", "indeed_search"),
+                             KW_LOC, "Indeed", FREE, 0.0, 1.2, prefer="indeed_api"))
+register_engine(SearchEngine("greenhouse", _lazy("site_greenhouse", "greenhouse_search"),
+                             KW_LOC, "Greenhouse", FREE, 0.0, 1.2))
+register_engine(SearchEngine("lever", _lazy("site_lever", "lever_search"), KW_LOC, "Lever", FREE, 0.0, 1.2))
+register_engine(SearchEngine("simplyhired", _lazy("site_simplyhired", "simplyhired_search"),
+                             KW_LOC, "SimplyHired", FREE, 0.0, 1.2))
+register_engine(SearchEngine("remoteok", _lazy("site_remoteok", "remoteok_search"),
+                             KW_LOC, "RemoteOK", FREE, 0.0, 1.2))
+register_engine(SearchEngine("weworkremotely", _lazy("site_weworkremotely", "weworkremotely_search"),
+                             KW_LOC, "WeWorkRemotely", FREE, 0.0, 1.2))
+register_engine(SearchEngine("remotive", _lazy("site_remotive", "remotive_search"),
+                             KW_LOC, "Remotive", FREE, 0.0, 1.2))
+
+# RapidAPI job APIs (paid per request; clients created on first use)
+for _name, (_cls, _env_key, _label) in API_ENGINE_CLASSES.items():
+    register_engine(SearchEngine(_name, _api_engine_func(_cls), KW_LOC, _label, PAID, 0.001, 0.5,
+                                 requires_env=("RAPIDAPI_KEY", _env_key)))
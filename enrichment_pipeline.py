@@ -5,10 +5,10 @@ Integrates with multiple APIs and data sources to enhance job results.
 
 import re
 import json
-import requests
-from typing import List, Dict, Optional
-from email_validator import validate_email, EmailNotValidError
+import time
+from typing import Callable, List, Dict, Optional
 from urllib.parse import urljoin, urlparse
+from perf_metrics import METRICS, timed_request
 
 USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
@@ -30,6 +30,8 @@ class JobEnrichment:
         Returns:
             Enriched job dictionary with new fields: emails, company_info, score
         """
+        t0 = time.perf_counter()
+        # A JobRecord copy shares the original's fields; only the added ones are new
         enriched = job.copy()
         
         # Try to extract emails from the job URL and company website
@@ -44,19 +46,35 @@ class JobEnrichment:
         # Calculate enrichment score
         enriched["enrichment_score"] = self._calculate_score(enriched)
         
+        METRICS.observe("enrich_job_seconds", time.perf_counter() - t0)
         return enriched
     
-    def enrich_jobs(self, jobs: List[Dict]) -> List[Dict]:
-        """Enrich multiple job records."""
+    def enrich_jobs(self, jobs: List[Dict], done: Optional[Dict[str, Dict]] = None,
+                    on_enriched: Optional[Callable[[str, Dict], None]] = None) -> List[Dict]:
+        """
+        Enrich multiple job records.
+        
+        Args:
+            jobs: Job records to enrich
+            done: Records already enriched by an interrupted run, by job URL (reused as-is)
+            on_enriched: Called with (url, enriched record) after each job, for checkpointing
+        """
         enriched = []
         for job in jobs:
+            url = job.get("url", "")
+            if done and url in done:
+                enriched.append(done[url])
+                continue
             try:
                 enriched_job = self.enrich_job(job)
                 enriched.append(enriched_job)
             except Exception as e:
                 if self.verbose:
                     print(f"[enrichment] Error enriching job: {e}")
+                enriched_job = job
                 enriched.append(job)  # Return original if enrichment fails
+            if on_enriched and url:
+                on_enriched(url, enriched_job)
         
         return enriched
     
@@ -115,12 +133,15 @@ class JobEnrichment:
             return []
         
         # Check cache first
-        if url in self.email_cache:
+        hit = url in self.email_cache
+        METRICS.cache("enrich_email", hit)
+        if hit:
             return self.email_cache[url]
         
+        import requests
         try:
             headers = {"User-Agent": USER_AGENT}
-            resp = requests.get(url, headers=headers, timeout=5)
+            resp = timed_request(requests.get, url, "enrichment", headers=headers, timeout=5)
             resp.raise_for_status()
             
             text = resp.text.lower()
@@ -160,6 +181,7 @@ class JobEnrichment:
         Returns:
             True if valid, False otherwise
         """
+        from email_validator import validate_email, EmailNotValidError
         try:
             valid = validate_email(email)
             return True
@@ -180,17 +202,20 @@ class JobEnrichment:
             return None
         
         # Check cache
-        if company_name in self.company_cache:
+        hit = company_name in self.company_cache
+        METRICS.cache("enrich_company", hit)
+        if hit:
             cached = self.company_cache[company_name]
             return cached.get("website")
         
+        import requests
         try:
             # Simple heuristic: try common domain patterns
             company_safe = company_name.lower().replace(" ", "")
             for tld in [".com", ".io", ".co", ".org", ".net"]:
                 test_url = f"https://{company_safe}{tld}"
                 try:
-                    resp = requests.head(test_url, timeout=3)
+                    resp = timed_request(requests.head, test_url, "enrichment", timeout=3)
                     if resp.status_code < 400:
                         self.company_cache[company_name] = {"website": test_url}
                         return test_url
@@ -202,7 +227,7 @@ class JobEnrichment:
             for tld in [".com", ".io", ".co", ".org", ".net"]:
                 test_url = f"https://{company_hyphen}{tld}"
                 try:
-                    resp = requests.head(test_url, timeout=3)
+                    resp = timed_request(requests.head, test_url, "enrichment", timeout=3)
                     if resp.status_code < 400:
                         self.company_cache[company_name] = {"website": test_url}
                         return test_url
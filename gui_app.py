@@ -9,6 +9,7 @@ from ttkbootstrap.constants import *
 import json
 import os
 import threading
+import queue
 import time
 from datetime import datetime
 from typing import List, Dict
@@ -19,23 +20,24 @@ from email.mime.text import MIMEText
 import webbrowser
 
 # Import scraper modules
-from search_engines import ENGINE_FUNCS
-from site_indeed import indeed_search
-from site_greenhouse import greenhouse_search
-from site_lever import lever_search
-from site_simplyhired import simplyhired_search
-from site_remoteok import remoteok_search
-from site_weworkremotely import weworkremotely_search
-from site_remotive import remotive_search
-from normalize import normalize_record, is_relevant
+from engine_registry import ENGINES, FREE, get_engine, resolve_engine, available_engines, set_min_interval
+from normalize import normalize_record, filter_relevant
+from near_dupes import collapse_near_duplicates
+from url_canon import canonical_key
+from job_store import JobStore
+from scrape_archive import ScrapeArchive
+from sweep_journal import SweepJournal
+from pipeline import JobPipeline
+from perf_metrics import METRICS
+from block_detector import BLOCKS, OK, classify_exception, observe
+from query_plan import get_history, plan_units, unit_query
+from job_record import JobColumns, to_dict
+from virtual_table import VirtualTable
 from email_extractor import extract_from_job_results, filter_and_dedupe_emails
 from email_manager import EmailManager
 from email_sender import EmailSender
 from enrichment_pipeline import JobEnrichment, sort_by_enrichment
 from proxy_manager import ProxyManager
-from proxy_finder import ProxyFinder
-from proxy_fetcher import ProxyFetcher
-from api_integrations import get_api_engines
 import subprocess
 import atexit
 import signal
@@ -44,8 +46,12 @@ import signal
 class JobScraperGUI:
     """Professional GUI for Job Scraper Ultimate"""
     
-    # Class-level proxy server process
+    # Class-level proxy server process (started by the first DuckDuckGo search)
     proxy_server_process = None
+    _proxy_finder = None
+    
+    # Status/stats/results updates from worker threads are applied at this rate
+    UI_TICK_MS = 100
     
     def __init__(self, root):
         self.root = root
@@ -54,9 +60,12 @@ class JobScraperGUI:
         
         # State variables
         self.scraping = False
-        self.results = []
+        self.results = JobColumns()  # one list per field instead of a dict per job
         self.extracted_emails = {}
-        self.archive_file = "output/scrape_archive.json"
+        self._email_rows = []
+        
+        # Worker threads post UI updates here; _ui_tick applies the latest of each
+        self._ui_queue = queue.Queue()
         
         # Archive selection tracking for email manager
         self.current_archive_entry = None
@@ -70,20 +79,19 @@ class JobScraperGUI:
         # Ensure output directory exists
         os.makedirs("output", exist_ok=True)
         
-        # Initialize archive data
+        # Archive store: summaries load at startup, run details on selection
+        self.archive = ScrapeArchive()
         self.archive_data = []
         # Email sender instance using SMTP
         self.email_sender = EmailSender(verbose=True)
         
-        # Start background DDG proxy server
-        self.start_ddg_proxy_server()
-        
         # Show welcome dialog FIRST as blocking modal
         self.show_welcome_dialog()
         
         # Build UI after welcome is accepted
         self.setup_ui()
         self.load_archive()
+        self.root.after(self.UI_TICK_MS, self._ui_tick)
         
         # Register cleanup on app close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
@@ -135,6 +143,18 @@ class JobScraperGUI:
         for child in widget.winfo_children():
             self._enable_widget(child)
     
+    @property
+    def proxy_finder(self):
+        """ProxyFinder (requests + bs4) is built the first time proxies are searched for"""
+        if self._proxy_finder is None:
+            from proxy_finder import ProxyFinder
+            self._proxy_finder = ProxyFinder()
+        return self._proxy_finder
+    
+    @proxy_finder.setter
+    def proxy_finder(self, finder):
+        self._proxy_finder = finder
+    
     @classmethod
     def start_ddg_proxy_server(cls):
         """Start background DuckDuckGo proxy server on localhost:8765"""
@@ -402,6 +422,9 @@ class JobScraperGUI:
         self.send_emails_var = tk.BooleanVar(value=False)
         ttk_boot.Checkbutton(options_frame, text="Send emails (50/day limit)", variable=self.send_emails_var, bootstyle="danger-round-toggle").pack(anchor=W, pady=5)
         
+        self.pipeline_var = tk.BooleanVar(value=False)
+        ttk_boot.Checkbutton(options_frame, text="Pipelined (enrich & extract while searching)", variable=self.pipeline_var, bootstyle="info-round-toggle").pack(anchor=W, pady=5)
+        
         # Action buttons
         action_frame = ttk_boot.Frame(left_panel)
         action_frame.pack(fill=X, pady=10)
@@ -412,6 +435,9 @@ class JobScraperGUI:
         self.stop_btn = ttk_boot.Button(action_frame, text="⛔ Stop", command=self.stop_scraping, bootstyle="danger", width=20, state=DISABLED)
         self.stop_btn.pack(fill=X, pady=5)
         
+        self.resume_btn = ttk_boot.Button(action_frame, text="⏯️ Resume Last Run", command=self.resume_last_run, bootstyle="secondary", width=20)
+        self.resume_btn.pack(fill=X, pady=5)
+        
         ttk_boot.Button(action_frame, text="💾 Save Results", command=self.save_results, bootstyle="info", width=20).pack(fill=X, pady=5)
         
         ttk_boot.Button(action_frame, text="🗑️ Clear Results", command=self.clear_results, bootstyle="warning", width=20).pack(fill=X, pady=5)
@@ -456,16 +482,22 @@ class JobScraperGUI:
         ttk_boot.Button(export_btn_frame, text="💾 Export to TXT", command=self.export_jobs_to_txt, bootstyle="success-outline").pack(side=LEFT, padx=5)
         ttk_boot.Button(export_btn_frame, text="📧 Email Results", command=self.email_jobs_to_user, bootstyle="info-outline").pack(side=LEFT, padx=5)
         
-        # Results text area with scrollbar
-        self.results_text = scrolledtext.ScrolledText(results_frame, wrap=tk.WORD, font=("Courier", 9))
-        self.results_text.pack(fill=BOTH, expand=YES)
-        self._bind_scroll_events(self.results_text)
+        # Results table: only the rows on screen are rendered (double-click opens the link)
+        self.results_view = VirtualTable(
+            results_frame,
+            columns=[("idx", "#", 50), ("title", "Title", 320), ("engine", "Engine", 110),
+                     ("url", "URL", 320), ("snippet", "Snippet", 360)],
+            count=self._result_row_count,
+            rows=self._result_rows,
+            on_activate=self._open_result_row,
+            bootstyle="success",
+        )
+        self.results_view.pack(fill=BOTH, expand=YES)
         
         # Color tags for results
-        self.results_text.tag_config("title", foreground="#2E86AB", font=("Courier", 9, "bold"))
-        self.results_text.tag_config("url", foreground="#A23B72")
-        self.results_text.tag_config("engine", foreground="#F18F01")
-        self.results_text.tag_config("email", foreground="#06A77D", font=("Courier", 9, "bold"))
+        self.results_view.tag_configure("result", foreground="#66b3ff")
+        self.results_view.tag_configure("email_header", foreground="#06A77D", font=("Helvetica", 9, "bold"))
+        self.results_view.tag_configure("email", foreground="#06A77D")
         
     def setup_archive_tab(self):
         """Setup the archive/history viewer"""
@@ -1041,10 +1073,12 @@ import json
 print(f"Total jobs scraped: {len(self.results)}")
 print(f"Total emails found: {len(self.extracted_emails)}")
 
-# Example: Access archive
+# Example: Access archive (summaries, most recent first)
 if self.archive_data:
-    latest = self.archive_data[-1]
+    latest = self.archive_data[0]
     print(f"Latest archive: {latest['keywords']} in {latest['locations']}")
+    run = self.archive.get_run(latest['id'])
+    print(f"Jobs stored: {len(run['all_results'])}")
 """
         self.developer_code_editor.insert(1.0, sample_code)
         self.developer_code_editor.tag_config("comment", foreground="#6a9955")
@@ -1100,7 +1134,6 @@ if self.archive_data:
         """Compact proxy status display at TOP of settings"""
         try:
             self.proxy_manager = ProxyManager()
-            self.proxy_finder = ProxyFinder()
         except Exception as e:
             print(f"Error initializing proxy managers: {e}", file=sys.stderr)
             self.proxy_manager = None
@@ -1165,7 +1198,6 @@ if self.archive_data:
         """Proxy management UI embedded in settings"""
         try:
             self.proxy_manager = ProxyManager()
-            self.proxy_finder = ProxyFinder()
         except Exception as e:
             print(f"Error initializing proxy managers: {e}", file=sys.stderr)
             self.proxy_manager = None
@@ -1982,7 +2014,7 @@ Do you agree to the terms and wish to continue using JobGoblin?
             self.output_dir.delete(0, tk.END)
             self.output_dir.insert(0, directory)
     
-    def start_scraping(self):
+    def start_scraping(self, resume_run_id=None):
         """Start the scraping process in a background thread"""
         
         # Validate inputs
@@ -2001,24 +2033,54 @@ Do you agree to the terms and wish to continue using JobGoblin?
         self.scraping = True
         self.stopped_by_user = False
         self.start_btn.config(state=DISABLED)
+        self.resume_btn.config(state=DISABLED)
         self.stop_btn.config(state=NORMAL)
         self.progress_bar.start()
         self.status_label.config(text="🔍 Scraping in progress...")
         self.clear_results()
         
         # Start scraping in background thread
-        thread = threading.Thread(target=self.run_scraper, daemon=True)
+        thread = threading.Thread(target=self.run_scraper, args=(resume_run_id,), daemon=True)
         thread.start()
     
-    def run_scraper(self):
+    def resume_last_run(self):
+        """Restore the inputs of the last unfinished run and continue it, skipping finished searches"""
+        try:
+            last = SweepJournal.last_unfinished("gui")
+        except Exception as e:
+            messagebox.showerror("Resume", f"Could not read the sweep journal:\n{e}")
+            return
+        if not last:
+            messagebox.showinfo("Resume", "No unfinished run to resume.")
+            return
+        
+        params = last["params"]
+        self.keywords_entry.delete(0, END)
+        self.keywords_entry.insert(0, ", ".join(params.get("keywords", [])))
+        self.locations_entry.delete(0, END)
+        self.locations_entry.insert(0, ", ".join(params.get("locations", [])))
+        for engine, var in self.engine_vars.items():
+            var.set(engine in params.get("engines", []))
+        self.max_results_var.set(params.get("max_results", 50))
+        self.extract_emails_var.set(params.get("extract_emails", True))
+        self.enrich_jobs_var.set(params.get("enrich", True))
+        
+        self.start_scraping(resume_run_id=last["run_id"])
+    
+    def run_scraper(self, resume_run_id=None):
         """Run the actual scraping process"""
         start_time = time.time()
+        journal = None
+        METRICS.reset()
         
         try:
             # Get parameters
             keywords = [k.strip() for k in self.keywords_entry.get().split(',') if k.strip()]
             locations = [l.strip() for l in self.locations_entry.get().split(',') if l.strip()]
             engines = [engine for engine, var in self.engine_vars.items() if var.get()]
+            if "duckduckgo" in engines:
+                # Deferred from startup: only runs that search DuckDuckGo need the proxy server
+                self.start_ddg_proxy_server()
             try:
                 max_total_results = int(self.max_results_var.get())
                 if max_total_results <= 0:
@@ -2030,159 +2092,116 @@ Do you agree to the terms and wish to continue using JobGoblin?
             send_emails = self.send_emails_var.get()
             hit_limit = False
             
-            self.results = []
+            self.results = JobColumns()
             
-            # Expand queries
-            queries = []
-            for kw in keywords:
-                if locations:
-                    for loc in locations:
-                        queries.append(f"{kw} {loc}")
-                else:
-                    queries.append(kw)
+            # Finished searches are checkpointed so a stopped or crashed run can be resumed
+            journal = SweepJournal.open("gui", {
+                "keywords": keywords, "locations": locations, "engines": engines,
+                "max_results": max_total_results, "extract_emails": extract_emails,
+                "enrich": self.enrich_jobs_var.get(),
+            }, resume=resume_run_id is not None, run_id=resume_run_id)
+            if journal.resumed:
+                self.results = JobColumns(journal.unit_results()[:max_total_results])
+                self.update_stats(len(self.results), 0, 0)
+                self.update_status(f"⏯️ Resuming: {journal.units_done} searches already done, {len(self.results)} jobs restored")
+                hit_limit = len(self.results) >= max_total_results
             
-            self.update_status(f"Running {len(queries)} queries across {len(engines)} engines...")
+            # Normalized, deduplicated keyword x location units (every engine gets the same
+            # units); ones every engine found empty recently go last
+            units = plan_units(keywords, locations, get_history(), engines)
             
-            # Initialize API engines if available
-            api_engines = {}
-            try:
-                api_engines = get_api_engines(verbose=False)
-                if api_engines:
-                    self.update_status(f"✓ {len(api_engines)} API engine(s) enabled")
-            except Exception as e:
-                if False:  # verbose
-                    print(f"[API] Could not initialize API engines: {e}")
+            self.update_status(f"Running {len(units)} queries across {len(engines)} engines...")
+            
+            # Pace every engine at the GUI's usual 1.2s (paid APIs keep their own limits)
+            set_min_interval(1.2, [e.name for e in ENGINES.values() if e.cost == FREE])
+            available_apis = [e.name for e in available_engines() if e.name.endswith("_api")]
+            if available_apis:
+                self.update_status(f"✓ {len(available_apis)} API engine(s) enabled")
             
-            # Web engines
-            WEB_ENGINES = {"duckduckgo", "google_cse", "bing", "serpapi", "linkedin", "glassdoor", "ziprecruiter"}
-            SITE_ENGINES = {"indeed", "greenhouse", "lever", "simplyhired"}
-            API_ENGINES = {"linkedin_api", "indeed_api", "glassdoor_api", "job_aggregator_api", "remote_jobs_api"}
+            jp = None
+            if self.pipeline_var.get() and not hit_limit:
+                with METRICS.stage("sweep"):
+                    jp = self._run_pipelined(units, engines, keywords, max_per_query, max_total_results,
+                                             extract_emails, send_emails, journal, start_time)
+                hit_limit = len(self.results) >= max_total_results
             
-            # Run web engines
-            for idx, query in enumerate(queries, 1):
+            for kw, loc in ([] if jp is not None else units):
                 if not self.scraping or hit_limit:
                     break
                     
                 for eng in engines:
                     if not self.scraping or hit_limit:
                         break
+                    if journal.unit_done(eng, kw, loc):
+                        continue
                     
-                    # Try API version first if available (faster, more reliable)
-                    api_key = f"{eng}_api"
-                    if api_key in api_engines and eng in ["linkedin", "indeed", "glassdoor"]:
-                        try:
-                            self.update_status(f"🚀 Using {eng.upper()} API for: {query}")
-                            kw = query.split()[0] if ' ' in query else query
-                            loc = ' '.join(query.split()[1:]) if ' ' in query else ""
-                            api_results = api_engines[api_key].search(kw, loc, max_results=max_per_query, verbose=False)
-                            
-                            if api_results:
-                                filtered = [normalize_record(r) for r in api_results if is_relevant(r.get("title", ""), r.get("snippet", ""), keywords, 0.5)]
-                                self.results.extend(filtered)
-                                # Trim if we exceeded the limit
-                                if len(self.results) > max_total_results:
-                                    self.results = self.results[:max_total_results]
-                                self.update_stats(len(self.results), 0, int(time.time() - start_time))
-                                self.update_status(f"✓ API found {len(filtered)} relevant results from {eng} (total: {len(self.results)}/{max_total_results})")
-                                if len(self.results) >= max_total_results:
-                                    self.update_status(f"🎯 Reached max results limit ({max_total_results}). Stopping scrape.")
-                                    hit_limit = True
-                                    break
-                                time.sleep(0.5)  # API rate limiting
-                                continue  # Skip scraping for this engine
-                        except Exception as e:
-                            self.update_status(f"⚠️ API failed for {eng}, falling back to scraping: {e}")
+                    with METRICS.stage("search"):
+                        results, answered = self._search_unit(eng, kw, loc, max_per_query, keywords)
                     
-                    # Regular scraping (fallback or no API)
-                    if eng in WEB_ENGINES:
-                        # Try with retry logic for proxy failures
-                        results = self._search_with_retry(eng, query, max_per_query, keywords)
-                        
-                        if results:
-                            filtered = [normalize_record(r) for r in results if is_relevant(r.get("title", ""), r.get("snippet", ""), keywords, 0.5)]
-                            self.results.extend(filtered)
-                            # Trim if we exceeded the limit
-                            if len(self.results) > max_total_results:
-                                self.results = self.results[:max_total_results]
-                            self.update_stats(len(self.results), 0, int(time.time() - start_time))
-                            if len(self.results) >= max_total_results:
-                                self.update_status(f"🎯 Reached max results limit ({max_total_results}). Stopping scrape.")
-                                hit_limit = True
-                                break
-                        
-                        time.sleep(1.2)  # Throttle
-            
-            # Run site engines
-            for eng in engines:
-                if not self.scraping or hit_limit:
-                    break
+                    if not self.scraping:
+                        break  # stopped mid-search; leave this unit for a resume
+                    filtered = [normalize_record(r) for r in filter_relevant(results, keywords, 0.5)] if results else []
+                    if answered:
+                        # Blocked or failed searches stay open so a resume retries them
+                        journal.record_unit(eng, kw, loc, filtered)
                     
-                if eng in SITE_ENGINES:
-                    for kw in keywords:
-                        if not self.scraping or hit_limit:
+                    if filtered:
+                        self.results.extend(filtered)
+                        # Trim if we exceeded the limit
+                        if len(self.results) > max_total_results:
+                            self.results = self.results[:max_total_results]
+                        self.update_stats(len(self.results), 0, int(time.time() - start_time))
+                        if len(self.results) >= max_total_results:
+                            self.update_status(f"🎯 Reached max results limit ({max_total_results}). Stopping scrape.")
+                            hit_limit = True
                             break
-                            
-                        locs = locations if locations else [""]
-                        for loc in locs:
-                            if not self.scraping or hit_limit:
-                                break
-                                
-                            self.update_status(f"[site] {eng} kw='{kw}' loc='{loc}'")
-                            
-                            if eng == "indeed":
-                                results = indeed_search(kw, loc, max_results=max_per_query, verbose=False)
-                            elif eng == "greenhouse":
-                                results = greenhouse_search(kw, loc, max_results=max_per_query, verbose=False)
-                            elif eng == "lever":
-                                results = lever_search(kw, loc, max_results=max_per_query, verbose=False)
-                            elif eng == "simplyhired":
-                                results = simplyhired_search(kw, loc, max_results=max_per_query, verbose=False)
-                            else:
-                                results = []
-                            
-                            filtered = [normalize_record(r) for r in results if is_relevant(r.get("title", ""), r.get("snippet", ""), keywords, 0.5)]
-                            self.results.extend(filtered)
-                            # Trim if we exceeded the limit
-                            if len(self.results) > max_total_results:
-                                self.results = self.results[:max_total_results]
-                            self.update_stats(len(self.results), 0, int(time.time() - start_time))
-                            if len(self.results) >= max_total_results:
-                                self.update_status(f"🎯 Reached max results limit ({max_total_results}). Stopping scrape.")
-                                hit_limit = True
-                                break
-                            
-                            time.sleep(1.2)
             
             # Dedupe
             seen = set()
             unique_results = []
             for r in self.results:
-                url = r.get('url')
+                url = canonical_key(r.get('url'))
                 if url and url not in seen:
                     seen.add(url)
                     unique_results.append(r)
-            self.results = unique_results[:max_total_results]
+            # Same posting syndicated across boards -> one canonical record
+            collapsed = collapse_near_duplicates(unique_results)
+            if len(collapsed) < len(unique_results):
+                self.update_status(f"🧬 Collapsed {len(unique_results) - len(collapsed)} syndicated duplicates")
+            self.results = JobColumns(collapsed[:max_total_results])
 
             if hit_limit:
                 self.update_status(f"⛔ Max results reached ({len(self.results)}/{max_total_results}). Finishing up...")
             
             # Enrich jobs with emails and company info
             enrich_jobs = self.enrich_jobs_var.get()
-            if enrich_jobs and self.results and self.scraping:
+            if enrich_jobs and self.results and jp is not None:
+                # Enriched by the pipeline as results came in
+                self.results = JobColumns(sort_by_enrichment(self.results, reverse=True))
+            elif enrich_jobs and self.results and self.scraping:
                 self.update_status(f"🔍 Enriching {len(self.results)} jobs with emails & company data...")
                 enricher = JobEnrichment(verbose=False)
-                enriched = enricher.enrich_jobs(self.results)
+                with METRICS.stage("enrich"):
+                    enriched = enricher.enrich_jobs(self.results, done=journal.stage_items("enrich"),
+                                                    on_enriched=lambda url, job: journal.put_stage_item("enrich", url, to_dict(job)))
                 enriched = sort_by_enrichment(enriched, reverse=True)
                 
                 avg_score = sum(j.get("enrichment_score", 0) for j in enriched) / len(enriched) if enriched else 0
                 self.update_status(f"✅ Enrichment complete. Avg score: {avg_score:.1f}/12.0")
                 
-                self.results = enriched
+                self.results = JobColumns(enriched)
             
             # Extract emails
             if extract_emails and self.scraping:
-                self.update_status(f"📧 Extracting emails from {len(self.results)} job postings...")
-                company_emails = extract_from_job_results(self.results, verbose=True)  # Enable verbose to see what's happening
+                if jp is not None:
+                    company_emails = jp.company_emails
+                else:
+                    self.update_status(f"📧 Extracting emails from {len(self.results)} job postings...")
+                    with METRICS.stage("extract_emails"):
+                        company_emails = extract_from_job_results(
+                            self.results, verbose=True,  # Enable verbose to see what's happening
+                            done=journal.stage_items("emails"),
+                            on_domain=lambda domain, info: journal.put_stage_item("emails", domain, info))
                 self.extracted_emails = filter_and_dedupe_emails(company_emails)
                 self.update_stats(len(self.results), len(self.extracted_emails), int(time.time() - start_time))
                 self.update_status(f"✅ Found {len(self.extracted_emails)} unique emails from {len(company_emails)} total extractions")
@@ -2204,8 +2223,8 @@ Do you agree to the terms and wish to continue using JobGoblin?
             # Save outputs
             self.auto_save_results()
             
-            # Send emails if requested
-            if send_emails and self.extracted_emails and self.scraping:
+            # Send emails if requested (pipelined runs sent each lead as it was found)
+            if send_emails and self.extracted_emails and self.scraping and jp is None:
                 self.update_status("📧 Sending emails...")
                 sender = EmailSender(verbose=False)
                 stats = sender.send_emails_from_csv("output/found_emails.csv", limit_per_run=50)
@@ -2213,8 +2232,9 @@ Do you agree to the terms and wish to continue using JobGoblin?
             
             # Update final status based on how scraping ended
             if self.stopped_by_user:
-                self.update_status(f"⛔ Scraping stopped by user. Found {len(self.results)} jobs, {len(self.extracted_emails)} emails.")
+                self.update_status(f"⛔ Scraping stopped by user. Found {len(self.results)} jobs, {len(self.extracted_emails)} emails. Use Resume to continue.")
             else:
+                journal.finish()
                 self.update_status("✅ Scraping completed successfully!")
             
         except Exception as e:
@@ -2222,107 +2242,176 @@ Do you agree to the terms and wish to continue using JobGoblin?
             messagebox.showerror("Scraping Error", f"An error occurred:\n{str(e)}")
         
         finally:
+            if journal is not None:
+                journal.close()
+            get_history().save()
+            try:
+                METRICS.write_report()
+                print(METRICS.summary(), file=sys.stderr)
+            except Exception as e:
+                print(f"Failed writing performance report: {e}", file=sys.stderr)
             self.root.after(0, self.scraping_finished)
     
+    def _search_unit(self, eng, kw, loc, max_per_query, keywords):
+        """
+        Raw results for one engine/keyword/location: preferred API first, then
+        scraping with retries. Returns (results, answered); answered is False
+        when the search was blocked, errored or stopped.
+        """
+        engine = get_engine(eng)
+        if not engine:
+            self.update_status(f"❌ Engine '{eng}' not available")
+            return [], False
+        
+        # Try the preferred API version first if available (faster, more reliable)
+        results = []
+        preferred = resolve_engine(eng)
+        if preferred is not engine:
+            try:
+                self.update_status(f"🚀 Using {preferred.label} for: {kw} {loc}".strip())
+                results = preferred.search(kw, loc, max_results=max_per_query, verbose=False)
+            except Exception as e:
+                self.update_status(f"⚠️ API failed for {eng}, falling back to scraping: {e}")
+                results = []
+        
+        # Regular scraping (fallback or no API), with retry logic for proxy failures
+        if not results:
+            results, answered = self._search_with_retry(engine, kw, loc, max_per_query, keywords)
+        else:
+            answered = True
+        # A blocked engine's empty answer says nothing about the query
+        if answered:
+            get_history().record(unit_query(kw, loc), len(results), eng)
+        return results, answered
+    
+    def _run_pipelined(self, units, engines, keywords, max_per_query, max_total_results,
+                       extract_emails, send_emails, journal, start_time):
+        """Search, dedupe, enrich, extract and send as overlapping stages; results show up as they finish"""
+        sender = EmailSender(verbose=False) if send_emails else None
+        
+        def search(unit):
+            eng, kw, loc = unit
+            if not self.scraping:
+                return []
+            results, answered = self._search_unit(eng, kw, loc, max_per_query, keywords)
+            if self.scraping and answered:
+                journal.record_unit(eng, kw, loc, [normalize_record(r) for r in filter_relevant(results, keywords, 0.5)])
+            return results
+        
+        def on_record(record):
+            self.results.append(record)
+            self.update_stats(len(self.results), len(jp.company_emails), int(time.time() - start_time))
+            if len(self.results) >= max_total_results:
+                self.update_status(f"🎯 Reached max results limit ({max_total_results}). Stopping scrape.")
+                jp.stop()
+        
+        def on_lead(lead):
+            if sender is not None and sender.send_lead(lead, subject="Job Lead Information"):
+                self.update_status(f"📧 Sent to {lead['email']}")
+        
+        jp = JobPipeline(search, keywords, relevance_threshold=0.5, enrich=self.enrich_jobs_var.get(),
+                         extract_emails=extract_emails, on_record=on_record, on_lead=on_lead)
+        self.update_status("⚡ Pipelined run: enriching and extracting while searching...")
+        todo = [(eng, kw, loc) for kw, loc in units for eng in engines if not journal.unit_done(eng, kw, loc)]
+        for _ in jp.run(todo):
+            if not self.scraping:
+                jp.stop()
+        print(f"[pipeline] {jp.summary()}", file=sys.stderr)
+        return jp
+    
     def stop_scraping(self):
         """Stop the scraping process"""
         self.scraping = False
         self.stopped_by_user = True
         self.update_status("⛔ Stopping scrape...")
     
-    def _search_with_retry(self, engine, query, max_results, keywords, max_retries=3):
-        """Search with automatic proxy rotation and retry on timeout"""
-        if engine in ("linkedin", "glassdoor", "ziprecruiter"):
-            # Handle site-filtered engines
-            site_map = {
-                "linkedin": "site:linkedin.com/jobs ",
-                "glassdoor": "site:glassdoor.com/Job ",
-                "ziprecruiter": "site:ziprecruiter.com/jobs "
-            }
-            if "serpapi" in ENGINE_FUNCS:
-                fn = ENGINE_FUNCS["serpapi"]
-                modified_query = site_map[engine] + query
-                query_to_use = modified_query
-            else:
-                self.update_status(f"⚠️ {engine} requires SerpAPI key (not configured)")
-                return []
-        else:
-            fn = ENGINE_FUNCS.get(engine)
-            if not fn:
-                self.update_status(f"❌ Engine '{engine}' not available")
-                return []
-            query_to_use = query
+    def _search_with_retry(self, engine, keyword, location, max_results, keywords, max_retries=3):
+        """
+        Search with retries driven by the block detector: engines charge each
+        CAPTCHA / rate limit / dead proxy to the exact route they used and
+        switch routes themselves, so a retry only happens when some route is
+        (or soon will be) usable again. Each attempt is observed on its own,
+        so concurrent searches never read each other's outcomes.
+        
+        Returns:
+            (results, answered): answered is False when the search was blocked,
+            errored or stopped, i.e. an empty list says nothing about the query
+        """
+        if not engine.is_available():
+            self.update_status(f"⚠️ {engine.name} requires {' or '.join(engine.requires_env)} (not configured)")
+            return [], False
+        query = engine.build_query(keyword, location)
         
-        # Try with retries
         for attempt in range(max_retries + 1):
             if not self.scraping:
-                return []
+                return [], False
             
             try:
-                self.update_status(f"[Attempt {attempt+1}/{max_retries+1}] Querying {engine}: {query}")
+                self.update_status(f"[Attempt {attempt+1}/{max_retries+1}] Querying {engine.name}: {query}")
                 
-                # Call the search function
-                if engine in ("linkedin", "glassdoor", "ziprecruiter"):
-                    results = fn(query_to_use, max_results=max_results, verbose=False)
-                else:
-                    results = fn(query_to_use, max_results=max_results, verbose=False)
+                # Call the search function (the registry applies the engine's rate limit)
+                with observe() as call:
+                    results = engine.search(keyword, location, max_results=max_results, verbose=False)
                 
-                # Success!
                 if results:
-                    self.update_status(f"✓ Found {len(results)} results from {engine}")
-                    return results
-                else:
-                    self.update_status(f"⚠️ No results from {engine} for: {query}")
-                    # Try one more time with a different proxy
-                    if attempt < max_retries:
-                        self.update_status(f"🔄 Retrying {engine} with different proxy...")
-                        # Mark current proxy as failed and get next one
-                        if self.proxy_manager:
-                            try:
-                                proxies = self.proxy_manager.get_all_proxies()
-                                if proxies:
-                                    current = self.proxy_manager.get_next_proxy()
-                                    if current:
-                                        self.proxy_manager.mark_proxy_failed(current.get('url'))
-                            except:
-                                pass
-                        time.sleep(2)
-                        continue
-                    return []
+                    self.update_status(f"✓ Found {len(results)} results from {engine.name}")
+                    return results, True
+                
+                outcome = call.outcome
+                if outcome == OK:
+                    # The engine got a real answer: there are simply no results
+                    self.update_status(f"⚠️ No results from {engine.name} for: {query}")
+                    return [], True
+                if attempt >= max_retries:
+                    # Nothing reported at all still counts as the engine's answer
+                    return [], outcome is None
+                if outcome is None:
+                    # Engine doesn't report routes: plain retry after a pause
+                    self.update_status(f"⚠️ No results from {engine.name} for: {query} - retrying...")
+                    time.sleep(2)
+                    continue
+                if not self._wait_for_route(engine, outcome, attempt):
+                    return [], False
             
             except Exception as e:
-                error_msg = str(e).lower()
-                
-                # Check if it's a timeout/proxy error
-                if any(x in error_msg for x in ['timeout', 'connection', 'proxy', 'reset', 'refused', 'read', 'timed out']):
-                    if attempt < max_retries:
-                        self.update_status(f"⚠️ {engine} proxy timeout - Finding new proxy (attempt {attempt+1}/{max_retries+1})...")
-                        
-                        # Mark current proxy as failed
-                        if self.proxy_manager:
-                            try:
-                                current = self.proxy_manager.get_next_proxy()
-                                if current:
-                                    self.proxy_manager.mark_proxy_failed(current.get('url'))
-                                    self.update_status(f"❌ Marked proxy as failed: {current.get('url')}")
-                            except:
-                                pass
-                        
-                        # Try to find new proxies
-                        self._auto_discover_proxies_quietly()
-                        
-                        time.sleep(2)
-                        continue
-                    else:
-                        self.update_status(f"❌ {engine} failed after {max_retries+1} attempts: {str(e)[:50]}")
-                        return []
-                else:
-                    # Other errors - don't retry
-                    self.update_status(f"❌ Error querying {engine}: {str(e)[:80]}")
-                    print(f"[{engine}] Error: {e}", file=sys.stderr)
-                    return []
-        
-        return []
+                outcome = classify_exception(e)
+                if outcome is None:
+                    # Not a blocking/connection problem - don't retry
+                    self.update_status(f"❌ Error querying {engine.name}: {str(e)[:80]}")
+                    print(f"[{engine.name}] Error: {e}", file=sys.stderr)
+                    return [], False
+                if attempt >= max_retries:
+                    self.update_status(f"❌ {engine.name} failed after {max_retries+1} attempts: {str(e)[:50]}")
+                    return [], False
+                self.update_status(f"⚠️ {engine.name} {outcome.replace('_', ' ')} (attempt {attempt+1}/{max_retries+1})...")
+                # The proxy that failed has already been charged where it was used;
+                # only go looking for new ones once every proxy is disabled
+                if self.proxy_manager and self.proxy_manager.proxies and \
+                        not any(p.get('enabled', True) for p in self.proxy_manager.proxies):
+                    self._auto_discover_proxies_quietly()
+                time.sleep(min(2 ** attempt, 8))
+        
+        return [], False
+    
+    def _wait_for_route(self, engine, outcome, attempt=0, max_wait=10.0) -> bool:
+        """Wait until one of the engine's routes is off backoff; False if that's more than max_wait away"""
+        if not BLOCKS.tracked(engine.name):
+            # Site scrapers' blocks come from the shared HTTP client, which keeps
+            # no backoff for the site itself: pause like an exception retry
+            self.update_status(f"⚠️ {engine.name} {outcome.replace('_', ' ')} - retrying...")
+            time.sleep(min(2 ** attempt, 8))
+            return self.scraping
+        wait = BLOCKS.retry_after(engine.name)
+        if wait > max_wait:
+            self.update_status(f"⛔ {engine.name}: every route blocked ({outcome.replace('_', ' ')}) - "
+                               f"skipping for {wait:.0f}s")
+            return False
+        if wait > 0:
+            self.update_status(f"⏳ {engine.name} {outcome.replace('_', ' ')} - next route free in {wait:.0f}s")
+            time.sleep(wait)
+        else:
+            self.update_status(f"🔄 {engine.name} {outcome.replace('_', ' ')} - switching route...")
+        return self.scraping
     
     def _auto_discover_proxies_quietly(self):
         """Auto-discover proxies in background without showing UI popups"""
@@ -2375,67 +2464,108 @@ Do you agree to the terms and wish to continue using JobGoblin?
         """Called when scraping is finished"""
         self.scraping = False
         self.start_btn.config(state=NORMAL)
+        self.resume_btn.config(state=NORMAL)
         self.stop_btn.config(state=DISABLED)
         self.progress_bar.stop()
     
     def update_status(self, message):
-        """Update status label (thread-safe)"""
-        self.root.after(0, lambda: self.status_label.config(text=message))
+        """Update status label (thread-safe; applied on the next UI tick)"""
+        self._ui_queue.put(("status", message))
     
     def update_stats(self, jobs, emails, elapsed):
-        """Update statistics display (thread-safe)"""
-        self.root.after(0, lambda: self.stats_jobs.config(text=f"Jobs Found: {jobs}"))
-        self.root.after(0, lambda: self.stats_emails.config(text=f"Emails Found: {emails}"))
-        self.root.after(0, lambda: self.stats_time.config(text=f"Time: {elapsed}s"))
+        """Update statistics display (thread-safe; applied on the next UI tick)"""
+        self._ui_queue.put(("stats", (jobs, emails, elapsed)))
     
     def display_results(self):
-        """Display scraping results in the text area"""
-        self.root.after(0, self._display_results_ui)
+        """Display scraping results in the results table"""
+        self._ui_queue.put(("results", None))
+    
+    def _ui_tick(self):
+        """Apply queued UI updates at a fixed rate; only the latest status/stats are drawn"""
+        status = stats = None
+        show_results = False
+        try:
+            while True:
+                kind, value = self._ui_queue.get_nowait()
+                if kind == "status":
+                    status = value
+                elif kind == "stats":
+                    stats = value
+                elif kind == "results":
+                    show_results = True
+        except queue.Empty:
+            pass
+        
+        try:
+            if status is not None:
+                self.status_label.config(text=status)
+            if stats is not None:
+                jobs, emails, elapsed = stats
+                self.stats_jobs.config(text=f"Jobs Found: {jobs}")
+                self.stats_emails.config(text=f"Emails Found: {emails}")
+                self.stats_time.config(text=f"Time: {elapsed}s")
+            if show_results:
+                self._display_results_ui()
+            elif self.scraping and len(self.results) != self.results_view.total:
+                # Live view while scraping: follow new rows if already at the bottom
+                self.results_view.refresh(keep_bottom=True)
+        except tk.TclError:
+            return  # window closed
+        self.root.after(self.UI_TICK_MS, self._ui_tick)
     
     def _display_results_ui(self):
         """Update UI with results (must run in main thread)"""
-        self.results_text.delete(1.0, tk.END)
-        
+        self._email_rows = list(self.extracted_emails.items())
+        self.results_view.offset = 0
+        self.results_view.refresh()
         if not self.results:
-            self.results_text.insert(tk.END, "No results found.\n")
-            return
-        
-        for idx, result in enumerate(self.results, 1):
-            self.results_text.insert(tk.END, f"\n{'='*80}\n")
-            self.results_text.insert(tk.END, f"[{idx}] ")
-            self.results_text.insert(tk.END, f"{result.get('title', 'No Title')}\n", "title")
-            url_val = result.get('url', 'N/A')
-            self.results_text.insert(tk.END, "🔗 URL: ")
-            start = self.results_text.index(tk.INSERT)
-            self.results_text.insert(tk.END, f"{url_val}\n", "url")
-            end = self.results_text.index(tk.INSERT)
-            tag_name = f"url_{idx}"
-            self.results_text.tag_add(tag_name, start, end)
-            self.results_text.tag_config(tag_name, foreground="#66b3ff", underline=True)
-            self.results_text.tag_bind(tag_name, "<Enter>", lambda e: self.results_text.config(cursor="hand2"))
-            self.results_text.tag_bind(tag_name, "<Leave>", lambda e: self.results_text.config(cursor=""))
-            self.results_text.tag_bind(tag_name, "<Button-1>", lambda e, u=url_val: webbrowser.open(u))
-            self.results_text.insert(tk.END, f"🔍 Engine: {result.get('engine', 'N/A')}\n", "engine")
-            if result.get('snippet'):
-                self.results_text.insert(tk.END, f"📝 {result['snippet'][:200]}...\n")
-        
-        if self.extracted_emails:
-            self.results_text.insert(tk.END, f"\n\n{'='*80}\n")
-            self.results_text.insert(tk.END, "📧 EXTRACTED EMAILS\n", "email")
-            self.results_text.insert(tk.END, f"{'='*80}\n")
-            
-            for idx, (email, info) in enumerate(self.extracted_emails.items(), 1):
+            self.status_label.config(text="No results found.")
+    
+    def _result_row_count(self):
+        emails = len(self._email_rows)
+        return len(self.results) + (emails + 1 if emails else 0)
+    
+    def _result_rows(self, start, stop):
+        """Rows [start, stop): job results, then an emails header and one row per email"""
+        results = self.results
+        rows = []
+        for idx in range(start, stop):
+            if idx < len(results):
+                result = results[idx]
+                snippet = (result.get('snippet') or '').replace('\n', ' ')[:200]
+                rows.append(((idx + 1, result.get('title', 'No Title'), result.get('engine', 'N/A'),
+                              result.get('url', 'N/A'), snippet), "result"))
+            elif idx == len(results):
+                rows.append((("", f"📧 EXTRACTED EMAILS ({len(self._email_rows)})", "", "", ""), "email_header"))
+            else:
+                pos = idx - len(results) - 1
+                if pos >= len(self._email_rows):
+                    break
+                email, info = self._email_rows[pos]
                 domains = ', '.join(list(info.get('domains', []))[:3])
-                self.results_text.insert(tk.END, f"\n[{idx}] ", "email")
-                self.results_text.insert(tk.END, f"{email}\n", "email")
-                self.results_text.insert(tk.END, f"    Domains: {domains}\n")
-                self.results_text.insert(tk.END, f"    Sources: {len(info.get('sources', []))}\n")
+                rows.append(((pos + 1, email, "email", domains, f"Sources: {len(info.get('sources', []))}"), "email"))
+        return rows
+    
+    def _open_result_row(self, index):
+        """Double-click: open a result's URL, or copy an email address"""
+        if index < len(self.results):
+            url = self.results[index].get('url')
+            if url:
+                webbrowser.open(url)
+            return
+        pos = index - len(self.results) - 1
+        if 0 <= pos < len(self._email_rows):
+            email = self._email_rows[pos][0]
+            self.root.clipboard_clear()
+            self.root.clipboard_append(email)
+            self.status_label.config(text=f"📋 Copied {email}")
     
     def clear_results(self):
         """Clear results display"""
-        self.results_text.delete(1.0, tk.END)
-        self.results = []
+        self.results = JobColumns()
         self.extracted_emails = {}
+        self._email_rows = []
+        self.results_view.refresh()
         self.update_stats(0, 0, 0)
     
     def save_results(self):
@@ -2457,9 +2587,17 @@ Do you agree to the terms and wish to continue using JobGoblin?
         # Create timestamped filename
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
+        # Record in the persistent job store (upsert: only unseen jobs are inserted)
+        try:
+            with JobStore() as store:
+                new, updated = store.upsert_many(self.results)
+            self.update_status(f"🗄️ Job store: {new} new, {updated} seen again")
+        except Exception as e:
+            self.update_status(f"⚠️ Job store error: {e}")
+        
         # Save JSON
         with open("output/web_jobs_ultimate.json", 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2)
+            json.dump(self.results.to_dicts(), f, indent=2)
         
         # Save TXT (main file)
         lines = []
@@ -2632,14 +2770,10 @@ Total Jobs: {len(self.results)}
         cancel_btn.pack(side=LEFT, padx=10, pady=5)
     
     def load_archive(self):
-        """Load scrape archive from file"""
-        if os.path.exists(self.archive_file):
-            try:
-                with open(self.archive_file, 'r', encoding='utf-8') as f:
-                    self.archive_data = json.load(f)
-            except:
-                self.archive_data = []
-        else:
+        """Load archive summaries (run details are read when a run is opened)"""
+        try:
+            self.archive_data = self.archive.summaries()
+        except Exception:
             self.archive_data = []
         
         self.refresh_archive_display()
@@ -2647,46 +2781,17 @@ Total Jobs: {len(self.results)}
     
     def save_to_archive(self, keywords, locations, engines, jobs_count, emails_count):
         """Save current scrape to archive"""
-        # Convert sets to lists for JSON serialization
-        serializable_emails = {}
-        for email, info in self.extracted_emails.items():
-            serializable_emails[email] = {
-                'email': email,
-                'domains': list(info.get('domains', [])),  # Convert set to list
-                'sources': list(info.get('sources', [])),
-                'job_titles': list(info.get('job_titles', []))  # Convert set to list
-            }
-        
-        entry = {
-            'id': len(self.archive_data) + 1,
-            'timestamp': datetime.now().isoformat(),
-            'keywords': keywords,
-            'locations': locations,
-            'engines': engines,
-            'jobs_found': jobs_count,
-            'emails_found': emails_count,
-            'results': self.results[:100],
-            'extracted_emails': serializable_emails,
-            'all_results': self.results
-        }
-        
-        self.archive_data.append(entry)
-        
-        # Save to file
-        with open(self.archive_file, 'w', encoding='utf-8') as f:
-            json.dump(self.archive_data, f, indent=2)
+        self.archive.add_run(keywords, locations, engines, self.results.to_dicts(), self.extracted_emails,
+                             jobs_found=jobs_count, emails_found=emails_count)
+        self.archive_data = self.archive.summaries()
         
         self.refresh_archive_display()
         self.refresh_archive_dropdown()
     
-    def refresh_archive_display(self):
-        """Refresh the archive treeview"""
-        # Clear existing items
-        for item in self.archive_tree.get_children():
-            self.archive_tree.delete(item)
-        
-        # Add archive entries
-        for entry in reversed(self.archive_data):  # Most recent first
+    def _insert_archive_rows(self, entries):
+        """Replace the archive treeview rows with these summaries"""
+        self.archive_tree.delete(*self.archive_tree.get_children())
+        for entry in entries:
             self.archive_tree.insert(
                 "",
                 tk.END,
@@ -2701,33 +2806,22 @@ Total Jobs: {len(self.results)}
                 )
             )
     
+    def refresh_archive_display(self):
+        """Refresh the archive treeview"""
+        self._insert_archive_rows(self.archive_data)  # Most recent first
+    
     def filter_archive(self):
-        """Filter archive based on search term"""
-        search_term = self.archive_search.get().lower()
-        
-        # Clear existing items
-        for item in self.archive_tree.get_children():
-            self.archive_tree.delete(item)
-        
-        # Add filtered entries
-        for entry in reversed(self.archive_data):
-            # Search in keywords, locations, and engines
-            searchable = ' '.join(entry.get('keywords', []) + entry.get('locations', []) + entry.get('engines', [])).lower()
-            
-            if search_term in searchable or not search_term:
-                self.archive_tree.insert(
-                    "",
-                    tk.END,
-                    text=entry['id'],
-                    values=(
-                        datetime.fromisoformat(entry['timestamp']).strftime("%Y-%m-%d %H:%M:%S"),
-                        ', '.join(entry.get('keywords', [])),
-                        ', '.join(entry.get('locations', []))[:50],
-                        ', '.join(entry.get('engines', []))[:50],
-                        entry.get('jobs_found', 0),
-                        entry.get('emails_found', 0)
-                    )
-                )
+        """Filter archive based on search term (debounced; queries the archive index)"""
+        if getattr(self, '_archive_filter_job', None):
+            self.root.after_cancel(self._archive_filter_job)
+        self._archive_filter_job = self.root.after(150, self._apply_archive_filter)
+    
+    def _apply_archive_filter(self):
+        self._archive_filter_job = None
+        search_term = self.archive_search.get().strip()
+        # Keywords, locations, engines, job titles and emails
+        entries = self.archive.summaries(search=search_term) if search_term else self.archive_data
+        self._insert_archive_rows(entries)
     
     def view_archive_details(self, event):
         """View details of selected archive entry"""
@@ -2738,8 +2832,8 @@ Total Jobs: {len(self.results)}
         item = self.archive_tree.item(selection[0])
         entry_id = int(item['text'])
         
-        # Find entry in archive
-        entry = next((e for e in self.archive_data if e['id'] == entry_id), None)
+        # Load the run's results and emails from the archive
+        entry = self.archive.get_run(entry_id)
         if not entry:
             return
         
@@ -2818,10 +2912,10 @@ ALL JOB LINKS & TITLES:
     def clear_archive(self):
         """Clear the entire archive"""
         if messagebox.askyesno("Clear Archive", "Are you sure you want to clear all archive data?"):
+            self.archive.clear()
             self.archive_data = []
-            if os.path.exists(self.archive_file):
-                os.remove(self.archive_file)
             self.refresh_archive_display()
+            self.refresh_archive_dropdown()
             self.archive_details.delete(1.0, tk.END)
             messagebox.showinfo("Archive Cleared", "Archive has been cleared")
 
@@ -2840,7 +2934,7 @@ ALL JOB LINKS & TITLES:
             messagebox.showerror("Error", "Could not determine the selected archive ID.")
             return
 
-        entry = next((e for e in self.archive_data if e['id'] == archive_id), None)
+        entry = self.archive.get_run(archive_id)
         if not entry:
             messagebox.showerror("Error", "Archive entry not found.")
             return
@@ -3034,7 +3128,7 @@ ALL JOB LINKS & TITLES:
     def refresh_archive_dropdown(self):
         """Refresh the archive dropdown with current archives"""
         archive_options = []
-        for entry in reversed(self.archive_data):
+        for entry in self.archive_data:  # Most recent first
             archive_id = entry.get('id')
             timestamp = datetime.fromisoformat(entry['timestamp']).strftime("%Y-%m-%d %H:%M")
             keywords = ', '.join(entry.get('keywords', []))[:40]
@@ -3060,8 +3154,8 @@ ALL JOB LINKS & TITLES:
             messagebox.showerror("Error", "Could not parse archive ID")
             return
         
-        # Find the archive entry
-        entry = next((e for e in self.archive_data if e['id'] == archive_id), None)
+        # Load the archive entry's emails (results aren't needed here)
+        entry = self.archive.get_run(archive_id, with_results=False)
         if not entry:
             messagebox.showerror("Error", "Archive not found")
             return
@@ -6,6 +6,13 @@ All scrapers should use this instead of direct requests.get()
 import requests
 from typing import Optional, Dict, Any
 from proxy_manager import ProxyManager
+from single_flight import HTTP_FLIGHT
+from perf_metrics import timed_request
+from block_detector import BLOCKS, OK, NETWORK_ERROR, proxy_route, classify_response, classify_exception, note
+
+# Proxy outcomes seen here are charged to this pseudo-engine: only network-level
+# failures count, since a 403/429 from one site says nothing about the proxy
+BLOCK_ENGINE = "http"
 
 # Global proxy manager instance
 _proxy_manager = None
@@ -17,6 +24,41 @@ def get_proxy_manager():
         _proxy_manager = ProxyManager()
     return _proxy_manager
 
+def _pick_proxy(proxy_mgr) -> Optional[Dict]:
+    """The next enabled proxy that isn't backing off after network failures"""
+    for _ in range(len(proxy_mgr.proxies)):
+        proxy_dict = proxy_mgr.get_next_proxy()
+        if not proxy_dict:
+            return None
+        if BLOCKS.usable(BLOCK_ENGINE, [proxy_route(proxy_dict.get('url', ''))]):
+            return proxy_dict
+    return None
+
+def _charge(proxy_mgr, proxy_dict: Dict, response=None, error: Optional[BaseException] = None):
+    """Record how a request through proxy_dict went, against that exact proxy"""
+    if error is not None:
+        outcome = NETWORK_ERROR if isinstance(error, (requests.ConnectionError, requests.Timeout)) else None
+    else:
+        outcome = NETWORK_ERROR if response.status_code in (407, 502, 504) else OK
+    if outcome:
+        # The call's own outcome is what the site finally answered (see get_with_proxy)
+        BLOCKS.record(BLOCK_ENGINE, proxy_route(proxy_dict.get('url', '')), outcome,
+                      proxy_manager=proxy_mgr, to_call=False)
+
+def _flight_key(url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]],
+                use_proxy: bool, kwargs: Dict[str, Any]) -> tuple:
+    """
+    Everything that shapes the request: only GETs that would be sent
+    identically (same headers, cookies, auth, proxies, ...) share a response
+    """
+    return (
+        url,
+        tuple(sorted((str(k), repr(v)) for k, v in (params or {}).items())),
+        tuple(sorted((str(k).lower(), str(v)) for k, v in (headers or {}).items())),
+        use_proxy,
+        tuple(sorted((k, repr(v)) for k, v in dict({"allow_redirects": True}, **kwargs).items())),
+    )
+
 def get_with_proxy(
     url: str,
     use_proxy: bool = True,
@@ -25,6 +67,7 @@ def get_with_proxy(
     headers: Optional[Dict[str, str]] = None,
     params: Optional[Dict[str, Any]] = None,
     verbose: bool = False,
+    coalesce: bool = True,
     **kwargs
 ) -> requests.Response:
     """
@@ -38,21 +81,56 @@ def get_with_proxy(
         headers: Optional HTTP headers
         params: Optional query parameters
         verbose: Print debug information
+        coalesce: Share one network call between identical in-flight GETs
         **kwargs: Additional arguments passed to requests.get()
     
     Returns:
-        requests.Response object
+        requests.Response object (shared between coalesced callers - don't mutate it)
         
     Raises:
         requests.RequestException: If request fails
     """
+    try:
+        if not coalesce or kwargs.get("stream"):
+            response = _get_with_proxy(url, use_proxy, retry_without_proxy, timeout, headers, params, verbose, **kwargs)
+        else:
+            key = _flight_key(url, params, headers, use_proxy, kwargs)
+            
+            def fetch():
+                response = _get_with_proxy(url, use_proxy, retry_without_proxy, timeout, headers, params, verbose, **kwargs)
+                response.content  # read the body now so every caller can use it
+                return response
+            
+            response = HTTP_FLIGHT.do(key, fetch)
+    except Exception as e:
+        note(classify_exception(e))
+        raise
+    # Tell an observing search whether the site answered or blocked it (coalesced callers too);
+    # a streamed body is left for the caller to read
+    if not kwargs.get("stream"):
+        note(classify_response("*", response))
+    return response
+
+def _get_with_proxy(
+    url: str,
+    use_proxy: bool,
+    retry_without_proxy: bool,
+    timeout: int,
+    headers: Optional[Dict[str, str]],
+    params: Optional[Dict[str, Any]],
+    verbose: bool,
+    **kwargs
+) -> requests.Response:
+    """Uncoalesced GET (see get_with_proxy)"""
     proxies = None
     used_proxy = False
+    proxy_mgr = None
+    proxy_dict = None
     
     if use_proxy:
         proxy_mgr = get_proxy_manager()
         if proxy_mgr and proxy_mgr.proxies:
-            proxy_dict = proxy_mgr.get_next_proxy()
+            proxy_dict = _pick_proxy(proxy_mgr)
             if proxy_dict:
                 proxies = proxy_mgr.get_requests_proxy(proxy_dict)
                 if proxies:
@@ -64,28 +142,36 @@ def get_with_proxy(
         if verbose:
             print(f"[HTTP] GET {url} (proxy={'enabled' if used_proxy else 'disabled'})")
         
-        response = requests.get(
+        response = timed_request(
+            requests.get,
             url,
+            "http_client",
             headers=headers,
             params=params,
             timeout=timeout,
             proxies=proxies,
             **kwargs
         )
+        if used_proxy:
+            _charge(proxy_mgr, proxy_dict, response=response)
         
         return response
         
     except Exception as e:
         if verbose:
             print(f"[HTTP] Error with {'proxy' if used_proxy else 'direct'}: {e}")
+        if used_proxy:
+            _charge(proxy_mgr, proxy_dict, error=e)
         
         # Retry without proxy if enabled and we were using one
         if used_proxy and retry_without_proxy:
             if verbose:
                 print(f"[HTTP] Retrying without proxy...")
             
-            response = requests.get(
+            response = timed_request(
+                requests.get,
                 url,
+                "http_client",
                 headers=headers,
                 params=params,
                 timeout=timeout,
@@ -130,11 +216,13 @@ def post_with_proxy(
     """
     proxies = None
     used_proxy = False
+    proxy_mgr = None
+    proxy_dict = None
     
     if use_proxy:
         proxy_mgr = get_proxy_manager()
         if proxy_mgr and proxy_mgr.proxies:
-            proxy_dict = proxy_mgr.get_next_proxy()
+            proxy_dict = _pick_proxy(proxy_mgr)
             if proxy_dict:
                 proxies = proxy_mgr.get_requests_proxy(proxy_dict)
                 if proxies:
@@ -146,8 +234,10 @@ def post_with_proxy(
         if verbose:
             print(f"[HTTP] POST {url} (proxy={'enabled' if used_proxy else 'disabled'})")
         
-        response = requests.post(
+        response = timed_request(
+            requests.post,
             url,
+            "http_client",
             headers=headers,
             data=data,
             json=json,
@@ -155,20 +245,26 @@ def post_with_proxy(
             proxies=proxies,
             **kwargs
         )
+        if used_proxy:
+            _charge(proxy_mgr, proxy_dict, response=response)
         
         return response
         
     except Exception as e:
         if verbose:
             print(f"[HTTP] Error with {'proxy' if used_proxy else 'direct'}: {e}")
+        if used_proxy:
+            _charge(proxy_mgr, proxy_dict, error=e)
         
         # Retry without proxy if enabled and we were using one
         if used_proxy and retry_without_proxy:
             if verbose:
                 print(f"[HTTP] Retrying without proxy...")
             
-            response = requests.post(
+            response = timed_request(
+                requests.post,
                 url,
+                "http_client",
                 headers=headers,
                 data=data,
                 json=json,
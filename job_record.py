@@ -0,0 +1,271 @@
+"""
+Job Record - compact representations for large sweeps
+A plain result dict carries its own hash table, a fresh copy of the same
+"engine"/"query" strings and an int timestamp per record, and gets copied
+again by normalization and enrichment. JobRecord keeps the common fields in
+__slots__ with the repetitive strings interned; any other key (enrichment's
+emails, company_info, ...) lives in an overflow dict that copies share until
+one of them writes. JobColumns stores many records as one list per field
+(timestamps in a packed array) and hands out JobRecords on access.
+
+Both read like the dicts the rest of the app expects (.get, [], in, items,
+dict(record)); to_dict / to_dicts / json_default convert at JSON boundaries.
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+# Fields every engine fills in, in the order they're listed
+FIELDS = ("engine", "query", "title", "url", "snippet", "company", "location", "ts", "hash")
+STR_FIELDS = tuple(f for f in FIELDS if f != "ts")
+# Values repeated across thousands of records: one shared string each
+INTERN_FIELDS = frozenset(("engine", "query", "company", "location", "source"))
+
+_FIELD_SET = frozenset(FIELDS)
+_MISSING = object()
+_NO_TS = -(2 ** 63)  # "no ts" in the packed timestamp column
+
+
+def _intern(key: str, value: Any) -> Any:
+    if key in INTERN_FIELDS and type(value) is str and len(value) < 256:
+        return sys.intern(value)
+    return value
+
+
+def intern_fields(record: MutableMapping) -> MutableMapping:
+    """Intern the repetitive string values of a plain dict record in place"""
+    for key in INTERN_FIELDS:
+        value = record.get(key)
+        if type(value) is str:
+            record[key] = _intern(key, value)
+    return record
+
+
+class JobRecord(MutableMapping):
+    """A job result as a slotted mapping: fixed fields in slots, the rest copy-on-write"""
+
+    __slots__ = FIELDS + ("_extra", "_shared")
+
+    def __init__(self, data: Optional[Mapping] = None, **fields):
+        self._extra: Optional[Dict[str, Any]] = None
+        self._shared = False
+        for source in (data or {}, fields):
+            for key, value in source.items():
+                self[key] = value
+
+    # ---------------- mapping -----------------
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is _MISSING:
+                raise KeyError(key)
+            return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra is not None else default
+
+    def __contains__(self, key) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def _own_extra(self) -> Dict[str, Any]:
+        """The overflow dict, copied first if another record shares it"""
+        if self._extra is None:
+            self._extra = {}
+        elif self._shared:
+            self._extra = dict(self._extra)
+        self._shared = False
+        return self._extra
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            setattr(self, key, _intern(key, value))
+        else:
+            self._own_extra()[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            if not hasattr(self, key):
+                raise KeyError(key)
+            delattr(self, key)
+        elif self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        else:
+            del self._own_extra()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra:
+            yield from self._extra
+
+    def __len__(self) -> int:
+        return sum(1 for key in FIELDS if hasattr(self, key)) + (len(self._extra) if self._extra else 0)
+
+    def __repr__(self) -> str:
+        return f"JobRecord({self.to_dict()!r})"
+
+    # ---------------- copies -----------------
+
+    def copy(self) -> "JobRecord":
+        """
+        Shallow copy that shares the slot values and, until either side
+        writes an extra field, the overflow dict.
+        """
+        clone = JobRecord.__new__(JobRecord)
+        for key in FIELDS:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                object.__setattr__(clone, key, value)
+        clone._extra = self._extra
+        clone._shared = self._shared = self._extra is not None
+        return clone
+
+    __copy__ = copy
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {key: getattr(self, key) for key in FIELDS if hasattr(self, key)}
+        if self._extra:
+            out.update(self._extra)
+        return out
+
+    def __reduce__(self):
+        return (JobRecord, (self.to_dict(),))
+
+
+def to_dict(record: Mapping) -> Dict[str, Any]:
+    """A plain dict for any record (dicts are returned as-is)"""
+    if isinstance(record, dict):
+        return record
+    return record.to_dict() if isinstance(record, JobRecord) else dict(record)
+
+
+def to_dicts(records: Iterable[Mapping]) -> List[Dict[str, Any]]:
+    """Plain dicts for a list, JobColumns or any iterable of records (for json.dump and friends)"""
+    if isinstance(records, JobColumns):
+        return records.to_dicts()
+    return [to_dict(r) for r in records]
+
+
+def json_default(value: Any) -> Any:
+    """json.dump(..., default=json_default): records become dicts, sets (email extraction) sorted lists, anything else str"""
+    if isinstance(value, JobRecord):
+        return value.to_dict()
+    if isinstance(value, JobColumns):
+        return value.to_dicts()
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+class JobColumns:
+    """
+    Many job records stored column-wise: one list per field in FIELDS, the
+    timestamps packed in an int64 array, and the uncommon keys in a sparse
+    {row: dict} map. Reads like a list of records; indexing and iteration
+    build JobRecords on the fly, slices are JobColumns.
+    """
+
+    def __init__(self, records: Iterable[Mapping] = ()):
+        self._cols: Dict[str, list] = {f: [] for f in STR_FIELDS}
+        self._ts = array("q")
+        self._extra: Dict[int, Dict[str, Any]] = {}
+        self._n = 0
+        self.extend(records)
+
+    # ---------------- writing -----------------
+
+    def append(self, record: Mapping):
+        row = self._n
+        get = record.get
+        for key in STR_FIELDS:
+            self._cols[key].append(_intern(key, get(key, _MISSING)))
+        ts = get("ts", _MISSING)
+        if type(ts) is int and ts != _NO_TS:
+            self._ts.append(ts)
+        else:
+            self._ts.append(_NO_TS)
+        if isinstance(record, JobRecord):
+            if record._extra:
+                # Shared with the record until one of them writes
+                self._extra[row] = record._extra
+                record._shared = True
+        else:
+            extra = {k: v for k, v in record.items() if k not in _FIELD_SET}
+            if extra:
+                self._extra[row] = extra
+        if ts is not _MISSING and self._ts[-1] == _NO_TS:
+            # Non-int timestamps (floats, ISO strings) keep their original value
+            self._extra[row] = dict(self._extra.get(row) or {}, ts=ts)
+        self._n += 1
+
+    def extend(self, records: Iterable[Mapping]):
+        if isinstance(records, JobColumns):
+            records = iter(records)
+        for record in records:
+            self.append(record)
+
+    def clear(self):
+        self.__init__()
+
+    # ---------------- reading -----------------
+
+    def __len__(self) -> int:
+        return self._n
+
+    def __bool__(self) -> bool:
+        return self._n > 0
+
+    def _record(self, row: int) -> JobRecord:
+        record = JobRecord.__new__(JobRecord)
+        for key in STR_FIELDS:
+            value = self._cols[key][row]
+            if value is not _MISSING:
+                object.__setattr__(record, key, value)
+        ts = self._ts[row]
+        if ts != _NO_TS:
+            object.__setattr__(record, "ts", ts)
+        extra = self._extra.get(row)
+        if extra and "ts" in extra and ts == _NO_TS:
+            object.__setattr__(record, "ts", extra["ts"])
+            extra = {k: v for k, v in extra.items() if k != "ts"} or None
+        record._extra = extra
+        record._shared = extra is not None
+        return record
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return JobColumns(self._record(row) for row in range(*index.indices(self._n)))
+        if index < 0:
+            index += self._n
+        if not 0 <= index < self._n:
+            raise IndexError("JobColumns index out of range")
+        return self._record(index)
+
+    def __iter__(self) -> Iterator[JobRecord]:
+        for row in range(self._n):
+            yield self._record(row)
+
+    def column(self, key: str) -> List[Any]:
+        """One field for every row (None where a record lacks it)"""
+        if key == "ts":
+            return [None if ts == _NO_TS else ts for ts in self._ts]
+        if key in self._cols:
+            return [None if v is _MISSING else v for v in self._cols[key]]
+        return [(self._extra.get(row) or {}).get(key) for row in range(self._n)]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        return [self._record(row).to_dict() for row in range(self._n)]
+
+    def __repr__(self) -> str:
+        return f"JobColumns({self._n} records)"
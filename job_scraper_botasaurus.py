@@ -9,9 +9,10 @@ from bs4 import BeautifulSoup
 from urllib.parse import urlparse, quote_plus
 import time
 import re
-from typing import List, Dict, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import hashlib
 from http_client import get_with_proxy
+from pipeline import iter_query_batch, query_key
 
 # Job-specific search terms for better results
 JOB_KEYWORDS = [
@@ -257,27 +258,35 @@ def scrape_job_listings(keyword: str, location: str = "", max_results_per_method
     return all_results[:max_results_per_method * 3]  # Return best results
 
 # Export for GUI integration
-def batch_scrape_jobs(keywords: List[str], locations: List[str] = None, max_per_query: int = 20) -> Dict[str, List[Dict]]:
+def iter_batch_scrape_jobs(keywords: List[str], locations: List[str] = None, max_per_query: int = 20,
+                           concurrency: int = 4, min_interval: float = 2.0) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Yield (query_key, results) as each keyword x location search finishes.
+    Up to `concurrency` searches run at once, started at least min_interval
+    seconds apart; a job already yielded for another query is left out.
+    """
+    def scrape(keyword: str, location: str) -> List[Dict]:
+        print(f"\n📍 Scraping: {query_key(keyword, location)}")
+        return scrape_job_listings(keyword, location, max_results_per_method=max_per_query)
+
+    return iter_query_batch(scrape, keywords, locations, concurrency=concurrency, min_interval=min_interval)
+
+def batch_scrape_jobs(keywords: List[str], locations: List[str] = None, max_per_query: int = 20,
+                      concurrency: int = 4, on_results: Optional[Callable[[str, List[Dict]], None]] = None
+                      ) -> Dict[str, List[Dict]]:
     """
     Batch scrape multiple keywords and locations
     Returns organized results by keyword
+    on_results(query_key, results) is called as each search finishes
     """
-    if not locations:
-        locations = [""]
-    
-    all_results = {}
-    
-    for keyword in keywords:
-        for location in locations:
-            query_key = f"{keyword} @ {location}" if location else keyword
-            
-            print(f"\n📍 Scraping: {query_key}")
-            results = scrape_job_listings(keyword, location, max_results_per_method=max_per_query)
-            
-            all_results[query_key] = results
-            time.sleep(2)  # Throttle between queries
+    found = {}
+    for key, results in iter_batch_scrape_jobs(keywords, locations, max_per_query, concurrency):
+        found[key] = results
+        if on_results:
+            on_results(key, results)
     
-    return all_results
+    # Same key order as the keyword x location loop
+    return {query_key(kw, loc): found.get(query_key(kw, loc), []) for kw in keywords for loc in (locations or [""])}
 
 if __name__ == "__main__":
     # Test
@@ -0,0 +1,258 @@
+"""
+Job Store - persistent SQLite store for every job ever scraped
+Records are upserted by canonical URL (or content hash), keep first_seen /
+last_seen timestamps, and are full-text searchable through an FTS5 index on
+title, snippet and company. JSON/CSV/TXT files are exported from the store.
+"""
+
+import os
+import csv
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from url_canon import canonical_key
+
+DEFAULT_DB_PATH = os.path.join("output", "jobs.db")
+
+# Added to exported records by the store itself, never stored in the record data
+_STORE_FIELDS = ("first_seen", "last_seen", "seen_count")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    canonical_key TEXT UNIQUE,
+    hash TEXT UNIQUE,
+    url TEXT,
+    title TEXT,
+    snippet TEXT,
+    company TEXT,
+    engine TEXT,
+    query TEXT,
+    data TEXT NOT NULL,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    seen_count INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS jobs_last_seen ON jobs(last_seen);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+    title, snippet, company, content='jobs', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN
+    INSERT INTO jobs_fts(rowid, title, snippet, company) VALUES (new.id, new.title, new.snippet, new.company);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, snippet, company) VALUES ('delete', old.id, old.title, old.snippet, old.company);
+END;
+CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE ON jobs BEGIN
+    INSERT INTO jobs_fts(jobs_fts, rowid, title, snippet, company) VALUES ('delete', old.id, old.title, old.snippet, old.company);
+    INSERT INTO jobs_fts(rowid, title, snippet, company) VALUES (new.id, new.title, new.snippet, new.company);
+END;
+"""
+
+
+class JobStore:
+    """SQLite-backed job history with upsert ingestion and full-text search"""
+
+    def __init__(self, path: str = DEFAULT_DB_PATH, verbose: bool = False):
+        self.path = path
+        self.verbose = verbose
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.has_fts = self._init_fts()
+
+    def _init_fts(self) -> bool:
+        try:
+            self.conn.executescript(_FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5: search() falls back to LIKE
+            if self.verbose:
+                print(f"[job_store] FTS5 unavailable ({e}); using LIKE search")
+            return False
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---------------- ingestion -----------------
+
+    def _find(self, key: Optional[str], h: Optional[str]) -> Optional[sqlite3.Row]:
+        if key:
+            row = self.conn.execute("SELECT id, data, seen_count FROM jobs WHERE canonical_key = ?", (key,)).fetchone()
+            if row:
+                return row
+        if h:
+            return self.conn.execute("SELECT id, data, seen_count FROM jobs WHERE hash = ?", (h,)).fetchone()
+        return None
+
+    def _upsert(self, record: Dict, now: str) -> bool:
+        record = {k: v for k, v in record.items() if k not in _STORE_FIELDS}
+        key = canonical_key(record.get("url") or "") or None
+        h = record.get("hash") or None
+        row = self._find(key, h)
+        if row is None:
+            self.conn.execute(
+                "INSERT INTO jobs (canonical_key, hash, url, title, snippet, company, engine, query, data, first_seen, last_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, h, record.get("url"), record.get("title", ""), record.get("snippet", ""),
+                 record.get("company", ""), record.get("engine", ""), record.get("query", ""),
+                 json.dumps(record, default=str), now, now),
+            )
+            return True
+
+        # Newer non-empty fields win; enrichment from earlier runs is kept
+        data = json.loads(row["data"])
+        data.update({k: v for k, v in record.items() if v not in (None, "", [], {})})
+        self.conn.execute(
+            "UPDATE jobs SET url = ?, title = ?, snippet = ?, company = ?, engine = ?, query = ?, data = ?, "
+            "last_seen = ?, seen_count = seen_count + 1 WHERE id = ?",
+            (data.get("url"), data.get("title", ""), data.get("snippet", ""), data.get("company", ""),
+             data.get("engine", ""), data.get("query", ""), json.dumps(data, default=str), now, row["id"]),
+        )
+        return False
+
+    def upsert(self, record: Dict) -> bool:
+        """Insert or refresh one record. Returns True if it was new."""
+        return self.upsert_many([record])[0] == 1
+
+    def upsert_many(self, records: Iterable[Dict]) -> Tuple[int, int]:
+        """Upsert records in one transaction. Returns (new, updated)."""
+        now = datetime.now().isoformat()
+        new = updated = 0
+        with self._lock, self.conn:
+            for record in records:
+                try:
+                    if self._upsert(record, now):
+                        new += 1
+                    else:
+                        updated += 1
+                except sqlite3.IntegrityError:
+                    # key belongs to one row and hash to another - leave both as they are
+                    updated += 1
+        if self.verbose:
+            print(f"[job_store] {new} new, {updated} updated ({self.path})")
+        return new, updated
+
+    def contains(self, url: str) -> bool:
+        """True if a job with this (canonicalized) URL is stored"""
+        key = canonical_key(url or "")
+        if not key:
+            return False
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM jobs WHERE canonical_key = ?", (key,)).fetchone() is not None
+
+    # ---------------- queries -----------------
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    @staticmethod
+    def _row_to_record(row: sqlite3.Row) -> Dict:
+        record = json.loads(row["data"])
+        record["first_seen"] = row["first_seen"]
+        record["last_seen"] = row["last_seen"]
+        record["seen_count"] = row["seen_count"]
+        return record
+
+    def iter_jobs(self, since: Optional[str] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """All stored jobs (optionally last seen at/after an ISO timestamp), newest first"""
+        sql = "SELECT data, first_seen, last_seen, seen_count FROM jobs"
+        params: List = []
+        if since:
+            sql += " WHERE last_seen >= ?"
+            params.append(since)
+        sql += " ORDER BY last_seen DESC, id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            cursor = self.conn.execute(sql, params)
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(500)
+            if not rows:
+                break
+            for row in rows:
+                yield self._row_to_record(row)
+
+    def search(self, text: str, limit: int = 50) -> List[Dict]:
+        """Full-text search over title, snippet and company, best matches first"""
+        text = (text or "").strip()
+        if not text:
+            return []
+        with self._lock:
+            if self.has_fts:
+                # Raw FTS syntax first; if it doesn't parse (stray quotes etc.), as a phrase
+                for match in (text, '"' + text.replace('"', '""') + '"'):
+                    try:
+                        rows = self.conn.execute(
+                            "SELECT j.data, j.first_seen, j.last_seen, j.seen_count FROM jobs_fts "
+                            "JOIN jobs j ON j.id = jobs_fts.rowid WHERE jobs_fts MATCH ? "
+                            "ORDER BY bm25(jobs_fts) LIMIT ?",
+                            (match, limit),
+                        ).fetchall()
+                        return [self._row_to_record(r) for r in rows]
+                    except sqlite3.OperationalError:
+                        continue
+                return []
+            like = f"%{text}%"
+            rows = self.conn.execute(
+                "SELECT data, first_seen, last_seen, seen_count FROM jobs "
+                "WHERE title LIKE ? OR snippet LIKE ? OR company LIKE ? ORDER BY last_seen DESC LIMIT ?",
+                (like, like, like, limit),
+            ).fetchall()
+        return [self._row_to_record(r) for r in rows]
+
+    # ---------------- export views -----------------
+
+    def export_json(self, path: str, since: Optional[str] = None) -> int:
+        """Write stored jobs as a JSON array (streamed, not built in memory)"""
+        n = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("[")
+            for record in self.iter_jobs(since=since):
+                body = json.dumps(record, indent=2, default=str).replace("\n", "\n  ")
+                f.write(("," if n else "") + "\n  " + body)
+                n += 1
+            f.write("\n]" if n else "]")
+        return n
+
+    def export_csv(self, path: str, since: Optional[str] = None) -> int:
+        n = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["title", "url", "engine", "query", "snippet", "first_seen", "last_seen"])
+            for r in self.iter_jobs(since=since):
+                w.writerow([r.get("title", ""), r.get("url", ""), r.get("engine", ""), r.get("query", ""),
+                            r.get("snippet", ""), r.get("first_seen", ""), r.get("last_seen", "")])
+                n += 1
+        return n
+
+    def export_txt(self, path: str, since: Optional[str] = None) -> int:
+        n = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for r in self.iter_jobs(since=since):
+                f.write(("\n" if n else "") + f"{r.get('title', '').strip()} | {r.get('url', '')} | {r.get('engine', '')} | {r.get('query', '')}")
+                n += 1
+        return n
@@ -0,0 +1,140 @@
+"""
+JSONL streaming output
+Records are appended to a .jsonl file the moment they are produced, and a
+small SQLite index next to it remembers which canonical URLs were already
+written. Memory stays flat however large the sweep and an interrupted run
+keeps everything written so far. Both files belong to one run: a new run
+starts them empty, a resumed one continues them without duplicating records.
+"""
+
+import os
+import json
+import sqlite3
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from url_canon import canonical_key
+
+
+class SeenIndex:
+    """On-disk set of dedupe keys"""
+
+    def __init__(self, path: str, commit_every: int = 200):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.commit_every = commit_every
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY)")
+        self.conn.commit()
+
+    def add(self, key: str) -> bool:
+        """Record key; True if it was not seen before"""
+        with self._lock:
+            cur = self.conn.execute("INSERT OR IGNORE INTO seen (key) VALUES (?)", (key,))
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self.conn.commit()
+                self._pending = 0
+            return cur.rowcount == 1
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM seen WHERE key = ?", (key,)).fetchone() is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("DELETE FROM seen")
+            self.conn.commit()
+            self._pending = 0
+
+    def close(self):
+        with self._lock:
+            self.conn.commit()
+            self.conn.close()
+
+
+class JsonlSink:
+    """Append-only JSONL writer with on-disk dedupe by canonical URL"""
+
+    def __init__(self, path: str, index_path: Optional[str] = None, resume: bool = False, verbose: bool = False):
+        """
+        Args:
+            path: JSONL file
+            index_path: Dedupe index (default: <path>.seen.db)
+            resume: Continue the file and index of an interrupted run; otherwise
+                    both start empty so an earlier run's URLs aren't dropped as duplicates
+        """
+        self.path = path
+        self.verbose = verbose
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.index = SeenIndex(index_path or path + ".seen.db")
+        if not resume:
+            self.index.clear()
+        self._lock = threading.Lock()
+        self._file = open(path, "a" if resume else "w", encoding="utf-8")
+        self.written = 0
+        self.skipped = 0
+
+    def write(self, record: Dict) -> bool:
+        """Append record unless its URL was already written. Returns True if written."""
+        key = canonical_key(record.get("url") or "") or record.get("hash")
+        if not key or not self.index.add(key):
+            self.skipped += 1
+            return False
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()  # each record survives a crash of this process
+            self.written += 1
+        return True
+
+    def write_many(self, records: Iterable[Dict]) -> int:
+        return sum(1 for r in records if self.write(r))
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.index.close()
+        if self.verbose:
+            print(f"[stream] {self.written} written, {self.skipped} duplicates skipped -> {self.path}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    """Yield records from a JSONL file, skipping a torn last line from an interrupted write"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def iter_chunks(records: Iterable[Dict], size: int = 500) -> Iterator[List[Dict]]:
+    """Group a record stream into lists of at most size records"""
+    chunk: List[Dict] = []
+    for r in records:
+        chunk.append(r)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
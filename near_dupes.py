@@ -0,0 +1,226 @@
+"""
+Near-duplicate job detection
+The same posting syndicated to Indeed, LinkedIn, SimplyHired and the
+company's own Greenhouse/Lever board arrives under different URLs.
+Records get a MinHash signature over the normalized words of title,
+company and snippet (word order and site-specific decoration vary between
+copies, so set similarity works better than SimHash here). LSH bands give
+sub-linear candidate lookup, and matching copies are collapsed into one
+canonical record.
+Only copies of one posting are merged: two records that both name an
+employer must name the same one, and a record with nothing but a title
+(no company, no snippet words beyond the title) is never merged, since a
+bare "Plumber" says nothing about which posting it is.
+"""
+
+import re
+import random
+import hashlib
+import importlib.util
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlparse
+
+# NumPy is imported on the first signature, not at startup
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+NUM_PERM = 32
+# Universal hashing (a*h + b) mod p with 32-bit token hashes stays below 2**63
+_PRIME = (1 << 31) - 1
+_rng = random.Random(1337)  # fixed seed: signatures are stable across runs
+_PERMS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+
+@lru_cache(maxsize=1)
+def _perm_arrays():
+    """(a, b) permutation columns for the vectorized MinHash"""
+    import numpy as np
+    return (np.array([a for a, _ in _PERMS], dtype=np.uint64)[:, None],
+            np.array([b for _, b in _PERMS], dtype=np.uint64)[:, None])
+
+# Words that differ between syndicated copies but say nothing about the job
+NOISE_WORDS = {
+    "indeed", "linkedin", "glassdoor", "simplyhired", "ziprecruiter", "monster",
+    "dice", "greenhouse", "lever", "com", "www", "job", "jobs", "hiring",
+    "apply", "now", "the", "a", "an", "and", "or", "of", "in", "at", "for",
+    "to", "with", "is", "on", "new",
+}
+
+# Hosts where the employer publishes directly - preferred as the canonical copy
+DIRECT_HOST_HINTS = (
+    "greenhouse.io", "lever.co", "workday", "icims.com", "ashbyhq.com",
+    "smartrecruiters.com", "careers.", "jobs.",
+)
+
+# Aggregators - least preferred as canonical
+AGGREGATOR_HOST_HINTS = (
+    "indeed.com", "linkedin.com", "glassdoor.com", "simplyhired.com",
+    "ziprecruiter.com", "monster.com", "dice.com", "careerbuilder.com",
+)
+
+# Legal-form suffixes dropped when comparing employer names
+COMPANY_SUFFIXES = {"inc", "llc", "ltd", "corp", "corporation", "co", "company", "gmbh", "plc"}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def _tokens(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in NOISE_WORDS]
+
+
+def _token_hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "big")
+
+
+def record_tokens(record: Dict) -> Set[str]:
+    """Normalized words of title, company and snippet"""
+    return set(_tokens(f"{record.get('title', '')} {record.get('company', '')} {record.get('snippet', '')}"))
+
+
+def minhash(tokens: Set[str]) -> Tuple[int, ...]:
+    """MinHash signature (NUM_PERM values) of a token set"""
+    if not tokens:
+        return tuple([_PRIME] * NUM_PERM)
+    hashes = [_token_hash(t) for t in tokens]
+    if HAS_NUMPY:
+        import numpy as np
+        a, b = _perm_arrays()
+        h = np.array(hashes, dtype=np.uint64)[None, :]
+        return tuple(((a * h + b) % _PRIME).min(axis=1).tolist())
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMS)
+
+
+def estimated_similarity(sig_a: Sequence[int], sig_b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity of the sets behind two signatures"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+def _title_set(record: Dict) -> Set[str]:
+    return set(_tokens(record.get("title", "")))
+
+
+def _company_key(record: Dict) -> str:
+    """Normalized employer name ("" when the record has none)"""
+    return " ".join(t for t in _tokens(record.get("company", "")) if t not in COMPANY_SUFFIXES)
+
+
+def _detail_set(record: Dict) -> Set[str]:
+    """Company and snippet words that aren't already in the title"""
+    return record_tokens(record) - _title_set(record)
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def source_rank(url: str) -> int:
+    """0 = employer's own board, 1 = unknown site, 2 = aggregator"""
+    host = urlparse(url or "").netloc.lower()
+    if any(h in host for h in DIRECT_HOST_HINTS):
+        return 0
+    if any(h in host for h in AGGREGATOR_HOST_HINTS):
+        return 2
+    return 1
+
+
+class NearDupIndex:
+    """MinHash index with LSH banding for near-duplicate lookup"""
+
+    def __init__(self, threshold: float = 0.7, bands: int = 8, min_title_similarity: float = 0.5):
+        """
+        Args:
+            threshold: Estimated Jaccard similarity of two records' words to call them
+                       duplicates; the words beyond the title must also reach it
+            bands: LSH bands the signature is split into (NUM_PERM / bands rows each);
+                   8 bands of 4 rows catch most pairs above ~0.7 similarity
+            min_title_similarity: Title word Jaccard both records must also reach,
+                                  so differently titled jobs at one company stay apart
+        """
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self.min_title_similarity = min_title_similarity
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(bands)]
+        self._signatures: List[Tuple[int, ...]] = []
+        self._titles: List[Set[str]] = []
+        self._details: List[Set[str]] = []
+        self._companies: List[str] = []
+        self.cluster_of: List[int] = []  # record index -> cluster id
+        self.clusters: List[List[Dict]] = []
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows]
+
+    def find(self, record: Dict, signature: Optional[Tuple[int, ...]] = None) -> Optional[int]:
+        """Cluster id of an indexed near-duplicate of record, if any"""
+        detail = _detail_set(record)
+        if not detail:
+            return None  # title only: nothing to tell this posting from another
+        if signature is None:
+            signature = minhash(record_tokens(record))
+        title = _title_set(record)
+        company = _company_key(record)
+        checked = set()
+        for band, key in self._band_keys(signature):
+            for idx in self._buckets[band].get(key, ()):
+                if idx in checked:
+                    continue
+                checked.add(idx)
+                if company and self._companies[idx] and company != self._companies[idx]:
+                    continue
+                if estimated_similarity(signature, self._signatures[idx]) < self.threshold:
+                    continue
+                if _jaccard(title, self._titles[idx]) < self.min_title_similarity:
+                    continue
+                if not self._details[idx] or _jaccard(detail, self._details[idx]) < self.threshold:
+                    continue
+                return self.cluster_of[idx]
+        return None
+
+    def add(self, record: Dict) -> bool:
+        """Index record. Returns True if it joined an existing cluster (a near-duplicate)."""
+        signature = minhash(record_tokens(record))
+        cluster = self.find(record, signature)
+        idx = len(self._signatures)
+        self._signatures.append(signature)
+        self._titles.append(_title_set(record))
+        self._details.append(_detail_set(record))
+        self._companies.append(_company_key(record))
+        for band, key in self._band_keys(signature):
+            self._buckets[band].setdefault(key, []).append(idx)
+        if cluster is None:
+            self.clusters.append([record])
+            self.cluster_of.append(len(self.clusters) - 1)
+            return False
+        self.clusters[cluster].append(record)
+        self.cluster_of.append(cluster)
+        return True
+
+    def canonical_records(self) -> List[Dict]:
+        """
+        One record per cluster, in first-seen order. The canonical copy is the
+        employer's own posting when present, otherwise the first seen; the
+        other copies' URLs are kept in "also_seen".
+        """
+        out = []
+        for members in self.clusters:
+            best = min(range(len(members)), key=lambda i: (source_rank(members[i].get("url", "")), i))
+            canonical = dict(members[best])
+            if len(members) > 1:
+                also_seen = [m.get("url") for i, m in enumerate(members) if i != best and m.get("url")]
+                also_seen += [u for u in canonical.get("also_seen", []) if u not in also_seen]
+                canonical["also_seen"] = also_seen
+                canonical["duplicate_count"] = len(members) - 1
+            out.append(canonical)
+        return out
+
+
+def collapse_near_duplicates(records: List[Dict], **index_kwargs) -> List[Dict]:
+    """Cluster near-duplicate records and keep one canonical record per posting"""
+    index = NearDupIndex(**index_kwargs)
+    for r in records:
+        index.add(r)
+    return index.canonical_records()
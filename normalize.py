@@ -1,13 +1,17 @@
 import re
-from urllib.parse import urlparse
+import importlib.util
+from functools import lru_cache
+from url_canon import canonicalize_url
+from job_record import intern_fields
 
-def clean_url(u: str) -> str:
+# NumPy is imported by the first scorer, not at startup
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+def clean_url(u: str, resolve: bool = False) -> str:
+    """Canonical job URL (see url_canon.canonicalize_url)"""
     if not u:
         return u
-    # Drop tracking query params (basic heuristic)
-    parsed = urlparse(u)
-    base = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-    return base.rstrip('/')
+    return canonicalize_url(u, resolve=resolve)
 
 JOB_HINT_WORDS = [
     "job", "jobs", "career", "careers", "apply", "hiring", "position", "opening", "vacancy", "contract", "freelance"
@@ -17,30 +21,103 @@ SERVICE_HINT_WORDS = [
     "repair", "support", "maintenance", "painting", "painter", "handyman", "landscaping", "lawn", "it"
 ]
 
-def relevance_score(title: str, snippet: str, keywords: list[str] | None = None) -> float:
-    text = f"{title} {snippet}".lower()
-    score = 0.0
-    # base hints
-    for w in JOB_HINT_WORDS:
-        if w in text:
-            score += 1.0
-    for w in SERVICE_HINT_WORDS:
-        if w in text:
-            score += 0.8
-    # keyword boost
-    if keywords:
-        for k in keywords:
+JOB_HINT_WEIGHT = 1.0
+SERVICE_HINT_WEIGHT = 0.8
+KEYWORD_WEIGHT = 1.2
+
+
+class RelevanceScorer:
+    """
+    Relevance scorer compiled once per keyword set.
+
+    Hint words and keywords are merged into one pattern table with summed
+    weights (a keyword that is also a hint word counts for both). Batches
+    are scored column-wise: each pattern is scanned across all unique texts
+    with C-level substring search, and the hit matrix is reduced against the
+    weight vector. Scores equal the per-record version: each pattern that
+    occurs as a substring adds its weight once.
+    """
+
+    def __init__(self, keywords: list[str] | None = None):
+        weights: dict[str, float] = {}
+        for w in JOB_HINT_WORDS:
+            weights[w] = weights.get(w, 0.0) + JOB_HINT_WEIGHT
+        for w in SERVICE_HINT_WORDS:
+            weights[w] = weights.get(w, 0.0) + SERVICE_HINT_WEIGHT
+        for k in keywords or []:
             k = (k or "").lower().strip()
-            if not k:
-                continue
-            if k in text:
-                score += 1.2
-    return score
+            if k:
+                weights[k] = weights.get(k, 0.0) + KEYWORD_WEIGHT
+
+        self.patterns = list(weights)
+        self.weights = [weights[p] for p in self.patterns]
+        self._table = tuple(zip(self.patterns, self.weights))
+        self._weights_array = None
+        if HAS_NUMPY:
+            import numpy as np
+            self._weights_array = np.array(self.weights, dtype=np.float64)
+
+    def score_text(self, text: str) -> float:
+        """Score already-lowercased text"""
+        return sum(w for p, w in self._table if p in text)
+
+    def score(self, title: str, snippet: str) -> float:
+        return self.score_text(f"{title} {snippet}".lower())
+
+    def score_batch(self, records: list[dict]):
+        """
+        Score many records in one call.
+        Returns a NumPy float array when NumPy is installed, else a list.
+        """
+        texts = [f"{r.get('title', '')} {r.get('snippet', '')}".lower() for r in records]
+        if not HAS_NUMPY:
+            return [self.score_text(t) for t in texts]
+        import numpy as np
+        if not texts:
+            return np.zeros(0, dtype=np.float64)
+
+        # The same result often arrives from several engines: score each text once
+        slot: dict[str, int] = {}
+        inverse = np.fromiter((slot.setdefault(t, len(slot)) for t in texts), dtype=np.intp, count=len(texts))
+        unique = list(slot)
+        hits = np.empty((len(unique), len(self.patterns)), dtype=bool)
+        for col, p in enumerate(self.patterns):
+            hits[:, col] = np.fromiter((p in t for t in unique), dtype=bool, count=len(unique))
+        return (hits @ self._weights_array)[inverse]
+
+    def filter(self, records: list[dict], threshold: float = 1.0) -> list[dict]:
+        """Records whose score meets threshold, in their original order"""
+        if not records:
+            return []
+        scores = self.score_batch(records)
+        if HAS_NUMPY:
+            import numpy as np
+            return [records[i] for i in np.flatnonzero(scores >= threshold)]
+        return [r for r, sc in zip(records, scores) if sc >= threshold]
+
+
+@lru_cache(maxsize=64)
+def _cached_scorer(keywords: tuple[str, ...]) -> RelevanceScorer:
+    return RelevanceScorer(list(keywords))
+
+
+def get_scorer(keywords: list[str] | None = None) -> RelevanceScorer:
+    """Compiled scorer for this keyword set (built once, then reused)"""
+    return _cached_scorer(tuple(keywords or ()))
+
+
+def relevance_score(title: str, snippet: str, keywords: list[str] | None = None) -> float:
+    return get_scorer(keywords).score(title, snippet)
 
 def is_relevant(title: str, snippet: str, keywords: list[str] | None = None, threshold: float = 1.0) -> bool:
     return relevance_score(title, snippet, keywords) >= threshold
 
-def normalize_record(r: dict) -> dict:
-    r = dict(r)
-    r["url"] = clean_url(r.get("url"))
+def filter_relevant(records: list[dict], keywords: list[str] | None = None, threshold: float = 1.0) -> list[dict]:
+    """Batch version of is_relevant over result dicts (title/snippet keys)"""
+    return get_scorer(keywords).filter(records, threshold)
+
+def normalize_record(r: dict, resolve_redirects: bool = False) -> dict:
+    # JobRecords copy-on-write; plain dicts share one engine/query/company string
+    r = intern_fields(r.copy())
+    r["url"] = clean_url(r.get("url"), resolve=resolve_redirects)
     return r
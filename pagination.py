@@ -0,0 +1,88 @@
+"""
+Lazy page walker for paginated job-site scrapers.
+Fetches page N+1 in the background while the consumer works through
+page N - only if page N doesn't already cover what the consumer asked
+for - and stops as soon as the consumer stops iterating.
+"""
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Iterable, Optional, Any, Dict
+
+# Safety cap so a site that keeps returning the same page cannot loop forever
+DEFAULT_MAX_PAGES = 10
+
+
+def iter_pages(
+    fetch_page: Callable[[int], Optional[Any]],
+    parse_page: Callable[[Any, int], Iterable[Dict]],
+    max_pages: int = DEFAULT_MAX_PAGES,
+    prefetch: bool = True,
+    limit: Optional[int] = None,
+) -> Iterator[Dict]:
+    """
+    Walk result pages lazily and yield parsed records one by one.
+
+    Args:
+        fetch_page: Called with a 0-based page index, returns a response (or None on failure)
+        parse_page: Called with (response, page_index), returns the records on that page
+        max_pages: Hard cap on the number of pages fetched
+        prefetch: Fetch the next page while the consumer works through the current one
+        limit: Records the consumer wants in total (None = unknown). Once the
+               pages so far cover it, no further page is requested.
+
+    Yields:
+        Records not seen on an earlier page (deduplicated by URL).
+        Iteration ends on a failed fetch, an empty page, a page with
+        nothing new, when limit records were yielded or when max_pages is reached.
+    """
+    if max_pages <= 0 or (limit is not None and limit <= 0):
+        return
+
+    seen_urls = set()
+    yielded = 0
+    executor = ThreadPoolExecutor(max_workers=1) if prefetch and max_pages > 1 else None
+    pending = None
+
+    try:
+        for page in range(max_pages):
+            if pending is not None:
+                resp = pending.result()
+                pending = None
+            else:
+                resp = fetch_page(page)
+
+            if resp is None:
+                return
+
+            # Parse first: whether another page is needed depends on what this one holds
+            new_records = []
+            for record in parse_page(resp, page):
+                url = record.get("url")
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+                new_records.append(record)
+
+            if not new_records:
+                return
+            if limit is not None:
+                new_records = new_records[:limit - yielded]
+            more_needed = limit is None or yielded + len(new_records) < limit
+
+            # Start on the next page while the consumer handles this one
+            if executor is not None and more_needed and page + 1 < max_pages:
+                # In the caller's context, so its block_detector.observe() sees this fetch
+                pending = executor.submit(contextvars.copy_context().run, fetch_page, page + 1)
+
+            for record in new_records:
+                yielded += 1
+                yield record
+
+            if not more_needed:
+                return
+    finally:
+        if pending is not None:
+            pending.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
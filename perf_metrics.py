@@ -0,0 +1,345 @@
+"""
+Performance metrics - where a sweep's time goes
+Process-wide counters, latency histograms and stage timers fed by cheap hooks
+in the HTTP client, the engine registry, the search engines, the email
+extractor and the enrichment pipeline. At the end of a run the collector
+writes a JSON report and prints a human summary; long-running modes can
+also expose the same numbers as Prometheus text on /metrics.
+"""
+
+import os
+import json
+import time
+import bisect
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_REPORT_PATH = os.path.join("output", "perf_report.json")
+
+# Seconds; the last bucket is +Inf
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Hosts beyond this many distinct values are counted as "other"
+MAX_HOSTS = 200
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram"""
+
+    def __init__(self, bounds: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (last finite bound for the +Inf bucket)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return self.bounds[min(i, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    def to_dict(self) -> Dict:
+        return {
+            "count": self.count, "sum": round(self.sum, 4),
+            "avg": round(self.sum / self.count, 4) if self.count else 0.0,
+            "p50": self.quantile(0.5), "p90": self.quantile(0.9), "p99": self.quantile(0.99),
+            "buckets": {("+Inf" if i == len(self.bounds) else str(self.bounds[i])): c for i, c in enumerate(self.counts)},
+        }
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Thread-safe collector of counters, histograms and stage timers"""
+
+    def __init__(self):
+        self.enabled = True
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.time()
+            self.counters: Dict[str, Dict[Labels, float]] = {}
+            self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+            self._hosts = set()
+
+    # ---------------- recording -----------------
+
+    def inc(self, name: str, value: float = 1, **labels):
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = _labels(labels)
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            hist = series.get(key)
+            if hist is None:
+                hist = series[key] = Histogram()
+            hist.observe(value)
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time a run stage (search, enrich, extract, ...); nested and repeated use adds up"""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - t0, stage=name)
+
+    def host_label(self, url: str) -> str:
+        try:
+            host = urlsplit(url).hostname or "unknown"
+        except ValueError:
+            return "unknown"
+        with self._lock:
+            if host in self._hosts:
+                return host
+            if len(self._hosts) >= MAX_HOSTS:
+                return "other"
+            self._hosts.add(host)
+        return host
+
+    def cache(self, cache: str, hit: bool):
+        self.inc("cache_lookups_total", cache=cache, result="hit" if hit else "miss")
+
+    # ---------------- views -----------------
+
+    def _counter_by(self, name: str, label: str) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for key, v in self.counters.get(name, {}).items():
+            lv = dict(key).get(label, "")
+            out[lv] = out.get(lv, 0) + v
+        return out
+
+    def _hist_by(self, name: str, label: str) -> Dict[str, Histogram]:
+        out: Dict[str, Histogram] = {}
+        for key, h in self.histograms.get(name, {}).items():
+            lv = dict(key).get(label, "")
+            agg = out.get(lv)
+            if agg is None:
+                agg = out[lv] = Histogram(h.bounds)
+            agg.counts = [a + b for a, b in zip(agg.counts, h.counts)]
+            agg.count += h.count
+            agg.sum += h.sum
+        return out
+
+    def cache_rates(self) -> Dict[str, Dict[str, float]]:
+        """Hit rate per cache, including the single-flight coalescers"""
+        rates: Dict[str, Dict[str, float]] = {}
+        for key, v in self.counters.get("cache_lookups_total", {}).items():
+            d = dict(key)
+            entry = rates.setdefault(d["cache"], {"hits": 0, "lookups": 0})
+            entry["lookups"] += v
+            if d["result"] == "hit":
+                entry["hits"] += v
+        try:
+            from single_flight import HTTP_FLIGHT, SEARCH_FLIGHT
+            for flight in (HTTP_FLIGHT, SEARCH_FLIGHT):
+                if flight.calls:
+                    rates[f"flight:{flight.name}"] = {"hits": flight.coalesced + flight.reused, "lookups": flight.calls}
+        except ImportError:
+            pass
+        for entry in rates.values():
+            entry["hit_rate"] = round(entry["hits"] / entry["lookups"], 3) if entry["lookups"] else 0.0
+        return rates
+
+    def proxy_success(self) -> Dict[str, float]:
+        outcomes = self._counter_by("proxy_requests_total", "outcome")
+        total = sum(outcomes.values())
+        ok = outcomes.get("ok", 0)
+        return {"ok": ok, "total": total, "success_rate": round(ok / total, 3) if total else 0.0}
+
+    def report(self) -> Dict:
+        """Everything collected so far as a JSON-serializable dict"""
+        with self._lock:
+            counters = {
+                name: [{"labels": dict(k), "value": v} for k, v in series.items()]
+                for name, series in self.counters.items()
+            }
+            histograms = {
+                name: [{"labels": dict(k), **h.to_dict()} for k, h in series.items()]
+                for name, series in self.histograms.items()
+            }
+            stages = {s: h.to_dict()["sum"] for s, h in self._hist_by("stage_seconds", "stage").items()}
+            bytes_total = sum(self._counter_by("http_bytes_total", "host").values())
+            caches = self.cache_rates()
+            proxies = self.proxy_success()
+        return {
+            "started": datetime.fromtimestamp(self.started).isoformat(),
+            "elapsed_s": round(time.time() - self.started, 3),
+            "stages_s": stages,
+            "bytes_transferred": int(bytes_total),
+            "caches": caches,
+            "proxies": proxies,
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def write_report(self, path: str = DEFAULT_REPORT_PATH) -> str:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.report(), f, indent=2)
+        return path
+
+    def summary(self, top_hosts: int = 8) -> str:
+        """Human-readable run summary"""
+        with self._lock:
+            elapsed = time.time() - self.started
+            stages = self._hist_by("stage_seconds", "stage")
+            engine_lat = self._hist_by("engine_search_seconds", "engine")
+            engine_results = self._counter_by("engine_results_total", "engine")
+            engine_errors = {}
+            for key, v in self.counters.get("engine_searches_total", {}).items():
+                d = dict(key)
+                if d.get("outcome") == "error":
+                    engine_errors[d["engine"]] = engine_errors.get(d["engine"], 0) + v
+            host_lat = self._hist_by("http_request_seconds", "host")
+            host_bytes = self._counter_by("http_bytes_total", "host")
+            caches = self.cache_rates()
+            proxies = self.proxy_success()
+            blocks = self._counter_by("block_outcomes_total", "outcome")
+            skipped = sum(self._counter_by("block_skipped_total", "engine").values())
+
+        lines = [f"=== Performance summary ({elapsed:.1f}s) ==="]
+        if stages:
+            lines.append("Stages:  " + " | ".join(f"{s} {h.sum:.1f}s" for s, h in
+                                                 sorted(stages.items(), key=lambda kv: -kv[1].sum)))
+        for engine, h in sorted(engine_lat.items(), key=lambda kv: -kv[1].sum):
+            lines.append(f"Engine {engine}: {h.count} searches, p50 {h.quantile(0.5)}s p90 {h.quantile(0.9)}s, "
+                         f"{int(engine_results.get(engine, 0))} results, {int(engine_errors.get(engine, 0))} errors")
+        for host, h in sorted(host_lat.items(), key=lambda kv: -kv[1].sum)[:top_hosts]:
+            lines.append(f"Host {host}: {h.count} requests, {h.sum:.1f}s total, p90 {h.quantile(0.9)}s, "
+                         f"{host_bytes.get(host, 0) / 1024:.0f} KB")
+        if caches:
+            lines.append("Caches:  " + " | ".join(f"{name} {c['hit_rate']:.0%} ({int(c['hits'])}/{int(c['lookups'])})"
+                                                 for name, c in sorted(caches.items())))
+        if proxies["total"]:
+            lines.append(f"Proxies: {int(proxies['ok'])}/{int(proxies['total'])} ok ({proxies['success_rate']:.0%})")
+        if blocks:
+            lines.append("Routes:  " + " | ".join(f"{o} {int(n)}" for o, n in sorted(blocks.items())) +
+                         f" | {int(skipped)} attempts skipped while backing off")
+        lines.append(f"Bytes:   {sum(host_bytes.values()) / 1048576:.2f} MB")
+        return "\n".join(lines)
+
+    def prometheus_text(self) -> str:
+        """Prometheus text exposition format"""
+        out: List[str] = []
+
+        def fmt(key: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+            items = list(key) + ([extra] if extra else [])
+            if not items:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items) + "}"
+
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                metric = f"jobgoblin_{name}"
+                out.append(f"# TYPE {metric} counter")
+                for key, v in series.items():
+                    out.append(f"{metric}{fmt(key)} {v}")
+            for name, series in sorted(self.histograms.items()):
+                metric = f"jobgoblin_{name}"
+                out.append(f"# TYPE {metric} histogram")
+                for key, h in series.items():
+                    cumulative = 0
+                    for i, c in enumerate(h.counts):
+                        cumulative += c
+                        le = "+Inf" if i == len(h.bounds) else str(h.bounds[i])
+                        out.append(f"{metric}_bucket{fmt(key, ('le', le))} {cumulative}")
+                    out.append(f"{metric}_sum{fmt(key)} {h.sum}")
+                    out.append(f"{metric}_count{fmt(key)} {h.count}")
+        out.append(f"jobgoblin_uptime_seconds {time.time() - self.started:.3f}")
+        return "\n".join(out) + "\n"
+
+
+METRICS = Metrics()
+
+
+# ============= HOOK HELPERS =============
+
+def observe_http(url: str, seconds: float, response=None, error: Optional[BaseException] = None,
+                 proxied: bool = False, source: str = "http"):
+    """Record one HTTP request: count, latency, bytes and proxy outcome"""
+    if not METRICS.enabled:
+        return
+    host = METRICS.host_label(url)
+    status = str(response.status_code) if response is not None else "error"
+    METRICS.inc("http_requests_total", host=host, source=source, status=status)
+    METRICS.observe("http_request_seconds", seconds, host=host)
+    if response is not None:
+        size = response.headers.get("Content-Length")
+        if size is None and getattr(response, "_content_consumed", False):
+            size = len(response.content or b"")
+        if size:
+            METRICS.inc("http_bytes_total", int(size), host=host)
+    if proxied:
+        ok = response is not None and response.status_code < 400
+        METRICS.inc("proxy_requests_total", outcome="ok" if ok else "fail", source=source)
+
+
+def timed_request(fetch, url: str, source: str, proxies=None, **kwargs):
+    """fetch(url, proxies=proxies, **kwargs) (requests.get, session.post, ...) with request metrics"""
+    t0 = time.perf_counter()
+    try:
+        response = fetch(url, proxies=proxies, **kwargs)
+    except Exception as e:
+        observe_http(url, time.perf_counter() - t0, error=e, proxied=bool(proxies), source=source)
+        raise
+    observe_http(url, time.perf_counter() - t0, response=response, proxied=bool(proxies), source=source)
+    return response
+
+
+# ============= PROMETHEUS ENDPOINT =============
+
+def serve_prometheus(port: int, host: str = "127.0.0.1", metrics: Metrics = METRICS):
+    """Serve metrics.prometheus_text() on http://host:port/metrics from a daemon thread"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = metrics.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
@@ -0,0 +1,345 @@
+"""
+Pipelined stages - overlap searching, enrichment, email extraction and sending
+Each stage runs its own worker threads and reads from a bounded queue, so a
+slow stage applies backpressure upstream instead of letting work pile up in
+memory, and the first enriched leads come out while searches are still
+running. Total wall time approaches the slowest stage instead of the sum.
+
+    search (N) -> normalize/dedupe (1) -> enrich (N) -> email extract (N) -> outbox (1)
+"""
+
+import time
+import queue
+import threading
+from urllib.parse import urlparse
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+_DONE = object()
+
+
+class Stage:
+    """One pipeline stage: func(item) returns an iterable of outputs (or None)"""
+
+    def __init__(self, name: str, func: Callable[[Any], Optional[Iterable[Any]]],
+                 workers: int = 1, queue_size: int = 100):
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.processed = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.max_depth = 0
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "processed": self.processed, "emitted": self.emitted,
+                "errors": self.errors, "busy_s": round(self.busy, 2), "max_queue": self.max_depth}
+
+
+class Pipeline:
+    """Runs items through a chain of stages connected by bounded queues"""
+
+    def __init__(self, stages: Sequence[Stage], verbose: bool = False):
+        self.stages = list(stages)
+        self.verbose = verbose
+        self._stop = threading.Event()
+        self.elapsed = 0.0
+
+    def stop(self):
+        """Stop feeding and skip remaining work; run() returns what already came out"""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
+
+    def run(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Yield the last stage's outputs as they are produced"""
+        t0 = time.monotonic()
+        queues = [queue.Queue(maxsize=s.queue_size) for s in self.stages]
+        out: "queue.Queue" = queue.Queue()  # drained by the caller; unbounded so workers never block on exit
+        alive = [s.workers for s in self.stages]
+        alive_lock = threading.Lock()
+
+        def feed():
+            try:
+                for item in items:
+                    if self._stop.is_set():
+                        break
+                    queues[0].put(item)  # blocks while the first stage is saturated
+            finally:
+                for _ in range(self.stages[0].workers):
+                    queues[0].put(_DONE)
+
+        def work(i: int):
+            stage = self.stages[i]
+            inbox = queues[i]
+            last = i == len(self.stages) - 1
+            outbox = out if last else queues[i + 1]
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                if self._stop.is_set():
+                    continue  # drain without working
+                stage.max_depth = max(stage.max_depth, inbox.qsize() + 1)
+                started = time.monotonic()
+                try:
+                    results = stage.func(item) or ()
+                    emitted = 0
+                    for r in results:
+                        outbox.put(r)
+                        emitted += 1
+                    with stage._lock:
+                        stage.processed += 1
+                        stage.emitted += emitted
+                except Exception as e:
+                    with stage._lock:
+                        stage.errors += 1
+                    if self.verbose:
+                        print(f"[pipeline] {stage.name} error: {e}")
+                finally:
+                    with stage._lock:
+                        stage.busy += time.monotonic() - started
+            with alive_lock:
+                alive[i] -= 1
+                finished = alive[i] == 0
+            if finished:
+                # Last worker of this stage closes the next one
+                for _ in range(1 if last else self.stages[i + 1].workers):
+                    outbox.put(_DONE)
+
+        threads = [threading.Thread(target=feed, name="pipeline-feed", daemon=True)]
+        for i, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                threads.append(threading.Thread(target=work, args=(i,), name=f"pipeline-{stage.name}-{n + 1}", daemon=True))
+        for t in threads:
+            t.start()
+
+        completed = False
+        try:
+            while True:
+                item = out.get()
+                if item is _DONE:
+                    completed = True
+                    break
+                yield item
+        finally:
+            if not completed:
+                self._stop.set()  # caller stopped consuming; let the workers wind down
+            self.elapsed = time.monotonic() - t0
+
+    def summary(self) -> str:
+        parts = [f"{s.name} x{s.workers}: {s.processed} in/{s.emitted} out, busy {s.busy:.1f}s, "
+                 f"max queue {s.max_depth}" + (f", {s.errors} errors" if s.errors else "")
+                 for s in self.stages]
+        return f"{self.elapsed:.1f}s wall; " + "; ".join(parts)
+
+
+# ============= QUERY BATCHES =============
+
+def query_key(keyword: str, location: str = "") -> str:
+    """Label of one keyword x location search in batch results"""
+    return f"{keyword} @ {location}" if location else keyword
+
+
+def iter_query_batch(
+    scrape: Callable[[str, str], List[Dict]],
+    keywords: Sequence[str],
+    locations: Optional[Sequence[str]] = None,
+    concurrency: int = 4,
+    min_interval: float = 0.0,
+    verbose: bool = False,
+) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Run scrape(keyword, location) for every pair on `concurrency` workers and
+    yield (query_key, results) as each search finishes. A posting already
+    yielded for an earlier query (same canonical URL) is dropped from later
+    ones; query starts are spaced at least min_interval seconds apart.
+    """
+    from url_canon import canonical_key
+    from engine_registry import RateLimiter
+
+    limiter = RateLimiter(min_interval)
+    seen = set()
+    units = [(kw, loc) for kw in keywords for loc in (locations or [""])]
+
+    def run(unit):
+        limiter.wait()
+        return [(query_key(*unit), scrape(*unit) or [])]
+
+    def dedupe(item):
+        # Single worker: `seen` needs no lock
+        key, results = item
+        fresh = []
+        for r in results:
+            url = r.get("url")
+            k = canonical_key(url) if url else r.get("hash")
+            if k is None or k not in seen:
+                if k is not None:
+                    seen.add(k)
+                fresh.append(r)
+        return [(key, fresh)]
+
+    pipeline = Pipeline([Stage("scrape", run, workers=max(1, min(concurrency, len(units)))),
+                         Stage("dedupe", dedupe)], verbose=verbose)
+    yield from pipeline.run(units)
+    if verbose:
+        print(f"[pipeline] batch: {pipeline.summary()}")
+
+
+# ============= JOB PIPELINE =============
+
+class JobPipeline:
+    """
+    The job sweep as a pipeline. Units go in; enriched records come out of
+    the outbox as soon as each one is through every stage.
+    """
+
+    def __init__(
+        self,
+        search_fn: Callable[[Any], List[Dict]],
+        keywords: List[str],
+        relevance_threshold: float = 1.0,
+        resolve_redirects: bool = False,
+        enrich: bool = True,
+        extract_emails: bool = False,
+        collapse_near_dupes: bool = True,
+        on_record: Optional[Callable[[Dict], None]] = None,
+        on_lead: Optional[Callable[[Dict], None]] = None,
+        search_workers: int = 4,
+        enrich_workers: int = 4,
+        extract_workers: int = 4,
+        queue_size: int = 50,
+        email_timeout: int = 10,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            search_fn: unit -> raw results (units are whatever the caller feeds, e.g. (engine, kw, loc))
+            on_record: Outbox callback for every final record (store, UI, JSONL, ...)
+            on_lead: Outbox callback for every newly extracted email, as
+                     {email, domains, job_titles, sources}; e.g. send right away
+            *_workers: Threads per stage; engines still apply their own rate limits
+            queue_size: Bound of each inter-stage queue (backpressure)
+        """
+        from near_dupes import NearDupIndex
+        from job_record import JobColumns
+
+        self.search_fn = search_fn
+        self.keywords = keywords
+        self.relevance_threshold = relevance_threshold
+        self.resolve_redirects = resolve_redirects
+        self.on_record = on_record
+        self.on_lead = on_lead
+        self.email_timeout = email_timeout
+        self.verbose = verbose
+        # Column store: a long sweep keeps one compact row per record, not a dict
+        self.records = JobColumns()
+        self.company_emails: Dict[str, Dict] = {}
+        self.first_record_after: Optional[float] = None
+        self._seen = set()
+        self._near = NearDupIndex() if collapse_near_dupes else None
+        self._domains = set()
+        self._lead_emails = set()
+        self._lock = threading.Lock()
+        self._enricher = None
+        if enrich:
+            from enrichment_pipeline import JobEnrichment
+            self._enricher = JobEnrichment(verbose=False)
+
+        stages = [
+            Stage("search", self._search, search_workers, queue_size),
+            Stage("normalize", self._normalize, 1, queue_size),
+        ]
+        if enrich:
+            stages.append(Stage("enrich", self._enrich, enrich_workers, queue_size))
+        if extract_emails:
+            stages.append(Stage("extract", self._extract, extract_workers, queue_size))
+        stages.append(Stage("outbox", self._outbox, 1, queue_size))
+        self.pipeline = Pipeline(stages, verbose=verbose)
+        self._t0 = time.monotonic()
+
+    # ---------------- stages -----------------
+
+    def _search(self, unit) -> List[List[Dict]]:
+        results = self.search_fn(unit)
+        return [results] if results else []
+
+    def _normalize(self, results: List[Dict]) -> Iterator[Dict]:
+        from normalize import normalize_record, filter_relevant
+        from url_canon import canonical_key
+
+        for r in filter_relevant(results, self.keywords, self.relevance_threshold):
+            r = normalize_record(r, self.resolve_redirects)
+            key = canonical_key(r.get("url") or "") or r.get("hash")
+            if not key or key in self._seen:
+                continue
+            self._seen.add(key)
+            # Streaming collapse: the first copy of a syndicated posting wins
+            if self._near is not None and self._near.add(r):
+                continue
+            yield r
+
+    def _enrich(self, record: Dict) -> List[Dict]:
+        try:
+            return [self._enricher.enrich_job(record)]
+        except Exception as e:
+            if self.verbose:
+                print(f"[enrichment] Error enriching job: {e}")
+            return [record]
+
+    def _extract(self, record: Dict) -> List[Tuple[Dict, Optional[Tuple[str, Dict]]]]:
+        from email_extractor import extract_emails_from_url
+
+        url = record.get("url", "")
+        domain = urlparse(url).netloc if url else ""
+        with self._lock:
+            fresh = bool(domain) and domain not in self._domains
+            if fresh:
+                self._domains.add(domain)
+        if not fresh:
+            return [(record, None)]
+        emails, error = extract_emails_from_url(url, timeout=self.email_timeout, verbose=self.verbose)
+        info = {"url": url, "emails": emails, "error": error, "title": record.get("title", ""), "job_url": url}
+        return [(record, (domain, info))]
+
+    def _outbox(self, item) -> List[Dict]:
+        record, found = item if isinstance(item, tuple) else (item, None)
+        if self.first_record_after is None:
+            self.first_record_after = time.monotonic() - self._t0
+        self.records.append(record)
+        if self.on_record:
+            self.on_record(record)
+        if found:
+            domain, info = found
+            self.company_emails[domain] = info
+            for email in sorted(info["emails"]):
+                if email in self._lead_emails:
+                    continue
+                self._lead_emails.add(email)
+                if self.on_lead:
+                    self.on_lead({"email": email, "domains": domain, "job_titles": info.get("title", ""),
+                                  "sources": [info.get("job_url", "")]})
+        return [record]
+
+    # ---------------- running -----------------
+
+    def run(self, units: Iterable[Any]) -> Iterator[Dict]:
+        """Yield final records as they leave the outbox"""
+        self._t0 = time.monotonic()
+        return self.pipeline.run(units)
+
+    def run_all(self, units: Iterable[Any]) -> Sequence[Dict]:
+        for _ in self.run(units):
+            pass
+        return self.records
+
+    def stop(self):
+        self.pipeline.stop()
+
+    def summary(self) -> str:
+        first = f"first record after {self.first_record_after:.1f}s; " if self.first_record_after is not None else ""
+        return first + self.pipeline.summary()
@@ -2,16 +2,13 @@
 Proxy rotation manager for bypassing rate limiting and blocks
 """
 import os
+import importlib.util
 import json
 from typing import List, Dict, Optional
 from datetime import datetime
 
-# Try to import ProxyFetcher for automatic proxy discovery
-try:
-    from proxy_fetcher import ProxyFetcher
-    HAS_PROXY_FETCHER = True
-except ImportError:
-    HAS_PROXY_FETCHER = False
+# ProxyFetcher (and requests) is imported when proxies are first fetched
+HAS_PROXY_FETCHER = importlib.util.find_spec("requests") is not None
 
 class ProxyManager:
     """Manages proxy rotation for web scraping"""
@@ -190,6 +187,7 @@ class ProxyManager:
             proxy_types = ["http", "https", "socks5"]
         
         try:
+            from proxy_fetcher import ProxyFetcher
             fetcher = ProxyFetcher()
             added = 0
             per_type = max(1, count // len(proxy_types))
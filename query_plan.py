@@ -0,0 +1,233 @@
+"""
+Query Plan - normalized, deduplicated query sets
+Keyword x location expansion goes through one place: keywords are trimmed and
+whitespace-collapsed, a whole location is mapped to one canonical name ("NYC",
+"new york city" and "New York, NY" are all "New York"), and queries that only
+differ in case, spacing, word order, repeated words or location spelling
+collapse into one. Synonyms never touch the keyword: "dc electrician" stays a
+DC (direct current) electrician, not a Washington one.
+A small history remembers which queries came back empty recently so the
+scheduler can run them last or skip them.
+"""
+
+import os
+import json
+import time
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar
+
+DEFAULT_HISTORY_FILE = os.path.join("output", "query_history.json")
+
+# An empty query is cold for EMPTY_TTL, doubling per empty run in a row up to EMPTY_TTL_MAX
+EMPTY_TTL = 6 * 3600.0
+EMPTY_TTL_MAX = 7 * 86400.0
+# Entries not touched for this long are dropped on save
+HISTORY_MAX_AGE = 30 * 86400.0
+
+# Lowercase spelling -> canonical location
+LOCATION_SYNONYMS = {
+    "nyc": "New York",
+    "new york city": "New York",
+    "new york, ny": "New York",
+    "new york ny": "New York",
+    "manhattan": "New York",
+    "sf": "San Francisco",
+    "san francisco, ca": "San Francisco",
+    "san fran": "San Francisco",
+    "bay area": "San Francisco Bay Area",
+    "sf bay area": "San Francisco Bay Area",
+    "la": "Los Angeles",
+    "los angeles, ca": "Los Angeles",
+    "dc": "Washington DC",
+    "d.c.": "Washington DC",
+    "washington, dc": "Washington DC",
+    "washington d.c.": "Washington DC",
+    "washington, d.c.": "Washington DC",
+    "philly": "Philadelphia",
+    "atx": "Austin",
+    "austin, tx": "Austin",
+    "chicago, il": "Chicago",
+    "seattle, wa": "Seattle",
+    "boston, ma": "Boston",
+    "remote": "Remote",
+    "wfh": "Remote",
+    "work from home": "Remote",
+    "anywhere": "Remote",
+    "fully remote": "Remote",
+    "remote us": "Remote",
+    "remote, us": "Remote",
+}
+
+_SUFFIXES = (", usa", ", us", ", united states", " usa")
+
+T = TypeVar("T")
+
+
+def _collapse(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+@lru_cache(maxsize=4096)
+def normalize_keyword(keyword: str) -> str:
+    """Keyword with whitespace collapsed; the caller's casing is kept for display"""
+    return _collapse(keyword).strip(" ,;")
+
+
+@lru_cache(maxsize=4096)
+def normalize_location(location: str) -> str:
+    """Canonical location name: synonyms mapped, country suffixes dropped"""
+    loc = _collapse(location).strip(" ,;")
+    lower = loc.lower()
+    for suffix in _SUFFIXES:
+        if lower.endswith(suffix) and len(lower) > len(suffix):
+            loc, lower = loc[:-len(suffix)].rstrip(" ,"), lower[:-len(suffix)].rstrip(" ,")
+            break
+    return LOCATION_SYNONYMS.get(lower, loc)
+
+
+@lru_cache(maxsize=16384)
+def query_key(query: str) -> str:
+    """
+    Identity of a query string for deduplication: case-folded, repeated words
+    dropped and the rest sorted (engines treat the words as a set). Location
+    spellings are unified beforehand by normalize_location, on the location
+    alone.
+    """
+    return " ".join(sorted(set(_collapse(query).lower().split())))
+
+
+def dedupe_queries(items: Iterable[T], key: Callable[[T], str] = lambda q: q) -> List[T]:
+    """items with duplicates (by query_key of key(item)) removed, first one kept"""
+    seen = set()
+    out = []
+    for item in items:
+        k = query_key(key(item))
+        if k and k not in seen:
+            seen.add(k)
+            out.append(item)
+    return out
+
+
+# ============= EMPTY-QUERY HISTORY =============
+
+class QueryHistory:
+    """Which (engine, query) pairs came back empty recently, across runs"""
+
+    def __init__(self, path: str = DEFAULT_HISTORY_FILE):
+        """
+        Args:
+            path: JSON file holding the history ("" = in-memory only)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        # "engine|query key" -> {"empty": runs empty in a row, "last": ts, "hits": last count}
+        self.entries: Dict[str, Dict] = {}
+        self.load()
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f).get("queries", {})
+        except Exception as e:
+            print(f"[query_plan] Error loading history: {e}")
+
+    def save(self):
+        if not self.path:
+            return
+        cutoff = time.time() - HISTORY_MAX_AGE
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._lock:
+                self.entries = {k: e for k, e in self.entries.items() if e.get("last", 0) >= cutoff}
+                data = {"queries": dict(self.entries), "updated": time.time()}
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            print(f"[query_plan] Error saving history: {e}")
+
+    @staticmethod
+    def _key(query: str, engine: str) -> str:
+        return f"{engine}|{query_key(query)}"
+
+    def record(self, query: str, count: int, engine: str = ""):
+        """Result count of a finished search (don't record failed ones: an error isn't "empty")"""
+        with self._lock:
+            entry = self.entries.setdefault(self._key(query, engine), {"empty": 0, "last": 0.0, "hits": 0})
+            entry["empty"] = entry["empty"] + 1 if count <= 0 else 0
+            entry["hits"] = int(count)
+            entry["last"] = time.time()
+
+    def cold_for(self, query: str, engine: str = "") -> float:
+        """Seconds this query stays cold for engine (0 = worth running)"""
+        with self._lock:
+            entry = self.entries.get(self._key(query, engine))
+        if not entry or entry.get("empty", 0) <= 0:
+            return 0.0
+        ttl = min(EMPTY_TTL_MAX, EMPTY_TTL * 2 ** (entry["empty"] - 1))
+        return max(0.0, entry.get("last", 0) + ttl - time.time())
+
+    def is_cold(self, query: str, engine: str = "") -> bool:
+        return self.cold_for(query, engine) > 0
+
+
+_history: Optional[QueryHistory] = None
+_history_lock = threading.Lock()
+
+
+def get_history() -> QueryHistory:
+    """The shared history at DEFAULT_HISTORY_FILE (loaded on first use)"""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = QueryHistory()
+        return _history
+
+
+# ============= PLANNING =============
+
+def unit_query(keyword: str, location: str = "") -> str:
+    """The "keyword location" string a unit is remembered under"""
+    return f"{keyword} {location}".strip()
+
+
+def expand_units(keywords: Sequence[str], locations: Sequence[str]) -> List[Tuple[str, str]]:
+    """
+    Normalized keyword x location pairs without duplicates; location is ""
+    when none were given.
+    """
+    kws = dedupe_queries(k for k in (normalize_keyword(k) for k in keywords) if k)
+    locs = []
+    seen = set()
+    for loc in (normalize_location(l) for l in locations or ()):
+        if loc and loc.lower() not in seen:
+            seen.add(loc.lower())
+            locs.append(loc)
+    units = [(kw, loc) for kw in kws for loc in (locs or [""])]
+    # Keywords can still overlap across locations ("java remote" x "" vs "java" x "Remote")
+    return dedupe_queries(units, key=lambda u: unit_query(*u))
+
+
+def plan_units(keywords: Sequence[str], locations: Sequence[str], history: Optional[QueryHistory] = None,
+               engines: Sequence[str] = (), skip_cold: bool = False) -> List[Tuple[str, str]]:
+    """
+    The minimal unit set for a sweep. With a history, units that every one of
+    `engines` found empty recently go last (or are dropped with skip_cold).
+    """
+    units = expand_units(keywords, locations)
+    if history is None:
+        return units
+    names = list(engines) or [""]
+    warm, cold = [], []
+    for kw, loc in units:
+        (cold if all(history.is_cold(unit_query(kw, loc), e) for e in names) else warm).append((kw, loc))
+    return warm if skip_cold else warm + cold
+
+
+def plan_queries(keywords: Sequence[str], locations: Sequence[str], history: Optional[QueryHistory] = None,
+                 engine: str = "", skip_cold: bool = False) -> List[str]:
+    """plan_units as combined "keyword location" strings"""
+    units = plan_units(keywords, locations, history, [engine], skip_cold=skip_cold)
+    return [unit_query(kw, loc) for kw, loc in units]
@@ -4,12 +4,13 @@ Uses ddgs package (official Python wrapper) instead of HTML scraping
 Combines with direct job board scrapers for maximum results
 """
 
-from ddgs import DDGS
-from typing import List, Dict
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import time
 import hashlib
 from http_client import get_with_proxy
+from search_engines import ddgs_text
 from bs4 import BeautifulSoup
+from pipeline import iter_query_batch, query_key
 
 JOB_KEYWORDS = [
     "hiring", "jobs", "careers", "employment", "positions", 
@@ -45,29 +46,28 @@ def search_duckduckgo_api(query: str, max_results: int = 20) -> List[Dict]:
     try:
         results = []
         
-        with DDGS() as ddgs:
-            # DDGS.text() returns generator of results
-            for result in ddgs.text(query, max_results=max_results):
-                try:
-                    title = result.get("title", "")
-                    url = result.get("href", "")
-                    body = result.get("body", "")
-                    
-                    if not url or not title:
-                        continue
-                    
-                    # Check if job-related
-                    if is_job_related(f"{title} {body}", url):
-                        results.append({
-                            "title": title,
-                            "url": url,
-                            "snippet": body[:200],
-                            "engine": "duckduckgo_api",
-                            "hash": _hash(title, url)
-                        })
-                except Exception as e:
+        # Identical queries from other scrapers share one DDGS call
+        for result in ddgs_text(query, max_results=max_results):
+            try:
+                title = result.get("title", "")
+                url = result.get("href", "")
+                body = result.get("body", "")
+                
+                if not url or not title:
                     continue
-        
+                
+                # Check if job-related
+                if is_job_related(f"{title} {body}", url):
+                    results.append({
+                        "title": title,
+                        "url": url,
+                        "snippet": body[:200],
+                        "engine": "duckduckgo_api",
+                        "hash": _hash(title, url)
+                    })
+            except Exception as e:
+                continue
+    
         return results
     
     except Exception as e:
@@ -88,25 +88,24 @@ def search_job_board_google(board: str, keyword: str, location: str = "", max_re
         q = f'site:{board} "{keyword}" (jobs OR careers OR hiring)'
     
     try:
-        with DDGS() as ddgs:
-            for result in ddgs.text(q, max_results=max_results):
-                try:
-                    title = result.get("title", "")
-                    url = result.get("href", "")
-                    body = result.get("body", "")
-                    
-                    if not url or not title:
-                        continue
-                    
-                    results.append({
-                        "title": title,
-                        "url": url,
-                        "snippet": body[:200],
-                        "engine": f"google_site_{board}",
-                        "hash": _hash(title, url)
-                    })
-                except:
+        for result in ddgs_text(q, max_results=max_results):
+            try:
+                title = result.get("title", "")
+                url = result.get("href", "")
+                body = result.get("body", "")
+                
+                if not url or not title:
                     continue
+                
+                results.append({
+                    "title": title,
+                    "url": url,
+                    "snippet": body[:200],
+                    "engine": f"google_site_{board}",
+                    "hash": _hash(title, url)
+                })
+            except:
+                continue
     except Exception as e:
         pass
     
@@ -182,26 +181,34 @@ def scrape_job_listings(keyword: str, location: str = "", max_results: int = 50)
     
     return all_results[:max_results]
 
-def batch_scrape_jobs(keywords: List[str], locations: List[str] = None, max_per_query: int = 20) -> Dict[str, List[Dict]]:
+def iter_batch_scrape_jobs(keywords: List[str], locations: List[str] = None, max_per_query: int = 20,
+                           concurrency: int = 4, min_interval: float = 1.0) -> Iterator[Tuple[str, List[Dict]]]:
+    """
+    Yield (query_key, results) as each keyword x location search finishes.
+    Up to `concurrency` searches run at once, started at least min_interval
+    seconds apart; a job already yielded for another query is left out.
+    """
+    def scrape(keyword: str, location: str) -> List[Dict]:
+        print(f"\n📍 Scraping: {query_key(keyword, location)}")
+        return scrape_job_listings(keyword, location, max_results=max_per_query)
+
+    return iter_query_batch(scrape, keywords, locations, concurrency=concurrency, min_interval=min_interval)
+
+def batch_scrape_jobs(keywords: List[str], locations: List[str] = None, max_per_query: int = 20,
+                      concurrency: int = 4, on_results: Optional[Callable[[str, List[Dict]], None]] = None
+                      ) -> Dict[str, List[Dict]]:
     """
     Batch scrape multiple keywords and locations
+    on_results(query_key, results) is called as each search finishes
     """
-    if not locations:
-        locations = [""]
-    
-    all_results = {}
-    
-    for keyword in keywords:
-        for location in locations:
-            query_key = f"{keyword} @ {location}" if location else keyword
-            
-            print(f"\n📍 Scraping: {query_key}")
-            results = scrape_job_listings(keyword, location, max_results=max_per_query)
-            
-            all_results[query_key] = results
-            time.sleep(1)  # Throttle between queries
-    
-    return all_results
+    found = {}
+    for key, results in iter_batch_scrape_jobs(keywords, locations, max_per_query, concurrency):
+        found[key] = results
+        if on_results:
+            on_results(key, results)
+    
+    # Same key order as the keyword x location loop
+    return {query_key(kw, loc): found.get(query_key(kw, loc), []) for kw in keywords for loc in (locations or [""])}
 
 if __name__ == "__main__":
     # Test
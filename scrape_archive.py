@@ -0,0 +1,237 @@
+"""
+Scrape Archive - SQLite store for the GUI's run history
+Each run is a small summary row (what the archive list shows) plus a
+compressed payload with its results and extracted emails that is only read
+when the run is opened. Archive search goes through an FTS5 index over
+keywords, locations, engines, job titles and emails. The old single-file
+JSON archive is imported once and set aside.
+"""
+
+import os
+import json
+import zlib
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from job_record import json_default
+
+DEFAULT_ARCHIVE_PATH = os.path.join("output", "scrape_archive.db")
+LEGACY_ARCHIVE_PATH = os.path.join("output", "scrape_archive.json")
+
+# Legacy entries kept the first results separately for quick previews
+PREVIEW_RESULTS = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    locations TEXT NOT NULL,
+    engines TEXT NOT NULL,
+    jobs_found INTEGER NOT NULL DEFAULT 0,
+    emails_found INTEGER NOT NULL DEFAULT 0,
+    search_text TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS run_payloads (
+    run_id INTEGER PRIMARY KEY,
+    results BLOB NOT NULL,
+    emails BLOB NOT NULL
+);
+"""
+
+# Trigram tokens give the same substring matching the old in-memory filter had
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS runs_fts USING fts5(summary, titles, emails, tokenize='trigram');
+"""
+
+_SUMMARY_COLUMNS = "id, timestamp, keywords, locations, engines, jobs_found, emails_found"
+
+
+def _pack(obj: Any) -> bytes:
+    return zlib.compress(json.dumps(obj, default=json_default, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _unpack(blob: bytes) -> Any:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+def _summary_text(keywords: List[str], locations: List[str], engines: List[str]) -> str:
+    return " ".join(list(keywords or []) + list(locations or []) + list(engines or [])).lower()
+
+
+class ScrapeArchive:
+    """Run history with instant summaries and lazily loaded run payloads"""
+
+    def __init__(self, path: str = DEFAULT_ARCHIVE_PATH, legacy_path: Optional[str] = LEGACY_ARCHIVE_PATH,
+                 verbose: bool = False):
+        self.path = path
+        self.verbose = verbose
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.has_fts = self._init_fts()
+        if legacy_path and os.path.exists(legacy_path):
+            self.import_legacy(legacy_path)
+
+    def _init_fts(self) -> bool:
+        try:
+            self.conn.executescript(_FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError as e:
+            # No FTS5 / trigram tokenizer (SQLite < 3.34): search() falls back to LIKE on summaries
+            if self.verbose:
+                print(f"[archive] FTS5 trigram index unavailable ({e}); using LIKE search")
+            return False
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    # ---------------- writing -----------------
+
+    def add_run(self, keywords: List[str], locations: List[str], engines: List[str], results: List[Dict],
+                extracted_emails: Dict[str, Dict], timestamp: Optional[str] = None,
+                run_id: Optional[int] = None, jobs_found: Optional[int] = None,
+                emails_found: Optional[int] = None) -> int:
+        """Archive one run; returns its id"""
+        timestamp = timestamp or datetime.now().isoformat()
+        summary = _summary_text(keywords, locations, engines)
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (id, timestamp, keywords, locations, engines, jobs_found, emails_found, search_text) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (run_id, timestamp, json.dumps(list(keywords or [])), json.dumps(list(locations or [])),
+                 json.dumps(list(engines or [])),
+                 len(results) if jobs_found is None else jobs_found,
+                 len(extracted_emails) if emails_found is None else emails_found, summary),
+            )
+            new_id = cur.lastrowid
+            self.conn.execute(
+                "INSERT INTO run_payloads (run_id, results, emails) VALUES (?, ?, ?)",
+                (new_id, _pack(results), _pack(extracted_emails)),
+            )
+            if self.has_fts:
+                titles = "\n".join(str(r.get("title") or "") for r in results).lower()
+                self.conn.execute(
+                    "INSERT INTO runs_fts (rowid, summary, titles, emails) VALUES (?, ?, ?, ?)",
+                    (new_id, summary, titles, "\n".join(extracted_emails).lower()),
+                )
+        return new_id
+
+    def clear(self):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM runs")
+            self.conn.execute("DELETE FROM run_payloads")
+            if self.has_fts:
+                self.conn.execute("DELETE FROM runs_fts")
+        with self._lock:
+            self.conn.execute("VACUUM")
+
+    # ---------------- reading -----------------
+
+    @staticmethod
+    def _summary(row) -> Dict[str, Any]:
+        return {
+            "id": row[0],
+            "timestamp": row[1],
+            "keywords": json.loads(row[2]),
+            "locations": json.loads(row[3]),
+            "engines": json.loads(row[4]),
+            "jobs_found": row[5],
+            "emails_found": row[6],
+        }
+
+    def summaries(self, search: str = "", limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Summary rows, most recent first. With `search`, only runs whose
+        keywords/locations/engines, job titles or emails contain it.
+        """
+        term = (search or "").strip().lower()
+        sql = f"SELECT {_SUMMARY_COLUMNS} FROM runs"
+        params: List[Any] = []
+        if term:
+            if self.has_fts and len(term) >= 3:
+                sql += " WHERE id IN (SELECT rowid FROM runs_fts WHERE runs_fts MATCH ?)"
+                params.append('"' + term.replace('"', '""') + '"')
+            else:
+                # Trigrams need 3+ characters; short terms only look at the (small) summary rows
+                sql += " WHERE search_text LIKE ? ESCAPE '\\'"
+                params.append("%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%")
+        sql += " ORDER BY id DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._summary(r) for r in rows]
+
+    def summary(self, run_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute(f"SELECT {_SUMMARY_COLUMNS} FROM runs WHERE id = ?", (run_id,)).fetchone()
+        return self._summary(row) if row else None
+
+    def results(self, run_id: int) -> List[Dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT results FROM run_payloads WHERE run_id = ?", (run_id,)).fetchone()
+        return _unpack(row[0]) if row else []
+
+    def emails(self, run_id: int) -> Dict[str, Dict]:
+        with self._lock:
+            row = self.conn.execute("SELECT emails FROM run_payloads WHERE run_id = ?", (run_id,)).fetchone()
+        return _unpack(row[0]) if row else {}
+
+    def get_run(self, run_id: int, with_results: bool = True) -> Optional[Dict[str, Any]]:
+        """A run in the old archive entry shape (summary + results/all_results + extracted_emails)"""
+        entry = self.summary(run_id)
+        if entry is None:
+            return None
+        if with_results:
+            all_results = self.results(run_id)
+            entry["all_results"] = all_results
+            entry["results"] = all_results[:PREVIEW_RESULTS]
+        entry["extracted_emails"] = self.emails(run_id)
+        return entry
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+
+    # ---------------- migration -----------------
+
+    def import_legacy(self, path: str) -> int:
+        """Import the old JSON list archive (once) and rename it to *.migrated"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except Exception as e:
+            if self.verbose:
+                print(f"[archive] could not read {path}: {e}")
+            return 0
+        with self._lock:
+            existing = {r[0] for r in self.conn.execute("SELECT id FROM runs")}
+        imported = 0
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            run_id = entry.get("id")
+            if run_id in existing:
+                continue
+            self.add_run(
+                entry.get("keywords", []), entry.get("locations", []), entry.get("engines", []),
+                entry.get("all_results", entry.get("results", [])), entry.get("extracted_emails", {}),
+                timestamp=entry.get("timestamp"), run_id=run_id if isinstance(run_id, int) else None,
+                jobs_found=entry.get("jobs_found"), emails_found=entry.get("emails_found"),
+            )
+            imported += 1
+        try:
+            os.replace(path, path + ".migrated")
+        except OSError:
+            pass
+        if self.verbose:
+            print(f"[archive] imported {imported} runs from {path}")
+        return imported
@@ -1,23 +1,19 @@
 import os
 import time
 import hashlib
+import importlib.util
 import requests
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
+from single_flight import SEARCH_FLIGHT
+from perf_metrics import timed_request
+from block_detector import (BLOCKS, OK, NETWORK_ERROR, DDGS_API, LOCAL_PROXY,
+                            classify_response, classify_exception, retry_after)
 
-# Try to use the reliable job scraper if available
-try:
-    from ddgs import DDGS
-    HAS_DDGS = True
-except ImportError:
-    HAS_DDGS = False
-
-# Try to import LinkedIn scraper
-try:
-    from site_linkedin import linkedin_job_search
-    HAS_LINKEDIN = True
-except ImportError:
-    HAS_LINKEDIN = False
+# Optional backends are only checked for here and imported on first use:
+# ddgs and selenium (via site_linkedin) are the slowest imports in the app
+HAS_DDGS = importlib.util.find_spec("ddgs") is not None
+HAS_LINKEDIN = importlib.util.find_spec("selenium") is not None
 
 USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
@@ -41,6 +37,38 @@ class SearchEngineResult(Dict):
 def _hash(title: str, url: str) -> str:
     return hashlib.sha1(f"{title}|{url}".encode("utf-8", errors="ignore")).hexdigest()
 
+def _get_serp(engine: str, fetch, url: str, use_proxy: bool = True, verbose: bool = False, **kwargs):
+    """
+    GET a results page over the first route that isn't blocked for `engine`:
+    proxies that aren't backing off, then a direct connection. Every attempt
+    is classified and charged to the exact route it used, so a CAPTCHA'd or
+    dead route sits out its backoff instead of being retried next query.
+
+    Returns the response, or None when every route failed or is backing off.
+    """
+    proxy_mgr = get_proxy_manager() if use_proxy else None
+    routes = BLOCKS.http_routes(engine, proxy_mgr)
+    if not routes and verbose:
+        print(f"[{engine}] every route is backing off; retry in {BLOCKS.retry_after(engine):.0f}s")
+    for route, proxies in routes:
+        if verbose:
+            print(f"[{engine}] via {route}")
+        try:
+            resp = timed_request(fetch, url, engine, proxies=proxies, **kwargs)
+        except Exception as e:
+            outcome = classify_exception(e) or NETWORK_ERROR
+            BLOCKS.record(engine, route, outcome, proxy_manager=proxy_mgr)
+            if verbose:
+                print(f"[{engine}] {outcome} via {route}: {e}")
+            continue
+        outcome = classify_response(engine, resp)
+        BLOCKS.record(engine, route, outcome, retry_after(resp), proxy_manager=proxy_mgr)
+        if outcome == OK:
+            return resp
+        if verbose:
+            print(f"[{engine}] {outcome} via {route} (HTTP {resp.status_code}) - switching route")
+    return None
+
 # ===== RELIABLE JOB-FOCUSED SEARCH USING DDGS API =====
 
 JOB_KEYWORDS = ["hiring", "jobs", "careers", "employment", "positions", "openings"]
@@ -63,6 +91,19 @@ def _is_job_result(title: str, body: str, url: str) -> bool:
     job_kw_count = sum(1 for kw in JOB_KEYWORDS if kw in text)
     return job_kw_count >= 1
 
+def ddgs_text(query: str, max_results: int = 20) -> List[Dict]:
+    """
+    Raw DDGS text results. Identical queries from different scrapers
+    (in flight or within the last few minutes) share one API call.
+    """
+    from ddgs import DDGS
+
+    def run():
+        with DDGS() as ddgs:
+            return list(ddgs.text(query, max_results=max_results))
+
+    return SEARCH_FLIGHT.do(("ddgs", query, max_results), run)
+
 def duckduckgo_search_v2(query: str, max_results: int = 20, verbose: bool = False, use_proxy: bool = True) -> List[SearchEngineResult]:
     """
     NEW: Search using official DDGS API instead of HTML scraping
@@ -76,6 +117,10 @@ def duckduckgo_search_v2(query: str, max_results: int = 20, verbose: bool = Fals
         if verbose:
             print("[duckduckgo_v2] DDGS not available, falling back to HTML scraping")
         return duckduckgo_search(query, max_results, verbose, use_proxy)
+    if not BLOCKS.usable("duckduckgo", [DDGS_API]):
+        if verbose:
+            print("[duckduckgo_v2] DDGS API is backing off, falling back to HTML scraping")
+        return duckduckgo_search(query, max_results, verbose, use_proxy)
     
     if verbose:
         print(f"[duckduckgo_v2] Searching DDGS API for: {query}")
@@ -84,39 +129,45 @@ def duckduckgo_search_v2(query: str, max_results: int = 20, verbose: bool = Fals
         results = []
         seen_hashes = set()
         
-        with DDGS() as ddgs:
-            for result in ddgs.text(query, max_results=max_results * 2):
-                try:
-                    title = result.get("title", "")
-                    url = result.get("href", "")
-                    body = result.get("body", "")
-                    
-                    if not url or not title or len(title) < 3:
-                        continue
-                    
-                    # Deduplicate
-                    h = _hash(title, url)
-                    if h in seen_hashes:
-                        continue
-                    seen_hashes.add(h)
+        try:
+            raw = ddgs_text(query, max_results=max_results * 2)
+        except Exception as e:
+            BLOCKS.record("duckduckgo", DDGS_API, classify_exception(e) or NETWORK_ERROR)
+            raise
+        BLOCKS.record("duckduckgo", DDGS_API, OK)
+        
+        for result in raw:
+            try:
+                title = result.get("title", "")
+                url = result.get("href", "")
+                body = result.get("body", "")
+                
+                if not url or not title or len(title) < 3:
+                    continue
+                
+                # Deduplicate
+                h = _hash(title, url)
+                if h in seen_hashes:
+                    continue
+                seen_hashes.add(h)
+                
+                # Filter for job-related content
+                if _is_job_result(title, body, url):
+                    results.append(SearchEngineResult({
+                        "title": title,
+                        "url": url,
+                        "snippet": body[:250],
+                        "engine": "duckduckgo_v2",
+                        "hash": h
+                    }))
                     
-                    # Filter for job-related content
-                    if _is_job_result(title, body, url):
-                        results.append(SearchEngineResult({
-                            "title": title,
-                            "url": url,
-                            "snippet": body[:250],
-                            "engine": "duckduckgo_v2",
-                            "hash": h
-                        }))
+                    if len(results) >= max_results:
+                        break
                         
-                        if len(results) >= max_results:
-                            break
-                            
-                except Exception as e:
-                    if verbose:
-                        print(f"  [Error parsing result: {e}]")
-                    continue
+            except Exception as e:
+                if verbose:
+                    print(f"  [Error parsing result: {e}]")
+                continue
         
         if verbose:
             print(f"[duckduckgo_v2] Found {len(results)} job-related results")
@@ -151,67 +202,24 @@ def duckduckgo_search(query: str, max_results: int = 20, verbose: bool = False,
     if verbose:
         print(f"[duckduckgo] GET {url} q={query}")
     
-    # Try with proxy first if enabled, then fallback to no proxy
-    proxies = None
-    used_proxy = False
-    
-    try:
+    def fetch(url, proxies=None, **kwargs):
+        # Fresh session per route so cookies from a blocked route don't follow us
         session = requests.Session()
         session.headers.update(headers)
-        
-        # Try with proxy if enabled
-        if use_proxy:
-            proxy_mgr = get_proxy_manager()
-            if proxy_mgr and proxy_mgr.proxies:
-                proxy_dict = proxy_mgr.get_next_proxy()
-                if proxy_dict:
-                    proxies = proxy_mgr.get_requests_proxy(proxy_dict)
-                    if verbose and proxies:
-                        print(f"[duckduckgo] Using proxy: {proxy_dict.get('url')}")
-                    used_proxy = True
-        
-        # Try to get cookies first
-        session.get("https://duckduckgo.com/", timeout=10, proxies=proxies)
+        timed_request(session.get, "https://duckduckgo.com/", "duckduckgo", timeout=10, proxies=proxies)
         time.sleep(0.5)
-        
-        resp = session.get(url, params={"q": query}, timeout=25, proxies=proxies)
-        
-        # Check for CAPTCHA challenge
-        if "confirm this search was made by a human" in resp.text or resp.status_code == 202:
-            if verbose:
-                print("[duckduckgo] CAPTCHA challenge detected - DuckDuckGo is blocking automated requests")
-            return []
-        
+        return session.get(url, proxies=proxies, **kwargs)
+    
+    resp = _get_serp("duckduckgo", fetch, url, use_proxy, verbose, params={"q": query}, timeout=25)
+    if resp is None:
+        # Every HTML route is blocked or failed: switch to the API / local server routes
+        return _duckduckgo_alternate(query, max_results, verbose)
+    try:
         resp.raise_for_status()
     except Exception as e:
         if verbose:
-            print(f"[duckduckgo] error with {'proxy' if used_proxy else 'direct'}: {e}")
-        
-        # If proxy failed, retry without proxy
-        if used_proxy and use_proxy:
-            if verbose:
-                print("[duckduckgo] Proxy failed, retrying without proxy...")
-            try:
-                session = requests.Session()
-                session.headers.update(headers)
-                
-                session.get("https://duckduckgo.com/", timeout=10, proxies=None)
-                time.sleep(0.5)
-                
-                resp = session.get(url, params={"q": query}, timeout=25, proxies=None)
-                
-                if "confirm this search was made by a human" in resp.text or resp.status_code == 202:
-                    if verbose:
-                        print("[duckduckgo] CAPTCHA challenge detected - DuckDuckGo is blocking automated requests")
-                    return []
-                
-                resp.raise_for_status()
-            except Exception as e2:
-                if verbose:
-                    print(f"[duckduckgo] error without proxy: {e2}")
-                return []
-        else:
-            return []
+            print(f"[duckduckgo] error: {e}")
+        return []
     
     soup = BeautifulSoup(resp.text, "html.parser")
     out = []
@@ -260,6 +268,40 @@ def duckduckgo_search(query: str, max_results: int = 20, verbose: bool = False,
     
     return out
 
+def _duckduckgo_alternate(query: str, max_results: int, verbose: bool = False) -> List[SearchEngineResult]:
+    """
+    DuckDuckGo results over the non-HTML routes, for when every proxy and the
+    direct connection are blocked: the DDGS API, then the local proxy server.
+    """
+    def record(title, href, snippet=""):
+        return {"engine": "duckduckgo", "query": query, "title": title, "url": href,
+                "snippet": snippet, "ts": int(time.time()), "hash": _hash(title, href)}
+
+    routes = ([DDGS_API] if HAS_DDGS else []) + [LOCAL_PROXY]
+    for route in BLOCKS.usable("duckduckgo", routes):
+        if verbose:
+            print(f"[duckduckgo] switching to {route}")
+        try:
+            if route == DDGS_API:
+                found = [record(r.get("title", ""), r.get("href", ""), r.get("body", "")[:250])
+                         for r in ddgs_text(query, max_results=max_results)]
+            else:
+                from ddg_proxy_client import is_proxy_available, search_via_proxy
+                if not is_proxy_available():
+                    BLOCKS.record("duckduckgo", route, NETWORK_ERROR)
+                    continue
+                found = [record(r.get("title", ""), r.get("url", ""))
+                         for r in search_via_proxy(query, max_results=max_results)]
+        except Exception as e:
+            outcome = classify_exception(e) or NETWORK_ERROR
+            BLOCKS.record("duckduckgo", route, outcome)
+            if verbose:
+                print(f"[duckduckgo] {outcome} via {route}: {e}")
+            continue
+        BLOCKS.record("duckduckgo", route, OK)
+        return [r for r in found if r["url"].startswith("http") and len(r["title"]) >= 3][:max_results]
+    return []
+
 # ---------------- Startpage Search -----------------
 
 def startpage_search(query: str, max_results: int = 20, verbose: bool = False, use_proxy: bool = True) -> List[SearchEngineResult]:
@@ -274,40 +316,16 @@ def startpage_search(query: str, max_results: int = 20, verbose: bool = False, u
     if verbose:
         print(f"[startpage] GET {url} q={query}")
     
-    # Try with proxy first if enabled, then fallback to no proxy
-    proxies = None
-    used_proxy = False
-    
+    resp = _get_serp("startpage", requests.get, url, use_proxy, verbose,
+                     params={"query": query}, headers=headers, timeout=25)
+    if resp is None:
+        return []
     try:
-        if use_proxy:
-            proxy_mgr = get_proxy_manager()
-            if proxy_mgr and proxy_mgr.proxies:
-                proxy_dict = proxy_mgr.get_next_proxy()
-                if proxy_dict:
-                    proxies = proxy_mgr.get_requests_proxy(proxy_dict)
-                    if verbose and proxies:
-                        print(f"[startpage] Using proxy: {proxy_dict.get('url')}")
-                    used_proxy = True
-        
-        resp = requests.get(url, params={"query": query}, headers=headers, timeout=25, proxies=proxies)
         resp.raise_for_status()
     except Exception as e:
         if verbose:
-            print(f"[startpage] error with {'proxy' if used_proxy else 'direct'}: {e}")
-        
-        # If proxy failed, retry without proxy
-        if used_proxy and use_proxy:
-            if verbose:
-                print("[startpage] Proxy failed, retrying without proxy...")
-            try:
-                resp = requests.get(url, params={"query": query}, headers=headers, timeout=25, proxies=None)
-                resp.raise_for_status()
-            except Exception as e2:
-                if verbose:
-                    print(f"[startpage] error without proxy: {e2}")
-                return []
-        else:
-            return []
+            print(f"[startpage] error: {e}")
+        return []
     
     soup = BeautifulSoup(resp.text, "html.parser")
     out = []
@@ -363,40 +381,15 @@ def google_cse_search(query: str, max_results: int = 20, verbose: bool = False,
     if verbose:
         print(f"[google_cse] GET {endpoint} q={query}")
     
-    # Try with proxy first if enabled, then fallback to no proxy
-    proxies = None
-    used_proxy = False
-    
+    resp = _get_serp("google_cse", requests.get, endpoint, use_proxy, verbose, params=params, timeout=30)
+    if resp is None:
+        return []
     try:
-        if use_proxy:
-            proxy_mgr = get_proxy_manager()
-            if proxy_mgr and proxy_mgr.proxies:
-                proxy_dict = proxy_mgr.get_next_proxy()
-                if proxy_dict:
-                    proxies = proxy_mgr.get_requests_proxy(proxy_dict)
-                    if verbose and proxies:
-                        print(f"[google_cse] Using proxy: {proxy_dict.get('url')}")
-                    used_proxy = True
-        
-        resp = requests.get(endpoint, params=params, timeout=30, proxies=proxies)
         resp.raise_for_status()
     except Exception as e:
         if verbose:
-            print(f"[google_cse] error with {'proxy' if used_proxy else 'direct'}: {e}")
-        
-        # If proxy failed, retry without proxy
-        if used_proxy and use_proxy:
-            if verbose:
-                print("[google_cse] Proxy failed, retrying without proxy...")
-            try:
-                resp = requests.get(endpoint, params=params, timeout=30, proxies=None)
-                resp.raise_for_status()
-            except Exception as e2:
-                if verbose:
-                    print(f"[google_cse] error without proxy: {e2}")
-                return []
-        else:
-            return []
+            print(f"[google_cse] error: {e}")
+        return []
     
     data = resp.json()
     items = data.get("items", [])
@@ -427,40 +420,15 @@ def bing_search(query: str, max_results: int = 20, verbose: bool = False, use_pr
     if verbose:
         print(f"[bing] GET {endpoint} q={query}")
     
-    # Try with proxy first if enabled, then fallback to no proxy
-    proxies = None
-    used_proxy = False
-    
+    resp = _get_serp("bing", requests.get, endpoint, use_proxy, verbose, params=params, headers=headers, timeout=30)
+    if resp is None:
+        return []
     try:
-        if use_proxy:
-            proxy_mgr = get_proxy_manager()
-            if proxy_mgr and proxy_mgr.proxies:
-                proxy_dict = proxy_mgr.get_next_proxy()
-                if proxy_dict:
-                    proxies = proxy_mgr.get_requests_proxy(proxy_dict)
-                    if verbose and proxies:
-                        print(f"[bing] Using proxy: {proxy_dict.get('url')}")
-                    used_proxy = True
-        
-        resp = requests.get(endpoint, params=params, headers=headers, timeout=30, proxies=proxies)
         resp.raise_for_status()
     except Exception as e:
         if verbose:
-            print(f"[bing] error with {'proxy' if used_proxy else 'direct'}: {e}")
-        
-        # If proxy failed, retry without proxy
-        if used_proxy and use_proxy:
-            if verbose:
-                print("[bing] Proxy failed, retrying without proxy...")
-            try:
-                resp = requests.get(endpoint, params=params, headers=headers, timeout=30, proxies=None)
-                resp.raise_for_status()
-            except Exception as e2:
-                if verbose:
-                    print(f"[bing] error without proxy: {e2}")
-                return []
-        else:
-            return []
+            print(f"[bing] error: {e}")
+        return []
     
     data = resp.json()
     web_pages = data.get("webPages", {}).get("value", [])
@@ -568,6 +536,8 @@ def linkedin_search(query: str, max_results: int = 20, verbose: bool = False,
         return []
     
     try:
+        from site_linkedin import linkedin_job_search
+        
         # Use provided credentials or get from environment
         email = linkedin_email or os.getenv("LINKEDIN_EMAIL", "")
         password = linkedin_password or os.getenv("LINKEDIN_PASSWORD", "")
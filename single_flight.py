@@ -0,0 +1,125 @@
+"""
+Single-flight request coalescing
+Identical requests issued while one is already in flight wait for that
+call and share its result instead of hitting the network again.
+Optionally a finished result is reused for a short TTL so back-to-back
+identical queries from different scrapers also collapse into one call.
+"""
+
+import time
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Call:
+    """One in-flight call that followers can wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key"""
+
+    def __init__(self, name: str, ttl: float = 0.0, max_entries: int = 512):
+        """
+        Args:
+            name: Label used in stats output
+            ttl: Seconds a finished result stays reusable (0 = only share in-flight calls)
+            max_entries: Cap on finished results kept for TTL reuse
+        """
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, _Call] = {}
+        self._recent: Dict[Hashable, tuple] = {}
+        self.calls = 0       # total do() calls
+        self.executed = 0    # calls that actually ran fn
+        self.coalesced = 0   # calls that joined an in-flight call
+        self.reused = 0      # calls served from a recent finished result
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() once per key at a time. Callers arriving while it runs
+        block until it finishes and get the same result (or exception).
+        """
+        with self._lock:
+            self.calls += 1
+            if self.ttl > 0:
+                hit = self._recent.get(key)
+                if hit is not None:
+                    if time.monotonic() - hit[0] < self.ttl:
+                        self.reused += 1
+                        return hit[1]
+                    del self._recent[key]
+            call = self._inflight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._inflight[key] = call
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                if self.ttl > 0 and call.error is None:
+                    if len(self._recent) >= self.max_entries:
+                        self._recent.pop(next(iter(self._recent)))
+                    self._recent[key] = (time.monotonic(), call.result)
+            call.done.set()
+        return call.result
+
+    @property
+    def saved(self) -> int:
+        """Network calls avoided"""
+        return self.coalesced + self.reused
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "reused": self.reused,
+                "saved": self.coalesced + self.reused,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._recent.clear()
+            self.calls = self.executed = self.coalesced = self.reused = 0
+
+
+# Shared groups for the HTTP and search layers
+HTTP_FLIGHT = SingleFlight("http")
+SEARCH_FLIGHT = SingleFlight("search", ttl=300.0)
+
+
+def flight_stats() -> Dict[str, Dict[str, int]]:
+    """Counters for every shared group"""
+    return {g.name: g.stats() for g in (HTTP_FLIGHT, SEARCH_FLIGHT)}
+
+
+def format_flight_stats() -> str:
+    """Human-readable one-liner, e.g. for end-of-run summaries"""
+    parts = []
+    for name, s in flight_stats().items():
+        parts.append(f"{name}: {s['executed']}/{s['calls']} sent, {s['saved']} saved")
+    return "; ".join(parts)
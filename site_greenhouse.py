@@ -1,9 +1,11 @@
 import time
 import hashlib
-from typing import List, Dict
+from itertools import islice
+from typing import List, Dict, Iterator, Optional
 import requests
 from bs4 import BeautifulSoup
 from http_client import get_with_proxy
+from pagination import iter_pages, DEFAULT_MAX_PAGES
 
 USER_AGENT = "Mozilla/5.0 (compatible; JobScraperUltimate/1.0)"
 
@@ -13,47 +15,51 @@ class SiteResult(Dict):
 def _hash(title: str, url: str) -> str:
     return hashlib.sha1(f"{title}|{url}".encode("utf-8", errors="ignore")).hexdigest()
 
-def greenhouse_search(keyword: str, location: str, max_results: int = 20, verbose: bool = False) -> List[SiteResult]:
-    """Search Greenhouse job boards by keyword. Crawls known public boards via sitemap index.
-    This is a heuristic approach: we fetch https://boards.greenhouse.io/ and search results pages.
-    """
-    headers = {"User-Agent": USER_AGENT}
-    query = f"{keyword} {location}".strip()
+def _page_url(query: str, page: int) -> str:
     url = "https://boards.greenhouse.io/search?q=" + requests.utils.quote(query)
+    if page:
+        url += f"&page={page + 1}"
+    return url
+
+def _fetch(url: str, verbose: bool = False) -> Optional[requests.Response]:
+    """Fetch one results page, retrying via direct request and alternate UA."""
+    headers = {"User-Agent": USER_AGENT}
     if verbose:
         print(f"[greenhouse] GET {url}")
-        attempts = 0
-        max_attempts = 3
-        while attempts < max_attempts:
-            try:
-                resp = get_with_proxy(url, headers=headers, timeout=30, use_proxy=True, verbose=verbose)
-                resp.raise_for_status()
-                break
-            except Exception as e:
-                if verbose:
-                    print(f"[greenhouse] error (attempt {attempts+1}):", e)
-                # Try direct request if proxy fails
-                if attempts == 0:
-                    try:
-                        resp = requests.get(url, headers=headers, timeout=30)
-                        resp.raise_for_status()
-                        break
-                    except Exception as e2:
-                        if verbose:
-                            print(f"[greenhouse] direct request error (attempt {attempts+1}):", e2)
-                # Adjust headers and retry
-                headers["User-Agent"] = USER_AGENT + f" Retry{attempts+1}"
-                attempts += 1
-        else:
-            return []
-    soup = BeautifulSoup(resp.text, "html.parser")
-    out: List[SiteResult] = []
+    attempts = 0
+    max_attempts = 3
+    while attempts < max_attempts:
+        try:
+            resp = get_with_proxy(url, headers=headers, timeout=30, use_proxy=True, verbose=verbose)
+            resp.raise_for_status()
+            return resp
+        except Exception as e:
+            if verbose:
+                print(f"[greenhouse] error (attempt {attempts+1}):", e)
+            # Try direct request if proxy fails
+            if attempts == 0:
+                try:
+                    resp = requests.get(url, headers=headers, timeout=30)
+                    resp.raise_for_status()
+                    return resp
+                except Exception as e2:
+                    if verbose:
+                        print(f"[greenhouse] direct request error (attempt {attempts+1}):", e2)
+            # Adjust headers and retry
+            headers["User-Agent"] = USER_AGENT + f" Retry{attempts+1}"
+            attempts += 1
+    return None
+
+def _parse_page(html: str, query: str) -> Iterator[SiteResult]:
+    soup = BeautifulSoup(html, "html.parser")
     for job in soup.select(".job"):
         a = job.select_one("a")
         if not a:
             continue
         title = a.get_text(" ", strip=True)
         href = a.get("href")
+        if not href:
+            continue
         company = job.select_one(".company")
         location_el = job.select_one(".location")
         snippet = ""
@@ -65,7 +71,7 @@ def greenhouse_search(keyword: str, location: str, max_results: int = 20, verbos
                 parts.append(location_el.get_text(" ", strip=True))
             snippet = " | ".join(parts)
         full_url = href if href.startswith("http") else "https://boards.greenhouse.io" + href
-        out.append({
+        yield {
             "engine": "greenhouse",
             "query": query,
             "title": title,
@@ -73,7 +79,24 @@ def greenhouse_search(keyword: str, location: str, max_results: int = 20, verbos
             "snippet": snippet,
             "ts": int(time.time()),
             "hash": _hash(title, full_url)
-        })
-        if len(out) >= max_results:
-            break
-    return out
+        }
+
+def iter_greenhouse(keyword: str, location: str, max_pages: int = DEFAULT_MAX_PAGES, verbose: bool = False,
+                    limit: Optional[int] = None) -> Iterator[SiteResult]:
+    """Lazily walk Greenhouse search result pages, prefetching the next page
+    unless the first `limit` records are already in hand."""
+    query = f"{keyword} {location}".strip()
+    return iter_pages(
+        lambda page: _fetch(_page_url(query, page), verbose=verbose),
+        lambda resp, page: _parse_page(resp.text, query),
+        max_pages=max_pages,
+        limit=limit,
+    )
+
+def greenhouse_search(keyword: str, location: str, max_results: int = 20, verbose: bool = False) -> List[SiteResult]:
+    """Search Greenhouse job boards by keyword. Crawls known public boards via sitemap index.
+    This is a heuristic approach: we fetch https://boards.greenhouse.io/ and search results pages.
+    """
+    # Page sizes vary and dedupe drops rows: walk until max_results, not a guessed page count
+    return list(islice(iter_greenhouse(keyword, location, max_pages=DEFAULT_MAX_PAGES, verbose=verbose,
+                                       limit=max_results), max_results))
@@ -1,13 +1,16 @@
 import time
 import hashlib
-from typing import List, Dict
+from itertools import islice
+from typing import List, Dict, Iterator, Optional
 from urllib.parse import urlencode, urljoin
 import requests
 from bs4 import BeautifulSoup
 from http_client import get_with_proxy
+from pagination import iter_pages, DEFAULT_MAX_PAGES
 
 USER_AGENT = "Mozilla/5.0 (compatible; JobScraperUltimate/1.0)"
 BASE = "https://www.indeed.com/"
+PAGE_SIZE = 10  # Indeed advances the `start` offset by 10 per results page
 
 class SiteResult(Dict):
     pass
@@ -15,43 +18,47 @@ class SiteResult(Dict):
 def _hash(title: str, url: str) -> str:
     return hashlib.sha1(f"{title}|{url}".encode("utf-8", errors="ignore")).hexdigest()
 
-def indeed_search(keyword: str, location: str, max_results: int = 20, verbose: bool = False) -> List[SiteResult]:
-    """Scrape Indeed search results for a keyword + location.
-    Heuristic HTML parser that attempts multiple selector strategies.
-    """
+def _page_url(keyword: str, location: str, page: int) -> str:
     params = {"q": keyword}
     if location:
         params["l"] = location
-    url = urljoin(BASE, f"jobs?{urlencode(params)}")
+    if page:
+        params["start"] = page * PAGE_SIZE
+    return urljoin(BASE, f"jobs?{urlencode(params)}")
+
+def _fetch(url: str, verbose: bool = False) -> Optional[requests.Response]:
+    """Fetch one results page, retrying via direct request and alternate UA."""
     headers = {"User-Agent": USER_AGENT}
     if verbose:
         print(f"[indeed] GET {url}")
-        attempts = 0
-        max_attempts = 3
-        while attempts < max_attempts:
-            try:
-                resp = get_with_proxy(url, headers=headers, timeout=30, use_proxy=True, verbose=verbose)
-                resp.raise_for_status()
-                break
-            except Exception as e:
-                if verbose:
-                    print(f"[indeed] error (attempt {attempts+1}):", e)
-                # Try direct request if proxy fails
-                if attempts == 0:
-                    try:
-                        resp = requests.get(url, headers=headers, timeout=30)
-                        resp.raise_for_status()
-                        break
-                    except Exception as e2:
-                        if verbose:
-                            print(f"[indeed] direct request error (attempt {attempts+1}):", e2)
-                # Adjust headers and retry
-                headers["User-Agent"] = USER_AGENT + f" Retry{attempts+1}"
-                attempts += 1
-        else:
-            return []
-    soup = BeautifulSoup(resp.text, "html.parser")
-    out: List[SiteResult] = []
+    attempts = 0
+    max_attempts = 3
+    while attempts < max_attempts:
+        try:
+            resp = get_with_proxy(url, headers=headers, timeout=30, use_proxy=True, verbose=verbose)
+            resp.raise_for_status()
+            return resp
+        except Exception as e:
+            if verbose:
+                print(f"[indeed] error (attempt {attempts+1}):", e)
+            # Try direct request if proxy fails
+            if attempts == 0:
+                try:
+                    resp = requests.get(url, headers=headers, timeout=30)
+                    resp.raise_for_status()
+                    return resp
+                except Exception as e2:
+                    if verbose:
+                        print(f"[indeed] direct request error (attempt {attempts+1}):", e2)
+            # Adjust headers and retry
+            headers["User-Agent"] = USER_AGENT + f" Retry{attempts+1}"
+            attempts += 1
+    return None
+
+def _parse_page(html: str, keyword: str, location: str) -> Iterator[SiteResult]:
+    """Heuristic HTML parser that attempts multiple selector strategies."""
+    soup = BeautifulSoup(html, "html.parser")
+    query = f"{keyword} {location}".strip()
 
     # Strategy 1: cards with data-jk attribute
     for a in soup.select('a[data-jk]'):
@@ -67,17 +74,15 @@ def indeed_search(keyword: str, location: str, max_results: int = 20, verbose: b
             if sn:
                 snippet = sn.get_text(" ", strip=True)
         full_url = href if href.startswith("http") else urljoin(BASE, href)
-        out.append({
+        yield {
             "engine": "indeed",
-            "query": f"{keyword} {location}".strip(),
+            "query": query,
             "title": title,
             "url": full_url,
             "snippet": snippet,
             "ts": int(time.time()),
             "hash": _hash(title, full_url)
-        })
-        if len(out) >= max_results:
-            return out
+        }
 
     # Strategy 2: classic job links under h2.jobTitle
     for h2 in soup.select("h2.jobTitle"):
@@ -95,16 +100,34 @@ def indeed_search(keyword: str, location: str, max_results: int = 20, verbose: b
             if sn:
                 snippet = sn.get_text(" ", strip=True)
         full_url = href if href.startswith("http") else urljoin(BASE, href)
-        out.append({
+        yield {
             "engine": "indeed",
-            "query": f"{keyword} {location}".strip(),
+            "query": query,
             "title": title,
             "url": full_url,
             "snippet": snippet,
             "ts": int(time.time()),
             "hash": _hash(title, full_url)
-        })
-        if len(out) >= max_results:
-            break
+        }
 
-    return out
+def iter_indeed(keyword: str, location: str, max_pages: int = DEFAULT_MAX_PAGES, verbose: bool = False,
+                limit: Optional[int] = None) -> Iterator[SiteResult]:
+    """Lazily walk Indeed result pages for a keyword + location.
+    The next page is prefetched while the current one is consumed, unless
+    the first `limit` records are already in hand; stop iterating to stop
+    fetching.
+    """
+    return iter_pages(
+        lambda page: _fetch(_page_url(keyword, location, page), verbose=verbose),
+        lambda resp, page: _parse_page(resp.text, keyword, location),
+        max_pages=max_pages,
+        limit=limit,
+    )
+
+def indeed_search(keyword: str, location: str, max_results: int = 20, verbose: bool = False) -> List[SiteResult]:
+    """Scrape Indeed search results for a keyword + location.
+    Walks as many result pages as needed to reach max_results.
+    """
+    # Page sizes vary and dedupe drops rows: walk until max_results, not a guessed page count
+    return list(islice(iter_indeed(keyword, location, max_pages=DEFAULT_MAX_PAGES, verbose=verbose,
+                                   limit=max_results), max_results))
@@ -1,9 +1,11 @@
 import time
 import hashlib
-from typing import List, Dict
+from itertools import islice
+from typing import List, Dict, Iterator, Optional
 import requests
 from bs4 import BeautifulSoup
 from http_client import get_with_proxy
+from pagination import iter_pages, DEFAULT_MAX_PAGES
 
 USER_AGENT = "Mozilla/5.0 (compatible; JobScraperUltimate/1.0)"
 
@@ -13,24 +15,25 @@ class SiteResult(Dict):
 def _hash(title: str, url: str) -> str:
     return hashlib.sha1(f"{title}|{url}".encode("utf-8", errors="ignore")).hexdigest()
 
-def lever_search(keyword: str, location: str, max_results: int = 20, verbose: bool = False) -> List[SiteResult]:
-    """Search Lever job boards via their public search endpoint.
-    Many companies host at jobs.lever.co/<company>. We use global search.
-    """
-    query = f"{keyword} {location}".strip()
+def _page_url(query: str, page: int) -> str:
     # Lever search page presents a global search
     url = "https://jobs.lever.co/search/?commit=filter&query=" + requests.utils.quote(query)
+    if page:
+        url += f"&page={page + 1}"
+    return url
+
+def _fetch(url: str, verbose: bool = False) -> Optional[requests.Response]:
+    """Fetch one results page, retrying via direct request and alternate UA."""
     headers = {"User-Agent": USER_AGENT}
     if verbose:
         print(f"[lever] GET {url}")
     attempts = 0
     max_attempts = 3
-    resp = None
     while attempts < max_attempts:
         try:
             resp = get_with_proxy(url, headers=headers, timeout=30, use_proxy=True, verbose=verbose)
             resp.raise_for_status()
-            break
+            return resp
         except Exception as e:
             if verbose:
                 print(f"[lever] error (attempt {attempts+1}):", e)
@@ -39,22 +42,22 @@ def lever_search(keyword: str, location: str, max_results: int = 20, verbose: bo
                 try:
                     resp = requests.get(url, headers=headers, timeout=30)
                     resp.raise_for_status()
-                    break
+                    return resp
                 except Exception as e2:
                     if verbose:
                         print(f"[lever] direct request error (attempt {attempts+1}):", e2)
             # Adjust headers and retry
             headers["User-Agent"] = USER_AGENT + f" Retry{attempts+1}"
             attempts += 1
-    else:
-        return []
-    if resp is None:
-        return []
-    soup = BeautifulSoup(resp.text, "html.parser")
-    out: List[SiteResult] = []
+    return None
+
+def _parse_page(html: str, query: str) -> Iterator[SiteResult]:
+    soup = BeautifulSoup(html, "html.parser")
     for a in soup.select("a.posting-title"):
         title = a.get_text(" ", strip=True)
         href = a.get("href")
+        if not href:
+            continue
         # Company and location nearby
         parent = a.find_parent("div", class_="posting")
         snippet = ""
@@ -68,7 +71,7 @@ def lever_search(keyword: str, location: str, max_results: int = 20, verbose: bo
                 parts.append(loc.get_text(" ", strip=True))
             snippet = " | ".join(parts)
         full_url = href if href.startswith("http") else "https://jobs.lever.co" + href
-        out.append({
+        yield {
             "engine": "lever",
             "query": query,
             "title": title,
@@ -76,7 +79,24 @@ def lever_search(keyword: str, location: str, max_results: int = 20, verbose: bo
             "snippet": snippet,
             "ts": int(time.time()),
             "hash": _hash(title, full_url)
-        })
-        if len(out) >= max_results:
-            break
-    return out
+        }
+
+def iter_lever(keyword: str, location: str, max_pages: int = DEFAULT_MAX_PAGES, verbose: bool = False,
+               limit: Optional[int] = None) -> Iterator[SiteResult]:
+    """Lazily walk Lever search result pages, prefetching the next page
+    unless the first `limit` records are already in hand."""
+    query = f"{keyword} {location}".strip()
+    return iter_pages(
+        lambda page: _fetch(_page_url(query, page), verbose=verbose),
+        lambda resp, page: _parse_page(resp.text, query),
+        max_pages=max_pages,
+        limit=limit,
+    )
+
+def lever_search(keyword: str, location: str, max_results: int = 20, verbose: bool = False) -> List[SiteResult]:
+    """Search Lever job boards via their public search endpoint.
+    Many companies host at jobs.lever.co/<company>. We use global search.
+    """
+    # Page sizes vary and dedupe drops rows: walk until max_results, not a guessed page count
+    return list(islice(iter_lever(keyword, location, max_pages=DEFAULT_MAX_PAGES, verbose=verbose,
+                                  limit=max_results), max_results))
@@ -1,8 +1,23 @@
+"""
+LinkedIn job search through a headless Chrome
+Drivers live in a small pool and stay warm across queries; the session
+cookies of a successful login are saved and loaded into new drivers, so
+only the first search (or an expired session) goes through the login form.
+Page readiness is detected with explicit waits instead of fixed sleeps, and
+linkedin_job_search_many() runs several queries on parallel drivers.
+"""
+
+import os
 import time
+import atexit
 import hashlib
-from typing import List, Dict
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
 import requests
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
@@ -11,6 +26,16 @@ import json
 
 USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
+COOKIE_PATH = os.path.join("output", "linkedin_cookies.json")
+POOL_SIZE = 2          # warm drivers kept for parallel queries
+PAGE_TIMEOUT = 15      # seconds to wait for a page to become usable
+SCROLL_TIMEOUT = 3     # seconds to wait for more cards after a scroll
+MAX_SCROLLS = 6
+
+JOB_CARDS = (By.XPATH, "//div[@class='base-card' or @class='job-card-container']")
+# Empty results / guest wall: stop waiting for cards
+NO_RESULTS = (By.CSS_SELECTOR, ".jobs-search-no-results-banner, .authwall-join-form, .no-results")
+
 class LinkedInResult(Dict):
     pass
 
@@ -33,16 +58,77 @@ def _create_driver(headless: bool = True):
         print(f"[linkedin] Failed to create WebDriver: {e}")
         return None
 
+# ============= SESSION COOKIES =============
+
+def _account_key(email: str) -> str:
+    # Cookie file is keyed by a hash, not the address itself
+    return hashlib.sha1(email.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+def _read_cookie_file() -> Dict[str, List[Dict]]:
+    try:
+        with open(COOKIE_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _load_cookies(email: str) -> List[Dict]:
+    """Saved, unexpired session cookies for an account"""
+    now = time.time()
+    return [c for c in _read_cookie_file().get(_account_key(email), [])
+            if not c.get("expiry") or c["expiry"] > now]
+
+def _save_cookies(email: str, cookies: List[Dict]):
+    data = _read_cookie_file()
+    data[_account_key(email)] = cookies
+    os.makedirs(os.path.dirname(COOKIE_PATH) or ".", exist_ok=True)
+    # Session cookies are credentials: owner-only file
+    fd = os.open(COOKIE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+def _logged_in(driver) -> bool:
+    url = driver.current_url
+    return "feed" in url or "mynetwork" in url
+
+def _on_login_wall(driver) -> bool:
+    url = driver.current_url
+    return "/login" in url or "authwall" in url or "checkpoint" in url
+
+def restore_session(driver, email: str, verbose: bool = False) -> bool:
+    """Load the account's saved cookies into driver; True if that yields a logged-in session"""
+    cookies = _load_cookies(email)
+    if not any(c.get("name") == "li_at" for c in cookies):
+        return False
+    try:
+        # Cookies can only be set for the domain currently loaded
+        driver.get("https://www.linkedin.com/robots.txt")
+        for cookie in cookies:
+            cookie = {k: v for k, v in cookie.items()
+                      if k in ("name", "value", "domain", "path", "secure", "httpOnly", "expiry", "sameSite")}
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException:
+                continue
+        driver.get("https://www.linkedin.com/feed/")
+        WebDriverWait(driver, PAGE_TIMEOUT).until(lambda d: _logged_in(d) or _on_login_wall(d))
+    except (TimeoutException, WebDriverException) as e:
+        if verbose:
+            print(f"[linkedin] Saved session not usable: {e}")
+        return False
+    if verbose:
+        print("[linkedin] Restored saved session" if _logged_in(driver) else "[linkedin] Saved session expired")
+    return _logged_in(driver)
+
 def linkedin_login(driver, email: str, password: str, verbose: bool = False) -> bool:
-    """Log into LinkedIn account."""
+    """Log into LinkedIn account (and save the session cookies on success)."""
     try:
         if verbose:
             print("[linkedin] Navigating to login page...")
         driver.get("https://www.linkedin.com/login")
-        time.sleep(2)
         
         # Enter email
-        email_field = WebDriverWait(driver, 10).until(
+        email_field = WebDriverWait(driver, PAGE_TIMEOUT).until(
             EC.presence_of_element_located((By.ID, "username"))
         )
         email_field.send_keys(email)
@@ -55,13 +141,20 @@ def linkedin_login(driver, email: str, password: str, verbose: bool = False) ->
         login_btn = driver.find_element(By.XPATH, "//button[@type='submit']")
         login_btn.click()
         
-        # Wait for page to load
-        time.sleep(4)
+        # Wait until we leave the login form (feed, checkpoint, or an error back on /login)
+        try:
+            WebDriverWait(driver, PAGE_TIMEOUT).until(
+                lambda d: _logged_in(d) or "checkpoint" in d.current_url
+                or d.find_elements(By.ID, "error-for-password") or d.find_elements(By.ID, "error-for-username")
+            )
+        except TimeoutException:
+            pass
         
         # Check if login was successful
-        if "feed" in driver.current_url or "mynetwork" in driver.current_url:
+        if _logged_in(driver):
             if verbose:
                 print("[linkedin] Login successful!")
+            _save_cookies(email, driver.get_cookies())
             return True
         else:
             if verbose:
@@ -73,8 +166,229 @@ def linkedin_login(driver, email: str, password: str, verbose: bool = False) ->
             print(f"[linkedin] Login error: {e}")
         return False
 
+# ============= DRIVER POOL =============
+
+class _Worker:
+    """A pooled driver and the account its session belongs to"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.account: Optional[str] = None
+
+class LinkedInBrowserPool:
+    """Warm Chrome drivers shared by LinkedIn searches, created on demand up to size"""
+
+    def __init__(self, size: int = POOL_SIZE, headless: bool = True):
+        self.size = max(1, size)
+        self.headless = headless
+        self.closed = False
+        self._idle: List[_Worker] = []
+        self._created = 0
+        self._cond = threading.Condition()
+        # One login at a time: later drivers pick the session up from the cookie file
+        self._login_lock = threading.Lock()
+
+    def grow(self, size: int):
+        with self._cond:
+            self.size = max(self.size, size)
+            self._cond.notify_all()
+
+    @contextmanager
+    def worker(self, timeout: Optional[float] = None) -> Iterator[Optional[_Worker]]:
+        """Borrow a driver (None if one can't be started); it returns to the pool afterwards"""
+        worker = self._acquire(timeout)
+        try:
+            yield worker
+        finally:
+            if worker is not None:
+                self._release(worker)
+
+    def _acquire(self, timeout: Optional[float]) -> Optional[_Worker]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._idle and self._created >= self.size:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if self.closed or (remaining is not None and remaining <= 0):
+                    return None
+                self._cond.wait(remaining)
+            if self.closed:
+                return None
+            if self._idle:
+                return self._idle.pop()
+            self._created += 1
+        driver = _create_driver(headless=self.headless)
+        if driver is None:
+            with self._cond:
+                self._created -= 1
+                self._cond.notify()
+            return None
+        return _Worker(driver)
+
+    def _release(self, worker: _Worker):
+        try:
+            worker.driver.current_url  # a crashed Chrome fails here
+            alive = True
+        except Exception:
+            alive = False
+        with self._cond:
+            keep = alive and not self.closed
+            if keep:
+                self._idle.append(worker)
+            else:
+                self._created -= 1
+            self._cond.notify()
+        if not keep:
+            _quit(worker)
+
+    def ensure_session(self, worker: _Worker, email: str, password: str, verbose: bool = False) -> bool:
+        """Make worker's driver logged in as email: saved cookies first, the login form if needed"""
+        if worker.account == email:
+            return True
+        with self._login_lock:
+            if worker.account:
+                worker.driver.delete_all_cookies()
+                worker.account = None
+            if restore_session(worker.driver, email, verbose) or linkedin_login(worker.driver, email, password, verbose):
+                worker.account = email
+                return True
+        return False
+
+    def close(self):
+        """Quit every idle driver; busy ones quit when released"""
+        with self._cond:
+            self.closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for worker in idle:
+            _quit(worker)
+
+def _quit(worker: _Worker):
+    try:
+        worker.driver.quit()
+    except Exception:
+        pass
+
+_pool: Optional[LinkedInBrowserPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool(size: int = POOL_SIZE) -> LinkedInBrowserPool:
+    """The shared driver pool (grown to at least size); drivers are quit at exit"""
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = LinkedInBrowserPool(size)
+            atexit.register(_pool.close)
+        elif size > _pool.size:
+            _pool.grow(size)
+        return _pool
+
+def close_pool():
+    """Quit the shared pool's drivers now (e.g. when a long-running GUI is done with LinkedIn)"""
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+
+# ============= SEARCH =============
+
+def _wait_for_results(driver) -> bool:
+    """Wait until job cards (or an empty-result / login wall) are on the page"""
+    try:
+        WebDriverWait(driver, PAGE_TIMEOUT).until(
+            EC.any_of(EC.presence_of_element_located(JOB_CARDS), EC.presence_of_element_located(NO_RESULTS))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+def _load_more(driver, max_results: int, verbose: bool = False) -> int:
+    """Scroll until max_results cards are loaded or scrolling stops adding cards"""
+    count = len(driver.find_elements(*JOB_CARDS))
+    for _ in range(MAX_SCROLLS):
+        if count >= max_results:
+            break
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        try:
+            WebDriverWait(driver, SCROLL_TIMEOUT).until(lambda d: len(d.find_elements(*JOB_CARDS)) > count)
+        except TimeoutException:
+            break
+        count = len(driver.find_elements(*JOB_CARDS))
+    if verbose:
+        print(f"[linkedin] {count} cards loaded")
+    return count
+
+def _parse_cards(driver, max_results: int, verbose: bool = False) -> List[LinkedInResult]:
+    results: List[LinkedInResult] = []
+    seen_urls = set()
+    
+    # Try to extract job listings
+    job_cards = driver.find_elements(*JOB_CARDS)
+    
+    if verbose:
+        print(f"[linkedin] Found {len(job_cards)} job cards")
+    
+    for card in job_cards[:max_results]:
+        try:
+            # Extract job title
+            title_elem = card.find_element(By.XPATH, ".//h3[@class='base-search-card__title']")
+            title = title_elem.text.strip()
+            
+            # Extract company
+            company_elem = card.find_element(By.XPATH, ".//h4[@class='base-search-card__subtitle']")
+            company = company_elem.text.strip()
+            
+            # Extract location
+            location_elem = card.find_element(By.XPATH, ".//span[@class='job-search-card__location']")
+            result_location = location_elem.text.strip()
+            
+            # Extract URL by clicking the card
+            link_elem = card.find_element(By.XPATH, ".//a[@class='base-card__full-link']")
+            job_url = link_elem.get_attribute("href")
+            
+            # Extract snippet if available
+            try:
+                snippet_elem = card.find_element(By.XPATH, ".//p[@class='base-search-card__snippet']")
+                snippet = snippet_elem.text.strip()
+            except:
+                snippet = ""
+            
+            # Avoid duplicates
+            if job_url in seen_urls:
+                continue
+            seen_urls.add(job_url)
+            
+            # Clean up the URL (remove parameters if needed)
+            if "?" in job_url:
+                job_url = job_url.split("?")[0]
+            
+            result = LinkedInResult({
+                "title": title,
+                "company": company,
+                "location": result_location,
+                "url": job_url,
+                "snippet": snippet or f"Position at {company} in {result_location}",
+                "engine": "linkedin",
+                "hash": _hash(title, job_url)
+            })
+            
+            results.append(result)
+            
+            if verbose:
+                print(f"[linkedin] Found: {title} @ {company}")
+            
+        except Exception as e:
+            if verbose:
+                print(f"[linkedin] Error parsing job card: {e}")
+            continue
+    
+    if verbose:
+        print(f"[linkedin] Total results: {len(results)}")
+    
+    return results
+
 def linkedin_job_search(keyword: str, location: str = "", email: str = "", password: str = "", 
-                       max_results: int = 20, verbose: bool = False) -> List[LinkedInResult]:
+                       max_results: int = 20, verbose: bool = False,
+                       pool: Optional[LinkedInBrowserPool] = None) -> List[LinkedInResult]:
     """
     Scrape LinkedIn job search results.
     
@@ -85,117 +399,68 @@ def linkedin_job_search(keyword: str, location: str = "", email: str = "", passw
         password: LinkedIn account password (optional)
         max_results: Maximum number of results to return
         verbose: Print debug messages
+        pool: Driver pool to borrow from (default: the shared pool)
     
     Returns:
         List of job results with title, url, company, location, snippet, engine, hash
     """
-    driver = _create_driver(headless=True)
-    if not driver:
-        return []
-    
-    try:
-        # If credentials provided, log in
-        if email and password:
-            if not linkedin_login(driver, email, password, verbose):
-                if verbose:
-                    print("[linkedin] Proceeding without authentication...")
-        
-        # Build search URL
-        search_query = keyword
-        if location:
-            search_query = f"{keyword} in {location}"
-        
-        # Use LinkedIn jobs search page
-        url = f"https://www.linkedin.com/jobs/search/?keywords={keyword}"
-        if location:
-            url += f"&location={location}"
-        
-        if verbose:
-            print(f"[linkedin] GET {url}")
-        
-        driver.get(url)
-        time.sleep(3)
-        
-        # Scroll to load more results
-        for _ in range(3):
-            driver.execute_script("window.scrollBy(0, 3000);")
-            time.sleep(1)
-        
-        results: List[LinkedInResult] = []
-        seen_urls = set()
-        
-        # Try to extract job listings
-        job_cards = driver.find_elements(By.XPATH, "//div[@class='base-card' or @class='job-card-container']")
-        
-        if verbose:
-            print(f"[linkedin] Found {len(job_cards)} job cards")
-        
-        for card in job_cards[:max_results]:
-            try:
-                # Extract job title
-                title_elem = card.find_element(By.XPATH, ".//h3[@class='base-search-card__title']")
-                title = title_elem.text.strip()
-                
-                # Extract company
-                company_elem = card.find_element(By.XPATH, ".//h4[@class='base-search-card__subtitle']")
-                company = company_elem.text.strip()
-                
-                # Extract location
-                location_elem = card.find_element(By.XPATH, ".//span[@class='job-search-card__location']")
-                result_location = location_elem.text.strip()
-                
-                # Extract URL by clicking the card
-                link_elem = card.find_element(By.XPATH, ".//a[@class='base-card__full-link']")
-                job_url = link_elem.get_attribute("href")
-                
-                # Extract snippet if available
-                try:
-                    snippet_elem = card.find_element(By.XPATH, ".//p[@class='base-search-card__snippet']")
-                    snippet = snippet_elem.text.strip()
-                except:
-                    snippet = ""
-                
-                # Avoid duplicates
-                if job_url in seen_urls:
-                    continue
-                seen_urls.add(job_url)
-                
-                # Clean up the URL (remove parameters if needed)
-                if "?" in job_url:
-                    job_url = job_url.split("?")[0]
-                
-                result = LinkedInResult({
-                    "title": title,
-                    "company": company,
-                    "location": result_location,
-                    "url": job_url,
-                    "snippet": snippet or f"Position at {company} in {result_location}",
-                    "engine": "linkedin",
-                    "hash": _hash(title, job_url)
-                })
-                
-                results.append(result)
-                
-                if verbose:
-                    print(f"[linkedin] Found: {title} @ {company}")
-                
-            except Exception as e:
-                if verbose:
-                    print(f"[linkedin] Error parsing job card: {e}")
-                continue
-        
-        if verbose:
-            print(f"[linkedin] Total results: {len(results)}")
-        
-        return results
-        
-    except Exception as e:
-        if verbose:
-            print(f"[linkedin] Error: {e}")
-        return []
+    pool = pool or get_pool()
+    with pool.worker() as worker:
+        if worker is None:
+            return []
+        driver = worker.driver
+        try:
+            # If credentials provided, log in (or reuse this driver's / the saved session)
+            authenticated = bool(email and password) and pool.ensure_session(worker, email, password, verbose)
+            if email and password and not authenticated and verbose:
+                print("[linkedin] Proceeding without authentication...")
+            
+            # Use LinkedIn jobs search page
+            url = f"https://www.linkedin.com/jobs/search/?keywords={keyword}"
+            if location:
+                url += f"&location={location}"
+            
+            if verbose:
+                print(f"[linkedin] GET {url}")
+            
+            driver.get(url)
+            _wait_for_results(driver)
+            
+            # Session expired since this driver logged in: log in again once
+            if authenticated and _on_login_wall(driver):
+                worker.account = None
+                if pool.ensure_session(worker, email, password, verbose):
+                    driver.get(url)
+                    _wait_for_results(driver)
+            
+            # Scroll to load more results
+            _load_more(driver, max_results, verbose)
+            return _parse_cards(driver, max_results, verbose)
+            
+        except Exception as e:
+            if verbose:
+                print(f"[linkedin] Error: {e}")
+            return []
+
+def linkedin_job_search_many(queries: Sequence[Tuple[str, str]], email: str = "", password: str = "",
+                             max_results: int = 20, workers: int = POOL_SIZE,
+                             verbose: bool = False) -> Dict[Tuple[str, str], List[LinkedInResult]]:
+    """
+    Run several (keyword, location) searches on parallel pooled drivers.
     
-    finally:
-        driver.quit()
+    Returns:
+        {(keyword, location): results}
+    """
+    queries = list(dict.fromkeys(queries))
+    if not queries:
+        return {}
+    workers = max(1, min(workers, len(queries)))
+    pool = get_pool(workers)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="linkedin") as executor:
+        found = executor.map(
+            lambda q: linkedin_job_search(q[0], q[1], email, password, max_results, verbose, pool=pool), queries
+        )
+        return dict(zip(queries, found))
 
 def linkedin_search_via_api(keyword: str, location: str = "", max_results: int = 20, 
                            verbose: bool = False) -> List[LinkedInResult]:
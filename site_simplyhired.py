@@ -1,10 +1,12 @@
 import time
 import hashlib
-from typing import List, Dict
+from itertools import islice
+from typing import List, Dict, Iterator, Optional
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, quote_plus
 from http_client import get_with_proxy
+from pagination import iter_pages, DEFAULT_MAX_PAGES
 
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
@@ -14,13 +16,16 @@ class SiteResult(Dict):
 def _hash(title: str, url: str) -> str:
     return hashlib.sha1(f"{title}|{url}".encode("utf-8", errors="ignore")).hexdigest()
 
-def simplyhired_search(keyword: str, location: str, max_results: int = 20, verbose: bool = False) -> List[SiteResult]:
-    """Search SimplyHired (free job board, no API required)."""
-    query = f"{keyword} {location}".strip()
+def _page_url(keyword: str, location: str, page: int) -> str:
     # SimplyHired uses simple URL structure
     base = "https://www.simplyhired.com/search"
     params = f"q={quote_plus(keyword)}&l={quote_plus(location)}" if location else f"q={quote_plus(keyword)}"
-    url = f"{base}?{params}"
+    if page:
+        params += f"&pn={page + 1}"
+    return f"{base}?{params}"
+
+def _fetch(url: str, verbose: bool = False) -> Optional[requests.Response]:
+    """Fetch one results page, retrying via direct request and alternate UA."""
     headers = {
         "User-Agent": USER_AGENT,
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -39,7 +44,7 @@ def simplyhired_search(keyword: str, location: str, max_results: int = 20, verbo
         try:
             resp = get_with_proxy(url, headers=headers, timeout=30, use_proxy=True, verbose=verbose)
             resp.raise_for_status()
-            break
+            return resp
         except Exception as e:
             if verbose:
                 print(f"[simplyhired] error (attempt {attempts+1}):", e)
@@ -48,18 +53,17 @@ def simplyhired_search(keyword: str, location: str, max_results: int = 20, verbo
                 try:
                     resp = requests.get(url, headers=headers, timeout=30)
                     resp.raise_for_status()
-                    break
+                    return resp
                 except Exception as e2:
                     if verbose:
                         print(f"[simplyhired] direct request error (attempt {attempts+1}):", e2)
             # Adjust headers and retry
             headers["User-Agent"] = USER_AGENT + f" Retry{attempts+1}"
             attempts += 1
-    else:
-        return []
-    
-    soup = BeautifulSoup(resp.text, "html.parser")
-    out: List[SiteResult] = []
+    return None
+
+def _parse_page(html: str, query: str) -> Iterator[SiteResult]:
+    soup = BeautifulSoup(html, "html.parser")
     
     # Try multiple selector strategies
     for article in soup.select("article.job-listing, div[data-job-id], li.job"):
@@ -81,7 +85,7 @@ def simplyhired_search(keyword: str, location: str, max_results: int = 20, verbo
         
         full_url = href if href.startswith("http") else urljoin("https://www.simplyhired.com", href)
         
-        out.append({
+        yield {
             "engine": "simplyhired",
             "query": query,
             "title": title,
@@ -89,8 +93,22 @@ def simplyhired_search(keyword: str, location: str, max_results: int = 20, verbo
             "snippet": snippet,
             "ts": int(time.time()),
             "hash": _hash(title, full_url)
-        })
-        if len(out) >= max_results:
-            break
-    
-    return out
+        }
+
+def iter_simplyhired(keyword: str, location: str, max_pages: int = DEFAULT_MAX_PAGES, verbose: bool = False,
+                     limit: Optional[int] = None) -> Iterator[SiteResult]:
+    """Lazily walk SimplyHired result pages, prefetching the next page
+    unless the first `limit` records are already in hand."""
+    query = f"{keyword} {location}".strip()
+    return iter_pages(
+        lambda page: _fetch(_page_url(keyword, location, page), verbose=verbose),
+        lambda resp, page: _parse_page(resp.text, query),
+        max_pages=max_pages,
+        limit=limit,
+    )
+
+def simplyhired_search(keyword: str, location: str, max_results: int = 20, verbose: bool = False) -> List[SiteResult]:
+    """Search SimplyHired (free job board, no API required)."""
+    # Page sizes vary and dedupe drops rows: walk until max_results, not a guessed page count
+    return list(islice(iter_simplyhired(keyword, location, max_pages=DEFAULT_MAX_PAGES, verbose=verbose,
+                                        limit=max_results), max_results))
@@ -0,0 +1,212 @@
+"""
+Sweep Journal - checkpoints for long keyword x location x engine sweeps
+Every finished (engine, keyword, location) unit is recorded with its results,
+and enrichment / email-extraction progress is recorded per item, so a sweep
+that dies part-way can be resumed without repeating finished fetches.
+"""
+
+import os
+import json
+import uuid
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from job_record import json_default
+
+DEFAULT_JOURNAL_PATH = os.path.join("output", "sweep_journal.db")
+
+# Finished runs beyond this many are pruned
+KEEP_RUNS = 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    started TEXT NOT NULL,
+    updated TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'running'
+);
+CREATE TABLE IF NOT EXISTS units (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    engine TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    location TEXT NOT NULL,
+    results TEXT NOT NULL,
+    done_at TEXT NOT NULL,
+    PRIMARY KEY (run_id, engine, keyword, location)
+);
+CREATE TABLE IF NOT EXISTS stage_items (
+    run_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    item_key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (run_id, stage, item_key)
+);
+"""
+
+
+def _params_key(params: Dict) -> str:
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+class SweepJournal:
+    """Checkpoint journal for one sweep run"""
+
+    def __init__(self, run_id: str, kind: str, params: Dict, path: str = DEFAULT_JOURNAL_PATH,
+                 resumed: bool = False, conn: Optional[sqlite3.Connection] = None):
+        self.run_id = run_id
+        self.kind = kind
+        self.params = params
+        self.path = path
+        self.resumed = resumed
+        self._lock = threading.Lock()
+        self.conn = conn or _connect(path)
+        self._done = {
+            (row[0], row[1], row[2])
+            for row in self.conn.execute(
+                "SELECT engine, keyword, location FROM units WHERE run_id = ?", (run_id,)
+            )
+        }
+
+    # ---------------- opening -----------------
+
+    @classmethod
+    def open(cls, kind: str, params: Dict, resume: bool = False, path: str = DEFAULT_JOURNAL_PATH,
+             run_id: Optional[str] = None) -> "SweepJournal":
+        """
+        Start a new journaled run, or with resume=True continue the most recent
+        unfinished run of this kind with identical params (or the given run_id).
+        """
+        conn = _connect(path)
+        if resume:
+            if run_id:
+                row = conn.execute(
+                    "SELECT run_id, params FROM runs WHERE run_id = ? AND status = 'running'", (run_id,)
+                ).fetchone()
+            else:
+                row = conn.execute(
+                    "SELECT run_id, params FROM runs WHERE kind = ? AND params = ? AND status = 'running' "
+                    "ORDER BY updated DESC LIMIT 1",
+                    (kind, _params_key(params)),
+                ).fetchone()
+            if row:
+                return cls(row[0], kind, json.loads(row[1]), path, resumed=True, conn=conn)
+
+        run_id = datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:6]
+        now = datetime.now().isoformat()
+        with conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, kind, params, started, updated) VALUES (?, ?, ?, ?, ?)",
+                (run_id, kind, _params_key(params), now, now),
+            )
+        _prune(conn)
+        return cls(run_id, kind, params, path, conn=conn)
+
+    @staticmethod
+    def last_unfinished(kind: str, path: str = DEFAULT_JOURNAL_PATH) -> Optional[Dict[str, Any]]:
+        """The most recent unfinished run of this kind: {run_id, params, started, units_done}"""
+        if not os.path.exists(path):
+            return None
+        conn = _connect(path)
+        try:
+            row = conn.execute(
+                "SELECT run_id, params, started FROM runs WHERE kind = ? AND status = 'running' "
+                "ORDER BY updated DESC LIMIT 1",
+                (kind,),
+            ).fetchone()
+            if not row:
+                return None
+            units = conn.execute("SELECT COUNT(*) FROM units WHERE run_id = ?", (row[0],)).fetchone()[0]
+            return {"run_id": row[0], "params": json.loads(row[1]), "started": row[2], "units_done": units}
+        finally:
+            conn.close()
+
+    # ---------------- search units -----------------
+
+    def unit_done(self, engine: str, keyword: str, location: str = "") -> bool:
+        return (engine, keyword, location or "") in self._done
+
+    @property
+    def units_done(self) -> int:
+        return len(self._done)
+
+    def record_unit(self, engine: str, keyword: str, location: str, results: List[Dict]):
+        """Checkpoint one finished (engine, keyword, location) unit and its results"""
+        now = datetime.now().isoformat()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO units (run_id, seq, engine, keyword, location, results, done_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.run_id, len(self._done), engine, keyword, location or "",
+                 json.dumps(results, default=json_default), now),
+            )
+            self.conn.execute("UPDATE runs SET updated = ? WHERE run_id = ?", (now, self.run_id))
+            self._done.add((engine, keyword, location or ""))
+
+    def unit_results(self) -> List[Dict]:
+        """Results of every finished unit, in completion order"""
+        out: List[Dict] = []
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT results FROM units WHERE run_id = ? ORDER BY seq", (self.run_id,)
+            ).fetchall()
+        for (results,) in rows:
+            out.extend(json.loads(results))
+        return out
+
+    # ---------------- enrichment / extraction progress -----------------
+
+    def stage_items(self, stage: str) -> Dict[str, Any]:
+        """Items already processed in a stage ("enrich", "emails", ...), by key"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT item_key, data FROM stage_items WHERE run_id = ? AND stage = ?", (self.run_id, stage)
+            ).fetchall()
+        return {k: json.loads(d) for k, d in rows}
+
+    def put_stage_item(self, stage: str, key: str, data: Any):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO stage_items (run_id, stage, item_key, data) VALUES (?, ?, ?, ?)",
+                (self.run_id, stage, key, json.dumps(data, default=json_default)),
+            )
+
+    # ---------------- lifecycle -----------------
+
+    def finish(self):
+        """Mark the run complete; it will no longer be offered for resume"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE runs SET status = 'done', updated = ? WHERE run_id = ?",
+                (datetime.now().isoformat(), self.run_id),
+            )
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _prune(conn: sqlite3.Connection):
+    """Drop finished runs beyond the newest KEEP_RUNS"""
+    old = [r[0] for r in conn.execute(
+        "SELECT run_id FROM runs WHERE status = 'done' ORDER BY updated DESC LIMIT -1 OFFSET ?", (KEEP_RUNS,)
+    )]
+    if not old:
+        return
+    with conn:
+        for run_id in old:
+            conn.execute("DELETE FROM units WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM stage_items WHERE run_id = ?", (run_id,))
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
@@ -0,0 +1,59 @@
+"""
+Regression tests for near-duplicate collapse
+Same-titled jobs at different employers, and bare titles with nothing else
+to compare, are separate postings and must survive the collapse.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from near_dupes import NearDupIndex, collapse_near_duplicates
+
+COMPANIES = ["Initech", "Hooli", "Globex", "Umbrella", "Stark Industries", "Wayne Enterprises"]
+
+
+def test_same_title_different_companies_in_snippet_stay_apart():
+    records = [{"title": "Senior Software Engineer", "snippet": f"{c} | Remote",
+                "url": f"https://jobs.example.com/{i}"} for i, c in enumerate(COMPANIES)]
+    assert len(collapse_near_duplicates(records)) == len(COMPANIES)
+
+
+def test_same_title_different_company_fields_stay_apart():
+    snippet = "Build and ship backend services. Python, Postgres, AWS. Remote friendly."
+    records = [{"title": "Senior Software Engineer", "company": c, "snippet": snippet,
+                "url": f"https://jobs.example.com/{i}"} for i, c in enumerate(COMPANIES)]
+    assert len(collapse_near_duplicates(records)) == len(COMPANIES)
+
+
+def test_initech_and_hooli_are_not_merged():
+    index = NearDupIndex()
+    assert not index.add({"title": "Senior Software Engineer", "company": "Initech",
+                          "snippet": "Initech | Remote", "url": "https://a.example.com/1"})
+    assert not index.add({"title": "Senior Software Engineer", "company": "Hooli",
+                          "snippet": "Hooli | Remote", "url": "https://b.example.com/2"})
+
+
+def test_title_only_records_are_never_collapsed():
+    records = [{"title": "Plumber", "snippet": "", "url": f"https://jobs.example.com/p{i}"} for i in range(5)]
+    assert len(collapse_near_duplicates(records)) == 5
+    records = [{"title": "Plumber", "snippet": "Plumber", "url": f"https://jobs.example.com/q{i}"} for i in range(5)]
+    assert len(collapse_near_duplicates(records)) == 5
+
+
+def test_syndicated_copies_still_collapse():
+    snippet = ("Acme is hiring a Senior Software Engineer to build payment APIs in Python and Go. "
+               "Remote within the US, competitive salary and equity.")
+    records = [
+        {"title": "Senior Software Engineer", "company": "Acme", "snippet": snippet,
+         "url": "https://www.indeed.com/viewjob?jk=1"},
+        {"title": "Senior Software Engineer - Acme", "company": "Acme Inc", "snippet": snippet + " Apply now on LinkedIn.",
+         "url": "https://www.linkedin.com/jobs/view/2"},
+        {"title": "Senior Software Engineer", "company": "Acme", "snippet": snippet,
+         "url": "https://boards.greenhouse.io/acme/jobs/3"},
+    ]
+    out = collapse_near_duplicates(records)
+    assert len(out) == 1
+    assert out[0]["url"] == "https://boards.greenhouse.io/acme/jobs/3"
+    assert out[0]["duplicate_count"] == 2
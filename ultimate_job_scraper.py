@@ -9,9 +9,14 @@ from bs4 import BeautifulSoup
 import time
 import re
 from urllib.parse import urlparse, parse_qs, unquote, urljoin, quote_plus
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from http_client import get_with_proxy
+from single_flight import format_flight_stats
+from query_plan import dedupe_queries, get_history, normalize_keyword, normalize_location
+from block_detector import OK, classify_response
 
 # Job-specific search terms to maximize results
 JOB_KEYWORDS = [
@@ -54,11 +59,20 @@ def is_job_related(text: str, url: str) -> bool:
     keyword_matches = sum(1 for kw in JOB_KEYWORDS if kw in text_lower)
     return keyword_matches >= 1
 
-def scrape_duckduckgo_lite(query: str, max_results: int = 10, use_proxy: bool = True, verbose: bool = False) -> List[Dict]:
+def scrape_duckduckgo_lite(query: str, max_results: int = 10, use_proxy: bool = True, verbose: bool = False, delay: float = 2.0) -> List[Dict]:
     """
     Scrape DuckDuckGo Lite with aggressive proxy rotation
     Uses lite.duckduckgo.com which is less likely to block
+    delay: Seconds to pause after the request (0 when the caller rate-limits)
     """
+    return _scrape_lite(query, max_results, use_proxy, verbose, delay)[0]
+
+def _answered(resp) -> bool:
+    """True if DDG served a results page rather than a block or challenge page"""
+    return classify_response("duckduckgo", resp) == OK
+
+def _scrape_lite(query: str, max_results: int, use_proxy: bool, verbose: bool, delay: float = 2.0) -> Tuple[List[Dict], bool]:
+    """(results, answered): answered is False when the request failed or was blocked"""
     encoded_query = quote_plus(query)
     search_url = f"https://lite.duckduckgo.com/lite/?q={encoded_query}"
     
@@ -78,12 +92,18 @@ def scrape_duckduckgo_lite(query: str, max_results: int = 10, use_proxy: bool =
         if verbose:
             print(f"[DDG_LITE] Got response: {len(resp.text)} bytes")
         
-        time.sleep(2)  # Rate limit
+        if delay:
+            time.sleep(delay)  # Rate limit
         
     except Exception as e:
         if verbose:
             print(f"[DDG_LITE] Error: {e}")
-        return []
+        return [], False
+    
+    if not _answered(resp):
+        if verbose:
+            print(f"[DDG_LITE] Blocked (status {resp.status_code})")
+        return [], False
     
     soup = BeautifulSoup(resp.text, "html.parser")
     results = []
@@ -128,13 +148,18 @@ def scrape_duckduckgo_lite(query: str, max_results: int = 10, use_proxy: bool =
     if verbose:
         print(f"[DDG_LITE] Found {len(results)} results")
     
-    return results
+    return results, True
 
-def scrape_duckduckgo_html(query: str, max_results: int = 10, use_proxy: bool = True, verbose: bool = False) -> List[Dict]:
+def scrape_duckduckgo_html(query: str, max_results: int = 10, use_proxy: bool = True, verbose: bool = False, delay: float = 2.0) -> List[Dict]:
     """
     Scrape DuckDuckGo HTML version (regular)
     Complementary to Lite version for maximum coverage
+    delay: Seconds to pause after the request (0 when the caller rate-limits)
     """
+    return _scrape_html(query, max_results, use_proxy, verbose, delay)[0]
+
+def _scrape_html(query: str, max_results: int, use_proxy: bool, verbose: bool, delay: float = 2.0) -> Tuple[List[Dict], bool]:
+    """(results, answered): answered is False when the request failed or was blocked"""
     url = "https://duckduckgo.com/html/"
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -160,12 +185,18 @@ def scrape_duckduckgo_html(query: str, max_results: int = 10, use_proxy: bool =
         )
         resp.raise_for_status()
         
-        time.sleep(2)
+        if delay:
+            time.sleep(delay)
         
     except Exception as e:
         if verbose:
             print(f"[DDG_HTML] Error: {e}")
-        return []
+        return [], False
+    
+    if not _answered(resp):
+        if verbose:
+            print(f"[DDG_HTML] Blocked (status {resp.status_code})")
+        return [], False
     
     soup = BeautifulSoup(resp.text, "html.parser")
     results = []
@@ -202,14 +233,56 @@ def scrape_duckduckgo_html(query: str, max_results: int = 10, use_proxy: bool =
     if verbose:
         print(f"[DDG_HTML] Found {len(results)} results")
     
-    return results
+    return results, True
+
+# Endpoints and the minimum spacing between requests to each in parallel mode
+DDG_LITE = "lite"
+DDG_HTML = "html"
+ENDPOINT_MIN_INTERVAL = {DDG_LITE: 2.0, DDG_HTML: 2.0}
+
+TOP_BOARDS = ["indeed", "linkedin", "glassdoor", "monster", "dice"]
+
+def _strategy_plan(keyword: str, location: str, max_results_per_strategy: int) -> List[Tuple[str, str, str, int]]:
+    """
+    (label, endpoint, query, max_results) for every distinct strategy, in
+    priority order; strategies whose query came back empty recently go last.
+    """
+    n = max_results_per_strategy
+    keyword, location = normalize_keyword(keyword), normalize_location(location)
+    plan = [
+        ("STRATEGY 1: DDG Lite Direct", DDG_LITE, f"{keyword} {location}".strip(), n),
+        ("STRATEGY 2: DDG HTML Direct", DDG_HTML, f"{keyword} {location}".strip(), n),
+        ("STRATEGY 3: DDG Lite + 'jobs'", DDG_LITE, f"{keyword} jobs {location}".strip(), n),
+        ("STRATEGY 4: DDG HTML + 'careers'", DDG_HTML, f"{keyword} careers {location}".strip(), n),
+        ("STRATEGY 5: DDG Lite + 'hiring'", DDG_LITE, f"{keyword} hiring {location}".strip(), n),
+    ]
+    for i, board in enumerate(TOP_BOARDS, 1):
+        plan.append((f"STRATEGY 6.{i}: {board.title()} Targeted", DDG_LITE,
+                     f"{keyword} {location} site:{board}.com".strip(), 10))
+    if not location:
+        plan.append(("STRATEGY 7: Remote Jobs", DDG_LITE, f"{keyword} remote jobs", n))
+    # Variants collide easily ("python jobs" + 'jobs', "java remote" + Remote): send each query once per endpoint
+    plan = dedupe_queries(plan, key=lambda s: f"@{s[1]} {s[2]}")
+    history = get_history()
+    warm = [s for s in plan if not history.is_cold(s[2], _history_engine(s[1]))]
+    return warm + [s for s in plan if s not in warm]
+
+def _history_engine(endpoint: str) -> str:
+    return f"ddg_{endpoint}"
+
+def _scraper_for(endpoint: str):
+    """The (results, answered) scraper behind an endpoint"""
+    return _scrape_html if endpoint == DDG_HTML else _scrape_lite
 
 def ultra_job_search(
     keyword: str,
     location: str = "",
     max_results_per_strategy: int = 20,
     use_proxy: bool = True,
-    verbose: bool = False
+    verbose: bool = False,
+    parallel: bool = False,
+    max_workers: int = 4,
+    target_unique: Optional[int] = None
 ) -> List[Dict]:
     """
     ULTRA-AGGRESSIVE job search using multiple strategies
@@ -224,102 +297,108 @@ def ultra_job_search(
     7. Keyword + "remote" if location not specified
     
     All strategies use proxy rotation for maximum success
-    """
-    all_results = []
-    seen_hashes = set()
-    
-    # Build base query
-    base_query = f"{keyword} {location}".strip()
-    
-    # Strategy 1: DDG Lite - Direct search
-    if verbose:
-        print(f"\n=== STRATEGY 1: DDG Lite Direct ===")
-    results = scrape_duckduckgo_lite(base_query, max_results_per_strategy, use_proxy, verbose)
-    for r in results:
-        if r['hash'] not in seen_hashes:
-            seen_hashes.add(r['hash'])
-            all_results.append(r)
-    
-    time.sleep(3)  # Rate limit between strategies
     
-    # Strategy 2: DDG HTML - Direct search
-    if verbose:
-        print(f"\n=== STRATEGY 2: DDG HTML Direct ===")
-    results = scrape_duckduckgo_html(base_query, max_results_per_strategy, use_proxy, verbose)
-    for r in results:
-        if r['hash'] not in seen_hashes:
-            seen_hashes.add(r['hash'])
-            all_results.append(r)
-    
-    time.sleep(3)
-    
-    # Strategy 3: DDG Lite - "jobs" variant
-    if verbose:
-        print(f"\n=== STRATEGY 3: DDG Lite + 'jobs' ===")
-    jobs_query = f"{keyword} jobs {location}".strip()
-    results = scrape_duckduckgo_lite(jobs_query, max_results_per_strategy, use_proxy, verbose)
-    for r in results:
-        if r['hash'] not in seen_hashes:
-            seen_hashes.add(r['hash'])
-            all_results.append(r)
+    parallel: Run strategies concurrently, spacing requests per endpoint
+              (ENDPOINT_MIN_INTERVAL) instead of sleeping between strategies
+    max_workers: Concurrent strategies in parallel mode
+    target_unique: Stop issuing strategies once this many unique results are in
+    """
+    plan = _strategy_plan(keyword, location, max_results_per_strategy)
     
-    time.sleep(3)
+    if parallel:
+        all_results = _run_strategies_parallel(plan, use_proxy, verbose, max_workers, target_unique)
+    else:
+        all_results = _run_strategies_sequential(plan, use_proxy, verbose, max_results_per_strategy, target_unique)
     
-    # Strategy 4: DDG HTML - "careers" variant
+    get_history().save()
     if verbose:
-        print(f"\n=== STRATEGY 4: DDG HTML + 'careers' ===")
-    careers_query = f"{keyword} careers {location}".strip()
-    results = scrape_duckduckgo_html(careers_query, max_results_per_strategy, use_proxy, verbose)
-    for r in results:
-        if r['hash'] not in seen_hashes:
-            seen_hashes.add(r['hash'])
-            all_results.append(r)
+        print(f"\n=== TOTAL RESULTS: {len(all_results)} unique jobs found ===")
+        print(f"[coalescing] {format_flight_stats()}")
     
-    time.sleep(3)
+    return all_results
+
+def _run_strategies_sequential(plan, use_proxy, verbose, max_results_per_strategy, target_unique) -> List[Dict]:
+    """Original one-at-a-time behaviour with fixed pauses between strategies"""
+    all_results = []
+    seen_hashes = set()
     
-    # Strategy 5: DDG Lite - "hiring" variant
-    if verbose:
-        print(f"\n=== STRATEGY 5: DDG Lite + 'hiring' ===")
-    hiring_query = f"{keyword} hiring {location}".strip()
-    results = scrape_duckduckgo_lite(hiring_query, max_results_per_strategy, use_proxy, verbose)
-    for r in results:
-        if r['hash'] not in seen_hashes:
-            seen_hashes.add(r['hash'])
-            all_results.append(r)
-    
-    time.sleep(3)
-    
-    # Strategy 6: Targeted job board searches (top 5 boards)
-    top_boards = ["indeed", "linkedin", "glassdoor", "monster", "dice"]
-    for board in top_boards:
-        if len(all_results) >= max_results_per_strategy * 5:
+    for label, endpoint, query, n in plan:
+        is_board = label.startswith("STRATEGY 6")
+        if is_board and len(all_results) >= max_results_per_strategy * 5:
+            continue
+        if target_unique and len(all_results) >= target_unique:
             break
-            
-        if verbose:
-            print(f"\n=== STRATEGY 6.{top_boards.index(board)+1}: {board.title()} Targeted ===")
         
-        board_query = f"{keyword} {location} site:{board}.com".strip()
-        results = scrape_duckduckgo_lite(board_query, 10, use_proxy, verbose)
+        if verbose:
+            print(f"\n=== {label} ===")
+        results, answered = _scraper_for(endpoint)(query, n, use_proxy, verbose)
+        if answered:
+            # A blocked or failed fetch says nothing about whether the query is empty
+            get_history().record(query, len(results), _history_engine(endpoint))
         for r in results:
             if r['hash'] not in seen_hashes:
                 seen_hashes.add(r['hash'])
                 all_results.append(r)
         
-        time.sleep(2)
+        if not label.startswith("STRATEGY 7"):
+            time.sleep(2 if is_board else 3)  # Rate limit between strategies
     
-    # Strategy 7: Remote variant if no location
-    if not location:
+    return all_results
+
+def _run_strategies_parallel(plan, use_proxy, verbose, max_workers, target_unique) -> List[Dict]:
+    """
+    Run strategies on a thread pool. Each endpoint has its own rate limiter,
+    results are merged into one hash set as they arrive, and remaining
+    strategies are cancelled once target_unique is reached.
+    """
+    from engine_registry import RateLimiter
+    
+    limiters = {ep: RateLimiter(interval) for ep, interval in ENDPOINT_MIN_INTERVAL.items()}
+    stop = threading.Event()
+    all_results = []
+    seen_hashes = set()
+    
+    def run(label, endpoint, query, n):
+        if stop.is_set():
+            return label, []
+        limiters[endpoint].wait()
+        if stop.is_set():
+            return label, []
         if verbose:
-            print(f"\n=== STRATEGY 7: Remote Jobs ===")
-        remote_query = f"{keyword} remote jobs"
-        results = scrape_duckduckgo_lite(remote_query, max_results_per_strategy, use_proxy, verbose)
-        for r in results:
-            if r['hash'] not in seen_hashes:
-                seen_hashes.add(r['hash'])
-                all_results.append(r)
+            print(f"\n=== {label} ===")
+        results, answered = _scraper_for(endpoint)(query, n, use_proxy, verbose, delay=0)
+        if answered:
+            get_history().record(query, len(results), _history_engine(endpoint))
+        return label, results
     
-    if verbose:
-        print(f"\n=== TOTAL RESULTS: {len(all_results)} unique jobs found ===")
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = [executor.submit(run, *strategy) for strategy in plan]
+        for future in as_completed(futures):
+            try:
+                label, results = future.result()
+            except Exception as e:
+                if verbose:
+                    print(f"[ULTRA] Strategy failed: {e}")
+                continue
+            
+            added = 0
+            for r in results:
+                if r['hash'] not in seen_hashes:
+                    seen_hashes.add(r['hash'])
+                    all_results.append(r)
+                    added += 1
+            if verbose and results:
+                print(f"[ULTRA] {label}: +{added} new ({len(all_results)} total)")
+            
+            if target_unique and len(all_results) >= target_unique:
+                if verbose:
+                    print(f"[ULTRA] Target of {target_unique} unique results reached, stopping early")
+                stop.set()
+                break
+    finally:
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
     
     return all_results
 
@@ -348,7 +427,8 @@ if __name__ == "__main__":
         location="remote",
         max_results_per_strategy=5,
         use_proxy=True,
-        verbose=True
+        verbose=True,
+        parallel=True
     )
     
     print(f"\n✅ Found {len(results)} total unique job listings")
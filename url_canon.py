@@ -0,0 +1,271 @@
+"""
+URL canonicalization for job postings
+Turns the many spellings of one posting URL (tracking params, www/case/
+scheme differences, search-engine redirect wrappers) into one canonical URL
+and a scheme-less dedupe key, while keeping the query params that actually
+identify a job (Indeed jk=, LinkedIn currentJobId=, Greenhouse gh_jid=, ...).
+"""
+
+import re
+import threading
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode, unquote
+
+from perf_metrics import METRICS
+
+# Query params that only track where a click came from
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "dclid", "yclid", "mc_cid", "mc_eid", "_hsenc", "_hsmi",
+    "ref", "refid", "ref_src", "trk", "trkinfo", "trackingid", "tracking_id", "src",
+    "from", "vjs", "tk", "advn", "adid", "sjdu", "acatk", "pub", "xkcb", "campaign",
+    "lipi", "midtoken", "midsig", "eboid", "recommendedflavor", "refer", "referrer",
+    "gh_src", "lever-source", "lever-origin", "source", "iis", "iisn",
+}
+TRACKING_PREFIXES = ("utm_", "pk_", "mtm_", "hsa_")
+
+
+class SiteRule:
+    """How to canonicalize URLs on one site"""
+
+    def __init__(
+        self,
+        keep_params: Optional[Tuple[str, ...]] = None,
+        rewrite: Optional[Callable[[str, Dict[str, str]], Optional[Tuple[str, Dict[str, str]]]]] = None,
+        force_https: bool = True,
+        host: Optional[str] = None,
+    ):
+        """
+        Args:
+            keep_params: Only these params survive (None = keep all non-tracking params)
+            rewrite: (path, params) -> (path, params) or None, for sites where the
+                     job id can appear in several URL shapes
+            force_https: Upgrade http:// to https://
+            host: Replace the host (e.g. collapse country/mobile subdomains)
+        """
+        self.keep_params = keep_params
+        self.rewrite = rewrite
+        self.force_https = force_https
+        self.host = host
+
+
+def _indeed_rewrite(path, params):
+    # /rc/clk?jk=..., /viewjob?jk=..., /m/viewjob?jk=..., /?vjk=... all name one job
+    jk = params.get("jk") or params.get("vjk")
+    if jk:
+        return "/viewjob", {"jk": jk}
+    return None
+
+
+_LINKEDIN_VIEW = re.compile(r"^/jobs/view/(?:[^/]*-)?(\d+)")
+
+
+def _linkedin_rewrite(path, params):
+    job_id = params.get("currentJobId")
+    m = _LINKEDIN_VIEW.match(path)
+    if m:
+        job_id = m.group(1)
+    if job_id:
+        return f"/jobs/view/{job_id}", {}
+    return None
+
+
+_GREENHOUSE_JOB = re.compile(r"^/([^/]+)/jobs/(\d+)")
+
+
+def _greenhouse_rewrite(path, params):
+    m = _GREENHOUSE_JOB.match(path)
+    if m:
+        return f"/{m.group(1)}/jobs/{m.group(2)}", {}
+    if params.get("gh_jid"):
+        return path, {"gh_jid": params["gh_jid"]}
+    return None
+
+
+# Matched against the host and its parent domains; longest suffix wins
+SITE_RULES: Dict[str, SiteRule] = {
+    "indeed.com": SiteRule(keep_params=("jk", "q", "l", "start"), rewrite=_indeed_rewrite),
+    "linkedin.com": SiteRule(keep_params=("keywords", "location", "start"), rewrite=_linkedin_rewrite, host="www.linkedin.com"),
+    "glassdoor.com": SiteRule(keep_params=("jl", "jobListingId")),
+    "ziprecruiter.com": SiteRule(keep_params=("jid", "lvk")),
+    "simplyhired.com": SiteRule(keep_params=("q", "l", "job")),
+    "greenhouse.io": SiteRule(keep_params=("gh_jid",), rewrite=_greenhouse_rewrite),
+    "lever.co": SiteRule(keep_params=()),
+    "remoteok.com": SiteRule(keep_params=()),
+    "weworkremotely.com": SiteRule(keep_params=()),
+    "remotive.com": SiteRule(keep_params=()),
+    "myworkdayjobs.com": SiteRule(keep_params=()),
+    "ashbyhq.com": SiteRule(keep_params=()),
+    "dice.com": SiteRule(keep_params=()),
+    "monster.com": SiteRule(keep_params=("jobid",)),
+}
+
+_DEFAULT_RULE = SiteRule(force_https=False)
+
+
+def _rule_for(host: str) -> SiteRule:
+    best, best_len = _DEFAULT_RULE, 0
+    for suffix, rule in SITE_RULES.items():
+        if (host == suffix or host.endswith("." + suffix)) and len(suffix) > best_len:
+            best, best_len = rule, len(suffix)
+    return best
+
+
+# ---------------- Redirect wrappers -----------------
+
+def unwrap_redirect(url: str) -> str:
+    """
+    Extract the target of search-engine redirect wrappers without any network
+    access (DuckDuckGo /l/?uddg=, Google /url?q=). Returns url unchanged otherwise.
+    """
+    if not url:
+        return url
+    if url.startswith("//"):
+        url = "https:" + url
+    for _ in range(3):  # wrappers are occasionally nested
+        parts = urlsplit(url)
+        host = parts.netloc.lower()
+        params = dict(parse_qsl(parts.query))
+        target = None
+        if host.endswith("duckduckgo.com") and parts.path.startswith("/l/"):
+            target = params.get("uddg")
+        elif (host.startswith("google.") or ".google." in host) and parts.path == "/url":
+            target = params.get("q") or params.get("url")
+        if not target:
+            return url
+        url = unquote(target) if "%" in target[:12] else target
+        if url.startswith("//"):
+            url = "https:" + url
+    return url
+
+
+# Wrappers whose target is only known to the server (or not in the URL)
+_NEEDS_RESOLVE = (
+    re.compile(r"(^|\.)indeed\.com/(rc/clk|pagead/clk)", re.I),
+    re.compile(r"(^|\.)ziprecruiter\.com/(ekm|km|c)/", re.I),
+    re.compile(r"^(lnkd\.in|t\.co|bit\.ly|tinyurl\.com|ow\.ly)/", re.I),
+)
+
+_resolve_cache: Dict[str, str] = {}
+_resolve_lock = threading.Lock()
+RESOLVE_CACHE_MAX = 5000
+
+
+def needs_resolution(url: str) -> bool:
+    """True for wrapper URLs that cannot be canonicalized offline"""
+    parts = urlsplit(url)
+    host_path = parts.netloc.lower().removeprefix("www.") + parts.path
+    if "indeed.com" in host_path and ("jk=" in parts.query or "vjk=" in parts.query):
+        return False
+    return any(p.search(host_path) for p in _NEEDS_RESOLVE)
+
+
+def resolve_redirect(url: str, timeout: float = 5.0) -> str:
+    """
+    Follow redirects to the final URL (cached per process).
+    Falls back to the original URL on any error.
+    """
+    with _resolve_lock:
+        hit = _resolve_cache.get(url)
+    METRICS.cache("resolve_redirect", hit is not None)
+    if hit is not None:
+        return hit
+    final = url
+    try:
+        import requests
+        resp = requests.head(url, allow_redirects=True, timeout=timeout,
+                             headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"})
+        if resp.url:
+            final = resp.url
+    except Exception:
+        pass
+    with _resolve_lock:
+        if len(_resolve_cache) >= RESOLVE_CACHE_MAX:
+            _resolve_cache.pop(next(iter(_resolve_cache)))
+        _resolve_cache[url] = final
+    return final
+
+
+# ---------------- Canonicalization -----------------
+
+_PCT_ESCAPE = re.compile(r"%[0-9a-fA-F]{2}")
+
+
+def _normalize_host(netloc: str, scheme: str) -> str:
+    host = netloc.rsplit("@", 1)[-1]  # drop credentials
+    port = ""
+    if host.startswith("["):
+        pass  # IPv6 literal, leave alone
+    elif ":" in host:
+        host, port = host.rsplit(":", 1)
+        if (scheme, port) in (("http", "80"), ("https", "443")):
+            port = ""
+    host = host.strip(".").lower()
+    try:
+        host = host.encode("idna").decode("ascii")
+    except (UnicodeError, ValueError):
+        pass
+    return f"{host}:{port}" if port else host
+
+
+def _is_tracking(name: str) -> bool:
+    lower = name.lower()
+    return lower in TRACKING_PARAMS or lower.startswith(TRACKING_PREFIXES)
+
+
+def canonicalize_url(url: str, resolve: bool = False) -> str:
+    """
+    Canonical form of a job URL:
+    - redirect wrappers unwrapped (network resolution only when resolve=True)
+    - host lowercased, punycode-encoded, default port dropped
+    - per-site identity params kept, tracking params dropped, params sorted
+    - duplicate/trailing slashes and fragments removed
+    """
+    if not url:
+        return url
+    url = unwrap_redirect(url.strip())
+    if resolve and needs_resolution(url):
+        url = unwrap_redirect(resolve_redirect(url))
+
+    parts = urlsplit(url)
+    scheme = (parts.scheme or "https").lower()
+    if scheme not in ("http", "https"):
+        return url
+    host = _normalize_host(parts.netloc, scheme)
+    rule = _rule_for(host.split(":", 1)[0])
+    if rule.force_https:
+        scheme = "https"
+    if rule.host:
+        host = rule.host
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    path = _PCT_ESCAPE.sub(lambda m: m.group(0).upper(), path)
+    params = {}
+    for k, v in parse_qsl(parts.query, keep_blank_values=False):
+        if k not in params:
+            params[k] = v
+
+    if rule.rewrite:
+        rewritten = rule.rewrite(path, params)
+        if rewritten:
+            path, params = rewritten
+    if rule.keep_params is not None:
+        params = {k: v for k, v in params.items() if k in rule.keep_params}
+    else:
+        params = {k: v for k, v in params.items() if not _is_tracking(k)}
+
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = urlencode(sorted(params.items()))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def canonical_key(url: str, resolve: bool = False) -> str:
+    """
+    Canonical URL without scheme or "www.", for dedupe
+    (http/https and www/bare copies of a page collide)
+    """
+    canon = canonicalize_url(url, resolve=resolve)
+    if not canon:
+        return canon
+    key = canon.split("://", 1)[-1]
+    return key[4:] if key.startswith("www.") else key
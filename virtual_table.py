@@ -0,0 +1,149 @@
+"""
+Virtual Table - a Treeview that only renders the rows on screen
+Rows live in the caller's data (a count and a row(start, stop) callback);
+the table keeps one Treeview item per visible line and rewrites their values
+as the user scrolls, so showing 100k results costs the same as showing 30.
+"""
+
+import tkinter as tk
+from tkinter import font as tkfont
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import ttkbootstrap as ttk_boot
+from ttkbootstrap.constants import *
+
+# (values, tag) for one rendered row; tag may be "" for the default look
+Row = Tuple[Sequence, str]
+
+
+class VirtualTable(ttk_boot.Frame):
+    """Scrollable table over count() rows fetched lazily with rows(start, stop)"""
+
+    def __init__(self, parent, columns: Sequence[Tuple[str, str, int]],
+                 count: Callable[[], int], rows: Callable[[int, int], List[Row]],
+                 on_activate: Optional[Callable[[int], None]] = None, bootstyle: str = "info", **kwargs):
+        """
+        Args:
+            columns: (id, heading, width) per column
+            count: Current number of rows
+            rows: Rows [start, stop) as (values, tag)
+            on_activate: Called with the absolute row index on double-click / Enter
+        """
+        super().__init__(parent, **kwargs)
+        self.count = count
+        self.rows = rows
+        self.on_activate = on_activate
+        self.offset = 0
+        self.total = 0
+        self.visible = 1
+        self._items: List[str] = []
+
+        self.tree = ttk_boot.Treeview(self, columns=[c[0] for c in columns], show="headings",
+                                      selectmode="browse", bootstyle=bootstyle)
+        for cid, heading, width in columns:
+            self.tree.heading(cid, text=heading, anchor="w")
+            self.tree.column(cid, width=width, minwidth=30, anchor="w", stretch=cid != columns[0][0])
+        self.scrollbar = ttk_boot.Scrollbar(self, orient=VERTICAL, command=self._on_scrollbar)
+        self.scrollbar.pack(side=RIGHT, fill=Y)
+        self.tree.pack(side=LEFT, fill=BOTH, expand=YES)
+
+        self.row_height = self._row_height()
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<Button-4>", lambda e: self.yview_scroll(-3, "units"))
+        self.tree.bind("<Button-5>", lambda e: self.yview_scroll(3, "units"))
+        self.tree.bind("<MouseWheel>", lambda e: self.yview_scroll(-3 if e.delta > 0 else 3, "units"))
+        self.tree.bind("<Prior>", lambda e: self.yview_scroll(-1, "pages"))
+        self.tree.bind("<Next>", lambda e: self.yview_scroll(1, "pages"))
+        self.tree.bind("<Home>", lambda e: self._scroll_to(0))
+        self.tree.bind("<End>", lambda e: self._scroll_to(self.total))
+        self.tree.bind("<Up>", lambda e: self._step_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._step_selection(1))
+        self.tree.bind("<Double-1>", self._on_activate)
+        self.tree.bind("<Return>", self._on_activate)
+
+    def tag_configure(self, tag: str, **options):
+        self.tree.tag_configure(tag, **options)
+
+    # ---------------- geometry -----------------
+
+    def _row_height(self) -> int:
+        try:
+            height = int(ttk_boot.Style().lookup("Treeview", "rowheight") or 0)
+        except (tk.TclError, ValueError):
+            height = 0
+        if height <= 0:
+            height = tkfont.nametofont("TkDefaultFont").metrics("linespace") + 6
+        return height
+
+    def _on_resize(self, event):
+        # One row's worth is the heading
+        visible = max(1, event.height // self.row_height - 1)
+        if visible != self.visible:
+            self.visible = visible
+            self.render()
+
+    # ---------------- scrolling -----------------
+
+    def _scroll_to(self, offset: int) -> str:
+        offset = max(0, min(offset, max(0, self.total - self.visible)))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+        return "break"
+
+    def yview_scroll(self, number: int, what: str = "units") -> str:
+        step = self.visible if what == "pages" else 1
+        return self._scroll_to(self.offset + number * step)
+
+    def _on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self._scroll_to(int(float(args[1]) * self.total))
+        elif args[0] == "scroll":
+            self.yview_scroll(int(args[1]), args[2])
+
+    def _step_selection(self, delta: int) -> str:
+        selection = self.tree.selection()
+        position = self._items.index(selection[0]) if selection and selection[0] in self._items else -1
+        target = position + delta
+        if target < 0:
+            self.yview_scroll(-1)
+            target = 0
+        elif target >= min(self.visible, len(self._items)):
+            self.yview_scroll(1)
+            target = min(self.visible, len(self._items)) - 1
+        if 0 <= target < len(self._items):
+            self.tree.selection_set(self._items[target])
+            self.tree.focus(self._items[target])
+        return "break"
+
+    def _on_activate(self, event=None):
+        selection = self.tree.selection()
+        if self.on_activate and selection and selection[0] in self._items:
+            self.on_activate(self.offset + self._items.index(selection[0]))
+        return "break"
+
+    # ---------------- rendering -----------------
+
+    def refresh(self, keep_bottom: bool = False):
+        """Re-read the row count (and the visible rows) after the data changed"""
+        at_bottom = self.offset + self.visible >= self.total
+        self.total = self.count()
+        if keep_bottom and at_bottom:
+            self.offset = max(0, self.total - self.visible)
+        self.offset = max(0, min(self.offset, max(0, self.total - self.visible)))
+        self.render()
+
+    def render(self):
+        """Write the visible window into the pooled Treeview items"""
+        self.total = self.count()
+        rows = self.rows(self.offset, min(self.total, self.offset + self.visible)) if self.total else []
+        while len(self._items) < len(rows):
+            self._items.append(self.tree.insert("", END, values=()))
+        while len(self._items) > len(rows):
+            self.tree.delete(self._items.pop())
+        for iid, (values, tag) in zip(self._items, rows):
+            self.tree.item(iid, values=list(values), tags=(tag,) if tag else ())
+        if self.total:
+            self.scrollbar.set(self.offset / self.total, min(1.0, (self.offset + self.visible) / self.total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
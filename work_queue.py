@@ -0,0 +1,338 @@
+"""
+Work Queue - multiprocess / multi-machine runner for large sweeps
+A sweep is split into (engine, keyword, location) units on a durable SQLite
+queue in a shared directory. Worker processes (local, or on other machines
+that mount the same directory) claim units and run search -> normalize ->
+enrich -> email extraction for each; the coordinator merges finished units
+into the job store as they arrive. Claimed units carry a lease, so units of
+a worker that died are handed out again.
+
+Note: SQLite locking over network filesystems is only as good as the
+filesystem's; use a local disk or a share with working POSIX locks.
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import multiprocessing
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from job_record import json_default
+
+DEFAULT_QUEUE_DIR = os.path.join("output", "queue")
+
+# A claimed unit not completed within this many seconds is handed out again
+DEFAULT_LEASE = 600
+MAX_ATTEMPTS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    params TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    engine TEXT NOT NULL,
+    keyword TEXT NOT NULL,
+    location TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    worker TEXT,
+    claimed_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    UNIQUE (run_id, engine, keyword, location)
+);
+CREATE INDEX IF NOT EXISTS units_status ON units(status, run_id);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    unit_id INTEGER NOT NULL,
+    run_id TEXT NOT NULL,
+    records TEXT NOT NULL,
+    emails TEXT NOT NULL,
+    merged INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS pacing (
+    engine TEXT PRIMARY KEY,
+    next_at REAL NOT NULL
+);
+"""
+
+
+class WorkQueue:
+    """Durable SQLite queue of search units shared by workers and a coordinator"""
+
+    def __init__(self, queue_dir: str = DEFAULT_QUEUE_DIR, lease: float = DEFAULT_LEASE):
+        os.makedirs(queue_dir, exist_ok=True)
+        self.queue_dir = queue_dir
+        self.path = os.path.join(queue_dir, "queue.db")
+        self.lease = lease
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _tx(self):
+        return _Transaction(self.conn)
+
+    # ---------------- producer -----------------
+
+    def enqueue(self, run_id: str, units: Iterable[Tuple[str, str, str]], params: Dict) -> int:
+        """Add (engine, keyword, location) units for a run. Returns how many were new."""
+        with self._tx():
+            self.conn.execute(
+                "INSERT OR IGNORE INTO runs (run_id, params, created) VALUES (?, ?, ?)",
+                (run_id, json.dumps(params, sort_keys=True, default=str), datetime.now().isoformat()),
+            )
+            added = 0
+            for engine, kw, loc in units:
+                cur = self.conn.execute(
+                    "INSERT OR IGNORE INTO units (run_id, engine, keyword, location) VALUES (?, ?, ?, ?)",
+                    (run_id, engine, kw, loc or ""),
+                )
+                added += cur.rowcount
+        return added
+
+    def run_params(self, run_id: str) -> Dict:
+        row = self.conn.execute("SELECT params FROM runs WHERE run_id = ?", (run_id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    # ---------------- workers -----------------
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """Take the next pending (or lease-expired) unit, or None if there is none"""
+        now = time.time()
+        with self._tx():
+            row = self.conn.execute(
+                "SELECT id, run_id, engine, keyword, location, attempts FROM units "
+                "WHERE (status = 'pending' OR (status = 'claimed' AND claimed_at < ?)) AND attempts < ? "
+                "ORDER BY id LIMIT 1",
+                (now - self.lease, MAX_ATTEMPTS),
+            ).fetchone()
+            if not row:
+                return None
+            self.conn.execute(
+                "UPDATE units SET status = 'claimed', worker = ?, claimed_at = ?, attempts = attempts + 1 WHERE id = ?",
+                (worker, now, row[0]),
+            )
+        return {"id": row[0], "run_id": row[1], "engine": row[2], "keyword": row[3], "location": row[4],
+                "attempt": row[5] + 1}
+
+    def complete(self, unit_id: int, run_id: str, records: List[Dict], emails: Dict):
+        """Store a unit's records and extracted emails and mark it done"""
+        with self._tx():
+            self.conn.execute(
+                "INSERT INTO results (unit_id, run_id, records, emails) VALUES (?, ?, ?, ?)",
+                (unit_id, run_id, json.dumps(records, default=json_default), json.dumps(emails, default=json_default)),
+            )
+            self.conn.execute("UPDATE units SET status = 'done', error = NULL WHERE id = ?", (unit_id,))
+
+    def fail(self, unit_id: int, error: str):
+        """Release a unit for retry, or mark it failed once it ran out of attempts"""
+        with self._tx():
+            self.conn.execute(
+                "UPDATE units SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "error = ? WHERE id = ?",
+                (MAX_ATTEMPTS, error[:500], unit_id),
+            )
+
+    def pace(self, engine: str, min_interval: float):
+        """
+        Shared per-engine throttle: reserve the engine's next call slot across
+        every worker using this queue, then sleep until it.
+        """
+        if min_interval <= 0:
+            return
+        with self._tx():
+            row = self.conn.execute("SELECT next_at FROM pacing WHERE engine = ?", (engine,)).fetchone()
+            now = time.time()
+            slot = max(now, row[0] if row else 0.0)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pacing (engine, next_at) VALUES (?, ?)", (engine, slot + min_interval)
+            )
+        if slot > now:
+            time.sleep(slot - now)
+
+    # ---------------- coordinator -----------------
+
+    def counts(self, run_id: str) -> Dict[str, int]:
+        """Units of a run by status"""
+        out = {"pending": 0, "claimed": 0, "done": 0, "failed": 0}
+        for status, n in self.conn.execute(
+            "SELECT status, COUNT(*) FROM units WHERE run_id = ? GROUP BY status", (run_id,)
+        ):
+            out[status] = n
+        return out
+
+    def is_finished(self, run_id: str) -> bool:
+        """True once every unit is done or failed for good (incl. lease expired on the last attempt)"""
+        row = self.conn.execute(
+            "SELECT COUNT(*) FROM units WHERE run_id = ? AND status NOT IN ('done', 'failed') "
+            "AND NOT (attempts >= ? AND (status = 'pending' OR claimed_at < ?))",
+            (run_id, MAX_ATTEMPTS, time.time() - self.lease),
+        ).fetchone()
+        return row[0] == 0
+
+    def latest_run(self, params: Dict) -> Optional[str]:
+        """Most recent run enqueued with identical params (for --resume)"""
+        row = self.conn.execute(
+            "SELECT run_id FROM runs WHERE params = ? ORDER BY created DESC LIMIT 1",
+            (json.dumps(params, sort_keys=True, default=str),),
+        ).fetchone()
+        return row[0] if row else None
+
+    def all_results(self, run_id: str) -> Iterable[Tuple[List[Dict], Dict]]:
+        """Every finished unit of a run, merged or not"""
+        for records, emails in self.conn.execute(
+            "SELECT records, emails FROM results WHERE run_id = ? ORDER BY id", (run_id,)
+        ).fetchall():
+            yield json.loads(records), json.loads(emails)
+
+    def take_results(self, run_id: str) -> List[Tuple[List[Dict], Dict]]:
+        """Finished units not merged yet, as (records, emails); marks them merged"""
+        with self._tx():
+            rows = self.conn.execute(
+                "SELECT id, records, emails FROM results WHERE run_id = ? AND merged = 0 ORDER BY id", (run_id,)
+            ).fetchall()
+            if rows:
+                self.conn.executemany("UPDATE results SET merged = 1 WHERE id = ?", [(r[0],) for r in rows])
+        return [(json.loads(r[1]), json.loads(r[2])) for r in rows]
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, so concurrent claimers serialize on the write lock"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, *exc):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+# ============= WORKER =============
+
+def process_unit(unit: Dict, params: Dict, verbose: bool = False) -> Tuple[List[Dict], Dict]:
+    """search -> normalize -> enrich -> extract emails for one unit"""
+    from engine_registry import get_engine
+    from normalize import normalize_record, filter_relevant
+
+    engine = get_engine(unit["engine"])
+    if engine is None:
+        raise ValueError(f"unknown engine {unit['engine']}")
+    results = engine.search(unit["keyword"], unit["location"],
+                            max_results=params.get("max_per_query", 20), verbose=verbose)
+    records = [
+        normalize_record(r, params.get("resolve_redirects", False))
+        for r in filter_relevant(results, params.get("keywords") or [unit["keyword"]],
+                                 params.get("relevance_threshold", 1.0))
+    ]
+
+    if records and params.get("enrich"):
+        from enrichment_pipeline import JobEnrichment
+        records = JobEnrichment(verbose=verbose).enrich_jobs(records)
+
+    emails = {}
+    if records and params.get("extract_emails"):
+        from email_extractor import extract_from_job_results
+        emails = extract_from_job_results(records, verbose=verbose)
+    return records, emails
+
+
+def run_worker(queue_dir: str = DEFAULT_QUEUE_DIR, worker_id: Optional[str] = None,
+               idle_exit: float = 5.0, verbose: bool = False) -> int:
+    """
+    Claim and process units until the queue has had no work for idle_exit
+    seconds (idle_exit <= 0: run forever). Returns the number of units processed.
+    """
+    from engine_registry import set_min_interval
+
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+    queue = WorkQueue(queue_dir)
+    # Pacing is shared through the queue instead of per process
+    set_min_interval(0)
+    params_cache: Dict[str, Dict] = {}
+    processed = 0
+    idle_since = time.monotonic()
+    try:
+        while True:
+            unit = queue.claim(worker_id)
+            if unit is None:
+                if idle_exit > 0 and time.monotonic() - idle_since >= idle_exit:
+                    break
+                time.sleep(0.5)
+                continue
+            idle_since = time.monotonic()
+            params = params_cache.get(unit["run_id"])
+            if params is None:
+                params = params_cache[unit["run_id"]] = queue.run_params(unit["run_id"])
+            try:
+                queue.pace(unit["engine"], params.get("throttle", 0.0))
+                records, emails = process_unit(unit, params, verbose=verbose)
+                queue.complete(unit["id"], unit["run_id"], records, emails)
+                processed += 1
+                if verbose:
+                    query = f"{unit['keyword']} {unit['location']}".strip()
+                    print(f"[worker {worker_id}] {unit['engine']} '{query}' -> {len(records)} records")
+            except Exception as e:
+                queue.fail(unit["id"], str(e))
+                print(f"[worker {worker_id}] unit {unit['id']} failed (attempt {unit['attempt']}): {e}")
+    finally:
+        queue.close()
+    return processed
+
+
+def start_workers(n: int, queue_dir: str = DEFAULT_QUEUE_DIR, verbose: bool = False) -> List[multiprocessing.Process]:
+    """Start n local worker processes"""
+    procs = []
+    for i in range(n):
+        p = multiprocessing.Process(target=run_worker, args=(queue_dir, None, 5.0, verbose),
+                                    name=f"jobgoblin-worker-{i + 1}", daemon=True)
+        p.start()
+        procs.append(p)
+    return procs
+
+
+# ============= COORDINATOR =============
+
+def coordinate(queue: WorkQueue, run_id: str, on_results: Callable[[List[Dict], Dict], None],
+               workers: Optional[List[multiprocessing.Process]] = None, poll: float = 1.0,
+               verbose: bool = False) -> Dict[str, int]:
+    """
+    Hand finished units to on_results(records, emails) as they arrive, until
+    every unit of the run is done or failed. If all local workers exit while
+    units remain (and no remote worker picks them up within a lease), stops
+    early. Returns the final unit counts.
+    """
+    last_report = 0.0
+    while True:
+        for records, emails in queue.take_results(run_id):
+            on_results(records, emails)
+        if queue.is_finished(run_id):
+            break
+        if workers is not None and not any(p.is_alive() for p in workers):
+            # Local workers exited on idle: collect what is left, then stop waiting
+            for records, emails in queue.take_results(run_id):
+                on_results(records, emails)
+            if queue.is_finished(run_id):
+                break
+            counts = queue.counts(run_id)
+            if not counts["claimed"]:
+                print(f"[queue] workers exited with {counts['pending']} unit(s) pending")
+                break
+        if verbose and time.monotonic() - last_report >= 10:
+            last_report = time.monotonic()
+            print(f"[queue] {queue.counts(run_id)}")
+        time.sleep(poll)
+    return queue.counts(run_id)